@@ -37,10 +37,11 @@ def schema(request_body_schema):
     """
 
     def add_validator(func):
+        schema_validator = validators._SchemaValidator(
+            request_body_schema, name=func.__qualname__)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            schema_validator = validators._SchemaValidator(
-                request_body_schema)
             try:
                 schema_validator.validate(kwargs['body'])
             except KeyError:
@@ -64,6 +65,9 @@ def query_schema(query_params_schema):
     """
 
     def add_validator(func):
+        schema_validator = validators._SchemaValidator(
+            query_params_schema, name=func.__qualname__ + ':query')
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             # NOTE(tpatil): The second argument of the method
@@ -81,8 +85,6 @@ def query_schema(query_params_schema):
 
             query_opts = {}
             query_opts.update(req.GET)
-            schema_validator = validators._SchemaValidator(
-                query_params_schema)
             schema_validator.validate(query_opts)
 
             return func(*args, **kwargs)
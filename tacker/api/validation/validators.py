@@ -18,6 +18,9 @@ Internal implementation of request Body validating middleware.
 
 """
 
+import threading
+import time
+
 import jsonschema
 from jsonschema import exceptions as jsonschema_exc
 import netaddr
@@ -132,6 +135,63 @@ class FormatChecker(jsonschema.FormatChecker):
             raise jsonschema_exc.FormatError(msg, cause=cause)
 
 
+class _ValidatorRegistry(object):
+    """Registry of compiled schema validators
+
+    A jsonschema validator is made only once per schema and shared by all
+    requests, so that the validator class, the FormatChecker and the
+    resolved $refs are reused. Schemas registered must be long-lived
+    (i.e. defined at module level) since they are kept by the registry.
+
+    The time spent in validation is accumulated per name of validation
+    (e.g. the API method) and available by get_stats().
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # {validator_org: (validator_cls, format_checker)}
+        self.validator_classes = {}
+        # {(validator_org, id(schema)): (schema, validator)}
+        self.validators = {}
+        # {name: {'count': int, 'total': float, 'max': float}}
+        self.stats = {}
+
+    def get(self, schema, validator_org):
+        key = (validator_org, id(schema))
+        entry = self.validators.get(key)
+        if entry is not None and entry[0] is schema:
+            return entry[1]
+
+        with self.lock:
+            if validator_org not in self.validator_classes:
+                # NOTE: FormatChecker is made at the first use so that
+                # all format checkers registered by cls_checks are used.
+                self.validator_classes[validator_org] = (
+                    jsonschema.validators.extend(validator_org,
+                                                 validators={}),
+                    FormatChecker())
+            validator_cls, format_checker = (
+                self.validator_classes[validator_org])
+            validator = validator_cls(schema, format_checker=format_checker)
+            self.validators[key] = (schema, validator)
+        return validator
+
+    def record(self, name, elapsed):
+        with self.lock:
+            stat = self.stats.setdefault(
+                name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            stat['count'] += 1
+            stat['total'] += elapsed
+            stat['max'] = max(stat['max'], elapsed)
+
+    def get_stats(self):
+        with self.lock:
+            return {name: dict(stat) for name, stat in self.stats.items()}
+
+
+VALIDATOR_REGISTRY = _ValidatorRegistry()
+
+
 class _SchemaValidator(object):
     """A validator class
 
@@ -141,16 +201,27 @@ class _SchemaValidator(object):
     Also FormatCheckers are added for checking data formats which would be
     passed through cinder api commonly.
 
+    The compiled validator is got from VALIDATOR_REGISTRY, so it is cheap
+    to make an instance per validation. If name is specified, the time
+    spent in validate() is recorded with the name.
+
     """
     validator_org = jsonschema.Draft7Validator
 
-    def __init__(self, schema):
-        validator_cls = jsonschema.validators.extend(self.validator_org,
-                                                     validators={})
-        format_checker = FormatChecker()
-        self.validator = validator_cls(schema, format_checker=format_checker)
+    def __init__(self, schema, name=None):
+        self.validator = VALIDATOR_REGISTRY.get(schema, self.validator_org)
+        self.name = name
 
     def validate(self, *args, **kwargs):
+        if self.name is None:
+            return self._validate(*args, **kwargs)
+        start = time.monotonic()
+        try:
+            return self._validate(*args, **kwargs)
+        finally:
+            VALIDATOR_REGISTRY.record(self.name, time.monotonic() - start)
+
+    def _validate(self, *args, **kwargs):
         try:
             self.validator.validate(*args, **kwargs)
         except jsonschema.ValidationError as ex:
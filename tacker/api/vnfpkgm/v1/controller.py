@@ -53,6 +53,8 @@ LOG = logging.getLogger(__name__)
 
 CONF = cfg.CONF
 
+VNFD_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
 
 class VnfPkgmController(wsgi.Controller):
 
@@ -273,6 +275,7 @@ class VnfPkgmController(wsgi.Controller):
             # send rpc message for deleting actual vnf_package
             # to conductors
             self.rpc_api.delete_vnf_package(context, vnf_package)
+            csar_utils.delete_vnfd_cache(vnf_package.id)
 
     @wsgi.response(http_client.ACCEPTED)
     @wsgi.expected_errors((http_client.FORBIDDEN, http_client.NOT_FOUND,
@@ -631,33 +634,69 @@ class VnfPkgmController(wsgi.Controller):
             raise webob.exc.HTTPConflict(explanation=msg % {"id": id,
                     "onboarded": fields.PackageOnboardingStateType.ONBOARDED})
 
-        try:
-            vnfd_files_and_data = self.rpc_api.\
-                get_vnf_package_vnfd(context, vnf_package)
-        except exceptions.FailedToGetVnfdData as e:
-            LOG.error(e.msg)
-            raise webob.exc.HTTPInternalServerError(explanation=str(e.msg))
+        # NOTE: VNFD of an onboarded package is never changed, so it is
+        # made only once and cached until the package is deleted.
+        vnfd_contents = None
+        vnfd_etags = csar_utils.load_vnfd_cache(vnf_package.id)
+        if vnfd_etags is None:
+            vnfd_contents = self._get_vnfd_contents(context, vnf_package)
+            vnfd_etags = csar_utils.save_vnfd_cache(vnf_package.id,
+                                                    vnfd_contents)
 
         if 'text/plain' in accept_headers:
             # Checking for yaml files only. This is required when there is
             # TOSCA.meta file along with single yaml file.
             # In such case we need to return single yaml file.
-            file_list = list(vnfd_files_and_data.keys())
-            yaml_files = [file for file in file_list if file.endswith(
-                ('.yaml', '.yml'))]
-            if len(yaml_files) == 1:
-                request.response.headers['Content-Type'] = 'text/plain'
-                return vnfd_files_and_data[yaml_files[0]]
+            if 'text/plain' in vnfd_etags:
+                content_type = 'text/plain'
             elif 'application/zip' in accept_headers:
-                request.response.headers['Content-Type'] = 'application/zip'
-                return self._create_vnfd_zip(vnfd_files_and_data)
+                content_type = 'application/zip'
             else:
                 msg = _("VNFD is implemented as multiple yaml files,"
                         " Accept header should be 'application/zip'.")
                 raise webob.exc.HTTPBadRequest(explanation=msg)
         else:
-            request.response.headers['Content-Type'] = 'application/zip'
-            return self._create_vnfd_zip(vnfd_files_and_data)
+            content_type = 'application/zip'
+
+        request.response.headers['Content-Type'] = content_type
+        request.response.etag = vnfd_etags[content_type]
+        if request.response.etag in request.if_none_match:
+            request.response.status_int = http_client.NOT_MODIFIED
+            return request.response
+
+        if vnfd_contents is None:
+            try:
+                vnfd_data = csar_utils.read_vnfd_cache(vnf_package.id,
+                                                       content_type)
+            except (OSError, ValueError, KeyError):
+                # e.g. deleted at the same time
+                vnfd_data = self._get_vnfd_contents(
+                    context, vnf_package)[content_type]
+        else:
+            vnfd_data = vnfd_contents[content_type]
+        if content_type == 'text/plain':
+            request.response.text = vnfd_data.decode('utf-8')
+        else:
+            request.response.body = vnfd_data
+        return request.response
+
+    def _get_vnfd_contents(self, context, vnf_package):
+        """Return VNFD data per content type got from the conductor"""
+        try:
+            vnfd_files_and_data = self.rpc_api.\
+                get_vnf_package_vnfd(context, vnf_package)
+        except exceptions.FailedToGetVnfdData as e:
+            LOG.error(e.msg)
+            raise webob.exc.HTTPInternalServerError(explanation=str(e.msg))
+
+        contents = {
+            'application/zip': self._create_vnfd_zip(vnfd_files_and_data)}
+        yaml_files = [file for file in vnfd_files_and_data
+                      if file.endswith(('.yaml', '.yml'))]
+        if len(yaml_files) == 1:
+            contents['text/plain'] = (
+                vnfd_files_and_data[yaml_files[0]].encode('utf-8'))
+        return contents
 
     @wsgi.response(http_client.OK)
     @wsgi.expected_errors((http_client.BAD_REQUEST, http_client.FORBIDDEN,
@@ -798,7 +837,12 @@ class VnfPkgmController(wsgi.Controller):
         buff = BytesIO()
         with ZipFile(buff, 'w', zipfile.ZIP_DEFLATED) as zip_archive:
             for file_path, file_data in vnfd_files_and_data.items():
-                zip_archive.writestr(file_path, file_data)
+                # NOTE: the timestamp is fixed so that the same archive
+                # (i.e. the same ETag) is made from the same VNFD.
+                zip_info = zipfile.ZipInfo(file_path,
+                                           date_time=VNFD_ZIP_DATE_TIME)
+                zip_info.compress_type = zipfile.ZIP_DEFLATED
+                zip_archive.writestr(zip_info, file_data)
 
         return buff.getvalue()
 
@@ -36,7 +36,7 @@ class OpenstackClients(object):
         self.auth_attr = auth_attr
 
     def _keystone_client(self):
-        return self.keystone_plugin.initialize_client(**self.auth_attr)
+        return self.keystone_plugin.get_cached_client(**self.auth_attr)
 
     def _heat_client(self):
         endpoint = self.keystone_session.get_endpoint(
@@ -78,7 +78,7 @@ class OpenstackSdkConnection(object):
           user_domain_name=access_info['user_domain_name'],
           project_domain_name=access_info['project_domain_name'])
 
-        session = self.keystone_plugin.initialize_client(**auth)
+        session = self.keystone_plugin.get_cached_client(**auth)
 
         conn = connection.Connection(
             region_name=access_info.get('region'),
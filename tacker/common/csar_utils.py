@@ -13,11 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
 from copy import deepcopy
 import hashlib
+import json
 import os
 import re
 import shutil
+import tempfile
 from urllib.parse import urlparse
 from urllib import request as urllib2
 import yaml
@@ -32,6 +35,8 @@ from toscaparser.tosca_template import ToscaTemplate
 
 from tacker.common import exceptions
 import tacker.conf
+# NOTE: registers the options of v2_vnfm.
+from tacker.sol_refactored.common import config as sol_config  # noqa: F401
 from tacker.tosca import utils as toscautils
 
 
@@ -47,6 +52,15 @@ TOSCA_META = 'TOSCA-Metadata/TOSCA.meta'
 ARTIFACT_KEYS = ['Source', 'Algorithm', 'Hash']
 IMAGE_FORMAT_LIST = ['raw', 'vhd', 'vhdx', 'vmdk', 'vdi', 'iso', 'ploop',
                    'qcow2', 'aki', 'ari', 'ami', 'img']
+# NOTE: artifacts are read by this size so that memory usage does not
+# depend on the size of artifacts.
+HASH_CHUNK_SIZE = 1024 * 1024
+VNFD_CACHE_DIR = '.vnfd_cache'
+VNFD_CACHE_INDEX = 'index.json'
+# NOTE: Terraform infra-driver of v2 API copies the files of a VNF package
+# once under this directory in tf_file_dir to make working directories of
+# hard links to them.
+TF_TEMPLATE_DIR = '.templates'
 
 
 def _check_type(custom_def, node_type, type_list):
@@ -425,6 +439,8 @@ def _get_vnf_artifacts(csar):
 
 def _convert_artifacts(vnf_artifacts, artifacts_data, csar):
     artifacts_data_split = re.split(b'\n\n+', artifacts_data)
+    # artifacts whose hash is validated
+    artifacts = []
 
     for data in artifacts_data_split:
         if re.findall(b'.?Name:.?|.?Source:.?|', data):
@@ -457,29 +473,51 @@ def _convert_artifacts(vnf_artifacts, artifacts_data, csar):
                         in IMAGE_FORMAT_LIST:
                     continue
                 else:
-                    algorithm = artifact_data_dict.get('Algorithm')
-                    hash_code = artifact_data_dict.get('Hash')
-                    result = _validate_hash(algorithm, hash_code,
-                                            csar, artifact_path)
-                    if result:
-                        vnf_artifacts.append(artifact_data_dict)
-                    else:
-                        invalid_artifact_err_msg = \
-                            (('The hash "%(hash)s" of artifact file '
-                              '"%(artifact)s" is an invalid value.') %
-                             {'hash': hash_code, 'artifact': artifact_path})
-                        raise exceptions.InvalidCSAR(invalid_artifact_err_msg)
+                    # NOTE: Algorithm and Source are validated here so that
+                    # an invalid one is found before reading artifacts.
+                    _get_hash_obj(artifact_data_dict.get('Algorithm'),
+                                  artifact_path)
+                    _validate_artifact_source(csar, artifact_path)
+                    artifacts.append(artifact_data_dict)
+
+    _validate_hashes(artifacts, csar)
+    vnf_artifacts.extend(artifacts)
 
     return vnf_artifacts
 
 
-def _validate_hash(algorithm, hash_code, csar, artifact_path):
-    z = zipfile.ZipFile(csar.path)
+def _validate_hashes(artifacts, csar):
+    """Validate hashes of artifacts concurrently
+
+    Artifacts are read in parallel by at most artifact_hash_workers
+    workers. The archive opened by csar is shared by the workers.
+    """
+    if not artifacts:
+        return
+    workers = max(1, min(CONF.vnf_package.artifact_hash_workers,
+                         len(artifacts)))
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda artifact: _validate_hash(
+                artifact['Algorithm'], artifact['Hash'], csar,
+                artifact['Source']),
+            artifacts))
+
+    for artifact, result in zip(artifacts, results):
+        if not result:
+            invalid_artifact_err_msg = \
+                (('The hash "%(hash)s" of artifact file '
+                  '"%(artifact)s" is an invalid value.') %
+                 {'hash': artifact['Hash'], 'artifact': artifact['Source']})
+            raise exceptions.InvalidCSAR(invalid_artifact_err_msg)
+
+
+def _get_hash_obj(algorithm, artifact_path):
     algorithm = algorithm.lower()
 
     # validate Algorithm's value
     if algorithm in HASH_DICT.keys():
-        hash_obj = HASH_DICT[algorithm]()
+        return HASH_DICT[algorithm]()
     else:
         invalid_artifact_err_msg = (('The algorithm("%(algorithm)s") of '
                                      'artifact("%(artifact_path)s") is '
@@ -487,26 +525,45 @@ def _validate_hash(algorithm, hash_code, csar, artifact_path):
                                     {'algorithm': algorithm,
                                      'artifact_path': artifact_path})
         raise exceptions.InvalidCSAR(invalid_artifact_err_msg)
-    filelist = csar.zfile.namelist()
 
+
+def _is_remote_artifact(artifact_path):
+    url = urlparse(artifact_path)
+    return url.scheme == 'file' or (bool(url.scheme) and bool(url.netloc))
+
+
+def _is_csar_member(csar, artifact_path):
+    try:
+        csar.zfile.getinfo(artifact_path)
+    except KeyError:
+        return False
+    return True
+
+
+def _validate_artifact_source(csar, artifact_path):
     # validate Source's value
-    if artifact_path in filelist:
-        hash_obj.update(z.read(artifact_path))
-    elif ((urlparse(artifact_path).scheme == 'file') or
-          (bool(urlparse(artifact_path).scheme) and
-           bool(urlparse(artifact_path).netloc))):
-        hash_obj.update(urllib2.urlopen(artifact_path).read())
-    else:
+    if (not _is_csar_member(csar, artifact_path) and
+            not _is_remote_artifact(artifact_path)):
         invalid_artifact_err_msg = (('The path("%(artifact_path)s") of '
                                      'artifact Source is an invalid value.') %
                                     {'artifact_path': artifact_path})
         raise exceptions.InvalidCSAR(invalid_artifact_err_msg)
 
-    # validate Hash's value
-    if hash_code == hash_obj.hexdigest():
-        return True
+
+def _validate_hash(algorithm, hash_code, csar, artifact_path):
+    hash_obj = _get_hash_obj(algorithm, artifact_path)
+    _validate_artifact_source(csar, artifact_path)
+
+    if _is_csar_member(csar, artifact_path):
+        artifact = csar.zfile.open(artifact_path)
     else:
-        return False
+        artifact = urllib2.urlopen(artifact_path)
+    with artifact:
+        for chunk in iter(lambda: artifact.read(HASH_CHUNK_SIZE), b''):
+            hash_obj.update(chunk)
+
+    # validate Hash's value
+    return hash_code == hash_obj.hexdigest()
 
 
 def extract_csar_zip_file(file_path, extract_path):
@@ -560,6 +617,100 @@ def delete_csar_data(package_uuid):
     shutil.rmtree(csar_zip_temp_path, ignore_errors=True)
     if os.path.isfile(csar_path):
         os.remove(csar_path)
+    delete_vnfd_cache(package_uuid)
+    delete_tf_template(package_uuid)
+
+
+def _get_vnfd_cache_path(package_uuid):
+    cache_path = (CONF.vnf_package.vnfd_cache_path or
+                  os.path.join(CONF.vnf_package.vnf_package_csar_path,
+                               VNFD_CACHE_DIR))
+    return os.path.join(cache_path, package_uuid)
+
+
+def _make_etag(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def load_vnfd_cache(package_uuid):
+    """Return ETags of the cached VNFD of a package
+
+    The return value is a dict whose key is the content type and value is
+    the ETag of the content, or None if the VNFD is not cached.
+    """
+    index_path = os.path.join(_get_vnfd_cache_path(package_uuid),
+                              VNFD_CACHE_INDEX)
+    try:
+        with open(index_path) as f:
+            return {content_type: etag
+                    for content_type, (_, etag) in json.load(f).items()}
+    except (OSError, ValueError):
+        return None
+
+
+def read_vnfd_cache(package_uuid, content_type):
+    cache_path = _get_vnfd_cache_path(package_uuid)
+    with open(os.path.join(cache_path, VNFD_CACHE_INDEX)) as f:
+        file_name, _ = json.load(f)[content_type]
+    with open(os.path.join(cache_path, file_name), 'rb') as f:
+        return f.read()
+
+
+def save_vnfd_cache(package_uuid, contents):
+    """Cache the VNFD of a package and return ETags of the contents
+
+    'contents' is a dict whose key is the content type and value is the
+    content (bytes). The VNFD of a package is never changed once the
+    package is onboarded, so the cache is valid until the package is
+    deleted. A file of a content is named by its hash. Failure of caching
+    is not an error since the VNFD can be made again.
+    """
+    etags = {content_type: _make_etag(data)
+             for content_type, data in contents.items()}
+    cache_path = _get_vnfd_cache_path(package_uuid)
+    if os.path.isdir(cache_path):
+        return etags
+
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # NOTE: made in a temporary directory and renamed so that a
+        # partially written cache is never used.
+        tmp_path = tempfile.mkdtemp(dir=os.path.dirname(cache_path))
+        index = {}
+        for content_type, data in contents.items():
+            file_name = etags[content_type]
+            with open(os.path.join(tmp_path, file_name), 'wb') as f:
+                f.write(data)
+            index[content_type] = (file_name, etags[content_type])
+        with open(os.path.join(tmp_path, VNFD_CACHE_INDEX), 'w') as f:
+            json.dump(index, f)
+        os.rename(tmp_path, cache_path)
+        tmp_path = None
+    except OSError as exp:
+        # NOTE: includes the case the cache is made by another request
+        # at the same time.
+        LOG.debug("VNFD of vnf package %(uuid)s is not cached: %(error)s",
+                  {'uuid': package_uuid,
+                   'error': encodeutils.exception_to_unicode(exp)})
+    finally:
+        if tmp_path is not None:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return etags
+
+
+def delete_vnfd_cache(package_uuid):
+    shutil.rmtree(_get_vnfd_cache_path(package_uuid), ignore_errors=True)
+
+
+def get_tf_template_path(package_uuid):
+    return os.path.join(CONF.v2_vnfm.tf_file_dir, TF_TEMPLATE_DIR,
+                        package_uuid)
+
+
+def delete_tf_template(package_uuid):
+    shutil.rmtree(get_tf_template_path(package_uuid), ignore_errors=True)
 
 
 class PreserveZipFilePermissions(zipfile.ZipFile):
@@ -52,6 +52,7 @@ from tacker.common import rpc
 from tacker.common import safe_utils
 from tacker.common import topics
 from tacker.common import utils
+from tacker.conductor import notification_delivery
 import tacker.conf
 from tacker import context as t_context
 from tacker.db.db_sqlalchemy import models
@@ -307,6 +308,16 @@ def grant_error_common(function):
     return decorated_function
 
 
+@functools.lru_cache(maxsize=1024)
+def _get_filter_vnfdids(subscription_filter):
+    # NOTE: subscription filters are parsed once per filter string since
+    # the same subscriptions are checked for every notification.
+    filter_values = jsonutils.loads(subscription_filter)
+    vnfdids = filter_values.get(
+        'vnfInstanceSubscriptionFilter', {}).get('vnfdIds')
+    return frozenset(vnfdids) if vnfdids else None
+
+
 def async_call(func):
     def inner(*args, **kwargs):
         th = threading.Thread(target=func, args=args,
@@ -1839,9 +1850,10 @@ class Conductor(manager.Manager, v2_hook.ConductorV2Hook):
         """Function to send notification to client
 
            This function is used to send notification
-           to client during LCM Operation.
+           to client during LCM Operation. The notifications are queued
+           to NOTIFICATION_DELIVERY and sent asynchronously.
 
-           :returns: 0 if status code of the response is 204
+           :returns: 0 if the notifications are queued
                     -1 if vnf_lcm_subscriptions is not found in the DB
                     -2 if an Internal Server Error occurs
         """
@@ -1896,41 +1908,12 @@ class Conductor(manager.Manager, v2_hook.ConductorV2Hook):
                 notification['timeStamp'] = timeutils.utcnow().isoformat()
                 try:
                     self.__set_auth_subscription(line)
-
-                    for num in range(CONF.vnf_lcm.retry_num):
-                        try:
-                            LOG.debug("send notify[%s]" %
-                                json.dumps(notification))
-                            auth_client = auth.auth_manager.get_auth_client(
-                                notification['subscriptionId'])
-                            response = auth_client.post(
-                                line.callback_uri,
-                                data=json.dumps(notification),
-                                timeout=CONF.vnf_lcm.retry_timeout,
-                                verify=CONF.vnf_lcm.verify_notification_ssl)
-                            if response.status_code == 204:
-                                LOG.debug(
-                                    "send success notify[%s]",
-                                    json.dumps(notification))
-                                break
-                            else:
-                                LOG.warning("Notification failed id[%s]"
-                                    " status[%s] callback_uri[%s]",
-                                    notification['id'], response.status_code,
-                                    line.callback_uri)
-                                LOG.debug("retry_wait %s",
-                                    CONF.vnf_lcm.retry_wait)
-                                self._retry_check(num)
-
-                                continue
-                        except requests.Timeout as e:
-                            LOG.warning("Notification request timed out."
-                                " id[%(id)s] callback_uri[%(uri)s]"
-                                " reason[%(reason)s]", {
-                                    "id": notification['id'],
-                                    "uri": line.callback_uri,
-                                    "reason": str(e)})
-                            self._retry_check(num)
+                    # NOTE: the notification is serialized here since it
+                    # is modified for the next subscription.
+                    notification_delivery.NOTIFICATION_DELIVERY.submit(
+                        notification_delivery.Delivery(
+                            line.id, line.callback_uri, notification['id'],
+                            json.dumps(notification)))
                 except Exception as e:
                     LOG.warning("send error[%s]" % str(e))
                     LOG.warning(traceback.format_exc())
@@ -1957,10 +1940,7 @@ class Conductor(manager.Manager, v2_hook.ConductorV2Hook):
         for subscription in vnf_lcm_subscriptions:
             if subscription.tenant_id == vnf_instance.get("tenant_id"):
                 if subscription.filter:
-                    filter_values = jsonutils.loads(subscription.filter)
-                    filter_vnfdids = filter_values.get(
-                        'vnfInstanceSubscriptionFilter', {}).get(
-                            'vnfdIds')
+                    filter_vnfdids = _get_filter_vnfdids(subscription.filter)
                     if filter_vnfdids:
                         if vnf_instance.get("vnfd_id") in filter_vnfdids:
                             extract_vnf_lcm_subscriptions.append(subscription)
@@ -0,0 +1,228 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+from concurrent import futures
+import heapq
+import itertools
+import threading
+import time
+
+from oslo_log import log as logging
+import requests
+
+from tacker import auth
+import tacker.conf
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = tacker.conf.CONF
+
+
+class Delivery(object):
+    """A notification to be sent to a subscription"""
+
+    def __init__(self, subscription_id, callback_uri, notification_id, body):
+        self.subscription_id = subscription_id
+        self.callback_uri = callback_uri
+        self.notification_id = notification_id
+        # NOTE: body is a serialized json string.
+        self.body = body
+        self.attempts = 0
+        self.queued_at = time.monotonic()
+
+
+class NotificationDeliveryEngine(object):
+    """Deliver v1 LCM notifications concurrently
+
+    Notifications are queued per subscription and sent in order of the
+    queue, so that a slow or failing subscriber does not delay the others.
+    Deliveries of different subscriptions are done by a pool of worker
+    threads (the size is CONF.vnf_lcm.notification_workers).
+
+    When a delivery fails with an error response or a timeout, it is
+    retried after CONF.vnf_lcm.retry_wait seconds up to
+    CONF.vnf_lcm.retry_num attempts in total. A worker does not wait for
+    the retry; the subscription is put on the timer and the following
+    notifications of the subscription are held until the retry ends.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        # {subscription_id: deque of Delivery}
+        self.queues = {}
+        # subscription ids being delivered or waiting for a retry
+        self.active = set()
+        # heap of (due, seq, subscription_id)
+        self.timers = []
+        self.timer_seq = itertools.count()
+        self.timer_thread = None
+        self.executor = None
+        self.stats = {'delivered': 0, 'failed': 0, 'retries': 0,
+                      'latency': {'count': 0, 'total': 0.0, 'max': 0.0}}
+
+    def submit(self, delivery):
+        with self.cond:
+            self.queues.setdefault(
+                delivery.subscription_id, collections.deque()).append(
+                    delivery)
+            if delivery.subscription_id not in self.active:
+                self.active.add(delivery.subscription_id)
+                self._dispatch(delivery.subscription_id)
+
+    def _dispatch(self, subscription_id):
+        # NOTE: must be called with self.cond held.
+        if self.executor is None:
+            self.executor = futures.ThreadPoolExecutor(
+                max_workers=CONF.vnf_lcm.notification_workers,
+                thread_name_prefix='notification')
+        self.executor.submit(self._deliver, subscription_id)
+
+    def _schedule(self, subscription_id, delay):
+        # NOTE: must be called with self.cond held.
+        heapq.heappush(self.timers, (time.monotonic() + delay,
+                                     next(self.timer_seq), subscription_id))
+        if self.timer_thread is None:
+            self.timer_thread = threading.Thread(target=self._run_timer,
+                                                 daemon=True)
+            self.timer_thread.start()
+        self.cond.notify_all()
+
+    def _run_timer(self):
+        with self.cond:
+            while True:
+                if not self.timers:
+                    self.cond.wait()
+                    continue
+                due, _, subscription_id = self.timers[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self.cond.wait(delay)
+                    continue
+                heapq.heappop(self.timers)
+                self._dispatch(subscription_id)
+
+    def _deliver(self, subscription_id):
+        with self.cond:
+            delivery = self.queues[subscription_id][0]
+        delivery.attempts += 1
+
+        try:
+            retry = not self._send(delivery)
+        except Exception as ex:
+            LOG.warning("send error[%s] id[%s] callback_uri[%s]", ex,
+                        delivery.notification_id, delivery.callback_uri)
+            retry = False
+            failed = True
+        else:
+            failed = retry
+            if retry and delivery.attempts >= CONF.vnf_lcm.retry_num:
+                LOG.warning("Number of retries exceeded retry count [%s]",
+                            CONF.vnf_lcm.retry_num)
+                retry = False
+
+        with self.cond:
+            if retry:
+                self.stats['retries'] += 1
+                LOG.debug("retry_wait %s", CONF.vnf_lcm.retry_wait)
+                if CONF.vnf_lcm.retry_wait > 0:
+                    self._schedule(subscription_id, CONF.vnf_lcm.retry_wait)
+                else:
+                    self._dispatch(subscription_id)
+                return
+
+            self._record(delivery, failed)
+            queue = self.queues[subscription_id]
+            queue.popleft()
+            if queue:
+                # NOTE: dispatched again rather than looping here so that
+                # the other subscriptions get workers in turn.
+                self._dispatch(subscription_id)
+            else:
+                del self.queues[subscription_id]
+                self.active.discard(subscription_id)
+                self.cond.notify_all()
+
+    def _send(self, delivery):
+        """Send a notification once
+
+        :returns: True if the notification is accepted, False if it
+                  should be retried
+        """
+        LOG.debug("send notify[%s]", delivery.body)
+        auth_client = auth.auth_manager.get_auth_client(
+            delivery.subscription_id)
+        try:
+            response = auth_client.post(
+                delivery.callback_uri,
+                data=delivery.body,
+                timeout=CONF.vnf_lcm.retry_timeout,
+                verify=CONF.vnf_lcm.verify_notification_ssl)
+        except requests.Timeout as ex:
+            LOG.warning("Notification request timed out."
+                        " id[%(id)s] callback_uri[%(uri)s]"
+                        " reason[%(reason)s]", {
+                            "id": delivery.notification_id,
+                            "uri": delivery.callback_uri,
+                            "reason": str(ex)})
+            return False
+
+        if response.status_code == 204:
+            LOG.debug("send success notify[%s]", delivery.body)
+            return True
+
+        LOG.warning("Notification failed id[%s] status[%s] callback_uri[%s]",
+                    delivery.notification_id, response.status_code,
+                    delivery.callback_uri)
+        return False
+
+    def _record(self, delivery, failed):
+        # NOTE: must be called with self.cond held.
+        elapsed = time.monotonic() - delivery.queued_at
+        if failed:
+            self.stats['failed'] += 1
+            return
+        self.stats['delivered'] += 1
+        latency = self.stats['latency']
+        latency['count'] += 1
+        latency['total'] += elapsed
+        latency['max'] = max(latency['max'], elapsed)
+        LOG.debug("Notification id[%s] delivered to %s in %.3f sec "
+                  "(%d attempts)", delivery.notification_id,
+                  delivery.callback_uri, elapsed, delivery.attempts)
+
+    def get_stats(self):
+        """Return the delivery metrics
+
+        'latency' is the time from queuing to the successful delivery.
+        """
+        with self.cond:
+            stats = dict(self.stats, latency=dict(self.stats['latency']))
+            stats['pending'] = sum(len(queue)
+                                   for queue in self.queues.values())
+            return stats
+
+    def wait(self, timeout=None):
+        """Wait for all queued notifications to be delivered
+
+        :returns: False if timed out
+        """
+        with self.cond:
+            return self.cond.wait_for(lambda: not self.active,
+                                      timeout=timeout)
+
+
+NOTIFICATION_DELIVERY = NotificationDeliveryEngine()
@@ -63,6 +63,13 @@ In ``tacker.conf`` (``[vnf_lcm]`` section)::
         'retry_timeout',
         default=10,
         help="Retry timeout (sec)"),
+    cfg.IntOpt(
+        'notification_workers',
+        default=8,
+        min=1,
+        help="Number of threads sending notifications concurrently. "
+             "Notifications of a subscription are sent in order by one "
+             "thread at a time"),
     cfg.BoolOpt(
         'test_callback_uri',
         default=True,
@@ -79,7 +79,17 @@ Related options:
                 help=_("List of del inputs from lower-vnfd")),
     cfg.IntOpt('vnf_package_num',
                default=100,
-               help=_("Number of vnf_packages contained in 1 page"))
+               help=_("Number of vnf_packages contained in 1 page")),
+    cfg.IntOpt('artifact_hash_workers',
+               default=4,
+               min=1,
+               help=_("Max number of artifacts whose hash is calculated "
+                      "concurrently when a VNF package is uploaded")),
+    cfg.StrOpt('vnfd_cache_path',
+               default='',
+               help=_("Path to cache VNFD archives returned by the Read "
+                      "VNFD API. If not specified, '.vnfd_cache' under "
+                      "vnf_package_csar_path is used."))
 
 ]
 
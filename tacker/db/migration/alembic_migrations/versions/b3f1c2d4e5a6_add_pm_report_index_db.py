@@ -0,0 +1,88 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add db table for pm report index
+
+Revision ID: b3f1c2d4e5a6
+Revises: ca2ad037c320
+Create Date: 2026-10-18 05:10:21.613904
+
+"""
+
+import json
+import uuid
+
+from alembic import op
+from oslo_utils import timeutils
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b3f1c2d4e5a6'
+down_revision = 'ca2ad037c320'
+
+
+def _index_id(job_id, object_instance_id, sub_object_instance_id, metric):
+    # NOTE: must be the same as pm_job_utils.report_index_id.
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, json.dumps(
+        [job_id, object_instance_id, sub_object_instance_id, metric])))
+
+
+def upgrade(active_plugins=None, options=None):
+    index_table = op.create_table(
+        'PmReportIndexV2',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('jobId', sa.String(length=255), nullable=False),
+        sa.Column('objectInstanceId', sa.String(length=255), nullable=False),
+        sa.Column('subObjectInstanceId', sa.String(length=255),
+                  nullable=True),
+        sa.Column('performanceMetric', sa.String(length=255),
+                  nullable=False),
+        sa.Column('latestTimeStamp', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB'
+    )
+    op.create_index('ix_PmReportIndexV2_jobId', 'PmReportIndexV2',
+                    ['jobId'])
+
+    # make the index of the reports already stored
+    report_table = sa.table(
+        'PerformanceReportV2',
+        sa.column('jobId', sa.String),
+        sa.column('entries', sa.JSON))
+    latest = {}
+    for row in op.get_bind().execute(report_table.select()):
+        job_id, entries = row.jobId, row.entries
+        if isinstance(entries, str):
+            entries = json.loads(entries)
+        for entry in entries:
+            if not entry.get('performanceValues'):
+                continue
+            key = (job_id, entry['objectInstanceId'],
+                   entry.get('subObjectInstanceId'),
+                   entry['performanceMetric'])
+            timestamp = max(
+                timeutils.normalize_time(
+                    timeutils.parse_isotime(value['timeStamp']))
+                for value in entry['performanceValues'])
+            if key not in latest or latest[key] < timestamp:
+                latest[key] = timestamp
+
+    if latest:
+        op.bulk_insert(index_table, [
+            {'id': _index_id(*key), 'jobId': key[0],
+             'objectInstanceId': key[1], 'subObjectInstanceId': key[2],
+             'performanceMetric': key[3], 'latestTimeStamp': timestamp}
+            for key, timestamp in latest.items()])
@@ -0,0 +1,84 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add readyTime to PerformanceReportV2
+
+Revision ID: c7d2e9f1a3b4
+Revises: b3f1c2d4e5a6
+Create Date: 2026-10-18 07:42:53.284711
+
+"""
+
+import json
+
+from alembic import op
+from oslo_utils import timeutils
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e9f1a3b4'
+down_revision = 'b3f1c2d4e5a6'
+
+
+def _parse_time(value):
+    return timeutils.normalize_time(timeutils.parse_isotime(value))
+
+
+def upgrade(active_plugins=None, options=None):
+    op.add_column('PerformanceReportV2',
+                  sa.Column('readyTime', sa.DateTime(), nullable=True))
+
+    # set readyTime of the reports already stored. it is the readyTime of
+    # the report in the PM job, which is the time of the first
+    # performance value of the report.
+    bind = op.get_bind()
+    job_table = sa.table(
+        'PmJobV2',
+        sa.column('reports', sa.JSON))
+    report_table = sa.table(
+        'PerformanceReportV2',
+        sa.column('id', sa.String),
+        sa.column('entries', sa.JSON),
+        sa.column('readyTime', sa.DateTime))
+
+    ready_times = {}
+    for row in bind.execute(job_table.select()):
+        reports = row.reports
+        if isinstance(reports, str):
+            reports = json.loads(reports)
+        for report in reports or []:
+            ready_times[report['href'].rsplit('/', 1)[-1]] = _parse_time(
+                report['readyTime'])
+
+    now = timeutils.utcnow()
+    for row in bind.execute(report_table.select()).fetchall():
+        ready_time = ready_times.get(row.id)
+        if ready_time is None:
+            entries = row.entries
+            if isinstance(entries, str):
+                entries = json.loads(entries)
+            try:
+                ready_time = _parse_time(
+                    entries[0]['performanceValues'][0]['timeStamp'])
+            except (IndexError, KeyError):
+                ready_time = now
+        bind.execute(report_table.update().where(
+            report_table.c.id == row.id).values(readyTime=ready_time))
+
+    op.alter_column('PerformanceReportV2', 'readyTime',
+                    existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_PerformanceReportV2_jobId_readyTime',
+                    'PerformanceReportV2', ['jobId', 'readyTime'])
@@ -0,0 +1,45 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add db table for auto heal timer
+
+Revision ID: d4e8a2b6c1f9
+Revises: c7d2e9f1a3b4
+Create Date: 2026-10-18 09:12:47.305118
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd4e8a2b6c1f9'
+down_revision = 'c7d2e9f1a3b4'
+
+
+def upgrade(active_plugins=None, options=None):
+    op.create_table(
+        'AutoHealTimerV2',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('source', sa.String(length=64), nullable=False),
+        sa.Column('vnfInstanceId', sa.String(length=255), nullable=False),
+        sa.Column('vnfcInstanceIds', sa.JSON(), nullable=False),
+        sa.Column('dueTime', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB'
+    )
+    op.create_index('ix_AutoHealTimerV2_dueTime', 'AutoHealTimerV2',
+                    ['dueTime'])
@@ -0,0 +1,42 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add db table for prometheus rule
+
+Revision ID: e9a3f5c7b2d4
+Revises: d4e8a2b6c1f9
+Create Date: 2026-10-18 14:03:21.518734
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e9a3f5c7b2d4'
+down_revision = 'd4e8a2b6c1f9'
+
+
+def upgrade(active_plugins=None, options=None):
+    op.create_table(
+        'PrometheusRuleV2',
+        sa.Column('id', sa.String(length=255), nullable=False),
+        sa.Column('ruleGroup', sa.JSON(), nullable=False),
+        sa.Column('targets', sa.JSON(), nullable=False),
+        sa.Column('reloadUris', sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        mysql_engine='InnoDB'
+    )
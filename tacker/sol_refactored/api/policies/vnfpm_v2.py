@@ -24,6 +24,7 @@ PM_JOB_PATH = V2_PATH + '/pm_jobs'
 PM_THRESHOLD_PATH = V2_PATH + '/thresholds'
 PM_JOB_ID_PATH = PM_JOB_PATH + '/{pmJobId}'
 PM_THRESHOLD_ID_PATH = PM_THRESHOLD_PATH + '/{thresholdId}'
+REPORT_INDEX = '/vnfpm/v2/pm_jobs/{id}/reports'
 REPORT_GET = '/vnfpm/v2/pm_jobs/{id}/reports/{report_id}'
 
 POLICY_NAME_PROM_PLUGIN = 'tacker_PROM_PLUGIN_api:PROM_PLUGIN:{}'
@@ -88,6 +89,19 @@ rules = [
             }
         ]
     ),
+    # Add new Rest API GET /vnfpm/v2/pm_jobs/{id}/reports to
+    # list the PM reports of the PM job.
+    policy.DocumentedRuleDefault(
+        name=POLICY_NAME.format('report_index'),
+        check_str=RULE_ANY,
+        description="List the performance reports of a PM job.",
+        operations=[
+            {
+                'method': 'GET',
+                'path': REPORT_INDEX
+            }
+        ]
+    ),
     # Add new Rest API GET /vnfpm/v2/pm_jobs/{id}/reports/{report_id} to
     # get the specified PM report.
     policy.DocumentedRuleDefault(
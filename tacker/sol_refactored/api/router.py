@@ -85,6 +85,7 @@ class VnfPmAPIRouterV2(sol_wsgi.SolAPIRouter):
         ("/pm_jobs", {"POST": "create", "GET": "index"}),
         ("/pm_jobs/{id}", {
             "PATCH": "update", "GET": "show", "DELETE": "delete"}),
+        ("/pm_jobs/{id}/reports", {"GET": "report_index"}),
         ("/pm_jobs/{id}/reports/{report_id}", {"GET": "report_get"}),
         ("/thresholds", {"POST": "create_threshold",
                          "GET": "index_threshold"}),
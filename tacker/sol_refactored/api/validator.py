@@ -33,16 +33,20 @@ class SolSchemaValidator(validators._SchemaValidator):
 
 def schema(request_body_schema, min_version, max_version=None):
 
+    min_ver = api_version.APIVersion(min_version)
+    max_ver = api_version.APIVersion(max_version)
+
     def add_validator(func):
+        # NOTE: compiled at the route setup (i.e. import) time.
+        schema_validator = SolSchemaValidator(request_body_schema,
+                                              name=func.__qualname__)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             ver = kwargs['request'].context.api_version
-            min_ver = api_version.APIVersion(min_version)
-            max_ver = api_version.APIVersion(max_version)
             if ver.matches(min_ver, max_ver):
                 if 'body' not in kwargs:
                     raise sol_ex.SolValidationError(detail="body is missing")
-                schema_validator = SolSchemaValidator(request_body_schema)
                 schema_validator.validate(kwargs['body'])
 
             return func(*args, **kwargs)
@@ -54,11 +58,13 @@ def schema(request_body_schema, min_version, max_version=None):
 def schema_nover(request_body_schema):
 
     def add_validator(func):
+        schema_validator = SolSchemaValidator(request_body_schema,
+                                              name=func.__qualname__)
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             if 'body' not in kwargs:
                 raise sol_ex.SolValidationError(detail="body is missing")
-            schema_validator = SolSchemaValidator(request_body_schema)
             schema_validator.validate(kwargs['body'])
 
             return func(*args, **kwargs)
@@ -32,6 +32,11 @@ from tacker.sol_refactored.common import exceptions as sol_ex
 
 LOG = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class SolRequest(webob.Request):
 
@@ -55,6 +60,48 @@ class SolRequest(webob.Request):
         return self.environ['tacker.context']
 
 
+def _dump_json(obj):
+    """Return (encoded bytes, separator of list elements)"""
+    if config.CONF.v2_vnfm.json_encoder == 'orjson' and orjson is not None:
+        # NOTE: datetime is passed to to_primitive so that the format is
+        # same as jsonutils.
+        return (orjson.dumps(obj, default=jsonutils.to_primitive,
+                             option=(orjson.OPT_PASSTHROUGH_DATETIME |
+                                     orjson.OPT_NON_STR_KEYS)),
+                b',')
+    return jsonutils.dump_as_bytes(obj), b', '
+
+
+def _encode_json(body):
+    """Encode body to a list of chunks of json
+
+    A list is encoded element by element so that a too big body is
+    rejected as soon as the size exceeds max_content_length without
+    encoding the rest and the whole encoded body is not copied into one
+    bytes object.
+    """
+    max_length = config.CONF.v2_vnfm.max_content_length
+    if not isinstance(body, list):
+        chunk, _ = _dump_json(body)
+        if len(chunk) > max_length:
+            raise sol_ex.ResponseTooBig(size=max_length)
+        return [chunk]
+
+    chunks = [b'[']
+    size = 2  # '[' and ']'
+    for i, elem in enumerate(body):
+        chunk, sep = _dump_json(elem)
+        if i > 0:
+            chunks.append(sep)
+            size += len(sep)
+        size += len(chunk)
+        if size > max_length:
+            raise sol_ex.ResponseTooBig(size=max_length)
+        chunks.append(chunk)
+    chunks.append(b']')
+    return chunks
+
+
 class SolResponse(object):
 
     # SOL013 4.2.3 Response header field
@@ -74,17 +121,16 @@ class SolResponse(object):
         self.headers.setdefault('content_type', content_type)
         content_type = self.headers['content_type']
         if self.body is None:
-            body = None
+            response = webob.Response(body=None)
         elif content_type == 'text/plain':
-            body = self.body
+            response = webob.Response(body=self.body)
         elif content_type == 'application/zip':
-            body = self.body
+            response = webob.Response(body=self.body)
         else:  # 'application/json'
-            body = jsonutils.dump_as_bytes(self.body)
-            if len(body) > config.CONF.v2_vnfm.max_content_length:
-                raise sol_ex.ResponseTooBig(
-                    size=config.CONF.v2_vnfm.max_content_length)
-        response = webob.Response(body=body)
+            chunks = _encode_json(self.body)
+            response = webob.Response(
+                app_iter=chunks,
+                content_length=sum(len(chunk) for chunk in chunks))
         response.status_int = self.status
         for hdr, val in self.headers.items():
             response.headers[hdr.replace('_', '-')] = val
@@ -32,12 +32,43 @@ VNFM_OPTS = [
     cfg.IntOpt('max_content_length',
                default=1000000,
                help=_('Max content length for list APIs.')),
+    cfg.StrOpt('json_encoder',
+               default='json',
+               choices=['json', 'orjson'],
+               help=_('JSON encoder used to serialize responses of v2 APIs. '
+                      'orjson is faster but needs the orjson package. '
+                      'If it is not installed, json is used.')),
     cfg.IntOpt('openstack_vim_stack_create_timeout',
                default=20,
                help=_('Timeout (in minutes) of heat stack creation.')),
     cfg.IntOpt('kubernetes_vim_rsc_wait_timeout',
                default=500,
                help=_('Timeout (second) of k8s res creation.')),
+    cfg.IntOpt('kubernetes_client_pool_size',
+               default=32,
+               min=0,
+               help=_('Max number of k8s API clients kept for reuse. '
+                      'A client is kept per VIM and reused by operations '
+                      'for the VIM. 0 means a client is created for each '
+                      'operation.')),
+    cfg.IntOpt('kubernetes_client_token_ttl',
+               default=300,
+               min=0,
+               help=_('Time (second) an OIDC token of a kept k8s API '
+                      'client is reused if the expiry of the token is '
+                      'unknown.')),
+    cfg.IntOpt('kubernetes_client_token_refresh_margin',
+               default=60,
+               min=0,
+               help=_('An OIDC token of a kept k8s API client is got again '
+                      'this time (second) before its expiry.')),
+    cfg.BoolOpt('kubernetes_vim_rsc_watch',
+                default=True,
+                help=_('Track the state of k8s resources (Pod, Deployment, '
+                       'ReplicaSet, DaemonSet and StatefulSet) by watch '
+                       'while waiting for completion of an operation. '
+                       'The resources are checked by polling if the watch '
+                       'is not available.')),
     cfg.IntOpt('vnf_instance_page_size',
                default=0,  # 0 means no paging
                help=_('Paged response size of the query result '
@@ -64,6 +95,55 @@ VNFM_OPTS = [
                       'connection error when sending a notification. '
                       'Period between retries is exponential starting '
                       '0.5 seconds up to a maximum of 60 seconds.')),
+    cfg.IntOpt('notify_workers',
+               default=10,
+               help=_('Number of worker threads which send notifications. '
+                      'Notifications are queued and sent by these '
+                      'workers.')),
+    cfg.IntOpt('notify_max_concurrency_per_endpoint',
+               default=4,
+               help=_('Max number of notifications sent concurrently to '
+                      'the same endpoint (scheme, host and port of '
+                      'callbackUri).')),
+    cfg.IntOpt('notify_retries',
+               default=0,  # 0 means no retry
+               help=_('Number of retries that should be attempted when '
+                      'sending a notification failed (i.e. error response '
+                      'or no response). Period between retries is '
+                      'exponential starting notify_retry_interval seconds '
+                      'up to a maximum of 60 seconds.')),
+    cfg.IntOpt('notify_retry_interval',
+               default=1,
+               help=_('Initial interval (second) of retries of sending a '
+                      'notification.')),
+    cfg.IntOpt('vnfd_cache_size',
+               default=32,
+               help=_('Max total size (MB) of VNFD files whose parsed '
+                      'contents are cached. Parsed contents are cached '
+                      'per vnfdId and the hash of VNFD files, and evicted '
+                      'in least recently used order. 0 means no cache.')),
+    cfg.IntOpt('db_sync_workers',
+               default=4,
+               help=_('Number of worker threads which synchronize the '
+                      'database with VIMs. VNF instances are grouped by '
+                      'VIM and namespace and each group is handled by '
+                      'one worker.')),
+    cfg.BoolOpt('db_sync_skip_unchanged',
+                default=True,
+                help=_('Skip the difference check of a VNF instance if '
+                       'neither the instance nor the resources in the VIM '
+                       'have changed since the last DB synchronization.')),
+    cfg.IntOpt('lcm_op_max_concurrency',
+               default=0,  # 0 means no limit
+               help=_('Max number of LCM operations executed at the same '
+                      'time by a tacker-conductor. Exceeding operations '
+                      'wait in a queue and they are executed in order of '
+                      'priority (heal first and instantiate last) and in '
+                      'round robin across tenants.')),
+    cfg.IntOpt('lcm_op_max_concurrency_per_vim',
+               default=0,  # 0 means no limit
+               help=_('Max number of LCM operations executed at the same '
+                      'time against the same VIM by a tacker-conductor.')),
     cfg.IntOpt('vnffm_alarm_page_size',
                default=0,  # 0 means no paging
                help=_('Paged response size of the query result '
@@ -76,6 +156,44 @@ VNFM_OPTS = [
                default=0,  # 0 means no paging
                help=_('Paged response size of the query result for '
                       'VNF PM job.')),
+    cfg.IntOpt('vnfpm_report_page_size',
+               default=0,  # 0 means no paging
+               help=_('Paged response size of the query result for '
+                      'reports of VNF PM job.')),
+    cfg.IntOpt('vnfpm_pmjob_max_reports',
+               default=100,  # 0 means unlimited
+               min=0,
+               help=_('Maximum number of the latest reports listed in '
+                      'the reports attribute of VNF PM job. All reports '
+                      'of the PM job can be listed by GET '
+                      '/vnfpm/v2/pm_jobs/{id}/reports. '
+                      'Default value "0" means unlimited.')),
+    cfg.IntOpt('vnfpm_report_retention',
+               default=0,  # 0 means the reports are kept forever
+               min=0,
+               help=_('Retention time (in seconds) of reports of VNF PM '
+                      'job. The reports older than it are deleted. '
+                      'Default value "0" means the reports are kept '
+                      'until the PM job is deleted.')),
+    cfg.IntOpt('vnfpm_report_rollup_age',
+               default=0,  # 0 means no roll-up
+               min=0,
+               help=_('Age (in seconds) of reports of VNF PM job to be '
+                      'rolled up. The reports older than it are rolled up '
+                      'into one report per vnfpm_report_rollup_interval. '
+                      'Default value "0" means no roll-up.')),
+    cfg.IntOpt('vnfpm_report_rollup_interval',
+               default=3600,
+               min=1,
+               help=_('Interval (in seconds) of the time buckets into '
+                      'which reports of VNF PM job are rolled up.')),
+    cfg.IntOpt('auto_heal_timer_poll_interval',
+               default=60,
+               min=1,
+               help=_('Interval (in seconds) of checking the pending auto '
+                      'heal timers stored in DB. Timers registered by '
+                      'another conductor (e.g. the one stopped) are '
+                      'taken over by this check.')),
     cfg.BoolOpt('placement_fallback_best_effort',
                default=False,
                help=_('If True, fallbackBestEffort setting is enabled '
@@ -131,10 +249,33 @@ VNFM_OPTS = [
                default='',
                help=_('Specifies the root CA certificate to use when the '
                       'heat_verify_cert option is True.')),
+    cfg.IntOpt('heat_check_interval_min',
+               default=1,
+               min=1,
+               help=_('Initial interval (second) of checking the progress '
+                      'of a heat stack operation. The interval is doubled '
+                      'while no stack event occurs up to '
+                      'heat_check_interval_max.')),
+    cfg.IntOpt('heat_check_interval_max',
+               default=10,
+               min=1,
+               help=_('Max interval (second) of checking the progress of '
+                      'a heat stack operation.')),
     cfg.StrOpt('tf_file_dir',
              default='/var/lib/tacker/terraform',
              help=_('Temporary directory for Terraform infra-driver to '
                     'store terraform config files')),
+    cfg.StrOpt('tf_plugin_cache_dir',
+               default='',
+               help=_('Directory shared by Terraform infra-driver as the '
+                      'provider plugin cache (TF_PLUGIN_CACHE_DIR) of all '
+                      'VNF instances. If not specified, '
+                      '<tf_file_dir>/.plugin-cache is used.')),
+    cfg.BoolOpt('tf_reuse_plan',
+                default=False,
+                help=_('Enable Terraform infra-driver to save the plan made '
+                       'by terraform plan and apply it as it is instead of '
+                       'planning again in terraform apply.')),
     cfg.BoolOpt('nova_verify_cert',
                 default=False,
                 help=_('Enable certificate verification during SSL/TLS '
@@ -291,6 +432,15 @@ PROMETHEUS_PLUGIN_OPTS = [
     cfg.BoolOpt('test_rule_with_promtool',
                 default=False,
                 help=_('Enable rule file validation using promtool.')),
+    cfg.IntOpt('rule_reload_window',
+               default=5,
+               min=0,
+               help=_('Time window (second) to put together the reloads of '
+                      'the Prometheus servers requested by the changes of '
+                      'the alert rules. Prometheus is reloaded once at the '
+                      'end of the window. If 0, it is reloaded at every '
+                      'change and a failure of the reload is returned to '
+                      'the API request.')),
     cfg.IntOpt('reporting_period_threshold',
                default=90,
                help=_('The time of reportingPeriod for the PM Threshold. '
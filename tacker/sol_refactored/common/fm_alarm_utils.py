@@ -33,12 +33,13 @@ def get_alarm(context, alarm_id):
     return alarm
 
 
-def get_alarms_all(context, marker=None):
-    return objects.AlarmV1.get_all(context, marker)
+def get_alarms_all(context, marker=None, limit=None):
+    return objects.AlarmV1.get_all(context, marker, limit)
 
 
 def get_not_cleared_alarms(context, inst_id):
-    return objects.AlarmV1.get_by_filter(context, managedObjectId=inst_id)
+    return objects.AlarmV1.get_by_filter(context, managedObjectId=inst_id,
+                                         alarmClearedTime=None)
 
 
 def alarm_href(alarm_id, endpoint):
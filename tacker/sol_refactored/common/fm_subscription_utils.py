@@ -34,17 +34,47 @@ def get_subsc(context, subsc_id):
     return subsc
 
 
-def get_subsc_all(context, marker=None):
-    return objects.FmSubscriptionV1.get_all(context, marker)
+def get_subsc_all(context, marker=None, limit=None):
+    return objects.FmSubscriptionV1.get_all(context, marker, limit)
 
 
 def subsc_href(subsc_id, endpoint):
     return f"{endpoint}/vnffm/v1/subscriptions/{subsc_id}"
 
 
+def _get_fm_subsc_index_keys(subsc):
+    # subsc.filter: FmNotificationsFilter
+    keys = {}
+    if not subsc.obj_attr_is_set('filter'):
+        return keys
+    subsc_filter = subsc.filter
+    if subsc_filter.obj_attr_is_set('notificationTypes'):
+        keys['notificationType'] = subsc_filter.notificationTypes
+    if subsc_filter.obj_attr_is_set('perceivedSeverities'):
+        keys['perceivedSeverity'] = subsc_filter.perceivedSeverities
+    if subsc_filter.obj_attr_is_set('eventTypes'):
+        keys['eventType'] = subsc_filter.eventTypes
+    if subsc_filter.obj_attr_is_set('vnfInstanceSubscriptionFilter'):
+        keys.update(subsc_utils.get_inst_subsc_filter_index_keys(
+            subsc_filter.vnfInstanceSubscriptionFilter))
+    return keys
+
+
+FM_SUBSC_INDEX = subsc_utils.SubscriptionIndex('FmSubscriptionV1',
+                                               _get_fm_subsc_index_keys)
+
+
 def get_matched_subscs(context, inst, notif_type, alarm):
+    candidates = FM_SUBSC_INDEX.get_candidates(
+        context,
+        notificationType=notif_type,
+        perceivedSeverity=alarm.perceivedSeverity,
+        eventType=alarm.eventType,
+        vnfdId=inst.get('vnfdId'),
+        vnfProvider=inst.get('vnfProvider'))
+
     subscs = []
-    for subsc in get_subsc_all(context):
+    for subsc in candidates:
         # subsc: FmSubscription
 
         if not subsc.obj_attr_is_set('filter'):
@@ -106,3 +136,31 @@ def get_alarm_subscs(context, alarm, inst):
 
     return get_matched_subscs(
         context, inst, 'AlarmNotification', alarm)
+
+
+def _alarm_match_key(alarm, inst):
+    # attributes of the alarm referred by get_matched_subscs.
+    faulty_res_type = (alarm.rootCauseFaultyResource.faultyResourceType
+                       if alarm.obj_attr_is_set('rootCauseFaultyResource')
+                       else None)
+    return (inst.id, alarm.obj_attr_is_set('alarmClearedTime'),
+            alarm.perceivedSeverity, alarm.eventType, alarm.probableCause,
+            faulty_res_type)
+
+
+def get_alarms_subscs(context, alarms, insts):
+    """Return [(alarm, subscs), ...] of the alarms
+
+    insts is {id: VnfInstance} of managedObjectIds of the alarms.
+    Subscriptions are matched once for the alarms which have the same
+    VNF instance and the same attributes referred by the matching.
+    """
+    matched = {}
+    result = []
+    for alarm in alarms:
+        inst = insts[alarm.managedObjectId]
+        key = _alarm_match_key(alarm, inst)
+        if key not in matched:
+            matched[key] = get_alarm_subscs(context, alarm, inst)
+        result.append((alarm, matched[key]))
+    return result
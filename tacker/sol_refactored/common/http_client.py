@@ -37,7 +37,7 @@ class HttpClient(object):
 
     def __init__(self, auth_handle, version=None,
             service_type='nfv-orchestration', connect_retries=None,
-            timeout=None, base_url=None):
+            timeout=None, base_url=None, keep_session=False):
         self.auth_handle = auth_handle
         self.version = version
         self.service_type = service_type
@@ -46,6 +46,20 @@ class HttpClient(object):
         self.connect_retries = connect_retries
         self.timeout = timeout
         self.base_url = base_url
+        # NOTE: If keep_session is True, the session is created at the
+        # first request and reused after that, so that the connection is
+        # kept alive between requests.
+        self.keep_session = keep_session
+        self._session = None
+
+    def _get_session(self, context):
+        if self._session is not None:
+            return self._session
+        session = self.auth_handle.get_session(
+            self.auth_handle.get_auth(context), self.service_type)
+        if self.keep_session:
+            self._session = session
+        return session
 
     def do_request(self, url, method, context=None, expected_status=[],
                    **kwargs):
@@ -74,8 +88,7 @@ class HttpClient(object):
         if self.base_url is not None:
             kwargs.setdefault('endpoint_override', self.base_url)
 
-        session = self.auth_handle.get_session(
-            self.auth_handle.get_auth(context), self.service_type)
+        session = self._get_session(context)
         resp = session.request(url, method, raise_exc=False, **kwargs)
 
         resp_body = self._decode_body(resp)
@@ -35,8 +35,8 @@ def get_lcmocc(context, lcmocc_id):
     return lcmocc
 
 
-def get_lcmocc_all(context, marker=None):
-    return objects.VnfLcmOpOccV2.get_all(context, marker)
+def get_lcmocc_all(context, marker=None, limit=None):
+    return objects.VnfLcmOpOccV2.get_all(context, marker, limit)
 
 
 def lcmocc_href(lcmocc_id, endpoint):
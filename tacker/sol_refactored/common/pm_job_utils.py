@@ -13,8 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+import uuid
 
+from oslo_db import exception as db_exc
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 
 from tacker.sol_refactored.common import config
@@ -26,30 +31,41 @@ LOG = logging.getLogger(__name__)
 CONF = config.CONF
 
 
-def update_report(context, job_id, report, timestamp, endpoint):
-    # update reports in the pmJob
-    pm_job = get_pm_job(context, job_id)
+def add_reports(pm_job, reports, endpoint, deleted_report_ids=()):
+    """Update the links of the reports in the PM job
 
-    job_report = _gen_job_report(job_id, report, timestamp, endpoint)
+    The links of the reports are appended and the links of the deleted
+    reports are removed. Only the latest
+    CONF.v2_vnfm.vnfpm_pmjob_max_reports links are kept. The others can be
+    got by the list of the reports of the PM job.
+    """
+    job_reports = (list(pm_job.reports)
+                   if pm_job.obj_attr_is_set('reports') else [])
+    job_reports.extend(make_job_report(report, endpoint)
+                       for report in reports)
+    job_reports = [job_report for job_report in job_reports
+                   if job_report.href.rsplit('/', 1)[-1]
+                   not in deleted_report_ids]
 
-    if pm_job.obj_attr_is_set('reports'):
-        pm_job.reports.append(job_report)
-    else:
-        pm_job.reports = [job_report]
+    max_reports = CONF.v2_vnfm.vnfpm_pmjob_max_reports
+    if max_reports > 0:
+        job_reports = job_reports[-max_reports:]
+    pm_job.reports = job_reports
 
     return pm_job
 
 
-def _gen_job_report(job_id, report, timestamp, endpoint):
+def make_job_report(report, endpoint):
     return objects.VnfPmJobV2_Reports(
-        href=f'{endpoint}/vnfpm/v2/pm_jobs/{job_id}/reports/{report.id}',
-        readyTime=timestamp
+        href=(f'{endpoint}/vnfpm/v2/pm_jobs/{report.jobId}/'
+              f'reports/{report.id}'),
+        readyTime=report.readyTime
     )
 
 
-def get_pm_job_all(context, marker=None):
+def get_pm_job_all(context, marker=None, limit=None):
     # get all pm-job
-    return objects.PmJobV2.get_all(context, marker)
+    return objects.PmJobV2.get_all(context, marker, limit)
 
 
 def get_pm_job(context, pm_job_id):
@@ -73,6 +89,199 @@ def get_pm_report(context, pm_job_id, report_id=None):
     return pm_reports
 
 
+def get_pm_reports(context, pm_job_id, marker=None, limit=None):
+    # get the reports of the PM job in order of readyTime
+    return objects.PerformanceReportV2.get_by_job(
+        context, pm_job_id, marker, limit)
+
+
+def report_index_id(job_id, object_instance_id, sub_object_instance_id,
+                    metric):
+    # NOTE: the id is derived from the key so that the index of a key can
+    # be got and updated by id.
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, jsonutils.dumps(
+        [job_id, object_instance_id, sub_object_instance_id, metric])))
+
+
+def update_report_index(context, reports):
+    """Update the latest report times by the entries of the reports
+
+    The reports must be of the same PM job.
+    """
+    latest = {}
+    for report in reports:
+        for entry in report.entries:
+            if not entry.performanceValues:
+                continue
+            sub_object_instance_id = (entry.subObjectInstanceId
+                if entry.obj_attr_is_set('subObjectInstanceId') else None)
+            index_id = report_index_id(
+                report.jobId, entry.objectInstanceId,
+                sub_object_instance_id, entry.performanceMetric)
+            timestamp = max(value.timeStamp
+                            for value in entry.performanceValues)
+            if index_id not in latest or latest[index_id][1] < timestamp:
+                latest[index_id] = (entry, timestamp)
+    if not latest:
+        return
+
+    try:
+        _update_report_index(context, reports[0].jobId, latest)
+    except db_exc.DBDuplicateEntry:
+        # NOTE: the index of a new key may be inserted by another conductor
+        # at the same time. It exists now, so it is read again and updated.
+        LOG.debug("The report index of PM job %s is inserted by another "
+                  "conductor. Retry updating it.", reports[0].jobId)
+        _update_report_index(context, reports[0].jobId, latest)
+
+
+def _update_report_index(context, job_id, latest):
+    current = {index.id: index.latestTimeStamp
+               for index in objects.PmReportIndexV2.get_by_ids(
+                   context, list(latest))}
+    indexes = []
+    for index_id, (entry, timestamp) in latest.items():
+        if index_id in current and current[index_id] >= timestamp:
+            continue
+        indexes.append(objects.PmReportIndexV2(
+            id=index_id,
+            jobId=job_id,
+            objectInstanceId=entry.objectInstanceId,
+            subObjectInstanceId=(entry.subObjectInstanceId
+                if entry.obj_attr_is_set('subObjectInstanceId') else None),
+            performanceMetric=entry.performanceMetric,
+            latestTimeStamp=timestamp
+        ))
+    objects.PmReportIndexV2.update_all(context, indexes)
+
+
+def get_report_index(context, pm_job_id):
+    """Get the latest report times of the PM job
+
+    Returns a dict of {(objectInstanceId, subObjectInstanceId,
+    performanceMetric): latest report time}.
+    """
+    # NOTE: subObjectInstanceId is not set if it is None in DB.
+    return {(index.objectInstanceId, index.get('subObjectInstanceId'),
+             index.performanceMetric): index.latestTimeStamp
+            for index in objects.PmReportIndexV2.get_by_filter(
+                context, jobId=pm_job_id)}
+
+
+def delete_report_index(context, pm_job_id):
+    objects.PmReportIndexV2.delete_by_filter(context, jobId=pm_job_id)
+
+
+def _bucket(ready_time, interval):
+    ready_time = ready_time.replace(tzinfo=datetime.timezone.utc)
+    return int(ready_time.timestamp()) // interval
+
+
+def _rollup_values(values):
+    # NOTE: values are down-sampled to one value; the mean if all values
+    # are numeric, the latest value otherwise.
+    latest = max(values, key=lambda value: value.timeStamp)
+    try:
+        numbers = [float(value.value) for value in values]
+    except (TypeError, ValueError):
+        return latest
+    rollup = objects.VnfPmReportV2_Entries_PerformanceValues(
+        timeStamp=latest.timeStamp,
+        value=str(sum(numbers) / len(numbers))
+    )
+    # NOTE: 'context' can not be specified as a keyword argument since it
+    # is taken as the context of the object.
+    rollup.context = {'rollupCount': len(numbers),
+                      'min': min(numbers),
+                      'max': max(numbers)}
+    return rollup
+
+
+def _rollup_reports(reports):
+    """Roll up the reports into the latest one of them"""
+    reports = sorted(reports, key=lambda report: report.readyTime)
+    entries = {}
+    for report in reports:
+        for entry in report.entries:
+            sub_object_instance_id = (entry.subObjectInstanceId
+                if entry.obj_attr_is_set('subObjectInstanceId') else None)
+            key = (entry.objectType, entry.objectInstanceId,
+                   sub_object_instance_id, entry.performanceMetric)
+            if key not in entries:
+                entries[key] = (entry, [])
+            entries[key][1].extend(entry.performanceValues)
+
+    rollup = reports[-1]
+    rollup.entries = []
+    for entry, values in entries.values():
+        entry.performanceValues = [_rollup_values(values)] if values else []
+        rollup.entries.append(entry)
+    return rollup
+
+
+def compact_reports(context, pm_job_id, now=None):
+    """Apply the retention and the roll-up to the reports of the PM job
+
+    The reports ready before CONF.v2_vnfm.vnfpm_report_retention seconds
+    ago are deleted. The reports ready before
+    CONF.v2_vnfm.vnfpm_report_rollup_age seconds ago are rolled up into
+    one report per CONF.v2_vnfm.vnfpm_report_rollup_interval seconds
+    bucket. Only the buckets whose reports are all older than the roll-up
+    age are rolled up so that a bucket is rolled up only once.
+
+    Returns the set of the ids of the deleted reports.
+    """
+    retention = CONF.v2_vnfm.vnfpm_report_retention
+    rollup_age = CONF.v2_vnfm.vnfpm_report_rollup_age
+    if retention <= 0 and rollup_age <= 0:
+        return set()
+
+    # NOTE: readyTime got from DB is a naive datetime in UTC.
+    now = timeutils.normalize_time(now) if now else timeutils.utcnow()
+    retention_limit = (now - datetime.timedelta(seconds=retention)
+                       if retention > 0 else None)
+    rollup_bucket = None
+    limit = retention_limit
+    if rollup_age > 0:
+        interval = CONF.v2_vnfm.vnfpm_report_rollup_interval
+        rollup_bucket = _bucket(
+            now - datetime.timedelta(seconds=rollup_age), interval)
+        rollup_limit = timeutils.normalize_time(
+            datetime.datetime.fromtimestamp(rollup_bucket * interval,
+                                            datetime.timezone.utc))
+        limit = rollup_limit if limit is None else max(limit, rollup_limit)
+
+    deleted = set()
+    buckets = {}
+    for report_id, ready_time in objects.PerformanceReportV2.get_ready_times(
+            context, pm_job_id, limit):
+        if retention_limit is not None and ready_time < retention_limit:
+            deleted.add(report_id)
+        elif rollup_bucket is not None:
+            bucket = _bucket(ready_time, interval)
+            if bucket < rollup_bucket:
+                buckets.setdefault(bucket, []).append(report_id)
+
+    rollups = []
+    for report_ids in buckets.values():
+        if len(report_ids) < 2:
+            continue
+        rollup = _rollup_reports(
+            objects.PerformanceReportV2.get_by_ids(context, report_ids))
+        rollups.append(rollup)
+        deleted.update(report_id for report_id in report_ids
+                       if report_id != rollup.id)
+
+    if rollups:
+        objects.PerformanceReportV2.update_all(context, rollups)
+    if deleted:
+        objects.PerformanceReportV2.delete_by_filter(
+            context, ids=list(deleted), jobId=pm_job_id)
+        LOG.debug("%d reports of PM job %s are deleted by the compaction.",
+                  len(deleted), pm_job_id)
+    return deleted
+
+
 def pm_job_href(pm_job_id, endpoint):
     return f"{endpoint}/vnfpm/v2/pm_jobs/{pm_job_id}"
 
@@ -27,8 +27,8 @@ LOG = logging.getLogger(__name__)
 CONF = config.CONF
 
 
-def get_pm_threshold_all(context, marker=None):
-    return objects.ThresholdV2.get_all(context, marker)
+def get_pm_threshold_all(context, marker=None, limit=None):
+    return objects.ThresholdV2.get_all(context, marker, limit)
 
 
 def get_pm_threshold(context, pm_threshold_id):
@@ -14,15 +14,10 @@
 #    under the License.
 
 import datetime
-import itertools
-import json
-import os
-import paramiko
 import re
-import tempfile
+import threading
 import yaml
 
-from keystoneauth1 import exceptions as ks_exc
 from oslo_log import log as logging
 from oslo_utils import uuidutils
 from tacker.common import utils
@@ -35,6 +30,7 @@ from tacker.sol_refactored.common import http_client
 from tacker.sol_refactored.common import monitoring_plugin_base as mon_base
 from tacker.sol_refactored.common import pm_job_utils
 from tacker.sol_refactored.common import pm_threshold_utils
+from tacker.sol_refactored.common import prometheus_rule_sync
 from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
 from tacker.sol_refactored.conductor import conductor_rpc_v2 as rpc
 from tacker.sol_refactored import objects
@@ -116,9 +112,9 @@ class PrometheusPluginPmBase(PrometheusPlugin):
                 }
             ]
         }
-        self.upload_rules(
-            context, target_list, reload_list,
-            rule_group, pm_job_or_threshold.id)
+        prometheus_rule_sync.RULE_SYNC.register(
+            context, pm_job_or_threshold.id, rule_group,
+            target_list, reload_list)
         return rule_group
 
     def convert_measurement_unit(self, metric, value):
@@ -265,70 +261,10 @@ class PrometheusPluginPmBase(PrometheusPlugin):
             return None
         return resources[0].computeResource
 
-    def _delete_rule(self, host, port, user, password, path, id):
-        with paramiko.Transport(sock=(host, port)) as client:
-            client.connect(username=user, password=password)
-            sftp = paramiko.SFTPClient.from_transport(client)
-            sftp.remove(f'{path}/{id}.json')
-
-    def reload_prom_server(self, context, reload_uri):
-        resp, _ = self.client.do_request(
-            reload_uri, "PUT", context=context)
-        if resp.status_code >= 400 and resp.status_code < 600:
-            raise sol_ex.PrometheusPluginError(
-                f"Reloading request to prometheus is failed: "
-                f"{resp.status_code}.")
-
-    def _upload_rule(self, rule_group, host, port, user, password, path, id):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            with open(os.path.join(tmpdir, 'rule.json'),
-                      'w+', encoding="utf-8") as fp:
-                json.dump(rule_group, fp, indent=4, ensure_ascii=False)
-                filename = fp.name
-            with paramiko.Transport(sock=(host, port)) as client:
-                LOG.info("Upload rule files to prometheus server: %s.", host)
-                client.connect(username=user, password=password)
-                sftp = paramiko.SFTPClient.from_transport(client)
-                sftp.put(filename, f'{path}/{id}.json')
-        self.verify_rule(host, port, user, password, path, id)
-
-    def verify_rule(self, host, port, user, password, path, id):
-        if not CONF.prometheus_plugin.test_rule_with_promtool:
-            return
-        with paramiko.SSHClient() as client:
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(host, port=port, username=user, password=password)
-            command = f"promtool check rules {path}/{id}.json"
-            LOG.info("Rule file validation command: %s", command)
-            _, stdout, stderr = client.exec_command(command)
-            if stdout.channel.recv_exit_status() != 0:
-                error_byte = stderr.read()
-                error_str = error_byte.decode('utf-8')
-                LOG.error(
-                    "Rule file validation with promtool failed: %s",
-                    error_str)
-                raise sol_ex.PrometheusPluginError(
-                    "Rule file validation with promtool failed.")
-
     def delete_rules(self, context, pm_job_or_threshold):
         target_list, reload_list = self.get_access_info(pm_job_or_threshold)
-        for target in target_list:
-            try:
-                self._delete_rule(
-                    target['host'], target['port'], target['user'],
-                    target['password'], target['path'], pm_job_or_threshold.id)
-            except (sol_ex.PrometheusPluginError, ks_exc.ClientException,
-                    paramiko.SSHException):
-                # NOTE(shimizu-koji): This exception is ignored.
-                # DELETE /pm_jobs/{id} will be success even if _delete_rule()
-                # is failed. Because the rule file was already deleted.
-                pass
-        for uri in reload_list:
-            try:
-                self.reload_prom_server(context, uri)
-            except (sol_ex.PrometheusPluginError, ks_exc.ClientException,
-                    paramiko.SSHException):
-                pass
+        prometheus_rule_sync.RULE_SYNC.unregister(
+            context, pm_job_or_threshold.id, target_list, reload_list)
 
     def get_access_info(self, pm_job_or_threshold):
         target_list = []
@@ -362,34 +298,6 @@ class PrometheusPluginPmBase(PrometheusPlugin):
             reload_list.append(uri)
         return target_list, list(set(reload_list))
 
-    def upload_rules(self, context, target_list, reload_list, rule_group, id):
-        def _cleanup_error(target_list):
-            for target in target_list:
-                try:
-                    self._delete_rule(target['host'], target['port'],
-                        target['user'], target['password'], target['path'],
-                        id)
-                except (sol_ex.PrometheusPluginError, ks_exc.ClientException,
-                        paramiko.SSHException):
-                    pass
-
-        try:
-            for target in target_list:
-                self._upload_rule(
-                    rule_group, target['host'], target['port'],
-                    target['user'], target['password'], target['path'],
-                    id)
-            for uri in reload_list:
-                self.reload_prom_server(context, uri)
-        except (sol_ex.PrometheusPluginError, ks_exc.ClientException,
-                paramiko.SSHException) as e:
-            LOG.error("failed to upload rule files: %s", e.args[0])
-            _cleanup_error(target_list)
-            raise e
-        except Exception as e:
-            _cleanup_error(target_list)
-            raise e
-
 
 class PrometheusPluginPm(PrometheusPluginPmBase, mon_base.MonitoringPlugin):
     _instance = None
@@ -413,6 +321,10 @@ class PrometheusPluginPm(PrometheusPluginPmBase, mon_base.MonitoringPlugin):
         self.reporting_period_margin = (
             CONF.prometheus_plugin.reporting_period_margin)
         self.notification_callback = self.default_callback
+        # {pm_job_id: {(objectInstanceId, subObjectInstanceId,
+        #  performanceMetric): the latest report time}}
+        self.latest_reports = {}
+        self.latest_reports_lock = threading.Lock()
         PrometheusPluginPm._instance = self
 
     def set_callback(self, notification_callback):
@@ -423,6 +335,8 @@ class PrometheusPluginPm(PrometheusPluginPmBase, mon_base.MonitoringPlugin):
 
     def delete_job(self, **kwargs):
         self.delete_rules(kwargs['context'], kwargs['pm_job'])
+        with self.latest_reports_lock:
+            self.latest_reports.pop(kwargs['pm_job'].id, None)
 
     def alert(self, **kwargs):
         try:
@@ -436,29 +350,29 @@ class PrometheusPluginPm(PrometheusPluginPmBase, mon_base.MonitoringPlugin):
     def default_callback(self, context, entries):
         self.rpc.store_job_info(context, entries)
 
+    def load_latest_reports(self, context, pm_job_id):
+        # NOTE: the index in DB is merged since the reports may be made by
+        # the other processes. The times of the reports made by this
+        # process are kept even if they are not stored yet.
+        report_index = pm_job_utils.get_report_index(context, pm_job_id)
+        with self.latest_reports_lock:
+            latest = self.latest_reports.setdefault(pm_job_id, {})
+            for key, timestamp in report_index.items():
+                if key not in latest or latest[key] < timestamp:
+                    latest[key] = timestamp
+
+    def update_latest_reports(self, reported, timestamp):
+        with self.latest_reports_lock:
+            for pm_job_id, key in reported:
+                self.latest_reports.setdefault(pm_job_id, {})[key] = (
+                    timestamp)
+
     def get_datetime_of_latest_report(
             self, context, pm_job, object_instance_id,
             sub_object_instance_id, metric):
-        report = pm_job_utils.get_pm_report(context, pm_job.id)
-        if not report:
-            return None
-
-        report = list(map(lambda x: x.entries, report))
-        report = list(itertools.chain.from_iterable(report))
-        entries_of_same_object = list(
-            filter(
-                lambda x: (
-                    x.objectInstanceId == object_instance_id and
-                    (not x.obj_attr_is_set('subObjectInstanceId') or
-                     x.subObjectInstanceId == sub_object_instance_id) and
-                    x.performanceMetric == metric),
-                report))
-        if len(entries_of_same_object) == 0:
-            return None
-        values = sum(list(map(
-            lambda x: x.performanceValues, entries_of_same_object)), [])
-        return max(values, key=lambda value:
-                   self.parse_datetime(value.timeStamp)).timeStamp
+        with self.latest_reports_lock:
+            return self.latest_reports.get(pm_job.id, {}).get(
+                (object_instance_id, sub_object_instance_id, metric))
 
     def filter_alert_by_time(
             self, context, pm_job, datetime_now,
@@ -510,6 +424,10 @@ class PrometheusPluginPm(PrometheusPluginPmBase, mon_base.MonitoringPlugin):
         result = {}
         context = request.context
         datetime_now = datetime.datetime.now(datetime.timezone.utc)
+        # NOTE: a PM job and its latest report times are got once per
+        # request, not per alert.
+        pm_jobs = {}
+        reported = []
         for alert in body['alerts']:
             if alert['labels']['function_type'] != 'vnfpm':
                 continue
@@ -521,7 +439,11 @@ class PrometheusPluginPm(PrometheusPluginPmBase, mon_base.MonitoringPlugin):
                     'sub_object_instance_id')
                 value = alert['annotations']['value']
 
-                pm_job = pm_job_utils.get_pm_job(context, pm_job_id)
+                if pm_job_id not in pm_jobs:
+                    pm_jobs[pm_job_id] = pm_job_utils.get_pm_job(
+                        context, pm_job_id)
+                    self.load_latest_reports(context, pm_jobs[pm_job_id].id)
+                pm_job = pm_jobs[pm_job_id]
                 self.filter_alert_by_time(context, pm_job, datetime_now,
                                           object_instance_id,
                                           sub_object_instance_id, metric)
@@ -543,6 +465,9 @@ class PrometheusPluginPm(PrometheusPluginPmBase, mon_base.MonitoringPlugin):
                     result[pm_job_id].append(entry)
                 else:
                     result[pm_job_id] = [entry]
+                reported.append(
+                    (pm_job.id,
+                     (object_instance_id, sub_object_instance_id, metric)))
 
             except sol_ex.PrometheusPluginSkipped:
                 pass
@@ -554,6 +479,9 @@ class PrometheusPluginPm(PrometheusPluginPmBase, mon_base.MonitoringPlugin):
                     'jobId': pm_job_id,
                     'entries': entries
                 } for pm_job_id, entries in result.items()])
+            # NOTE: the alerts after this are filtered by this report even
+            # before it is stored by the conductor.
+            self.update_latest_reports(reported, datetime_now)
         return result
 
     def decompose_metrics_vnfc(self, pm_job):
@@ -982,12 +910,10 @@ class PrometheusPluginFm(PrometheusPlugin, mon_base.MonitoringPlugin):
             # alertmanager may repeat the same reports.
             LOG.error("%s: %s", e.__class__.__name__, e.args[0])
 
-    def default_callback(self, context, alarm):
-        self.rpc.store_alarm_info(context, alarm)
+    def default_callback(self, context, alarms):
+        self.rpc.store_alarms_info(context, alarms)
 
-    def vnfc_instance_ids(
-            self, context, vnf_instance_id, alert_entry):
-        inst = inst_utils.get_inst(context, vnf_instance_id)
+    def vnfc_instance_ids(self, inst, alert_entry):
         resources = (inst.instantiatedVnfInfo.vnfcResourceInfo
                 if inst.obj_attr_is_set('instantiatedVnfInfo') and
                 inst.instantiatedVnfInfo.obj_attr_is_set(
@@ -1025,10 +951,8 @@ class PrometheusPluginFm(PrometheusPlugin, mon_base.MonitoringPlugin):
         for alm in not_cleared:
             alm.alarmClearedTime = ends_at
             alm.alarmChangedTime = datetime_now
-            if self.notification_callback:
-                self.notification_callback(context, alm)
 
-    def create_new_alarm(self, context, alert_entry, datetime_now):
+    def create_new_alarm(self, context, inst, alert_entry, datetime_now):
         vnf_instance_id = alert_entry['labels']['vnf_instance_id']
         fingerprint = alert_entry['fingerprint']
         perceived_severity = alert_entry['labels']['perceived_severity']
@@ -1038,8 +962,10 @@ class PrometheusPluginFm(PrometheusPlugin, mon_base.MonitoringPlugin):
             f"detail: {alert_entry['annotations'].get('fault_details')}"
         ]
 
-        vnfc_instance_ids = self.vnfc_instance_ids(
-            context, vnf_instance_id, alert_entry)
+        if inst is None:
+            LOG.error(f"vnf instance {vnf_instance_id} is not found.")
+            raise sol_ex.PrometheusPluginSkipped()
+        vnfc_instance_ids = self.vnfc_instance_ids(inst, alert_entry)
         if len(vnfc_instance_ids) == 0:
             LOG.error("failed to specify vnfc_instance for the alert.")
             raise sol_ex.PrometheusPluginSkipped()
@@ -1074,50 +1000,85 @@ class PrometheusPluginFm(PrometheusPlugin, mon_base.MonitoringPlugin):
 
         _links = fm_alarm_utils.make_alarm_links(new_alarm, self.endpoint)
         new_alarm._links = _links
-        if self.notification_callback:
-            self.notification_callback(context, new_alarm)
         return new_alarm
 
-    def get_not_cleared_alarms(self, context, vnf_instance_id, fingerprint):
+    def get_not_cleared_alarms(self, context, vnf_instance_id):
+        """Return the not cleared alarms of the VNF instance
+
+        The alarms are returned as a dict whose key is the fingerprint
+        of the alert (i.e. 'fingerprint: xxx' of faultDetails).
+        """
         alms = fm_alarm_utils.get_not_cleared_alarms(context, vnf_instance_id)
-        fpstr = f'fingerprint: {fingerprint}'
-        return list(filter(
-            lambda x: (not x.obj_attr_is_set('alarmClearedTime') and
-                       x.obj_attr_is_set('faultDetails') and
-                       fpstr in x.faultDetails), alms))
+        not_cleared = {}
+        for alm in alms:
+            if (alm.obj_attr_is_set('alarmClearedTime') or
+                    not alm.obj_attr_is_set('faultDetails')):
+                continue
+            for detail in alm.faultDetails:
+                if detail.startswith('fingerprint: '):
+                    not_cleared.setdefault(detail, []).append(alm)
+        return not_cleared
 
     def create_or_update_alarm(
-            self, context, alert_entry, datetime_now):
+            self, context, inst, not_cleared, alert_entry, datetime_now):
+        """Make or clear the alarm of the alert
+
+        not_cleared is the one returned by get_not_cleared_alarms and it
+        is updated according to the result.
+        """
         status = alert_entry['status']
-        vnf_instance_id = alert_entry['labels']['vnf_instance_id']
-        fingerprint = alert_entry['fingerprint']
-        not_cleared = self.get_not_cleared_alarms(
-            context, vnf_instance_id, fingerprint)
+        fpstr = f"fingerprint: {alert_entry['fingerprint']}"
+        alarms = not_cleared.get(fpstr, [])
 
-        if status == 'resolved' and len(not_cleared) > 0:
+        if status == 'resolved' and len(alarms) > 0:
             ends_at = alert_entry['endsAt']
             self.update_alarm(
-                context, not_cleared, ends_at, datetime_now)
-            return not_cleared
-        if status == 'firing' and len(not_cleared) == 0:
+                context, alarms, ends_at, datetime_now)
+            del not_cleared[fpstr]
+            return alarms
+        if status == 'firing' and len(alarms) == 0:
             new_alarm = self.create_new_alarm(
-                context, alert_entry, datetime_now)
+                context, inst, alert_entry, datetime_now)
+            not_cleared[fpstr] = [new_alarm]
             return [new_alarm]
         raise sol_ex.PrometheusPluginSkipped()
 
     @validator.schema_nover(prometheus_plugin_schemas.AlertMessage)
     def _alert(self, request, body):
+        context = request.context
         now = datetime.datetime.now(datetime.timezone.utc)
-        result = []
+        # NOTE: the alerts are grouped by VNF instance so that a VNF
+        # instance and its not cleared alarms are got once per request.
+        alerts_per_inst = {}
         for alert in body['alerts']:
             if alert['labels']['function_type'] != 'vnffm':
                 continue
+            alerts_per_inst.setdefault(
+                alert['labels']['vnf_instance_id'], []).append(alert)
+
+        result = {}
+        for vnf_instance_id, alerts in alerts_per_inst.items():
             try:
-                alarms = self.create_or_update_alarm(
-                    request.context, alert, now)
-                result.extend(alarms)
-            except sol_ex.PrometheusPluginSkipped:
-                pass
+                inst = inst_utils.get_inst(context, vnf_instance_id)
+            except sol_ex.VnfInstanceNotFound:
+                # NOTE: the alarms already raised can be cleared.
+                inst = None
+            not_cleared = self.get_not_cleared_alarms(
+                context, vnf_instance_id)
+            for alert in alerts:
+                try:
+                    alarms = self.create_or_update_alarm(
+                        context, inst, not_cleared, alert, now)
+                except sol_ex.PrometheusPluginSkipped:
+                    continue
+                # NOTE: an alarm changed more than once is stored and
+                # notified only once with the last state.
+                result.update((alarm.id, alarm) for alarm in alarms)
+
+        result = list(result.values())
+        if result and self.notification_callback:
+            # Call ConductorV2
+            self.notification_callback(context, result)
         return result
 
 
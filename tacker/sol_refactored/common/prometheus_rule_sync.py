@@ -0,0 +1,334 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import io
+import json
+import shlex
+import threading
+import uuid
+
+from keystoneauth1 import exceptions as ks_exc
+from oslo_log import log as logging
+from oslo_utils import excutils
+import paramiko
+
+from tacker.common import coordination
+from tacker import context as tacker_context
+from tacker.sol_refactored.common import config
+from tacker.sol_refactored.common import exceptions as sol_ex
+from tacker.sol_refactored.common import http_client
+from tacker.sol_refactored import objects
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = config.CONF
+
+# The file which contains the alert rules of all the PM jobs and
+# thresholds of a target.
+RULE_FILE = 'tacker-rules.json'
+
+# NOTE: errors of a target are ignored in deleting rules.
+_IGNORED_ERRORS = (sol_ex.PrometheusPluginError, ks_exc.ClientException,
+                   paramiko.SSHException, EOFError, OSError)
+
+
+def _target_key(target):
+    return (target['host'], target['port'], target['path'])
+
+
+@contextlib.contextmanager
+def _lock(target):
+    coord = coordination.COORDINATOR
+    # NOTE: it is noop if already started.
+    coord.start()
+    name = uuid.uuid5(uuid.NAMESPACE_URL,
+                      'prometheus_rule/{}:{}{}'.format(*_target_key(target)))
+    lock = coord.get_lock(f'prometheus_rule-{name}')
+    # NOTE: 'with lock' is not used since it can't handle
+    # lock failed exception well.
+    lock.acquire(blocking=True)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+class SshConnection(object):
+    """An SSH connection to a Prometheus server kept to be reused"""
+
+    def __init__(self, host, port, user, password):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        # NOTE: an SFTP session can't be used by multiple threads at once.
+        self.lock = threading.Lock()
+        self.transport = None
+        self.sftp = None
+
+    def _connect(self):
+        self.close()
+        LOG.info("Connect to prometheus server: %s.", self.host)
+        transport = paramiko.Transport(sock=(self.host, self.port))
+        try:
+            transport.connect(username=self.user, password=self.password)
+            self.sftp = paramiko.SFTPClient.from_transport(transport)
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                transport.close()
+        self.transport = transport
+
+    def close(self):
+        if self.transport is not None:
+            try:
+                self.transport.close()
+            except Exception:
+                pass
+        self.transport = None
+        self.sftp = None
+
+    def run(self, func, *args):
+        """Call func(self, *args) on the connection
+
+        The connection is made if not yet. When the connection kept is
+        found broken, it is made again and func is retried once. So func
+        must be idempotent.
+        """
+        with self.lock:
+            reused = (self.transport is not None and
+                      self.transport.is_active())
+            if not reused:
+                self._connect()
+            try:
+                return func(self, *args)
+            except (paramiko.SSHException, EOFError, OSError) as ex:
+                self.close()
+                if not reused:
+                    raise
+                LOG.info("Reconnect to prometheus server %s: %s.",
+                         self.host, ex)
+            self._connect()
+            try:
+                return func(self, *args)
+            except (paramiko.SSHException, EOFError, OSError):
+                with excutils.save_and_reraise_exception():
+                    self.close()
+
+    def exec_command(self, command):
+        """Execute a command and return its exit status and stderr"""
+        channel = self.transport.open_session()
+        try:
+            channel.exec_command(command)
+            status = channel.recv_exit_status()
+            error = channel.makefile_stderr('rb').read()
+        finally:
+            channel.close()
+        return status, error.decode('utf-8')
+
+
+class PrometheusRuleSync(object):
+    """Synchronize the alert rules with the Prometheus servers
+
+    The alert rules of each PM job and threshold are stored in DB
+    (PrometheusRuleV2) as the desired state. The rule groups of all of them
+    set to a target (a rule directory of a Prometheus server) are written
+    to one file (RULE_FILE) of the target, so that a change writes only the
+    file of each target concerned. The file is validated before it is put
+    in place. The file of a target is written under the lock of the
+    coordination since it is shared by the processes of tacker-server.
+
+    The SSH connections are kept per host and user and reused.
+
+    The reloads of Prometheus requested within
+    CONF.prometheus_plugin.rule_reload_window seconds are put together and
+    each reload URI is requested once at the end of the window.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # {(host, port, user): SshConnection}
+        self.connections = {}
+        self.pending_reloads = set()
+        self.reload_timer = None
+        self.client = http_client.HttpClient(http_client.NoAuthHandle())
+
+    def _get_connection(self, target):
+        key = (target['host'], target['port'], target['user'])
+        with self.lock:
+            conn = self.connections.get(key)
+            if conn is None or conn.password != target['password']:
+                if conn is not None:
+                    with conn.lock:
+                        conn.close()
+                conn = SshConnection(target['host'], target['port'],
+                                     target['user'], target['password'])
+                self.connections[key] = conn
+        return conn
+
+    def register(self, context, rule_id, rule_group, target_list,
+                 reload_list):
+        """Set the rule group of a PM job or threshold to the targets
+
+        The rules are not stored when they can't be set to any of the
+        targets. The error is raised in that case.
+        """
+        rule = objects.PrometheusRuleV2.get_by_id(context, rule_id)
+        old = None
+        if rule is None:
+            rule = objects.PrometheusRuleV2(id=rule_id)
+        else:
+            old = (rule.ruleGroup, rule.targets, rule.reloadUris)
+        rule.ruleGroup = rule_group
+        rule.targets = target_list
+        rule.reloadUris = reload_list
+        if old is None:
+            rule.create(context)
+        else:
+            rule.update(context)
+
+        synced = []
+        try:
+            for target in target_list:
+                self._sync_target(context, target)
+                synced.append(target)
+            self._reload(context, reload_list)
+        except Exception as ex:
+            with excutils.save_and_reraise_exception():
+                LOG.error("failed to upload rule files: %s", ex)
+                if old is None:
+                    rule.delete(context)
+                else:
+                    rule.ruleGroup, rule.targets, rule.reloadUris = old
+                    rule.update(context)
+                for target in synced + (old[1] if old else []):
+                    try:
+                        self._sync_target(context, target)
+                    except Exception as e:
+                        LOG.warning("failed to restore rule file of %s: %s",
+                                    target['host'], e)
+
+    def unregister(self, context, rule_id, target_list, reload_list):
+        """Remove the rule group of a PM job or threshold from the targets
+
+        Errors of the targets are ignored. The rule group left is removed
+        by the next change of the target since it is not in DB any more.
+        """
+        rule = objects.PrometheusRuleV2.get_by_id(context, rule_id)
+        if rule is None:
+            # NOTE: the PM job or threshold was created before the rule
+            # files were put together. The rule file of its own is removed.
+            for target in target_list:
+                try:
+                    self._get_connection(target).run(
+                        self._remove_file,
+                        f"{target['path']}/{rule_id}.json")
+                except _IGNORED_ERRORS:
+                    pass
+        else:
+            rule.delete(context)
+            target_list, reload_list = rule.targets, rule.reloadUris
+            for target in target_list:
+                try:
+                    self._sync_target(context, target)
+                except _IGNORED_ERRORS as ex:
+                    LOG.warning("failed to remove rules of %s from %s: %s",
+                                rule_id, target['host'], ex)
+        try:
+            self._reload(context, reload_list)
+        except _IGNORED_ERRORS:
+            pass
+
+    def _sync_target(self, context, target):
+        key = _target_key(target)
+        with _lock(target):
+            rules = objects.PrometheusRuleV2.get_all(context)
+            groups = sum(
+                [rule.ruleGroup['groups']
+                 for rule in sorted(rules, key=lambda rule: rule.id)
+                 if any(_target_key(t) == key for t in rule.targets)], [])
+            self._get_connection(target).run(
+                self._write_rule_file, target['path'], groups)
+
+    def _remove_file(self, conn, filename):
+        try:
+            conn.sftp.remove(filename)
+        except FileNotFoundError:
+            pass
+
+    def _write_rule_file(self, conn, path, groups):
+        rule_file = f'{path}/{RULE_FILE}'
+        if not groups:
+            self._remove_file(conn, rule_file)
+            return
+
+        # NOTE: the file is written to a temporary file and validated
+        # before it replaces the rule file, so that the rule file in place
+        # is not broken by a failure.
+        tmp_file = f'{path}/.{RULE_FILE}.tmp'
+        LOG.info("Upload rule files to prometheus server: %s.", conn.host)
+        data = json.dumps({'groups': groups}, indent=4, ensure_ascii=False)
+        conn.sftp.putfo(io.BytesIO(data.encode('utf-8')), tmp_file)
+        if CONF.prometheus_plugin.test_rule_with_promtool:
+            command = f"promtool check rules {shlex.quote(tmp_file)}"
+            LOG.info("Rule file validation command: %s", command)
+            status, error = conn.exec_command(command)
+            if status != 0:
+                LOG.error("Rule file validation with promtool failed: %s",
+                          error)
+                self._remove_file(conn, tmp_file)
+                raise sol_ex.PrometheusPluginError(
+                    "Rule file validation with promtool failed.")
+        conn.sftp.posix_rename(tmp_file, rule_file)
+
+    def reload_prom_server(self, context, reload_uri):
+        resp, _ = self.client.do_request(
+            reload_uri, "PUT", context=context)
+        if resp.status_code >= 400 and resp.status_code < 600:
+            raise sol_ex.PrometheusPluginError(
+                f"Reloading request to prometheus is failed: "
+                f"{resp.status_code}.")
+
+    def _reload(self, context, reload_list):
+        window = CONF.prometheus_plugin.rule_reload_window
+        if window <= 0:
+            for uri in reload_list:
+                self.reload_prom_server(context, uri)
+            return
+
+        with self.lock:
+            self.pending_reloads.update(reload_list)
+            if self.reload_timer is None and self.pending_reloads:
+                self.reload_timer = threading.Timer(window,
+                                                    self.flush_reloads)
+                self.reload_timer.daemon = True
+                self.reload_timer.start()
+
+    def flush_reloads(self):
+        """Request the pending reloads of Prometheus"""
+        with self.lock:
+            uris = sorted(self.pending_reloads)
+            self.pending_reloads.clear()
+            self.reload_timer = None
+        context = tacker_context.get_admin_context()
+        for uri in uris:
+            try:
+                self.reload_prom_server(context, uri)
+            except Exception as ex:
+                LOG.error("Reloading prometheus %s failed: %s", uri, ex)
+
+
+RULE_SYNC = PrometheusRuleSync()
@@ -13,7 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import heapq
+import random
 import threading
+import time
+import urllib
 
 from oslo_log import log as logging
 from oslo_utils import timeutils
@@ -33,6 +38,8 @@ LOG = logging.getLogger(__name__)
 CONF = config.CONF
 
 TEST_NOTIFICATION_TIMEOUT = 20  # seconds
+NOTIFY_RETRY_MAX_INTERVAL = 60  # seconds
+NOTIFY_CLIENT_CACHE_SIZE = 1000
 NOTIFY_TYPE_PM = 'PM'
 NOTIFY_TYPE_FM = 'FM'
 
@@ -49,8 +56,8 @@ def get_subsc(context, subsc_id):
     return subsc
 
 
-def get_subsc_all(context, marker=None):
-    return objects.LccnSubscriptionV2.get_all(context, marker)
+def get_subsc_all(context, marker=None, limit=None):
+    return objects.LccnSubscriptionV2.get_all(context, marker, limit)
 
 
 def subsc_href(subsc_id, endpoint):
@@ -145,9 +152,46 @@ def get_lcmocc_subscs(context, lcmocc, inst):
             lcmocc.operation, lcmocc.operationState)
 
 
+def _get_lcm_subsc_index_keys(subsc):
+    # subsc.filter: LifecycleChangeNotificationsFilter
+    keys = {}
+    if not subsc.obj_attr_is_set('filter'):
+        return keys
+    subsc_filter = subsc.filter
+    if subsc_filter.obj_attr_is_set('notificationTypes'):
+        keys['notificationType'] = subsc_filter.notificationTypes
+    if subsc_filter.obj_attr_is_set('operationTypes'):
+        keys['operationType'] = subsc_filter.operationTypes
+    if subsc_filter.obj_attr_is_set('operationStates'):
+        keys['operationState'] = subsc_filter.operationStates
+    if subsc_filter.obj_attr_is_set('vnfInstanceSubscriptionFilter'):
+        keys.update(get_inst_subsc_filter_index_keys(
+            subsc_filter.vnfInstanceSubscriptionFilter))
+    return keys
+
+
+def get_inst_subsc_filter_index_keys(inst_filter):
+    # inst_filter: VnfInstanceSubscriptionFilter
+    keys = {}
+    if inst_filter.obj_attr_is_set('vnfdIds'):
+        keys['vnfdId'] = inst_filter.vnfdIds
+    if inst_filter.obj_attr_is_set('vnfProductsFromProviders'):
+        keys['vnfProvider'] = [products.vnfProvider for products
+                               in inst_filter.vnfProductsFromProviders]
+    return keys
+
+
 def get_matched_subscs(context, inst, notif_type, op_type, op_state):
+    candidates = LCM_SUBSC_INDEX.get_candidates(
+        context,
+        notificationType=notif_type,
+        operationType=op_type,
+        operationState=op_state,
+        vnfdId=inst.get('vnfdId'),
+        vnfProvider=inst.get('vnfProvider'))
+
     subscs = []
-    for subsc in get_subsc_all(context):
+    for subsc in candidates:
         # subsc: LccnSubscription
 
         if not subsc.obj_attr_is_set('filter'):
@@ -266,15 +310,305 @@ def get_subsc_auth(auth_req):
     return auth
 
 
-def async_call(func):
-    def inner(*args, **kwargs):
-        th = threading.Thread(target=func, args=args,
-                              kwargs=kwargs, daemon=True)
-        th.start()
-    return inner
+class SubscriptionIndex(object):
+    """In-memory index of subscriptions for notification matching.
+
+    It holds the subscriptions deserialized and indexes them by the
+    attributes of their filters, so that the candidates of matching are
+    found by dict lookups instead of scanning all subscriptions.
+
+    Subscriptions are never modified after creation (there is no API to
+    modify them). So the index is synchronized with DB by comparing the
+    ids of subscriptions only, which also reflects subscriptions
+    created or deleted by other processes (ex. tacker-server for
+    tacker-conductor).
+
+    Note that the candidates must be checked by the original matching
+    logic since the index does not cover all filter attributes.
+    """
+
+    def __init__(self, obj_name, get_index_keys):
+        # obj_name: name of the subscription object. It is resolved when
+        #           used since objects may not be registered at this time.
+        # get_index_keys: function which returns {key: list of values} of
+        #                 a subscription. A key not included means that
+        #                 the subscription matches any value of the key.
+        self.obj_name = obj_name
+        self.get_index_keys = get_index_keys
+        self.lock = threading.Lock()
+        self.invalidate()
+
+    def invalidate(self):
+        self.subscs = {}
+        self.seq = {}
+        self.next_seq = 0
+        self.any_ids = collections.defaultdict(set)
+        self.value_ids = collections.defaultdict(
+            lambda: collections.defaultdict(set))
+
+    def _add(self, subsc):
+        if subsc.id in self.subscs:
+            return
+        self.subscs[subsc.id] = subsc
+        self.seq[subsc.id] = self.next_seq
+        self.next_seq += 1
+        keys = self.get_index_keys(subsc)
+        # NOTE: any_ids of a key is registered when the key appears at
+        # first. Subscriptions added before it match any value of the key.
+        for key in keys:
+            if key not in self.any_ids:
+                self.any_ids[key] = set(self.subscs) - {subsc.id}
+        for key, ids in self.any_ids.items():
+            if key not in keys:
+                ids.add(subsc.id)
+        for key, values in keys.items():
+            for value in values:
+                self.value_ids[key][value].add(subsc.id)
+
+    def _remove(self, subsc_id):
+        if self.subscs.pop(subsc_id, None) is None:
+            return
+        del self.seq[subsc_id]
+        for ids in self.any_ids.values():
+            ids.discard(subsc_id)
+        for value_ids in self.value_ids.values():
+            for ids in value_ids.values():
+                ids.discard(subsc_id)
+
+    def _sync(self, context):
+        obj_cls = getattr(objects, self.obj_name)
+        ids = obj_cls.get_all_ids(context)
+        for subsc_id in set(self.subscs) - set(ids):
+            self._remove(subsc_id)
+        new_ids = [subsc_id for subsc_id in ids
+                   if subsc_id not in self.subscs]
+        if new_ids:
+            new_subscs = {subsc.id: subsc for subsc in
+                          obj_cls.get_by_ids(context, new_ids)}
+            # keep the order of ids
+            for subsc_id in new_ids:
+                if subsc_id in new_subscs:
+                    self._add(new_subscs[subsc_id])
+
+    def add(self, subsc):
+        with self.lock:
+            self._add(subsc)
+
+    def remove(self, subsc_id):
+        with self.lock:
+            self._remove(subsc_id)
+
+    def get_candidates(self, context, **values):
+        """Get subscriptions which may match the values specified.
+
+        A value None means not checked by the index.
+        """
+        with self.lock:
+            self._sync(context)
+            ids = set(self.subscs)
+            for key, value in values.items():
+                if value is None or key not in self.any_ids:
+                    continue
+                ids &= (self.any_ids[key] |
+                        self.value_ids[key].get(value, set()))
+                if not ids:
+                    return []
+            return [self.subscs[subsc_id]
+                    for subsc_id in sorted(ids, key=self.seq.get)]
+
+
+LCM_SUBSC_INDEX = SubscriptionIndex('LccnSubscriptionV2',
+                                    _get_lcm_subsc_index_keys)
+
+
+class _Notification(object):
+
+    def __init__(self, endpoint, obj_data, notif_data, version):
+        self.endpoint = endpoint
+        self.obj_data = obj_data
+        self.notif_data = notif_data
+        self.version = version
+        self.attempts = 0
+        self.queued_at = time.monotonic()
+
+
+class NotificationDispatcher(object):
+    """Dispatcher of notifications with a bounded pool of workers.
+
+    Notifications are queued and sent by a fixed number of worker threads
+    instead of starting a thread per notification. Notifications to the
+    same endpoint (scheme, host and port of callbackUri) are sent
+    concurrently up to a limit and the rest wait in the per-endpoint
+    queue. A failed notification is retried with exponential backoff
+    if configured. HttpClient (i.e. the keep-alive session) is reused
+    per callbackUri and authentication.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.ready = collections.deque()
+        self.pending = collections.defaultdict(collections.deque)
+        self.in_flight = collections.Counter()
+        self.retry_heap = []
+        self.retry_seq = 0
+        self.workers = []
+        self.clients = collections.OrderedDict()
+        self.clients_lock = threading.Lock()
+        self.stats = collections.Counter()
+
+    def _start_workers(self):
+        for _ in range(max(CONF.v2_vnfm.notify_workers, 1)):
+            th = threading.Thread(target=self._worker, daemon=True)
+            th.start()
+            self.workers.append(th)
+
+    def dispatch(self, obj_data, notif_data, version):
+        url = urllib.parse.urlsplit(obj_data.callbackUri)
+        endpoint = f'{url.scheme}://{url.netloc}'
+        notif = _Notification(endpoint, obj_data, notif_data, version)
+        with self.cond:
+            if not self.workers:
+                self._start_workers()
+            self._enqueue(notif)
+
+    def _enqueue(self, notif):
+        # NOTE: must be called with self.cond held.
+        limit = max(CONF.v2_vnfm.notify_max_concurrency_per_endpoint, 1)
+        if self.in_flight[notif.endpoint] < limit:
+            self.in_flight[notif.endpoint] += 1
+            self.ready.append(notif)
+            self.cond.notify()
+        else:
+            self.pending[notif.endpoint].append(notif)
+
+    def _done(self, notif):
+        # NOTE: must be called with self.cond held.
+        self.in_flight[notif.endpoint] -= 1
+        if self.in_flight[notif.endpoint] <= 0:
+            del self.in_flight[notif.endpoint]
+        pending = self.pending.get(notif.endpoint)
+        if pending:
+            self._enqueue(pending.popleft())
+            if not pending:
+                del self.pending[notif.endpoint]
+        self.cond.notify_all()
+
+    def _get_next(self):
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                while self.retry_heap and self.retry_heap[0][0] <= now:
+                    _, _, notif = heapq.heappop(self.retry_heap)
+                    self._enqueue(notif)
+                if self.ready:
+                    return self.ready.popleft()
+                timeout = None
+                if self.retry_heap:
+                    timeout = self.retry_heap[0][0] - now
+                self.cond.wait(timeout)
+
+    def _worker(self):
+        while True:
+            notif = self._get_next()
+            result = self._send(notif)
+            with self.cond:
+                self._done(notif)
+                self._finish(notif, result)
+
+    def _finish(self, notif, result):
+        # NOTE: must be called with self.cond held.
+        if not result and notif.attempts <= CONF.v2_vnfm.notify_retries:
+            delay = min(CONF.v2_vnfm.notify_retry_interval *
+                        2 ** (notif.attempts - 1), NOTIFY_RETRY_MAX_INTERVAL)
+            # add jitter to avoid retries to the same endpoint at once.
+            delay *= random.uniform(0.8, 1.2)
+            self.retry_seq += 1
+            heapq.heappush(self.retry_heap,
+                           (time.monotonic() + delay, self.retry_seq, notif))
+            self.stats['retried'] += 1
+            self.cond.notify()
+            return
+
+        latency = time.monotonic() - notif.queued_at
+        self.stats['sent' if result else 'failed'] += 1
+        self.stats['latency_total'] += latency
+        self.stats['latency_max'] = max(self.stats['latency_max'], latency)
+        self.cond.notify_all()
+
+    def _get_client(self, notif):
+        auth = notif.obj_data.get('authentication')
+        key = (notif.version, notif.obj_data.callbackUri,
+               auth.to_json() if auth is not None else None)
+        with self.clients_lock:
+            client = self.clients.get(key)
+            if client is not None:
+                self.clients.move_to_end(key)
+                return client
+            auth_handle = common_script_utils.get_http_auth_handle(auth)
+            connect_retries = (CONF.v2_vnfm.notify_connect_retries
+                               if CONF.v2_vnfm.notify_connect_retries
+                               else None)
+            client = http_client.HttpClient(auth_handle,
+                                            version=notif.version,
+                                            connect_retries=connect_retries,
+                                            keep_session=True)
+            self.clients[key] = client
+            if len(self.clients) > NOTIFY_CLIENT_CACHE_SIZE:
+                self.clients.popitem(last=False)
+            return client
+
+    def _send(self, notif):
+        notif.attempts += 1
+        try:
+            client = self._get_client(notif)
+            client.do_request(notif.obj_data.callbackUri, "POST",
+                              expected_status=[204], body=notif.notif_data)
+        except Exception as ex:
+            # NOTE: SolException may occur if test_notification was not
+            # executed. Other exceptions are ex. connection error which
+            # remains after connect_retries.
+            if notif.attempts <= CONF.v2_vnfm.notify_retries:
+                LOG.warning(f"send_notification failed: {ex}. retry later.")
+            else:
+                LOG.exception(f"send_notification failed: {ex}")
+            return False
+        return True
+
+    def get_stats(self):
+        """Return counters of the dispatcher.
+
+        - queued: number of notifications waiting to be sent
+          (including ones waiting for retry)
+        - in_flight: number of notifications being sent
+        - sent/failed/retried: accumulated number of notifications
+        - latency_avg/latency_max: time (second) from dispatch to
+          completion of sent or failed notifications
+        """
+        with self.cond:
+            completed = self.stats['sent'] + self.stats['failed']
+            return {
+                'queued': (len(self.ready) + len(self.retry_heap) +
+                           sum(len(q) for q in self.pending.values())),
+                'in_flight': sum(self.in_flight.values()) - len(self.ready),
+                'sent': self.stats['sent'],
+                'failed': self.stats['failed'],
+                'retried': self.stats['retried'],
+                'latency_avg': (self.stats['latency_total'] / completed
+                                if completed else 0),
+                'latency_max': self.stats['latency_max']
+            }
+
+    def wait_idle(self, timeout=None):
+        """Wait until all notifications dispatched are completed."""
+        with self.cond:
+            return self.cond.wait_for(
+                lambda: not self.in_flight and not self.pending and
+                not self.retry_heap, timeout)
+
+
+NOTIFICATION_DISPATCHER = NotificationDispatcher()
 
 
-@async_call
 def send_notification(obj_data, notif_data, notify_type=None):
     version = api_version.CURRENT_VERSION
     if notify_type == NOTIFY_TYPE_PM:
@@ -282,20 +616,7 @@ def send_notification(obj_data, notif_data, notify_type=None):
     elif notify_type == NOTIFY_TYPE_FM:
         version = api_version.CURRENT_FM_VERSION
 
-    auth_handle = common_script_utils.get_http_auth_handle(
-        obj_data.get('authentication'))
-    connect_retries = (CONF.v2_vnfm.notify_connect_retries
-                       if CONF.v2_vnfm.notify_connect_retries else None)
-    client = http_client.HttpClient(auth_handle,
-                                    version=version,
-                                    connect_retries=connect_retries)
-    url = obj_data.callbackUri
-    try:
-        resp, _ = client.do_request(
-            url, "POST", expected_status=[204], body=notif_data)
-    except sol_ex.SolException as ex:
-        # it may occur if test_notification was not executed.
-        LOG.exception(f"send_notification failed: {ex}")
+    NOTIFICATION_DISPATCHER.dispatch(obj_data, notif_data, version)
 
 
 def test_notification(obj_data, notify_type=None):
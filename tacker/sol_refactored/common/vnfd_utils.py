@@ -14,21 +14,94 @@
 #    under the License.
 
 
+import collections
+import hashlib
 import io
 import os
 import re
 import shutil
 import tempfile
+import threading
 import zipfile
 
 from oslo_log import log as logging
 import yaml
 
+from tacker.sol_refactored.common import config
 from tacker.sol_refactored.common import exceptions as sol_ex
 
 
 LOG = logging.getLogger(__name__)
 
+CONF = config.CONF
+
+
+class _ParsedVnfd(object):
+    """Parsed contents of VNFD shared by Vnfd objects
+
+    The contents must not be modified since they are shared by Vnfd
+    objects made from the same VNFD files.
+    """
+
+    def __init__(self, tosca_meta, definitions, size):
+        self.tosca_meta = tosca_meta
+        self.definitions = definitions
+        self.size = size
+        # memos of the derived lookups
+        self.vnfd_flavours = {}
+        self.nodes = {}
+        self.policies = {}
+
+
+class VnfdCache(object):
+    """LRU cache of parsed VNFD
+
+    The key is a tuple of vnfdId and the hash of the VNFD files. The total
+    size of the VNFD files whose contents are cached is bounded by
+    CONF.v2_vnfm.vnfd_cache_size.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = collections.OrderedDict()
+        self.size = 0
+
+    def _max_size(self):
+        return CONF.v2_vnfm.vnfd_cache_size * 1024 * 1024
+
+    def get(self, vnfd_id, digest):
+        with self.lock:
+            parsed = self.entries.get((vnfd_id, digest))
+            if parsed is not None:
+                self.entries.move_to_end((vnfd_id, digest))
+            return parsed
+
+    def put(self, vnfd_id, digest, parsed):
+        max_size = self._max_size()
+        if parsed.size > max_size:
+            return
+        with self.lock:
+            old = self.entries.pop((vnfd_id, digest), None)
+            if old is not None:
+                self.size -= old.size
+            self.entries[(vnfd_id, digest)] = parsed
+            self.size += parsed.size
+            while self.size > max_size:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= evicted.size
+
+    def invalidate(self, vnfd_id=None):
+        with self.lock:
+            if vnfd_id is None:
+                self.entries.clear()
+                self.size = 0
+                return
+            for key in [key for key in self.entries if key[0] == vnfd_id]:
+                self.size -= self.entries.pop(key).size
+
+
+VNFD_CACHE = VnfdCache()
+
 
 class Vnfd(object):
 
@@ -38,6 +111,8 @@ class Vnfd(object):
         self.definitions = {}
         self.vnfd_flavours = {}
         self.csar_dir = None
+        self._nodes = {}
+        self._policies = {}
 
     def init_from_csar_dir(self, csar_dir):
         self.csar_dir = csar_dir
@@ -65,16 +140,39 @@ class Vnfd(object):
         if not os.path.isfile(path):
             raise sol_ex.InvalidVnfdFormat()
 
-        # expand from yaml to dict for TOSCA.meta and Definitions
-        with open(path, 'r') as f:
-            self.tosca_meta = yaml.safe_load(f.read())
-
+        # NOTE: reading files is cheap compared to expanding yaml. the hash
+        # of files is used to find the parsed contents in the cache so that
+        # an update of the files is detected.
+        with open(path, 'rb') as f:
+            tosca_meta = f.read()
+        files = {}
         path = os.path.join(csar_dir, 'Definitions')
         for entry in os.listdir(path):
             if entry.endswith(('.yaml', '.yml')):
-                with open(os.path.join(path, entry), 'r') as f:
-                    content = yaml.safe_load(f.read())
-                self.definitions[entry] = content
+                with open(os.path.join(path, entry), 'rb') as f:
+                    files[entry] = f.read()
+
+        digest = hashlib.sha256(tosca_meta)
+        for entry in sorted(files):
+            digest.update(entry.encode())
+            digest.update(hashlib.sha256(files[entry]).digest())
+        digest = digest.hexdigest()
+
+        parsed = VNFD_CACHE.get(self.vnfd_id, digest)
+        if parsed is None:
+            # expand from yaml to dict for TOSCA.meta and Definitions
+            parsed = _ParsedVnfd(
+                yaml.safe_load(tosca_meta),
+                {entry: yaml.safe_load(content)
+                 for entry, content in files.items()},
+                len(tosca_meta) + sum(len(c) for c in files.values()))
+            VNFD_CACHE.put(self.vnfd_id, digest, parsed)
+
+        self.tosca_meta = parsed.tosca_meta
+        self.definitions = parsed.definitions
+        self.vnfd_flavours = parsed.vnfd_flavours
+        self._nodes = parsed.nodes
+        self._policies = parsed.policies
 
     def _assert_csar_dir(self):
         if self.csar_dir is None:
@@ -126,7 +224,7 @@ class Vnfd(object):
         for name, data in nodes.items():
             if (data['type'] in types and
                     data.get('properties', {}).get('sw_image_data')):
-                sw_image[name] = data['properties']['sw_image_data']
+                sw_image[name] = dict(data['properties']['sw_image_data'])
                 sw_file = (data
                            .get('artifacts', {})
                            .get('sw_image', {})
@@ -153,15 +251,19 @@ class Vnfd(object):
         return prop
 
     def get_nodes(self, flavour_id, node_type):
-        vnfd = self.get_vnfd_flavour(flavour_id)
-        nodes = (vnfd
-                 .get('topology_template', {})
-                 .get('node_templates', {}))
+        res = self._nodes.get((flavour_id, node_type))
+        if res is None:
+            vnfd = self.get_vnfd_flavour(flavour_id)
+            nodes = (vnfd
+                     .get('topology_template', {})
+                     .get('node_templates', {}))
 
-        res = {name: data
-            for name, data in nodes.items() if data['type'] == node_type}
+            res = {name: data
+                for name, data in nodes.items() if data['type'] == node_type}
+            self._nodes[(flavour_id, node_type)] = res
 
-        return res
+        # NOTE: return a copy since the caller may modify it.
+        return dict(res)
 
     def get_vdu_nodes(self, flavour_id):
         return self.get_nodes(flavour_id, 'tosca.nodes.nfv.Vdu.Compute')
@@ -269,17 +371,21 @@ class Vnfd(object):
             # as this error does not disturb the process, continue.
 
     def get_policy_values_by_type(self, flavour_id, policy_type):
-        vnfd = self.get_vnfd_flavour(flavour_id)
-        policies = (vnfd.get('topology_template', {})
-                        .get('policies', []))
-        if isinstance(policies, dict):
-            policies = [policies]
-
-        ret = [value
-            for policy in policies for value in policy.values()
-            if value['type'] == policy_type]
-
-        return ret
+        ret = self._policies.get((flavour_id, policy_type))
+        if ret is None:
+            vnfd = self.get_vnfd_flavour(flavour_id)
+            policies = (vnfd.get('topology_template', {})
+                            .get('policies', []))
+            if isinstance(policies, dict):
+                policies = [policies]
+
+            ret = [value
+                for policy in policies for value in policy.values()
+                if value['type'] == policy_type]
+            self._policies[(flavour_id, policy_type)] = ret
+
+        # NOTE: return a copy since the caller may modify it.
+        return list(ret)
 
     def get_default_instantiation_level(self, flavour_id):
         policies = self.get_policy_values_by_type(flavour_id,
@@ -0,0 +1,230 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import contextlib
+import datetime
+import heapq
+import itertools
+import threading
+import uuid
+
+from oslo_log import log as logging
+from oslo_utils import timeutils
+
+from tacker.common import coordination
+from tacker import context as tacker_context
+from tacker.sol_refactored.common import config
+from tacker.sol_refactored import objects
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = config.CONF
+
+
+def timer_id(source, vnf_instance_id):
+    return str(uuid.uuid5(uuid.NAMESPACE_URL,
+                          f'auto_heal/{source}/{vnf_instance_id}'))
+
+
+@contextlib.contextmanager
+def _lock(timer_id):
+    coord = coordination.COORDINATOR
+    # NOTE: it is noop if already started.
+    coord.start()
+    lock = coord.get_lock(f'auto_heal-{timer_id}')
+    # NOTE: 'with lock' is not used since it can't handle
+    # lock failed exception well.
+    lock.acquire(blocking=True)
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+class AutoHealTimer(object):
+    """Timers of the auto heal requested by notifications
+
+    The server notification and the Prometheus Plugin do not heal a VNF
+    instance as soon as they are notified of a failure. They wait for a
+    while (timer_interval of each) and heal all the VNFCs notified in the
+    meantime at once.
+
+    The pending heals are stored in DB (AutoHealTimerV2) so that they are
+    not lost when the conductor is restarted. All the timers of the
+    conductor are handled by one thread, which sleeps until the earliest
+    one expires. The thread also checks DB every
+    CONF.v2_vnfm.auto_heal_timer_poll_interval seconds to take over the
+    timers of the other conductors (e.g. the one stopped).
+
+    A timer is updated under the lock of the coordination so that it can
+    be shared by multiple conductors. When a timer expires on more than
+    one conductor, only the first one which removes it from DB requests
+    the heal.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        # {source: handler(vnf_instance_id, vnfc_instance_ids)}
+        self.handlers = {}
+        # heap of (due, seq, timer_id)
+        self.timers = []
+        self.timer_seq = itertools.count()
+        # {timer_id: due} of the timers in the heap. the entries of the
+        # heap which do not match it are obsolete and ignored.
+        self.scheduled = {}
+        self.thread = None
+
+    def register(self, source, handler):
+        self.handlers[source] = handler
+
+    def start(self):
+        """Start the thread if not yet
+
+        The timers stored in DB are loaded at first.
+        """
+        with self.cond:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _push(self, timer_id, due):
+        # NOTE: must be called with self.cond held.
+        # NOTE: dueTime is timezone aware when it is set to the object and
+        # naive (UTC) when it is got from DB.
+        due = timeutils.normalize_time(due)
+        if self.scheduled.get(timer_id) == due:
+            return
+        self.scheduled[timer_id] = due
+        heapq.heappush(self.timers, (due, next(self.timer_seq), timer_id))
+        self.cond.notify_all()
+
+    def add(self, source, vnf_instance_id, vnfc_instance_ids, interval):
+        """Add VNFCs to the pending heal of the VNF instance
+
+        The timer starts if the VNF instance has no pending heal.
+        """
+        context = tacker_context.get_admin_context()
+        t_id = timer_id(source, vnf_instance_id)
+        with _lock(t_id):
+            timer = objects.AutoHealTimerV2.get_by_id(context, t_id)
+            if timer is None:
+                timer = objects.AutoHealTimerV2(
+                    id=t_id,
+                    source=source,
+                    vnfInstanceId=vnf_instance_id,
+                    vnfcInstanceIds=list(dict.fromkeys(vnfc_instance_ids)),
+                    dueTime=timeutils.utcnow() + datetime.timedelta(
+                        seconds=interval))
+                timer.create(context)
+            else:
+                new_ids = [vnfc_id for vnfc_id in
+                           dict.fromkeys(vnfc_instance_ids)
+                           if vnfc_id not in timer.vnfcInstanceIds]
+                if new_ids:
+                    timer.vnfcInstanceIds = timer.vnfcInstanceIds + new_ids
+                    timer.update(context)
+
+        with self.cond:
+            self._push(t_id, timer.dueTime)
+
+    def cancel(self, source, vnf_instance_id):
+        """Discard the pending heal of the VNF instance"""
+        context = tacker_context.get_admin_context()
+        t_id = timer_id(source, vnf_instance_id)
+        with _lock(t_id):
+            objects.AutoHealTimerV2.delete_by_filter(context, ids=[t_id])
+        with self.cond:
+            self.scheduled.pop(t_id, None)
+
+    def _load(self):
+        context = tacker_context.get_admin_context()
+        try:
+            timers = objects.AutoHealTimerV2.get_all(context)
+        except Exception as ex:
+            LOG.warning("Loading auto heal timers failed: %s", ex)
+            return
+        with self.cond:
+            for timer in timers:
+                self._push(timer.id, timer.dueTime)
+
+    def _run(self):
+        next_poll = timeutils.utcnow()
+        while True:
+            now = timeutils.utcnow()
+            if now >= next_poll:
+                self._load()
+                next_poll = now + datetime.timedelta(
+                    seconds=CONF.v2_vnfm.auto_heal_timer_poll_interval)
+
+            expired = []
+            with self.cond:
+                while self.timers:
+                    due, _, t_id = self.timers[0]
+                    if self.scheduled.get(t_id) != due:
+                        # obsolete
+                        heapq.heappop(self.timers)
+                        continue
+                    if due > now:
+                        break
+                    heapq.heappop(self.timers)
+                    del self.scheduled[t_id]
+                    expired.append(t_id)
+
+                if not expired:
+                    wake_at = next_poll
+                    if self.timers:
+                        wake_at = min(wake_at, self.timers[0][0])
+                    self.cond.wait(
+                        (wake_at - timeutils.utcnow()).total_seconds())
+                    continue
+
+            for t_id in expired:
+                try:
+                    self._expire(t_id)
+                except Exception as ex:
+                    LOG.error("Expiration of auto heal timer %s failed: %s",
+                              t_id, ex)
+
+    def _expire(self, t_id):
+        context = tacker_context.get_admin_context()
+        with _lock(t_id):
+            timer = objects.AutoHealTimerV2.get_by_id(context, t_id)
+            if timer is None:
+                # canceled or expired on another conductor.
+                return
+            if timeutils.normalize_time(timer.dueTime) > timeutils.utcnow():
+                # canceled and added again.
+                with self.cond:
+                    self._push(t_id, timer.dueTime)
+                return
+            objects.AutoHealTimerV2.delete_by_filter(context, ids=[t_id])
+
+        handler = self.handlers.get(timer.source)
+        if handler is None:
+            LOG.error("No handler of auto heal timer source %s. "
+                      "vnfInstanceId: %s, vnfcInstanceIds: %s",
+                      timer.source, timer.vnfInstanceId,
+                      timer.vnfcInstanceIds)
+            return
+        # NOTE: the heal is requested in another thread so that the other
+        # timers expire on time.
+        threading.Thread(target=handler,
+                         args=(timer.vnfInstanceId, timer.vnfcInstanceIds),
+                         daemon=True).start()
+
+
+AUTO_HEAL_TIMER = AutoHealTimer()
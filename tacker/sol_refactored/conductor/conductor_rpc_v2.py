@@ -92,6 +92,9 @@ class PrometheusPluginConductor(object):
     def store_alarm_info(self, context, alarm):
         self.cast(context, 'store_alarm_info', alarm=alarm)
 
+    def store_alarms_info(self, context, alarms):
+        self.cast(context, 'store_alarms_info', alarms=alarms)
+
     def store_job_info(self, context, reports):
         self.cast(context, 'store_job_info', reports=reports)
 
@@ -13,12 +13,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+from concurrent import futures
 import copy
 import threading
+import time
 
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 from oslo_service import loopingcall
 from oslo_utils import encodeutils
+from oslo_utils import timeutils
 
 from tacker.common import log
 from tacker import context as tacker_context
@@ -27,6 +32,8 @@ from tacker.sol_refactored.common import coordinate
 from tacker.sol_refactored.common import exceptions as sol_ex
 from tacker.sol_refactored.common import lcm_op_occ_utils as lcmocc_utils
 from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
+from tacker.sol_refactored.conductor import auto_heal_timer
+from tacker.sol_refactored.conductor import lcm_op_scheduler
 from tacker.sol_refactored.conductor import prometheus_plugin_driver as pp_drv
 from tacker.sol_refactored.conductor import server_notification_driver as sdrv
 from tacker.sol_refactored.conductor import vnffm_driver_v1
@@ -64,7 +71,12 @@ class ConductorV2(object):
         self.nfvo_client = nfvo_client.NfvoClient()
         self.prom_driver = pp_drv.PrometheusPluginDriver(self)
         self.sn_driver = sdrv.ServerNotificationDriver(self)
+        self.op_scheduler = lcm_op_scheduler.LcmOpScheduler()
+        self._sync_fingerprints = {}
+        self.sync_db_stats = {}
         self._change_lcm_op_state()
+        # NOTE: the pending auto heals stored in DB are taken over.
+        auto_heal_timer.AUTO_HEAL_TIMER.start()
 
         self._periodic_call()
 
@@ -79,8 +91,13 @@ class ConductorV2(object):
         # NOTE: If the conductor down during processing and
         # the LcmOperationState STARTING/PROCESSING/ROLLING_BACK remain,
         # change it at the next startup.
+        # NOTE: lcmoccs are updated by one UPDATE statement per state and
+        # vnf instances are gotten by one query so that the startup time
+        # does not depend on the number of lcmoccs. notifications are sent
+        # by workers of the notification dispatcher.
         context = tacker_context.get_admin_context()
         ex = sol_ex.ConductorProcessingError()
+        error = objects.ProblemDetails.from_dict(ex.make_problem_details())
 
         state_list = [(fields.LcmOperationStateType.STARTING,
                        fields.LcmOperationStateType.ROLLED_BACK),
@@ -88,17 +105,42 @@ class ConductorV2(object):
                        fields.LcmOperationStateType.FAILED_TEMP),
                       (fields.LcmOperationStateType.ROLLING_BACK,
                        fields.LcmOperationStateType.FAILED_TEMP)]
+        changed_lcmoccs = []
         for before_state, after_state in state_list:
             lcmoccs = objects.VnfLcmOpOccV2.get_by_filter(context,
                 operationState=before_state)
+            if not lcmoccs:
+                continue
+            values = {'operationState': after_state,
+                      'stateEnteredTime': timeutils.utcnow(),
+                      'error': error}
+            objects.VnfLcmOpOccV2.update_by_filter(context, values,
+                ids=[lcmocc.id for lcmocc in lcmoccs],
+                operationState=before_state)
             for lcmocc in lcmoccs:
-                lcmocc_utils.update_lcmocc_status(lcmocc, after_state)
-                self._set_lcmocc_error(lcmocc, ex)
-                inst = inst_utils.get_inst(context, lcmocc.vnfInstanceId)
-                lcmocc.update(context)
-                # send notification
-                self.nfvo_client.send_lcmocc_notification(context, lcmocc,
-                                                          inst, self.endpoint)
+                for key, value in values.items():
+                    setattr(lcmocc, key, value)
+                lcmocc.obj_reset_changes()
+            changed_lcmoccs.extend(lcmoccs)
+
+        if not changed_lcmoccs:
+            return
+        LOG.info("operationState of %d VnfLcmOpOccs are changed.",
+                 len(changed_lcmoccs))
+
+        insts = objects.VnfInstanceV2.get_by_ids(context,
+            list({lcmocc.vnfInstanceId for lcmocc in changed_lcmoccs}))
+        insts = {inst.id: inst for inst in insts}
+        for lcmocc in changed_lcmoccs:
+            inst = insts.get(lcmocc.vnfInstanceId)
+            if inst is None:
+                # should not occur.
+                LOG.error("VnfInstance %s of VnfLcmOpOcc %s not found.",
+                          lcmocc.vnfInstanceId, lcmocc.id)
+                continue
+            # send notification
+            self.nfvo_client.send_lcmocc_notification(context, lcmocc,
+                                                      inst, self.endpoint)
 
     def _set_lcmocc_error(
             self, lcmocc, ex, user_script_err_handling_data={}):
@@ -119,7 +161,11 @@ class ConductorV2(object):
     def start_lcm_op(self, context, lcmocc_id):
         lcmocc = lcmocc_utils.get_lcmocc(context, lcmocc_id)
 
-        self.start_lcm_op_internal(context, lcmocc)
+        self.start_lcm_op_scheduled(context, lcmocc)
+
+    def start_lcm_op_scheduled(self, context, lcmocc):
+        self.op_scheduler.submit(context, lcmocc,
+                                 self.start_lcm_op_internal, context, lcmocc)
 
     @coordinate.lock_vnf_instance('{lcmocc.vnfInstanceId}', delay=True)
     def start_lcm_op_internal(self, context, lcmocc):
@@ -215,7 +261,8 @@ class ConductorV2(object):
     def retry_lcm_op(self, context, lcmocc_id):
         lcmocc = lcmocc_utils.get_lcmocc(context, lcmocc_id)
 
-        self._retry_lcm_op(context, lcmocc)
+        self.op_scheduler.submit(context, lcmocc,
+                                 self._retry_lcm_op, context, lcmocc)
 
     @coordinate.lock_vnf_instance('{lcmocc.vnfInstanceId}', delay=True)
     def _retry_lcm_op(self, context, lcmocc):
@@ -283,7 +330,8 @@ class ConductorV2(object):
     def rollback_lcm_op(self, context, lcmocc_id):
         lcmocc = lcmocc_utils.get_lcmocc(context, lcmocc_id)
 
-        self._rollback_lcm_op(context, lcmocc)
+        self.op_scheduler.submit(context, lcmocc,
+                                 self._rollback_lcm_op, context, lcmocc)
 
     @coordinate.lock_vnf_instance('{lcmocc.vnfInstanceId}', delay=True)
     def _rollback_lcm_op(self, context, lcmocc):
@@ -395,27 +443,115 @@ class ConductorV2(object):
     def _sync_db(self):
         """Periodic database update invocation method(v2 api)"""
         LOG.debug("Starting _sync_db")
+        start = time.monotonic()
         context = tacker_context.get_admin_context()
 
         vnf_instances = objects.VnfInstanceV2.get_by_filter(
             context, instantiationState='INSTANTIATED')
+
+        # NOTE: VNF instances are grouped by VIM and namespace so that
+        # resources of the VIM are listed once per group. Groups are
+        # handled concurrently by a bounded number of workers.
+        groups = {}
+        stats = collections.Counter()
         for inst in vnf_instances:
             try:
                 vim_info = inst_utils.select_vim_info(inst.vimConnectionInfo)
-                self.vnflcm_driver.diff_check_inst(inst, vim_info)
-                self._sync_inst(context, inst, vim_info)
-            except sol_ex.DbSyncNoDiff:
-                continue
-            except sol_ex.DbSyncFailed as e:
-                LOG.error("%s: %s", e.__class__.__name__, e.args[0])
-            except sol_ex.OtherOperationInProgress:
-                LOG.info("There is an LCM operation in progress, so "
-                         f"skip this DB synchronization. vnf: {inst.id}.")
+                key = self._get_sync_group_key(inst, vim_info)
             except Exception as e:
                 LOG.error(f"Failed to synchronize database vnf: {inst.id} "
                           f"Error: {encodeutils.exception_to_unicode(e)}")
+                stats['failed'] += 1
+                continue
+            groups.setdefault(key, []).append((inst, vim_info))
+
+        workers = max(1, min(CONF.v2_vnfm.db_sync_workers, len(groups)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(
+                    lambda group: self._sync_group(context, group),
+                    groups.values()):
+                stats.update(result)
+
+        # forget fingerprints of VNF instances which no longer exist
+        inst_ids = {inst.id for inst in vnf_instances}
+        for inst_id in list(self._sync_fingerprints):
+            if inst_id not in inst_ids:
+                self._sync_fingerprints.pop(inst_id, None)
+
+        elapsed = time.monotonic() - start
+        self.sync_db_stats = {
+            'instances': len(vnf_instances),
+            'groups': len(groups),
+            'synced': stats['synced'],
+            'no_diff': stats['no_diff'],
+            'skipped': stats['skipped'],
+            'failed': stats['failed'],
+            'duration': elapsed
+        }
+        LOG.info("DB synchronization finished: %(instances)d instances "
+                 "in %(groups)d groups, %(synced)d synced, %(no_diff)d "
+                 "no difference, %(skipped)d skipped, %(failed)d failed, "
+                 "duration %(duration).3f sec.", self.sync_db_stats)
+        if elapsed > CONF.db_synchronization_interval:
+            LOG.warning("DB synchronization took %.3f sec which exceeds "
+                        "db_synchronization_interval(%d sec).",
+                        elapsed, CONF.db_synchronization_interval)
         LOG.debug("Ended _sync_db")
 
+    def _get_sync_group_key(self, inst, vim_info):
+        metadata = inst.instantiatedVnfInfo.get('metadata', {})
+        return (jsonutils.dumps(vim_info.to_dict(), sort_keys=True),
+                metadata.get('namespace'))
+
+    def _sync_group(self, context, group):
+        stats = collections.Counter()
+        inst, vim_info = group[0]
+        try:
+            resources = self.vnflcm_driver.list_sync_resources(
+                inst, vim_info)
+        except sol_ex.DbSyncNoDiff:
+            stats['no_diff'] += len(group)
+            return stats
+        except Exception as e:
+            for inst, _ in group:
+                LOG.error(f"Failed to synchronize database vnf: {inst.id} "
+                          f"Error: {encodeutils.exception_to_unicode(e)}")
+            stats['failed'] += len(group)
+            return stats
+
+        for inst, vim_info in group:
+            stats[self._sync_inst_with_resources(
+                context, inst, vim_info, resources)] += 1
+        return stats
+
+    def _sync_inst_with_resources(self, context, inst, vim_info, resources):
+        fingerprint = None
+        try:
+            fingerprint = self.vnflcm_driver.get_sync_fingerprint(
+                inst, vim_info, resources)
+            if (CONF.v2_vnfm.db_sync_skip_unchanged and
+                    fingerprint is not None and
+                    self._sync_fingerprints.get(inst.id) == fingerprint):
+                return 'skipped'
+            self.vnflcm_driver.diff_check_inst(inst, vim_info, resources)
+            self._sync_inst(context, inst, vim_info)
+            self._sync_fingerprints.pop(inst.id, None)
+            return 'synced'
+        except sol_ex.DbSyncNoDiff:
+            if fingerprint is not None:
+                self._sync_fingerprints[inst.id] = fingerprint
+            return 'no_diff'
+        except sol_ex.DbSyncFailed as e:
+            LOG.error("%s: %s", e.__class__.__name__, e.args[0])
+        except sol_ex.OtherOperationInProgress:
+            LOG.info("There is an LCM operation in progress, so "
+                     f"skip this DB synchronization. vnf: {inst.id}.")
+            return 'skipped'
+        except Exception as e:
+            LOG.error(f"Failed to synchronize database vnf: {inst.id} "
+                      f"Error: {encodeutils.exception_to_unicode(e)}")
+        return 'failed'
+
     @coordinate.lock_vnf_instance('{inst.id}')
     def _sync_inst(self, context, inst, vim_info):
         # NOTE(fengyi): The operation_state in the opocc of vnf_instance
@@ -432,7 +568,12 @@ class ConductorV2(object):
         vnf_inst.update(context)
 
     def store_alarm_info(self, context, alarm):
-        self.vnffm_driver.store_alarm_info(context, alarm)
+        # NOTE: it is left for the compatibility with tacker-server
+        # which is not upgraded yet.
+        self.vnffm_driver.store_alarms_info(context, [alarm])
+
+    def store_alarms_info(self, context, alarms):
+        self.vnffm_driver.store_alarms_info(context, alarms)
 
     def store_job_info(self, context, reports):
         # call pm_driver
@@ -0,0 +1,246 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+from concurrent import futures
+import threading
+import time
+
+from oslo_log import log as logging
+
+from tacker.sol_refactored.common import config
+from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
+from tacker.sol_refactored.objects.v2 import fields
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = config.CONF
+
+# NOTE: smaller value is higher priority.
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+OPERATION_PRIORITY = {
+    fields.LcmOperationType.HEAL: PRIORITY_HIGH,
+    fields.LcmOperationType.INSTANTIATE: PRIORITY_LOW
+}
+
+DEFAULT_TENANT = 'default'
+DEFAULT_VIM = 'default'
+
+# NOTE: the number of workers when lcm_op_max_concurrency is not set. It is
+# the same as the default executor_thread_pool_size of oslo.messaging, i.e.
+# the number of operations executed at the same time by RPC threads before.
+DEFAULT_WORKERS = 64
+
+
+class _Entry(object):
+
+    def __init__(self, lcmocc_id, operation, tenant, vim_key, func, args):
+        self.lcmocc_id = lcmocc_id
+        self.operation = operation
+        self.tenant = tenant
+        self.vim_key = vim_key
+        self.priority = OPERATION_PRIORITY.get(operation, PRIORITY_NORMAL)
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.func = func
+        self.args = args
+
+
+class LcmOpScheduler(object):
+    """Admission control of LCM operations executed by the conductor
+
+    An LCM operation is queued and executed by a worker thread of the
+    scheduler when it is admitted, so that the RPC thread which requested
+    it returns at once and waiting operations do not occupy RPC threads.
+    The number of operations executed at the same time is limited globally
+    and per VIM. Waiting operations are admitted in order of priority (i.e.
+    heal first and instantiate last), and operations of the same priority
+    are admitted in round robin across tenants.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        # {priority: OrderedDict({tenant: deque([entry, ...])})}
+        self.waiting = collections.defaultdict(collections.OrderedDict)
+        # {vim_key: number of running operations}
+        self.running = collections.Counter()
+        self.num_running = 0
+        self.admitted = 0
+        self.wait_time_max = 0.0
+        self.executor = None
+
+    def _has_room(self, vim_key):
+        max_total = CONF.v2_vnfm.lcm_op_max_concurrency
+        max_per_vim = CONF.v2_vnfm.lcm_op_max_concurrency_per_vim
+        if max_total > 0 and self.num_running >= max_total:
+            return False
+        if max_per_vim > 0 and self.running[vim_key] >= max_per_vim:
+            return False
+        return True
+
+    def _grant(self, entry):
+        entry.granted = True
+        self.running[entry.vim_key] += 1
+        self.num_running += 1
+        self.admitted += 1
+        self.wait_time_max = max(self.wait_time_max,
+                                 time.monotonic() - entry.enqueued_at)
+
+    def _schedule(self):
+        """Admit waiting operations as many as possible
+
+        :returns: the entries admitted
+        """
+        # NOTE: must be called with self.cond held.
+        granted = []
+        while True:
+            entry = self._pick()
+            if entry is None:
+                return granted
+            self._grant(entry)
+            granted.append(entry)
+
+    def _pick(self):
+        # NOTE: must be called with self.cond held.
+        for priority in sorted(self.waiting):
+            tenants = self.waiting[priority]
+            for tenant in list(tenants):
+                entries = tenants[tenant]
+                for entry in entries:
+                    if self._has_room(entry.vim_key):
+                        break
+                else:
+                    continue
+                entries.remove(entry)
+                # move the tenant to the tail for round robin.
+                tenants.pop(tenant)
+                if entries:
+                    tenants[tenant] = entries
+                return entry
+        return None
+
+    def get_vim_key(self, context, lcmocc):
+        inst = inst_utils.get_inst(context, lcmocc.vnfInstanceId)
+        vim_infos = inst.to_dict().get('vimConnectionInfo', {})
+        if lcmocc.operation == fields.LcmOperationType.INSTANTIATE:
+            # NOTE: vimConnectionInfo of the request is merged to the one
+            # the VNF instance already has.
+            req_vim_infos = lcmocc.operationParams.to_dict().get(
+                'vimConnectionInfo', {})
+            vim_infos = inst_utils.json_merge_patch(vim_infos, req_vim_infos)
+        if not vim_infos:
+            # default VIM is used.
+            return DEFAULT_VIM
+        # NOTE: it is assumed that there is only one vimConnectionInfo.
+        # see inst_utils.select_vim_info.
+        vim_info = next(iter(vim_infos.values()))
+        vim_id = vim_info.get('vimId')
+        if vim_id:
+            return vim_id
+        interface_info = vim_info.get('interfaceInfo', {})
+        return interface_info.get('endpoint', DEFAULT_VIM)
+
+    def submit(self, context, lcmocc, func, *args):
+        """Queue an LCM operation
+
+        func(*args) is executed by a worker thread when the operation is
+        admitted. It returns without waiting for it.
+        """
+        try:
+            vim_key = self.get_vim_key(context, lcmocc)
+        except Exception:
+            # NOTE: it is not the job of the scheduler to report an error.
+            # the error will be detected by the operation itself.
+            LOG.debug("Getting VIM of VnfLcmOpOcc %s failed.", lcmocc.id)
+            vim_key = DEFAULT_VIM
+        entry = _Entry(lcmocc.id, lcmocc.operation,
+                       context.project_id or DEFAULT_TENANT, vim_key,
+                       func, args)
+
+        with self.cond:
+            self.waiting[entry.priority].setdefault(
+                entry.tenant, collections.deque()).append(entry)
+            granted = self._schedule()
+            if not entry.granted:
+                LOG.info("VnfLcmOpOcc %s (%s) is queued. %s", entry.lcmocc_id,
+                         entry.operation, self._get_state())
+        for granted_entry in granted:
+            self._dispatch(granted_entry)
+
+    def _dispatch(self, entry):
+        with self.cond:
+            if self.executor is None:
+                self.executor = futures.ThreadPoolExecutor(
+                    max_workers=(CONF.v2_vnfm.lcm_op_max_concurrency or
+                                 DEFAULT_WORKERS),
+                    thread_name_prefix='lcm_op')
+            self.executor.submit(self._run, entry)
+
+    def _run(self, entry):
+        LOG.debug("VnfLcmOpOcc %s (%s) is admitted.", entry.lcmocc_id,
+                  entry.operation)
+        try:
+            entry.func(*entry.args)
+        except Exception:
+            LOG.exception("VnfLcmOpOcc %s (%s) failed.", entry.lcmocc_id,
+                          entry.operation)
+        finally:
+            with self.cond:
+                self.running[entry.vim_key] -= 1
+                if self.running[entry.vim_key] <= 0:
+                    del self.running[entry.vim_key]
+                self.num_running -= 1
+                granted = self._schedule()
+                self.cond.notify_all()
+            for granted_entry in granted:
+                self._dispatch(granted_entry)
+
+    def _get_state(self):
+        waiting = collections.Counter()
+        waiting_per_tenant = collections.Counter()
+        for tenants in self.waiting.values():
+            for tenant, entries in tenants.items():
+                for entry in entries:
+                    waiting[entry.operation] += 1
+                    waiting_per_tenant[tenant] += 1
+        return {
+            'running': self.num_running,
+            'running_per_vim': dict(self.running),
+            'waiting': sum(waiting.values()),
+            'waiting_per_operation': dict(waiting),
+            'waiting_per_tenant': dict(waiting_per_tenant),
+            'admitted': self.admitted,
+            'wait_time_max': self.wait_time_max
+        }
+
+    def get_state(self):
+        with self.cond:
+            return self._get_state()
+
+    def wait(self, timeout=None):
+        """Wait for all queued operations to finish
+
+        :returns: False if timed out
+        """
+        with self.cond:
+            return self.cond.wait_for(
+                lambda: self.num_running == 0 and not any(
+                    entries for tenants in self.waiting.values()
+                    for entries in tenants.values()),
+                timeout=timeout)
@@ -13,10 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import threading
-
 from oslo_log import log as logging
+from oslo_utils import encodeutils
+
+from tacker import context as tacker_context
 from tacker.sol_refactored.common import config as cfg
+from tacker.sol_refactored.conductor import auto_heal_timer
 from tacker.sol_refactored.conductor import vnflcm_auto
 from tacker.sol_refactored import objects
 
@@ -24,64 +26,21 @@ LOG = logging.getLogger(__name__)
 
 CONF = cfg.CONF
 
-
-class VnfmAutoHealTimer():
-    def __init__(self, context, vnf_instance_id,
-                 expiration_time, expiration_handler):
-        self.lock = threading.Lock()
-        self.expired = False
-        self.queue = set()
-        self.context = context
-        self.vnf_instance_id = vnf_instance_id
-        self.expiration_handler = expiration_handler
-        self.timer = threading.Timer(expiration_time, self.expire)
-        self.timer.start()
-
-    def expire(self):
-        _expired = False
-        with self.lock:
-            if not self.expired:
-                self._cancel()
-                _expired = True
-        if _expired:
-            self.expiration_handler(
-                self.context, self.vnf_instance_id, list(self.queue))
-
-    def add_vnfc_info_id(self, vnfc_info_id):
-        with self.lock:
-            if not self.expired:
-                self.queue.add(vnfc_info_id)
-
-    def _cancel(self):
-        self.timer.cancel()
-        self.expired = True
-
-    def cancel(self):
-        with self.lock:
-            if not self.expired:
-                self._cancel()
-
-    def __del__(self):
-        self.cancel()
+TIMER_SOURCE = 'prometheus_plugin'
 
 
 class PrometheusPluginDriver():
     def __init__(self, conductor):
-        self.timer_map = {}
-        self.expiration_time = CONF.prometheus_plugin.timer_interval
+        self.timer = auto_heal_timer.AUTO_HEAL_TIMER
+        self.timer.register(TIMER_SOURCE, self._timer_expired)
         self.conductor = conductor
 
     def enqueue_heal(self, context, vnf_instance_id, vnfc_info_id):
-        if vnf_instance_id not in self.timer_map:
-            self.timer_map[vnf_instance_id] = VnfmAutoHealTimer(
-                context, vnf_instance_id, self.expiration_time,
-                self._timer_expired)
-        self.timer_map[vnf_instance_id].add_vnfc_info_id(vnfc_info_id)
+        self.timer.add(TIMER_SOURCE, vnf_instance_id, [vnfc_info_id],
+                       CONF.prometheus_plugin.timer_interval)
 
     def dequeue_heal(self, vnf_instance_id):
-        if vnf_instance_id in self.timer_map:
-            self.timer_map[vnf_instance_id].cancel()
-            del self.timer_map[vnf_instance_id]
+        self.timer.cancel(TIMER_SOURCE, vnf_instance_id)
 
     def _trigger_heal(self, context, vnf_instance_id, vnfc_info_ids):
         LOG.info(f"VNFM AutoHealing is triggered. vnf: {vnf_instance_id}, "
@@ -90,9 +49,15 @@ class PrometheusPluginDriver():
         vnflcm_auto.auto_heal(context, vnf_instance_id, heal_req.to_dict(),
                               self.conductor)
 
-    def _timer_expired(self, context, vnf_instance_id, vnfc_info_ids):
-        self.dequeue_heal(vnf_instance_id)
-        self._trigger_heal(context, vnf_instance_id, vnfc_info_ids)
+    def _timer_expired(self, vnf_instance_id, vnfc_info_ids):
+        # NOTE: the timer may be taken over from another conductor, so
+        # the context of the alert is not kept.
+        context = tacker_context.get_admin_context()
+        try:
+            self._trigger_heal(context, vnf_instance_id, vnfc_info_ids)
+        except Exception as exp:
+            LOG.error("VNFM AutoHealing is failed: %s.",
+                      encodeutils.exception_to_unicode(exp))
 
     def trigger_scale(self, context, vnf_instance_id, scale_req):
         LOG.info(f"VNFM AutoScaling is triggered. vnf: {vnf_instance_id}, "
@@ -13,74 +13,33 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import threading
-
 from oslo_log import log as logging
 from oslo_utils import encodeutils
 
 from tacker import context as tacker_context
 from tacker.sol_refactored.common import config as cfg
+from tacker.sol_refactored.conductor import auto_heal_timer
 from tacker.sol_refactored.conductor import vnflcm_auto
 from tacker.sol_refactored import objects
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
-
-class ServerNotificationTimer():
-    def __init__(self, vnf_instance_id, expiration_time, expiration_handler):
-        self.lock = threading.Lock()
-        self.expired = False
-        self.queue = []
-        self.vnf_instance_id = vnf_instance_id
-        self.expiration_handler = expiration_handler
-        self.timer = threading.Timer(expiration_time, self.expire)
-        self.timer.start()
-
-    def expire(self):
-        _expired = False
-        with self.lock:
-            if not self.expired:
-                self._cancel()
-                _expired = True
-        if _expired:
-            self.expiration_handler(
-                self.vnf_instance_id, list(set(self.queue)))
-
-    def append(self, vnfc_instance_ids):
-        with self.lock:
-            if not self.expired:
-                self.queue.extend(vnfc_instance_ids)
-
-    def _cancel(self):
-        self.timer.cancel()
-        self.expired = True
-
-    def cancel(self):
-        with self.lock:
-            if not self.expired:
-                self._cancel()
-
-    def __del__(self):
-        self.cancel()
+TIMER_SOURCE = 'server_notification'
 
 
 class ServerNotificationDriver():
     def __init__(self, conductor):
-        self.timer_map = {}
-        self.expiration_time = CONF.server_notification.timer_interval
+        self.timer = auto_heal_timer.AUTO_HEAL_TIMER
+        self.timer.register(TIMER_SOURCE, self.timer_expired)
         self.conductor = conductor
 
     def notify(self, vnf_instance_id, vnfc_instance_ids):
-        if vnf_instance_id not in self.timer_map:
-            self.timer_map[vnf_instance_id] = ServerNotificationTimer(
-                vnf_instance_id, self.expiration_time, self.timer_expired)
-        self.timer_map[vnf_instance_id].append(vnfc_instance_ids)
+        self.timer.add(TIMER_SOURCE, vnf_instance_id, vnfc_instance_ids,
+                       CONF.server_notification.timer_interval)
 
     def remove_timer(self, vnf_instance_id):
-        if vnf_instance_id in self.timer_map:
-            self.timer_map[vnf_instance_id].cancel()
-            del self.timer_map[vnf_instance_id]
+        self.timer.cancel(TIMER_SOURCE, vnf_instance_id)
 
     def request_heal(self, vnf_instance_id, vnfc_instance_ids):
         LOG.info("server_notification auto healing is processed: %s.",
@@ -97,5 +56,4 @@ class ServerNotificationDriver():
                       encodeutils.exception_to_unicode(exp))
 
     def timer_expired(self, vnf_instance_id, vnfc_instance_ids):
-        self.remove_timer(vnf_instance_id)
         self.request_heal(vnf_instance_id, vnfc_instance_ids)
@@ -15,11 +15,10 @@
 
 from oslo_log import log as logging
 
+from tacker.db import api as db_api
 from tacker.sol_refactored.common import config
-from tacker.sol_refactored.common import exceptions as sol_ex
-from tacker.sol_refactored.common import fm_alarm_utils as alarm_utils
-from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
 from tacker.sol_refactored.nfvo import nfvo_client
+from tacker.sol_refactored import objects
 
 
 LOG = logging.getLogger(__name__)
@@ -32,19 +31,31 @@ class VnfFmDriverV1():
         self.endpoint = CONF.v2_vnfm.endpoint
         self.nfvo_client = nfvo_client.NfvoClient()
 
-    def store_alarm_info(self, context, alarm):
-        # store alarm into DB
-        try:
-            alarm_utils.get_alarm(context, alarm.id)
-            with context.session.begin():
-                alarm.update(context)
-        except sol_ex.AlarmNotFound:
-            with context.session.begin():
-                alarm.create(context)
+    def store_alarms_info(self, context, alarms):
+        # store alarms into DB in one transaction
+        self._store_alarms(context, alarms)
 
-        # get inst
-        inst = inst_utils.get_inst(context, alarm.managedObjectId)
+        # get insts
+        insts = objects.VnfInstanceV2.get_by_ids(
+            context, list({alarm.managedObjectId for alarm in alarms}))
+        insts = {inst.id: inst for inst in insts}
 
         # send notification
-        self.nfvo_client.send_alarm_notification(
-            context, alarm, inst, self.endpoint)
+        notif_alarms = []
+        for alarm in alarms:
+            if alarm.managedObjectId not in insts:
+                LOG.warning("VnfInstance %s of Alarm %s not found.",
+                            alarm.managedObjectId, alarm.id)
+                continue
+            notif_alarms.append(alarm)
+        self.nfvo_client.send_alarm_notifications(
+            context, notif_alarms, insts, self.endpoint)
+
+    @db_api.context_manager.writer
+    def _store_alarms(self, context, alarms):
+        existing = {alarm.id for alarm in objects.AlarmV1.get_by_ids(
+            context, [alarm.id for alarm in alarms])}
+        objects.AlarmV1.create_all(
+            context, [alarm for alarm in alarms if alarm.id not in existing])
+        objects.AlarmV1.update_all(
+            context, [alarm for alarm in alarms if alarm.id in existing])
@@ -44,7 +44,7 @@ def _auto_heal_pre(context, vnf_instance_id, heal_req):
 
 def auto_heal(context, vnf_instance_id, heal_req, conductor):
     lcmocc = _auto_heal_pre(context, vnf_instance_id, heal_req)
-    conductor.start_lcm_op_internal(context, lcmocc)
+    conductor.start_lcm_op_scheduled(context, lcmocc)
 
 
 @coordinate.lock_vnf_instance('{vnf_instance_id}')
@@ -73,4 +73,4 @@ def _auto_scale_pre(context, vnf_instance_id, scale_req):
 
 def auto_scale(context, vnf_instance_id, scale_req, conductor):
     lcmocc = _auto_scale_pre(context, vnf_instance_id, scale_req)
-    conductor.start_lcm_op_internal(context, lcmocc)
+    conductor.start_lcm_op_scheduled(context, lcmocc)
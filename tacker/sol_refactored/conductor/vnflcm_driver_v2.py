@@ -28,6 +28,7 @@ from tacker.sol_refactored.common import vim_utils
 from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
 from tacker.sol_refactored.infra_drivers.kubernetes import helm
 from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes
+from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_utils
 from tacker.sol_refactored.infra_drivers.openstack import openstack
 from tacker.sol_refactored.infra_drivers.terraform import terraform
 from tacker.sol_refactored.nfvo import nfvo_client
@@ -902,6 +903,10 @@ class VnfLcmDriverV2(object):
             inst_utils.check_metadata_format(inst.metadata)
 
         if req.obj_attr_is_set('vimConnectionInfo'):
+            # NOTE: k8s API clients kept for the old VIMs are not used
+            # any more.
+            for vim_info in inst.get('vimConnectionInfo', {}).values():
+                kubernetes_utils.K8S_API_CLIENT_POOL.invalidate(vim_info)
             self._merge_vim_connection_info(inst, req)
 
         if req.obj_attr_is_set('vnfcInfoModifications'):
@@ -1249,13 +1254,35 @@ class VnfLcmDriverV2(object):
             raise sol_ex.DbSyncNoDiff(
                 "There are no differences in Vnfc resources.")
 
-    def diff_check_inst(self, vnf_inst, vim_info):
+    def list_sync_resources(self, vnf_inst, vim_info):
         if vim_info.vimType == 'ETSINFV.KUBERNETES.V_1':
             driver = kubernetes.Kubernetes()
-            driver.diff_check_inst(vnf_inst, vim_info)
+            return driver.list_sync_resources(vnf_inst, vim_info)
         elif vim_info.vimType == 'ETSINFV.HELM.V_3':
             driver = helm.Helm()
-            driver.diff_check_inst(vnf_inst, vim_info)
+            return driver.list_sync_resources(vnf_inst, vim_info)
+        else:
+            # Only support CNF
+            raise sol_ex.DbSyncNoDiff(
+                "There are no differences in Vnfc resources.")
+
+    def get_sync_fingerprint(self, vnf_inst, vim_info, resources):
+        if vim_info.vimType == 'ETSINFV.KUBERNETES.V_1':
+            driver = kubernetes.Kubernetes()
+            return driver.get_sync_fingerprint(vnf_inst, resources)
+        elif vim_info.vimType == 'ETSINFV.HELM.V_3':
+            driver = helm.Helm()
+            return driver.get_sync_fingerprint(vnf_inst, resources)
+        # no fingerprint. the difference check is always done.
+        return None
+
+    def diff_check_inst(self, vnf_inst, vim_info, resources=None):
+        if vim_info.vimType == 'ETSINFV.KUBERNETES.V_1':
+            driver = kubernetes.Kubernetes()
+            driver.diff_check_inst(vnf_inst, vim_info, resources)
+        elif vim_info.vimType == 'ETSINFV.HELM.V_3':
+            driver = helm.Helm()
+            driver.diff_check_inst(vnf_inst, vim_info, resources)
         else:
             # Only support CNF
             raise sol_ex.DbSyncNoDiff(
@@ -15,6 +15,9 @@
 
 import datetime
 
+from oslo_log import log as logging
+
+from tacker.db import api as db_api
 from tacker.sol_refactored.common import config
 from tacker.sol_refactored.common import exceptions as sol_ex
 from tacker.sol_refactored.common import pm_job_utils
@@ -24,6 +27,7 @@ from tacker.sol_refactored.nfvo import nfvo_client
 from tacker.sol_refactored import objects
 
 
+LOG = logging.getLogger(__name__)
 CONF = config.CONF
 
 
@@ -34,20 +38,33 @@ class VnfPmDriverV2():
         self.nfvo_client = nfvo_client.NfvoClient()
 
     def store_job_info(self, context, reports):
+        reports = [self._make_report(report) for report in reports]
+        job_reports = {}
         for report in reports:
-            # store report into db
-            report = self._store_report(context, report)
+            job_reports.setdefault(report.jobId, []).append(report)
+
+        # store reports into db and update job reports in one transaction
+        pm_jobs, deleted = self._store_reports(context, job_reports)
 
-            # update job reports
-            job_id = report.jobId
-            timestamp = report.entries[0].performanceValues[0].timeStamp
-            pm_job = self._update_job_reports(
-                context, job_id, report, timestamp, self.endpoint)
+        # NOTE: the latest report times are indexed in separate transactions
+        # after the reports are committed, so that a conflict of the index
+        # with another conductor doesn't drop the reports.
+        for job_id in pm_jobs:
+            try:
+                pm_job_utils.update_report_index(context,
+                                                 job_reports[job_id])
+            except Exception as ex:
+                LOG.error("Failed to update the report index of PM job "
+                          "%s: %s", job_id, ex)
 
+        for report in reports:
+            pm_job = pm_jobs.get(report.jobId)
+            if pm_job is None or report.id in deleted:
+                continue
             # Send a notify pm job request to the NFVO client.
             # POST /{pmjob.callbackUri}
             self.nfvo_client.send_pm_job_notification(
-                report, pm_job, timestamp, self.endpoint)
+                report, pm_job, report.readyTime, self.endpoint)
 
     def store_threshold_info(self, context, threshold_states):
         for threshold_state in threshold_states:
@@ -74,16 +91,28 @@ class VnfPmDriverV2():
                 subsc_utils.send_notification(
                     threshold, notif_data, subsc_utils.NOTIFY_TYPE_PM)
 
-    def _store_report(self, context, report):
+    def _make_report(self, report):
         report = objects.PerformanceReportV2.from_dict(report)
-        report.create(context)
+        report.readyTime = report.entries[0].performanceValues[0].timeStamp
         return report
 
-    def _update_job_reports(
-            self, context, job_id, report, timestamp, endpoint):
-        # update reports in the pmJob
-        update_job = pm_job_utils.update_report(
-            context, job_id, report, timestamp, endpoint)
-        with context.session.begin():
-            update_job.update(context)
-        return update_job
+    @db_api.context_manager.writer
+    def _store_reports(self, context, job_reports):
+        pm_jobs = {}
+        deleted = set()
+        for job_id, reports in job_reports.items():
+            pm_job = objects.PmJobV2.get_by_id(context, job_id)
+            if pm_job is None:
+                # NOTE: the PM job may be deleted after the reports were
+                # made. The reports are dropped not to fail the others.
+                LOG.warning("PM job %s does not exist. %d reports are "
+                            "dropped.", job_id, len(reports))
+                continue
+            objects.PerformanceReportV2.create_all(context, reports)
+            deleted |= pm_job_utils.compact_reports(context, job_id)
+            pm_job_utils.add_reports(pm_job, reports, self.endpoint,
+                                     deleted)
+            pm_jobs[job_id] = pm_job
+        # update reports in the pmJobs
+        objects.PmJobV2.update_all(context, list(pm_jobs.values()))
+        return pm_jobs, deleted
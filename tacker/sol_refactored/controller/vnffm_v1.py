@@ -64,8 +64,8 @@ class VnfFmControllerV1(sol_wsgi.SolAPIController):
 
     def index(self, request):
         filters, _, pager = self._fm_view.parse_query_params(request)
-        alarms = fm_alarm_utils.get_alarms_all(request.context,
-                                               marker=pager.marker)
+        alarms = self._fm_view.get_all(request.context,
+                                       fm_alarm_utils.get_alarms_all, pager)
 
         resp_body = self._fm_view.detail_list(alarms, filters, None, pager)
 
@@ -127,6 +127,7 @@ class VnfFmControllerV1(sol_wsgi.SolAPIController):
                 subsc, subsc_utils.NOTIFY_TYPE_FM)
 
         subsc.create(context)
+        fm_subsc_utils.FM_SUBSC_INDEX.add(subsc)
 
         resp_body = self._subsc_view.detail(subsc)
         self_href = fm_subsc_utils.subsc_href(subsc.id, self.endpoint)
@@ -137,8 +138,8 @@ class VnfFmControllerV1(sol_wsgi.SolAPIController):
 
     def subscription_list(self, request):
         filters, _, pager = self._subsc_view.parse_query_params(request)
-        subscs = fm_subsc_utils.get_subsc_all(request.context,
-                                           marker=pager.marker)
+        subscs = self._subsc_view.get_all(request.context,
+                                          fm_subsc_utils.get_subsc_all, pager)
 
         resp_body = self._subsc_view.detail_list(subscs, filters, None, pager)
 
@@ -159,6 +160,7 @@ class VnfFmControllerV1(sol_wsgi.SolAPIController):
         subsc = fm_subsc_utils.get_subsc(request.context, id)
 
         subsc.delete(context)
+        fm_subsc_utils.FM_SUBSC_INDEX.remove(subsc.id)
 
         return sol_wsgi.SolResponse(204, None,
                                     version=api_version.CURRENT_FM_VERSION)
@@ -122,10 +122,10 @@ class VnfLcmControllerV2(sol_wsgi.SolAPIController):
         insts = self._inst_view.get_dict_all(request.context, filters,
                                              selector, pager)
         if config.CONF.oslo_policy.enhanced_tacker_policy:
-            insts = [inst for inst in insts if request.context.can(
+            insts = (inst for inst in insts if request.context.can(
                 POLICY_NAME.format('index'),
                 target=self._get_policy_target_dict(inst),
-                fatal=False)]
+                fatal=False))
 
         resp_body = self._inst_view.detail_dict_list(insts, filters,
                                                      selector, pager)
@@ -495,6 +495,7 @@ class VnfLcmControllerV2(sol_wsgi.SolAPIController):
             subsc_utils.test_notification(subsc)
 
         subsc.create(context)
+        subsc_utils.LCM_SUBSC_INDEX.add(subsc)
 
         resp_body = self._subsc_view.detail(subsc)
         self_href = subsc_utils.subsc_href(subsc.id, self.endpoint)
@@ -504,8 +505,8 @@ class VnfLcmControllerV2(sol_wsgi.SolAPIController):
     def subscription_list(self, request):
         filters, _, pager = self._subsc_view.parse_query_params(request)
 
-        subscs = subsc_utils.get_subsc_all(request.context,
-                                           marker=pager.marker)
+        subscs = self._subsc_view.get_all(request.context,
+                                          subsc_utils.get_subsc_all, pager)
 
         resp_body = self._subsc_view.detail_list(subscs, filters, pager)
 
@@ -523,6 +524,7 @@ class VnfLcmControllerV2(sol_wsgi.SolAPIController):
         subsc = subsc_utils.get_subsc(request.context, id)
 
         subsc.delete(context)
+        subsc_utils.LCM_SUBSC_INDEX.remove(subsc.id)
 
         return sol_wsgi.SolResponse(204, None)
 
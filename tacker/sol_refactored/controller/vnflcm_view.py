@@ -408,22 +408,59 @@ class BaseViewBuilder(object):
 
         return filters, selector, pager
 
-    def _handle_pager(self, pager, resp_body):
-        if pager.page_size == 0:
-            pager.next_marker = None
-            return resp_body
+    def _get_paging_marker(self, val):
+        return val.get_paging_marker(val)
 
-        if len(resp_body) > pager.page_size:
-            resp_body = resp_body[:pager.page_size]
-            pager.next_marker = resp_body[-1]["id"]
-        else:
-            pager.next_marker = None
+    def _iter_chunks(self, get_chunk, pager):
+        # NOTE: +1 to find there are more data
+        limit = pager.page_size + 1
+        marker = pager.marker
+        while True:
+            chunk = get_chunk(marker, limit)
+            # NOTE: the marker is made before the values are used since
+            # they may be modified by detail methods.
+            next_marker = (self._get_paging_marker(chunk[-1])
+                           if len(chunk) == limit else None)
+            yield from chunk
+            if next_marker is None:
+                return
+            marker = next_marker
+
+    def get_all(self, context, get_all_func, pager):
+        """Get values after the marker from DB
+
+        Values are got by chunk of the page size so that the values
+        unnecessary for the page are not loaded even if filtering is
+        done after getting from DB.
+        """
+        if pager.page_size == 0:
+            return get_all_func(context, marker=pager.marker)
+        return self._iter_chunks(
+            lambda marker, limit: get_all_func(context, marker=marker,
+                                               limit=limit),
+            pager)
+
+    def _handle_pager(self, pager, values, detail):
+        pager.next_marker = None
+        resp_body = []
+        last_marker = None
+        for val in values:
+            if pager.page_size > 0:
+                if len(resp_body) == pager.page_size:
+                    # there are more data
+                    pager.next_marker = last_marker
+                    break
+                if len(resp_body) == pager.page_size - 1:
+                    # NOTE: the marker is made before detail since it may
+                    # modify the value.
+                    last_marker = self._get_paging_marker(val)
+            resp_body.append(detail(val))
         return resp_body
 
     def detail_list(self, values, filters, selector, pager):
-        resp_body = [self.detail(v, selector) for v in values
-                     if self.match_filters(v, filters)]
-        return self._handle_pager(pager, resp_body)
+        values = (v for v in values if self.match_filters(v, filters))
+        return self._handle_pager(
+            pager, values, lambda v: self.detail(v, selector))
 
 
 class EnhanceViewBuilder(BaseViewBuilder):
@@ -437,6 +474,23 @@ class EnhanceViewBuilder(BaseViewBuilder):
         return EnhanceAttributeSelector(self._ALL, self._MANDATORY,
                                         self._EXCLUDE_DEFAULT, **params)
 
+    def _to_db_filter(self, item):
+        if item.op in self.opOne:
+            values = item.values[0]
+        else:  # opMulti
+            values = item.values
+        # NOTE: cont and ncont are not supported at the moment.
+        if item.op in ['cont', 'ncont']:
+            return None
+        if len(item.attr) == 1:
+            return (item.op, item.attr[0], values)
+        if self.obj_cls.is_json_path_filterable(item.attr):
+            return (item.op, item.attr, values)
+        return None
+
+    def _get_paging_marker(self, val):
+        return self.obj_cls.get_paging_marker(val)
+
     def get_dict_all(self, context, filters, selector, pager):
         # calc db fields
         extra_attrs = set()
@@ -446,39 +500,34 @@ class EnhanceViewBuilder(BaseViewBuilder):
             if item.attr[0] not in selector.all_attrs:
                 # never match
                 return []
-            extra_attrs.add(item.attr[0])
-            # NOTE: cont and ncont are not supported at the moment.
-            if len(item.attr) == 1 and item.op not in ['cont', 'ncont']:
-                if item.op in self.opOne:
-                    db_filters.append(
-                        (item.op, item.attr[0], item.values[0]))
-                else:  # opMulti
-                    db_filters.append(
-                        (item.op, item.attr[0], item.values))
+            db_filter = self._to_db_filter(item)
+            if db_filter is None:
+                # filter after getting from DB
+                extra_attrs.add(item.attr[0])
+            else:
+                db_filters.append(db_filter)
                 rm_filters.append(item)
         for item in rm_filters:
             filters.remove(item)
         selector.add_extra_attrs(extra_attrs)
         attrs = selector.return_attrs | selector.extra_attrs
-        limit = None
-        if (pager.page_size > 0 and len(filters) == 0 and
-                len(selector.extra_attrs) == 0):
-            # short cut. set limit if no filtering need later.
-            # NOTE: +1 to find there are more data
-            limit = pager.page_size + 1
-        if pager.marker:
-            db_filters.append(('gt', 'id', pager.marker))
 
-        return self.obj_cls.get_dict_all(context, attrs, db_filters, limit)
+        # NOTE: values may be dropped after getting from DB by filters
+        # not pushed down and extra attrs (ex. for policy check). They are
+        # got by chunk in that case too.
+        def _get_chunk(marker, limit):
+            return self.obj_cls.get_dict_all(context, attrs, db_filters,
+                                             limit, marker=marker)
+
+        if pager.page_size == 0:
+            return _get_chunk(pager.marker, None)
+        return self._iter_chunks(_get_chunk, pager)
 
     def detail_dict_list(self, values, filters, selector, pager):
         if filters:
-            resp_body = [self.detail_dict(v, selector) for v in values
-                         if self.match_filters(v, filters)]
-        else:
-            # short cut a bit
-            resp_body = [self.detail_dict(v, selector) for v in values]
-        return self._handle_pager(pager, resp_body)
+            values = (v for v in values if self.match_filters(v, filters))
+        return self._handle_pager(
+            pager, values, lambda v: self.detail_dict(v, selector))
 
 
 class InstanceViewBuilder(EnhanceViewBuilder):
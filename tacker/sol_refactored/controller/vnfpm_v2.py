@@ -15,6 +15,7 @@
 
 import copy
 import datetime
+import functools
 
 from oslo_log import log as logging
 from oslo_utils import uuidutils
@@ -96,6 +97,8 @@ class VnfPmControllerV2(sol_wsgi.SolAPIController):
         self.endpoint = CONF.v2_vnfm.endpoint
         self._pm_job_view = vnfpm_view.PmJobViewBuilder(self.endpoint,
             CONF.v2_vnfm.vnfpm_pmjob_page_size)
+        self._pm_report_view = vnfpm_view.PmJobViewBuilder(self.endpoint,
+            CONF.v2_vnfm.vnfpm_report_page_size)
         self._pm_threshold_view = (
             vnfpm_view.PmThresholdViewBuilder(self.endpoint,
                 CONF.v2_vnfm.vnfpm_pmthreshold_page_size))
@@ -204,8 +207,8 @@ class VnfPmControllerV2(sol_wsgi.SolAPIController):
     def index(self, request):
         filters, selector, pager = self._pm_job_view.parse_query_params(
             request)
-        pm_job = pm_job_utils.get_pm_job_all(request.context,
-                                             marker=pager.marker)
+        pm_job = self._pm_job_view.get_all(request.context,
+                                           pm_job_utils.get_pm_job_all, pager)
         resp_body = self._pm_job_view.detail_list(pm_job, filters,
                                                   selector, pager)
 
@@ -253,15 +256,30 @@ class VnfPmControllerV2(sol_wsgi.SolAPIController):
 
         self.plugin.delete_job(context=context, pm_job=pm_job)
 
-        reports = objects.PerformanceReportV2.get_by_filter(context,
-                                                            jobId=pm_job.id)
-        for report in reports:
-            report.delete(context)
+        objects.PerformanceReportV2.delete_by_filter(context,
+                                                     jobId=pm_job.id)
+        pm_job_utils.delete_report_index(context, pm_job.id)
         pm_job.delete(context)
 
         return sol_wsgi.SolResponse(204, None,
                                     version=api_version.CURRENT_PM_VERSION)
 
+    def report_index(self, request, id):
+        context = request.context
+        # check the PM job exists
+        pm_job_utils.get_pm_job(context, id)
+
+        pager = self._pm_report_view.parse_pager(request)
+        pm_reports = self._pm_report_view.get_all(
+            context,
+            functools.partial(pm_job_utils.get_pm_reports, pm_job_id=id),
+            pager)
+        resp_body = self._pm_report_view.report_list(pm_reports, pager)
+
+        return sol_wsgi.SolResponse(200, resp_body,
+                                    version=api_version.CURRENT_PM_VERSION,
+                                    link=pager.get_link())
+
     def report_get(self, request, id, report_id):
         pm_report = pm_job_utils.get_pm_report(
             request.context, id, report_id)
@@ -368,8 +386,8 @@ class VnfPmControllerV2(sol_wsgi.SolAPIController):
     def index_threshold(self, request):
         filters, _, pager = self._pm_threshold_view.parse_query_params(
             request)
-        pm_job = pm_threshold_utils.get_pm_threshold_all(request.context,
-                                                         marker=pager.marker)
+        pm_job = self._pm_threshold_view.get_all(
+            request.context, pm_threshold_utils.get_pm_threshold_all, pager)
         resp_body = self._pm_threshold_view.detail_list(pm_job, filters,
                                                         None, pager)
 
@@ -49,8 +49,15 @@ class PmJobViewBuilder(base_view.BaseViewBuilder):
             resp.pop('id')
         if resp.get('jobId'):
             resp.pop('jobId')
+        resp.pop('readyTime', None)
         return resp
 
+    def report_list(self, pm_reports, pager):
+        return self._handle_pager(
+            pager, pm_reports,
+            lambda pm_report: pm_job_utils.make_job_report(
+                pm_report, self.endpoint).to_dict())
+
 
 class PmThresholdViewBuilder(base_view.BaseViewBuilder):
     def parse_selector(self, req):
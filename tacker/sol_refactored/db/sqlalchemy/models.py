@@ -256,9 +256,66 @@ class PerformanceReportV2(model_base.BASE):
     - v3.3.1 6.5.2.10 (API version: 2.1.0)
     """
     __tablename__ = 'PerformanceReportV2'
+    __table_args__ = (
+        sa.Index('ix_PerformanceReportV2_jobId_readyTime',
+                 'jobId', 'readyTime'),
+    )
     id = sa.Column(sa.String(255), nullable=False, primary_key=True)
     jobId = sa.Column(sa.String(255), nullable=False, primary_key=False)
     entries = sa.Column(sa.JSON(), nullable=False)
+    # NOTE: 'readyTime' attribute is not included in the original
+    #       'Report' data type definition. It is the same as 'readyTime'
+    #       of the report in the PmJob and used for retention, roll-up
+    #       and paging of the reports.
+    readyTime = sa.Column(sa.DateTime(), nullable=False)
+
+
+class PmReportIndexV2(model_base.BASE):
+    """Type: PmReportIndex
+
+    This is a proprietary implementation of Tacker.
+    Contain the latest report time per objectInstanceId,
+    subObjectInstanceId and performanceMetric of a PM job.
+    """
+
+    __tablename__ = 'PmReportIndexV2'
+    id = sa.Column(sa.String(36), nullable=False, primary_key=True)
+    jobId = sa.Column(sa.String(255), nullable=False, index=True)
+    objectInstanceId = sa.Column(sa.String(255), nullable=False)
+    subObjectInstanceId = sa.Column(sa.String(255), nullable=True)
+    performanceMetric = sa.Column(sa.String(255), nullable=False)
+    latestTimeStamp = sa.Column(sa.DateTime(), nullable=False)
+
+
+class AutoHealTimerV2(model_base.BASE):
+    """Type: AutoHealTimer
+
+    This is a proprietary implementation of Tacker.
+    Contain the pending auto heal of a VNF instance requested by
+    the server notification or the Prometheus Plugin.
+    """
+
+    __tablename__ = 'AutoHealTimerV2'
+    id = sa.Column(sa.String(36), nullable=False, primary_key=True)
+    source = sa.Column(sa.String(64), nullable=False)
+    vnfInstanceId = sa.Column(sa.String(255), nullable=False)
+    vnfcInstanceIds = sa.Column(sa.JSON(), nullable=False)
+    dueTime = sa.Column(sa.DateTime(), nullable=False, index=True)
+
+
+class PrometheusRuleV2(model_base.BASE):
+    """Type: PrometheusRule
+
+    This is a proprietary implementation of Tacker.
+    Contain the alert rules of a PM job or a PM threshold to be set
+    to the Prometheus servers by the Prometheus Plugin.
+    """
+
+    __tablename__ = 'PrometheusRuleV2'
+    id = sa.Column(sa.String(255), nullable=False, primary_key=True)
+    ruleGroup = sa.Column(sa.JSON(), nullable=False)
+    targets = sa.Column(sa.JSON(), nullable=False)
+    reloadUris = sa.Column(sa.JSON(), nullable=False)
 
 
 class CryptKey(model_base.BASE):
@@ -36,7 +36,7 @@ class Helm(kubernetes_common.KubernetesCommon):
         vim_info = inst_utils.select_vim_info(inst.vimConnectionInfo)
         with kubernetes_utils.AuthContextManager(vim_info) as acm:
             k8s_api_client = acm.init_k8s_api_client()
-            helm_client = acm.init_helm_client()
+            helm_client = acm.init_helm_client(k8s_api_client)
             self._instantiate(req, inst, grant_req, grant, vnfd,
                               k8s_api_client, helm_client)
 
@@ -87,7 +87,7 @@ class Helm(kubernetes_common.KubernetesCommon):
         vim_info = inst_utils.select_vim_info(inst.vimConnectionInfo)
         with kubernetes_utils.AuthContextManager(vim_info) as acm:
             k8s_api_client = acm.init_k8s_api_client()
-            helm_client = acm.init_helm_client()
+            helm_client = acm.init_helm_client(k8s_api_client)
             namespace = req.additionalParams.get('namespace', 'default')
             release_name = self._get_release_name(inst)
 
@@ -98,7 +98,7 @@ class Helm(kubernetes_common.KubernetesCommon):
         vim_info = inst_utils.select_vim_info(inst.vimConnectionInfo)
         with kubernetes_utils.AuthContextManager(vim_info) as acm:
             k8s_api_client = acm.init_k8s_api_client()
-            helm_client = acm.init_helm_client()
+            helm_client = acm.init_helm_client(k8s_api_client)
             namespace = inst.instantiatedVnfInfo.metadata['namespace']
             release_name = inst.instantiatedVnfInfo.metadata['release_name']
 
@@ -126,7 +126,7 @@ class Helm(kubernetes_common.KubernetesCommon):
         vim_info = inst_utils.select_vim_info(inst.vimConnectionInfo)
         with kubernetes_utils.AuthContextManager(vim_info) as acm:
             k8s_api_client = acm.init_k8s_api_client()
-            helm_client = acm.init_helm_client()
+            helm_client = acm.init_helm_client(k8s_api_client)
             self._scale(req, inst, grant_req, grant, vnfd,
                         k8s_api_client, helm_client)
 
@@ -181,7 +181,7 @@ class Helm(kubernetes_common.KubernetesCommon):
         vim_info = inst_utils.select_vim_info(inst.vimConnectionInfo)
         with kubernetes_utils.AuthContextManager(vim_info) as acm:
             k8s_api_client = acm.init_k8s_api_client()
-            helm_client = acm.init_helm_client()
+            helm_client = acm.init_helm_client(k8s_api_client)
             self._scale_rollback(req, inst, grant_req, grant, vnfd,
                                  k8s_api_client, helm_client)
 
@@ -209,7 +209,7 @@ class Helm(kubernetes_common.KubernetesCommon):
         vim_info = inst_utils.select_vim_info(inst.vimConnectionInfo)
         with kubernetes_utils.AuthContextManager(vim_info) as acm:
             k8s_api_client = acm.init_k8s_api_client()
-            helm_client = acm.init_helm_client()
+            helm_client = acm.init_helm_client(k8s_api_client)
             if req.additionalParams['upgrade_type'] == 'RollingUpdate':
                 self._change_vnfpkg_rolling_update(req, inst, grant_req,
                     grant, vnfd, k8s_api_client, helm_client)
@@ -263,7 +263,7 @@ class Helm(kubernetes_common.KubernetesCommon):
         vim_info = inst_utils.select_vim_info(inst.vimConnectionInfo)
         with kubernetes_utils.AuthContextManager(vim_info) as acm:
             k8s_api_client = acm.init_k8s_api_client()
-            helm_client = acm.init_helm_client()
+            helm_client = acm.init_helm_client(k8s_api_client)
             if req.additionalParams['upgrade_type'] == 'RollingUpdate':
                 self._change_vnfpkg_rolling_update_rollback(
                     req, inst, grant_req, grant, vnfd, k8s_api_client,
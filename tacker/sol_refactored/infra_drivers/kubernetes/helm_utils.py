@@ -13,10 +13,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
+import collections
+import copy
+import gzip
+import os
 import subprocess
+import threading
 import yaml
 
+from kubernetes import client
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 
 from tacker.sol_refactored.common import exceptions as sol_ex
 
@@ -25,11 +33,91 @@ LOG = logging.getLogger(__name__)
 HELM_INSTALL_TIMEOUT = "120s"
 RELEASE_NOT_FOUND_MSG = 'Error: release: not found'
 
+# NOTE: helm stores a release revision in a secret of this type (default
+# storage driver of helm v3). The 'release' data is base64 encoded gzipped
+# json of the release.
+HELM_RELEASE_SECRET_TYPE = 'helm.sh/release.v1'
+HELM_SECRET_DRIVERS = ('', 'secret', 'secrets')
+GZIP_MAGIC = b'\x1f\x8b'
+
+MANIFEST_CACHE_SIZE = 128
+
+
+class HelmRelease(object):
+    """Revision of a helm release read from the storage secret
+
+    'revision' is an int. 'status' is the one of helm release (e.g.
+    'deployed', 'superseded', 'failed').
+    """
+
+    def __init__(self, name, namespace, revision, status, secret):
+        self.name = name
+        self.namespace = namespace
+        self.revision = revision
+        self.status = status
+        self._secret = secret
+
+    def get_manifest(self):
+        return _MANIFEST_CACHE.get(self._secret)
+
+
+def decode_release(data):
+    """Decode 'release' data of a helm storage secret to a dict"""
+    raw = base64.b64decode(base64.b64decode(data))
+    if raw[:2] == GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    return jsonutils.loads(raw)
+
+
+class _ManifestCache(object):
+    """LRU cache of manifests decoded from helm storage secrets
+
+    A storage secret is created per revision and its manifest is never
+    changed, so a decoded manifest is kept by the uid of the secret and
+    need not be invalidated.
+    """
+
+    def __init__(self, size=MANIFEST_CACHE_SIZE):
+        self.size = size
+        self.lock = threading.Lock()
+        # {uid: manifest}
+        self.manifests = collections.OrderedDict()
+
+    def get(self, secret):
+        uid = secret.metadata.uid
+        with self.lock:
+            if uid in self.manifests:
+                self.manifests.move_to_end(uid)
+                return self.manifests[uid]
+
+        release = decode_release(secret.data['release'])
+        manifest = [res for res in yaml.safe_load_all(release['manifest'])
+                    if res]
+
+        with self.lock:
+            self.manifests[uid] = manifest
+            while len(self.manifests) > self.size:
+                self.manifests.popitem(last=False)
+        return manifest
+
+
+_MANIFEST_CACHE = _ManifestCache()
+
 
 class HelmClient():
+    """Execute helm operations
+
+    Mutating operations (install, upgrade, uninstall and rollback) are done
+    by the helm command. If k8s_api_client is specified and helm uses the
+    secret storage driver, the state and the manifest of a release are read
+    from the storage secrets via k8s API instead of the helm command.
+    """
 
-    def __init__(self, helm_auth_params):
+    def __init__(self, helm_auth_params, k8s_api_client=None):
         self.helm_auth_params = helm_auth_params
+        self.k8s_api_client = None
+        if os.environ.get('HELM_DRIVER', '') in HELM_SECRET_DRIVERS:
+            self.k8s_api_client = k8s_api_client
 
     def _execute_command(self, helm_command, raise_ex=True):
         helm_command.extend(self.helm_auth_params)
@@ -42,12 +130,36 @@ class HelmClient():
         return result
 
     def _get_revision(self, result):
-        for line in result.stdout.split('\n'):
-            if 'REVISION' in line:
-                revision = line.split()[-1]
-                return revision
+        # NOTE: install and upgrade are executed with '--output json'.
+        return str(jsonutils.loads(result.stdout)['version'])
+
+    def get_release(self, release_name, namespace):
+        """Return the latest revision of the release or None
+
+        Only available when k8s_api_client is used.
+        """
+        v1 = client.CoreV1Api(api_client=self.k8s_api_client)
+        try:
+            secrets = v1.list_namespaced_secret(
+                namespace=namespace,
+                label_selector=f'owner=helm,name={release_name}').items
+        except client.ApiException as ex:
+            raise sol_ex.HelmOperationFailed(sol_detail=str(ex))
+
+        releases = [
+            HelmRelease(release_name, namespace,
+                        int(secret.metadata.labels['version']),
+                        secret.metadata.labels.get('status'), secret)
+            for secret in secrets
+            if secret.type == HELM_RELEASE_SECRET_TYPE]
+        if not releases:
+            return None
+        return max(releases, key=lambda release: release.revision)
 
     def is_release_exist(self, release_name, namespace):
+        if self.k8s_api_client is not None:
+            return self.get_release(release_name, namespace) is not None
+
         # execute helm status command
         helm_command = ["helm", "status", release_name, "--namespace",
                         namespace]
@@ -68,7 +180,8 @@ class HelmClient():
             set_params = ','.join([f"{key}={value}"
                                    for key, value in parameters.items()])
             helm_command.extend(["--set", set_params])
-        helm_command.extend(["--timeout", HELM_INSTALL_TIMEOUT])
+        helm_command.extend(["--timeout", HELM_INSTALL_TIMEOUT,
+                             "--output", "json"])
         result = self._execute_command(helm_command)
 
         return self._get_revision(result)
@@ -81,7 +194,8 @@ class HelmClient():
             set_params = ','.join([f"{key}={value}"
                                    for key, value in parameters.items()])
             helm_command.extend(["--set", set_params])
-        helm_command.extend(["--timeout", HELM_INSTALL_TIMEOUT])
+        helm_command.extend(["--timeout", HELM_INSTALL_TIMEOUT,
+                             "--output", "json"])
         result = self._execute_command(helm_command)
 
         return self._get_revision(result)
@@ -93,6 +207,14 @@ class HelmClient():
         self._execute_command(helm_command)
 
     def get_manifest(self, release_name, namespace):
+        if self.k8s_api_client is not None:
+            release = self.get_release(release_name, namespace)
+            if release is None:
+                raise sol_ex.HelmOperationFailed(
+                    sol_detail=f'release {release_name} not found.')
+            # NOTE: a copy is returned since the caller modifies it.
+            return copy.deepcopy(release.get_manifest())
+
         # execute helm get manifest command
         helm_command = ["helm", "get", "manifest", release_name,
                         "--namespace", namespace]
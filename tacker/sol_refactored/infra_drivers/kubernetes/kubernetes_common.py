@@ -14,17 +14,20 @@
 #    under the License.
 
 import copy
+import hashlib
+import json
 import operator
 import re
+import time
 
 from oslo_log import log as logging
-from oslo_service import loopingcall
 
 from tacker.sol_refactored.common import config
 from tacker.sol_refactored.common import exceptions as sol_ex
 from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
 from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_resource
 from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_utils
+from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_watch
 from tacker.sol_refactored.nfvo import nfvo_client
 from tacker.sol_refactored import objects
 
@@ -122,9 +125,11 @@ class KubernetesCommon(object):
         cls = getattr(kubernetes_resource, res['kind'])
         return cls(k8s_api_client, res)
 
-    def _update_vnfc_info(self, inst, k8s_api_client):
-        all_pods = kubernetes_utils.list_namespaced_pods(
-            k8s_api_client, inst.instantiatedVnfInfo.metadata['namespace'])
+    def _update_vnfc_info(self, inst, k8s_api_client, all_pods=None):
+        if all_pods is None:
+            all_pods = kubernetes_utils.list_namespaced_pods(
+                k8s_api_client,
+                inst.instantiatedVnfInfo.metadata['namespace'])
         vnfc_resources = []
         for pod in all_pods:
             pod_name = pod.metadata.name
@@ -158,73 +163,165 @@ class KubernetesCommon(object):
             for vnfc_res_info in vnfc_resources
         ]
 
-    def _check_status(self, check_func, *args):
-        timer = loopingcall.FixedIntervalWithTimeoutLoopingCall(
-            check_func, *args)
-        try:
-            timer.start(interval=CHECK_INTERVAL,
-                timeout=CONF.v2_vnfm.kubernetes_vim_rsc_wait_timeout).wait()
-        except loopingcall.LoopingCallTimeOut:
-            raise sol_ex.K8sOperaitionTimeout()
+    def _wait_k8s_reses(self, k8s_reses, check_func, k8s_api_client=None,
+            extra_watch_keys=()):
+        """Wait until all resources become the expected state
+
+        check_func(reses, tracker) returns the resources which become the
+        expected state among reses. The state is got from the tracker if
+        the resource is watched (see kubernetes_watch.ResourceTracker).
+        Otherwise, it is checked by polling at CHECK_INTERVAL.
+        """
+        check_reses = set(k8s_reses)
+        if not check_reses:
+            return
+        if k8s_api_client is None:
+            k8s_api_client = next(iter(check_reses)).k8s_api_client
+
+        def _watch_keys(res):
+            return {(res.namespace, res.kind)} | set(extra_watch_keys)
+
+        keys = set()
+        if CONF.v2_vnfm.kubernetes_vim_rsc_watch:
+            for res in check_reses:
+                keys |= _watch_keys(res)
+
+        deadline = (time.monotonic() +
+                    CONF.v2_vnfm.kubernetes_vim_rsc_wait_timeout)
+        next_poll = 0
+        with kubernetes_watch.ResourceTracker(k8s_api_client,
+                                              keys) as tracker:
+            def _is_watched(res):
+                return all(tracker.is_watched(*key)
+                           for key in _watch_keys(res))
+
+            while True:
+                seq = tracker.seq
+                now = time.monotonic()
+                poll = now >= next_poll or now >= deadline
+                if poll:
+                    next_poll = now + CHECK_INTERVAL
+                reses = {res for res in check_reses
+                         if poll or _is_watched(res)}
+                if reses:
+                    check_reses -= check_func(reses, tracker)
+                if not check_reses:
+                    return
+                if now >= deadline:
+                    raise sol_ex.K8sOperaitionTimeout()
+
+                timeout = deadline - now
+                if not all(_is_watched(res) for res in check_reses):
+                    timeout = min(timeout, next_poll - now)
+                tracker.wait(seq, timeout)
+
+    def _get_watched_info(self, res, tracker):
+        # NOTE: the 2nd value is None if the resource does not exist.
+        if tracker.is_watched(res.namespace, res.kind):
+            return True, tracker.get(res.namespace, res.kind, res.name)
+        return False, None
 
     def _wait_k8s_reses_ready(self, k8s_reses):
-        def _check_ready(check_reses):
-            ok_reses = {res for res in check_reses if res.is_ready()}
-            check_reses -= ok_reses
-            if not check_reses:
-                raise loopingcall.LoopingCallDone()
+        def _check_ready(reses, tracker):
+            ok_reses = set()
+            for res in reses:
+                watched, info = self._get_watched_info(res, tracker)
+                if watched:
+                    if info is not None and res.is_ready(info):
+                        ok_reses.add(res)
+                elif res.is_ready():
+                    ok_reses.add(res)
+            return ok_reses
 
-        check_reses = set(k8s_reses)
-        self._check_status(_check_ready, check_reses)
+        self._wait_k8s_reses(k8s_reses, _check_ready)
 
     def _wait_k8s_reses_deleted(self, k8s_reses):
-        def _check_deleted(check_reses):
-            ok_reses = {res for res in check_reses if not res.is_exists()}
-            check_reses -= ok_reses
-            if not check_reses:
-                raise loopingcall.LoopingCallDone()
+        def _check_deleted(reses, tracker):
+            ok_reses = set()
+            for res in reses:
+                watched, info = self._get_watched_info(res, tracker)
+                if watched:
+                    if info is None or not res.is_exists(info):
+                        ok_reses.add(res)
+                elif not res.is_exists():
+                    ok_reses.add(res)
+            return ok_reses
 
-        check_reses = set(k8s_reses)
-        self._check_status(_check_deleted, check_reses)
+        self._wait_k8s_reses(k8s_reses, _check_deleted)
 
     def _wait_k8s_reses_updated(self, k8s_reses, k8s_api_client, namespace,
             old_pods_names):
-        def _check_updated(check_reses, k8s_api_client, namespace,
-                old_pods_names):
+        def _check_updated(reses, tracker):
             ok_reses = set()
-            all_pods = kubernetes_utils.list_namespaced_pods(
-                k8s_api_client, namespace)
-            for res in check_reses:
+            if tracker.is_watched(namespace, 'Pod'):
+                all_pods = [pod for pod in tracker.list(namespace, 'Pod')
+                            if pod.status.phase == 'Running']
+            else:
+                all_pods = kubernetes_utils.list_namespaced_pods(
+                    k8s_api_client, namespace)
+            for res in reses:
                 pods_info = [pod for pod in all_pods
                              if self._is_match_pod_naming_rule(
                                  res.kind, res.name, pod.metadata.name)]
-                if res.is_update(pods_info, old_pods_names):
+                watched, info = self._get_watched_info(res, tracker)
+                if watched:
+                    if (info is not None and
+                            res.is_update(pods_info, old_pods_names, info)):
+                        ok_reses.add(res)
+                elif res.is_update(pods_info, old_pods_names):
                     ok_reses.add(res)
-            check_reses -= ok_reses
-            if not check_reses:
-                raise loopingcall.LoopingCallDone()
+            return ok_reses
 
-        check_reses = set(k8s_reses)
-        self._check_status(_check_updated, check_reses, k8s_api_client,
-                           namespace, old_pods_names)
+        self._wait_k8s_reses(k8s_reses, _check_updated,
+                             k8s_api_client=k8s_api_client,
+                             extra_watch_keys=[(namespace, 'Pod')])
 
-    def diff_check_inst(self, inst, vim_info):
-        inst_tmp = copy.deepcopy(inst)
-        self.diff_check_and_update_vnfc(inst_tmp, vim_info)
+    def list_sync_resources(self, inst, vim_info):
+        """List Pods to be compared with the VNF instance
 
-    def diff_check_and_update_vnfc(self, vnf_instance, vim_info):
+        The result can be shared by VNF instances which use the same
+        VIM and namespace.
+        """
+        namespace = inst.instantiatedVnfInfo.metadata['namespace']
         with kubernetes_utils.AuthContextManager(vim_info) as acm:
             k8s_api_client = acm.init_k8s_api_client()
-            old_pods_names = {
-                vnfc.computeResource.resourceId for vnfc in
-                vnf_instance.instantiatedVnfInfo.vnfcResourceInfo}
-            self._update_vnfc_info(vnf_instance, k8s_api_client)
-            new_pods_names = {
-                vnfc.computeResource.resourceId for vnfc in
-                vnf_instance.instantiatedVnfInfo.vnfcResourceInfo}
-            if operator.eq(old_pods_names, new_pods_names):
-                raise sol_ex.DbSyncNoDiff(
-                    "There are no differences in Vnfc resources.")
+            return kubernetes_utils.list_namespaced_pods(
+                k8s_api_client, namespace)
+
+    def get_sync_fingerprint(self, inst, all_pods):
+        """Make a fingerprint of the inputs of the difference check"""
+        pods_names = sorted(pod.metadata.name for pod in all_pods)
+        vnfc_names = sorted(
+            vnfc.computeResource.resourceId for vnfc in
+            inst.instantiatedVnfInfo.vnfcResourceInfo)
+        vdu_reses = sorted(
+            (vdu_name, vdu_res['kind'], vdu_res['metadata']['name'])
+            for vdu_name, vdu_res in
+            inst.instantiatedVnfInfo.metadata['vdu_reses'].items())
+        data = json.dumps([pods_names, vnfc_names, vdu_reses])
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def diff_check_inst(self, inst, vim_info, all_pods=None):
+        inst_tmp = copy.deepcopy(inst)
+        self.diff_check_and_update_vnfc(inst_tmp, vim_info, all_pods)
+
+    def diff_check_and_update_vnfc(self, vnf_instance, vim_info,
+            all_pods=None):
+        old_pods_names = {
+            vnfc.computeResource.resourceId for vnfc in
+            vnf_instance.instantiatedVnfInfo.vnfcResourceInfo}
+        if all_pods is None:
+            with kubernetes_utils.AuthContextManager(vim_info) as acm:
+                k8s_api_client = acm.init_k8s_api_client()
+                self._update_vnfc_info(vnf_instance, k8s_api_client)
+        else:
+            self._update_vnfc_info(vnf_instance, None, all_pods)
+        new_pods_names = {
+            vnfc.computeResource.resourceId for vnfc in
+            vnf_instance.instantiatedVnfInfo.vnfcResourceInfo}
+        if operator.eq(old_pods_names, new_pods_names):
+            raise sol_ex.DbSyncNoDiff(
+                "There are no differences in Vnfc resources.")
 
     def sync_db(self, context, vnf_instance, vim_info):
         self.diff_check_and_update_vnfc(vnf_instance, vim_info)
@@ -60,9 +60,15 @@ class CommonResource:
     def delete(self, body):
         pass
 
-    def is_exists(self):
+    def is_exists(self, info=None):
+        """Check if the resource exists
+
+        info is the object got from k8s (ex. by watch). It is read from k8s
+        if not specified.
+        """
         try:
-            info = self.read()
+            if info is None:
+                info = self.read()
             if info is None:
                 # resource not exists
                 return False
@@ -309,12 +315,12 @@ class Pod(NamespacedResource):
         self.k8s_client.create_namespaced_pod(
             namespace=self.namespace, body=create_info)
 
-    def is_ready(self):
-        pod_info = self.read()
+    def is_ready(self, info=None):
+        pod_info = info or self.read()
         return pod_info.status.phase and pod_info.status.phase == 'Running'
 
-    def is_update(self, pods_info, old_pods_names):
-        return self.is_ready()
+    def is_update(self, pods_info, old_pods_names, info=None):
+        return self.is_ready(info)
 
 
 class PodTemplate(NamespacedResource):
@@ -384,14 +390,14 @@ class ControllerRevision(NamespacedResource):
 class DaemonSet(NamespacedResource):
     api_class = client.AppsV1Api
 
-    def is_ready(self):
-        daemonset_info = self.read()
+    def is_ready(self, info=None):
+        daemonset_info = info or self.read()
         return (daemonset_info.status.desired_number_scheduled and
                 (daemonset_info.status.desired_number_scheduled ==
                  daemonset_info.status.number_ready))
 
-    def is_update(self, pods_info, old_pods_names):
-        daemonset_info = self.read()
+    def is_update(self, pods_info, old_pods_names, info=None):
+        daemonset_info = info or self.read()
         replicas = daemonset_info.status.desired_number_scheduled
 
         for pod_info in pods_info:
@@ -404,14 +410,14 @@ class DaemonSet(NamespacedResource):
 class Deployment(NamespacedResource):
     api_class = client.AppsV1Api
 
-    def is_ready(self):
-        deployment_info = self.read()
+    def is_ready(self, info=None):
+        deployment_info = info or self.read()
         return (deployment_info.status.replicas and
                 (deployment_info.status.replicas ==
                  deployment_info.status.ready_replicas))
 
-    def is_update(self, pods_info, old_pods_names):
-        deployment_info = self.read()
+    def is_update(self, pods_info, old_pods_names, info=None):
+        deployment_info = info or self.read()
         replicas = deployment_info.spec.replicas
 
         for pod_info in pods_info:
@@ -424,14 +430,14 @@ class Deployment(NamespacedResource):
 class ReplicaSet(NamespacedResource):
     api_class = client.AppsV1Api
 
-    def is_ready(self):
-        replicaset_info = self.read()
+    def is_ready(self, info=None):
+        replicaset_info = info or self.read()
         return (replicaset_info.status.replicas and
                 (replicaset_info.status.replicas ==
                  replicaset_info.status.ready_replicas))
 
-    def is_update(self, pods_info, old_pods_names):
-        replicaset_info = self.read()
+    def is_update(self, pods_info, old_pods_names, info=None):
+        replicaset_info = info or self.read()
         replicas = replicaset_info.spec.replicas
         for pod_info in pods_info:
             if pod_info.metadata.name in old_pods_names:
@@ -490,8 +496,8 @@ class StatefulSet(NamespacedResource):
             raise sol_ex.K8sOperationFailed(sol_title=sol_title,
                                             sol_detail=str(ex))
 
-    def is_ready(self):
-        statefulset_info = self.read()
+    def is_ready(self, info=None):
+        statefulset_info = info or self.read()
         replicas = statefulset_info.status.replicas
         if replicas == statefulset_info.status.ready_replicas:
             volume_claim_templates = (
@@ -513,8 +519,8 @@ class StatefulSet(NamespacedResource):
         else:
             return False
 
-    def is_update(self, pods_info, old_pods_names):
-        statefulset_info = self.read()
+    def is_update(self, pods_info, old_pods_names, info=None):
+        statefulset_info = info or self.read()
         replicas = statefulset_info.spec.replicas
 
         for pod_info in pods_info:
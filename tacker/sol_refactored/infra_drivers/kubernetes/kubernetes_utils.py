@@ -13,16 +13,25 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import atexit
+import base64
+import collections
+import hashlib
 import os
 import re
+import shutil
 import tempfile
+import threading
+import time
 from urllib.parse import urlparse
 import urllib.request as urllib2
 
 from kubernetes import client
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 import yaml
 
+from tacker.sol_refactored.common import config
 from tacker.sol_refactored.common import exceptions as sol_ex
 from tacker.sol_refactored.common import oidc_utils
 from tacker.sol_refactored.infra_drivers.kubernetes import helm_utils
@@ -31,6 +40,8 @@ from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_resource
 
 LOG = logging.getLogger(__name__)
 
+CONF = config.CONF
+
 SUPPORTED_NAMESPACE_KIND = {
     "Binding",
     "ConfigMap",
@@ -126,69 +137,220 @@ def list_namespaced_pods(k8s_api_client, namespace, isall=False):
     return [pod for pod in all_pods if pod.status.phase == 'Running']
 
 
+def _format_ca_cert(ca_cert_str):
+    ca_cert = re.sub(r'\s', '\n', ca_cert_str)
+    ca_cert = re.sub(r'BEGIN\nCERT', r'BEGIN CERT', ca_cert)
+    ca_cert = re.sub(r'END\nCERT', r'END CERT', ca_cert)
+    return ca_cert
+
+
+def _get_token_expiry(id_token):
+    # NOTE: the token is not verified here. it is only used to know when
+    # the token should be refreshed. the API server verifies it.
+    try:
+        payload = id_token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        return float(jsonutils.loads(
+            base64.urlsafe_b64decode(payload))['exp'])
+    except Exception:
+        LOG.debug("Expiry of the id token is unknown.")
+        return None
+
+
+def _create_k8s_api_client(vim_info, ca_cert_file):
+    """Create a k8s API client
+
+    Return the client and the expiry time of its token (None if the
+    token does not expire).
+    """
+    k8s_config = client.Configuration()
+    k8s_config.host = vim_info.interfaceInfo['endpoint']
+    expires_at = None
+
+    if 'oidc_token_url' in vim_info.accessInfo:
+        # Obtain a openid token from openid provider
+        id_token = oidc_utils.get_id_token_with_password_grant(
+            vim_info.accessInfo.get('oidc_token_url'),
+            vim_info.accessInfo.get('username'),
+            vim_info.accessInfo.get('password'),
+            vim_info.accessInfo.get('client_id'),
+            client_secret=vim_info.accessInfo.get('client_secret'),
+            ssl_ca_cert=ca_cert_file
+        )
+        k8s_config.api_key_prefix['authorization'] = 'Bearer'
+        k8s_config.api_key['authorization'] = id_token
+        expires_at = _get_token_expiry(id_token)
+        if expires_at is None:
+            expires_at = (time.time() +
+                          CONF.v2_vnfm.kubernetes_client_token_ttl)
+    else:
+        if ('username' in vim_info.accessInfo and
+                vim_info.accessInfo.get('password') is not None):
+            k8s_config.username = vim_info.accessInfo['username']
+            k8s_config.password = vim_info.accessInfo['password']
+            basic_token = k8s_config.get_basic_auth_token()
+            k8s_config.api_key['authorization'] = basic_token
+
+        if 'bearer_token' in vim_info.accessInfo:
+            k8s_config.api_key_prefix['authorization'] = 'Bearer'
+            k8s_config.api_key['authorization'] = vim_info.accessInfo[
+                'bearer_token']
+
+    if ca_cert_file:
+        k8s_config.ssl_ca_cert = ca_cert_file
+        k8s_config.verify_ssl = True
+    else:
+        k8s_config.verify_ssl = False
+
+    return client.api_client.ApiClient(configuration=k8s_config), expires_at
+
+
+class _PooledClient(object):
+
+    def __init__(self, api_client, expires_at):
+        self.api_client = api_client
+        self.expires_at = expires_at
+
+    def is_valid(self, now):
+        # NOTE: refresh the token a bit earlier than its expiry so that it
+        # does not expire during an operation as much as possible.
+        return (self.expires_at is None or
+                now < self.expires_at -
+                CONF.v2_vnfm.kubernetes_client_token_refresh_margin)
+
+
+class K8sApiClientPool(object):
+    """Pool of k8s API clients per VIM
+
+    A k8s API client (i.e. its connections to the API server and its
+    token) is reused by the operations for the same VIM. The OIDC token
+    is got again when it is about to expire.
+
+    The key of the pool is the hash of the contents of the VIM connection
+    info, so a client is not used any more after the VIM is updated. It is
+    dropped from the pool in LRU order. CA certificate files are shared by
+    the clients which have the same certificate.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # {key: _PooledClient}
+        self.clients = collections.OrderedDict()
+        # {hash of ca cert: file path}
+        self.ca_cert_files = {}
+        self.ca_cert_dir = None
+
+    def _get_key(self, vim_info):
+        interface_info = vim_info.get('interfaceInfo', {})
+        data = {
+            'endpoint': interface_info.get('endpoint'),
+            'ssl_ca_cert': interface_info.get('ssl_ca_cert'),
+            'accessInfo': vim_info.get('accessInfo', {})
+        }
+        return hashlib.sha256(
+            jsonutils.dump_as_bytes(data, sort_keys=True)).hexdigest()
+
+    def get_ca_cert_file(self, ca_cert_str):
+        """Return the path of the file of the CA certificate
+
+        The file is shared and must not be removed by the caller.
+        """
+        ca_cert = _format_ca_cert(ca_cert_str)
+        cert_hash = hashlib.sha256(ca_cert.encode()).hexdigest()
+        with self.lock:
+            path = self.ca_cert_files.get(cert_hash)
+            if path is not None and os.path.exists(path):
+                return path
+            if self.ca_cert_dir is None:
+                self.ca_cert_dir = tempfile.mkdtemp(prefix='tacker-k8s-ca-')
+                atexit.register(shutil.rmtree, self.ca_cert_dir, True)
+            path = os.path.join(self.ca_cert_dir, cert_hash + '.pem')
+            # NOTE: written to another file and renamed so that a
+            # partially written file is not seen by others.
+            fd, tmp_path = tempfile.mkstemp(dir=self.ca_cert_dir)
+            os.write(fd, ca_cert.encode())
+            os.close(fd)
+            os.rename(tmp_path, path)
+            self.ca_cert_files[cert_hash] = path
+            return path
+
+    def get(self, vim_info):
+        key = self._get_key(vim_info)
+        with self.lock:
+            pooled = self.clients.get(key)
+            if pooled is not None and pooled.is_valid(time.time()):
+                self.clients.move_to_end(key)
+                return pooled.api_client
+
+        # NOTE: a client is created out of the lock since it may take time
+        # to get a token.
+        ca_cert_file = None
+        if 'ssl_ca_cert' in vim_info.interfaceInfo:
+            ca_cert_file = self.get_ca_cert_file(
+                vim_info.interfaceInfo['ssl_ca_cert'])
+        api_client, expires_at = _create_k8s_api_client(vim_info,
+                                                        ca_cert_file)
+        with self.lock:
+            self.clients[key] = _PooledClient(api_client, expires_at)
+            self.clients.move_to_end(key)
+            while len(self.clients) > CONF.v2_vnfm.kubernetes_client_pool_size:
+                # NOTE: the dropped client is not closed explicitly since
+                # it may be still used by an operation.
+                self.clients.popitem(last=False)
+        return api_client
+
+    def invalidate(self, vim_info=None):
+        """Drop the client of the VIM or all clients if not specified"""
+        with self.lock:
+            if vim_info is None:
+                self.clients.clear()
+            else:
+                self.clients.pop(self._get_key(vim_info), None)
+
+
+K8S_API_CLIENT_POOL = K8sApiClientPool()
+
+
 class AuthContextManager:
     def __init__(self, vim_info):
         self.vim_info = vim_info
         self.ca_cert_file = None
+        self.shared_ca_cert_file = False
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        if self.ca_cert_file:
+        if self.ca_cert_file and not self.shared_ca_cert_file:
             os.remove(self.ca_cert_file)
 
+    def _use_pool(self):
+        return CONF.v2_vnfm.kubernetes_client_pool_size > 0
+
     def _create_ca_cert_file(self, ca_cert_str):
         if self.ca_cert_file:
             return
+        if self._use_pool():
+            self.ca_cert_file = K8S_API_CLIENT_POOL.get_ca_cert_file(
+                ca_cert_str)
+            self.shared_ca_cert_file = True
+            return
         file_descriptor, self.ca_cert_file = tempfile.mkstemp()
-        ca_cert = re.sub(r'\s', '\n', ca_cert_str)
-        ca_cert = re.sub(r'BEGIN\nCERT', r'BEGIN CERT', ca_cert)
-        ca_cert = re.sub(r'END\nCERT', r'END CERT', ca_cert)
+        ca_cert = _format_ca_cert(ca_cert_str)
         # write ca cert file
         os.write(file_descriptor, ca_cert.encode())
         os.close(file_descriptor)
 
     def init_k8s_api_client(self):
-        k8s_config = client.Configuration()
-        k8s_config.host = self.vim_info.interfaceInfo['endpoint']
+        if self._use_pool():
+            return K8S_API_CLIENT_POOL.get(self.vim_info)
 
         if 'ssl_ca_cert' in self.vim_info.interfaceInfo:
             self._create_ca_cert_file(
                 self.vim_info.interfaceInfo['ssl_ca_cert'])
-
-        if 'oidc_token_url' in self.vim_info.accessInfo:
-            # Obtain a openid token from openid provider
-            id_token = oidc_utils.get_id_token_with_password_grant(
-                self.vim_info.accessInfo.get('oidc_token_url'),
-                self.vim_info.accessInfo.get('username'),
-                self.vim_info.accessInfo.get('password'),
-                self.vim_info.accessInfo.get('client_id'),
-                client_secret=self.vim_info.accessInfo.get('client_secret'),
-                ssl_ca_cert=self.ca_cert_file
-            )
-            k8s_config.api_key_prefix['authorization'] = 'Bearer'
-            k8s_config.api_key['authorization'] = id_token
-        else:
-            if ('username' in self.vim_info.accessInfo and
-                    self.vim_info.accessInfo.get('password') is not None):
-                k8s_config.username = self.vim_info.accessInfo['username']
-                k8s_config.password = self.vim_info.accessInfo['password']
-                basic_token = k8s_config.get_basic_auth_token()
-                k8s_config.api_key['authorization'] = basic_token
-
-            if 'bearer_token' in self.vim_info.accessInfo:
-                k8s_config.api_key_prefix['authorization'] = 'Bearer'
-                k8s_config.api_key['authorization'] = self.vim_info.accessInfo[
-                    'bearer_token']
-
-        if self.ca_cert_file:
-            k8s_config.ssl_ca_cert = self.ca_cert_file
-            k8s_config.verify_ssl = True
-        else:
-            k8s_config.verify_ssl = False
-
-        return client.api_client.ApiClient(configuration=k8s_config)
+        api_client, _ = _create_k8s_api_client(self.vim_info,
+                                               self.ca_cert_file)
+        return api_client
 
     def _get_helm_auth_params(self):
         kube_apiserver = self.vim_info.interfaceInfo['endpoint']
@@ -201,5 +363,8 @@ class AuthContextManager:
 
         return helm_auth_params
 
-    def init_helm_client(self):
-        return helm_utils.HelmClient(self._get_helm_auth_params())
+    def init_helm_client(self, k8s_api_client=None):
+        # NOTE: if k8s_api_client is specified, it is used to read helm
+        # releases instead of the helm command.
+        return helm_utils.HelmClient(self._get_helm_auth_params(),
+                                     k8s_api_client)
@@ -0,0 +1,182 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from kubernetes import client
+from kubernetes import watch
+from oslo_log import log as logging
+
+from tacker.sol_refactored.common import config
+from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_resource
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = config.CONF
+
+# NOTE: kinds whose state is tracked by watch. The other kinds are checked
+# by polling since they are few and become ready soon in general.
+WATCH_KIND = {'Pod', 'Deployment', 'ReplicaSet', 'DaemonSet', 'StatefulSet'}
+
+# NOTE: a watch request is re-issued (resumed from the last
+# resourceVersion) at this interval so that it does not hang on a broken
+# connection and stops soon after the tracker is stopped.
+WATCH_TIMEOUT = 30
+
+HTTP_STATUS_GONE = 410
+
+
+class _KindWatch(object):
+    """Keep the latest objects of a kind in a namespace by watch"""
+
+    def __init__(self, tracker, k8s_api_client, kind, namespace):
+        self.tracker = tracker
+        self.kind = kind
+        self.namespace = namespace
+        api_class = getattr(kubernetes_resource, kind).api_class
+        self.list_func = getattr(
+            api_class(api_client=k8s_api_client),
+            'list_namespaced' + kubernetes_resource.convert(kind))
+        self.watch = watch.Watch()
+        # {name: object}
+        self.objects = {}
+        # NOTE: objects are valid only while synced is True.
+        self.synced = False
+
+    def _list(self):
+        resp = self.list_func(namespace=self.namespace)
+        with self.tracker.cond:
+            self.objects = {obj.metadata.name: obj for obj in resp.items}
+            self.synced = True
+            self.tracker.changed()
+        return resp.metadata.resource_version
+
+    def _broken(self, ex):
+        # NOTE: the waiters fall back to polling.
+        LOG.warning("Watch of %s in %s is not available: %s", self.kind,
+                    self.namespace, ex)
+        with self.tracker.cond:
+            self.synced = False
+            self.tracker.changed()
+
+    def start(self):
+        # NOTE: the first list is done synchronously so that the objects
+        # are available just after the tracker is started.
+        try:
+            resource_version = self._list()
+        except Exception as ex:
+            self._broken(ex)
+            return
+        thread = threading.Thread(target=self._run,
+                                  args=(resource_version,), daemon=True)
+        thread.start()
+
+    def _run(self, resource_version):
+        try:
+            while not self.tracker.stopped:
+                try:
+                    for event in self.watch.stream(
+                            self.list_func, namespace=self.namespace,
+                            resource_version=resource_version,
+                            timeout_seconds=WATCH_TIMEOUT):
+                        self._handle_event(event)
+                        if self.tracker.stopped:
+                            break
+                    if self.watch.resource_version is not None:
+                        resource_version = self.watch.resource_version
+                except client.ApiException as ex:
+                    if ex.status != HTTP_STATUS_GONE:
+                        raise
+                    # resourceVersion is too old. list again.
+                    LOG.debug("Watch of %s in %s expired. list again.",
+                              self.kind, self.namespace)
+                    resource_version = self._list()
+        except Exception as ex:
+            self._broken(ex)
+
+    def _handle_event(self, event):
+        obj = event['object']
+        with self.tracker.cond:
+            if event['type'] in ('ADDED', 'MODIFIED'):
+                self.objects[obj.metadata.name] = obj
+            elif event['type'] == 'DELETED':
+                self.objects.pop(obj.metadata.name, None)
+            else:
+                # BOOKMARK etc.
+                return
+            self.tracker.changed()
+
+
+class ResourceTracker(object):
+    """Track the state of k8s resources by watch
+
+    Only one watch is made per namespace and kind, and it is shared by
+    all resources of the kind in the namespace. A watch is resumed from the
+    last resourceVersion when it is expired. While the watch is not
+    available (i.e. listing failed or the watch is broken), the resources
+    of the kind should be checked by polling.
+
+    Usage:
+        with ResourceTracker(k8s_api_client, [(namespace, kind), ...]) as t:
+            while True:
+                seq = t.seq
+                (check resources using t.is_watched and t.get)
+                t.wait(seq, timeout)
+    """
+
+    def __init__(self, k8s_api_client, keys):
+        self.cond = threading.Condition()
+        self.seq = 0
+        self.stopped = False
+        self.watches = {}
+        for namespace, kind in keys:
+            if kind in WATCH_KIND and namespace is not None:
+                self.watches[(namespace, kind)] = _KindWatch(
+                    self, k8s_api_client, kind, namespace)
+
+    def __enter__(self):
+        for kind_watch in self.watches.values():
+            kind_watch.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        with self.cond:
+            self.stopped = True
+        for kind_watch in self.watches.values():
+            kind_watch.watch.stop()
+
+    def changed(self):
+        # NOTE: must be called with self.cond held.
+        self.seq += 1
+        self.cond.notify_all()
+
+    def is_watched(self, namespace, kind):
+        kind_watch = self.watches.get((namespace, kind))
+        return kind_watch is not None and kind_watch.synced
+
+    def get(self, namespace, kind, name):
+        """Return the latest object or None if it does not exist"""
+        with self.cond:
+            return self.watches[(namespace, kind)].objects.get(name)
+
+    def list(self, namespace, kind):
+        with self.cond:
+            return list(self.watches[(namespace, kind)].objects.values())
+
+    def wait(self, seq, timeout):
+        """Wait for a change after seq is got up to timeout seconds"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.seq != seq, timeout=timeout)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import random
+
 from oslo_log import log as logging
 from oslo_service import loopingcall
 
@@ -25,7 +27,7 @@ LOG = logging.getLogger(__name__)
 
 CONF = config.CONF
 
-CHECK_INTERVAL = 5
+CHECK_INTERVAL_JITTER = 0.2
 
 
 class HeatClient(object):
@@ -126,34 +128,119 @@ class HeatClient(object):
 
         return body['resources']
 
+    def get_events(self, stack_name, marker=None):
+        path = f"stacks/{stack_name}/events?sort_dir=asc"
+        if marker is not None:
+            path += f"&marker={marker}"
+        resp, body = self.client.do_request(path, "GET",
+                expected_status=[200, 404])
+
+        if resp.status_code == 404:
+            return None
+
+        return body['events']
+
+    def get_last_event_id(self, stack_name):
+        path = f"stacks/{stack_name}/events?sort_dir=desc&limit=1"
+        resp, body = self.client.do_request(path, "GET",
+                expected_status=[200, 404])
+
+        if resp.status_code == 404 or not body['events']:
+            return None
+
+        return body['events'][0]['id']
+
     def _wait_completion(self, stack_name, operation, complete_status,
             progress_status, failed_status):
         # NOTE: timeout is specified for each stack operation. so it is
         # not forever loop.
+        # NOTE: the status of the stack is checked only when an event of
+        # the stack itself occurs or the check interval reaches the max.
+        # Otherwise only new events are got and the check interval is
+        # doubled while no event occurs. It reduces the number of requests
+        # to heat and detects the completion soon.
+        short_name = stack_name.split('/')[0]
+        min_interval = CONF.v2_vnfm.heat_check_interval_min
+        max_interval = max(CONF.v2_vnfm.heat_check_interval_max,
+                           min_interval)
+        state = {'marker': None, 'interval': min_interval,
+                 'no_events': False}
+
+        def _fall_back(ex):
+            # NOTE: events API may not be available. fall back to
+            # checking the status only.
+            LOG.warning("Get events of %s failed. %s", short_name, ex)
+            state['no_events'] = True
+
         def _check_status():
             status, status_reason = self.get_status(stack_name)
             if status in complete_status:
-                LOG.info("%s %s done.", operation, stack_name.split('/')[0])
+                LOG.info("%s %s done.", operation, short_name)
                 raise loopingcall.LoopingCallDone()
             elif status in failed_status:
                 if (status == "ROLLBACK_COMPLETE"
                         or status == "ROLLBACK_FAILED"):
                     status_reason = self.get_original_failed_reason(stack_name)
-                LOG.error("%s %s failed.", operation, stack_name.split('/')[0])
+                LOG.error("%s %s failed.", operation, short_name)
                 sol_title = "%s failed" % operation
                 raise sol_ex.StackOperationFailed(sol_title=sol_title,
                                                   sol_detail=status_reason)
             elif status not in progress_status:
                 LOG.error("%s %s failed. status: %s", operation,
-                          stack_name.split('/')[0], status)
+                          short_name, status)
                 sol_title = "%s failed" % operation
                 raise sol_ex.StackOperationFailed(sol_title=sol_title,
                                                   sol_detail='Unknown error')
-            LOG.debug("%s %s %s", operation, stack_name.split('/')[0],
-                      progress_status)
-
-        timer = loopingcall.FixedIntervalLoopingCall(_check_status)
-        timer.start(interval=CHECK_INTERVAL).wait()
+            LOG.debug("%s %s %s", operation, short_name, progress_status)
+
+        def _check_events():
+            # return True if it is necessary to check the status
+            if state['no_events']:
+                return True
+            try:
+                events = self.get_events(stack_name, state['marker'])
+            except sol_ex.SolException as ex:
+                _fall_back(ex)
+                return True
+            if events is None:
+                # the stack is not found (ex. deleted).
+                return True
+            if not events:
+                return False
+            for event in events:
+                LOG.debug("%s %s: %s %s %s", operation, short_name,
+                          event['resource_name'], event['resource_status'],
+                          event.get('resource_status_reason'))
+            state['marker'] = events[-1]['id']
+            return any(event['resource_name'] == short_name
+                       for event in events)
+
+        def _check():
+            at_max = state['interval'] >= max_interval
+            marker = state['marker']
+            if _check_events() or at_max:
+                _check_status()
+            if state['marker'] != marker:
+                # NOTE: something is going on. check again soon.
+                state['interval'] = min_interval
+            else:
+                state['interval'] = min(state['interval'] * 2, max_interval)
+            return state['interval'] * random.uniform(
+                1 - CHECK_INTERVAL_JITTER, 1 + CHECK_INTERVAL_JITTER)
+
+        try:
+            state['marker'] = self.get_last_event_id(stack_name)
+        except sol_ex.SolException as ex:
+            _fall_back(ex)
+
+        # check the status first since the operation may already finish.
+        try:
+            _check_status()
+        except loopingcall.LoopingCallDone:
+            return
+
+        timer = loopingcall.DynamicLoopingCall(_check)
+        timer.start(initial_delay=min_interval).wait()
 
     def wait_stack_create(self, stack_name):
         if CONF.v2_vnfm.enable_rollback_stack:
@@ -13,8 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_concurrency import lockutils
 from oslo_log import log as logging
 
+from tacker.common import csar_utils
 from tacker.common import exceptions
 from tacker.objects import vnf_package_vnfd
 from tacker.sol_refactored.common import config
@@ -23,16 +25,27 @@ from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
 from tacker.sol_refactored import objects
 from tacker.sol_refactored.objects.v2 import fields as v2fields
 
+import hashlib
 import json
 import os
 import shutil
 import subprocess
 import tacker.conf
+import tempfile
 
 LOG = logging.getLogger(__name__)
 
 CONF = config.CONF
 
+TF_PLUGIN_CACHE_DIR = '.plugin-cache'
+TF_PLAN_FILE = 'tacker.tfplan'
+
+# NOTE: files written in a working directory by terraform or this driver.
+# They are kept on change_vnfpkg and never hard linked.
+TF_LOCAL_FILES = ['.terraform', '.terraform.lock.hcl', 'terraform.tfstate',
+                  'terraform.tfstate.backup', 'provider.tf',
+                  'provider.tf.json', TF_PLAN_FILE]
+
 
 class Terraform():
     '''Implements Terraform in Tacker'''
@@ -60,17 +73,50 @@ class Terraform():
 
         access_info = vim_conn_info.get('accessInfo', {})
 
+        self._init(working_dir)
+        self._plan_and_apply(access_info, working_dir, tf_var_path)
+
+    def _init(self, working_dir, upgrade=False):
+        '''Executes terraform init with the shared plugin cache'''
+
         init_cmd = ['terraform', 'init']
-        self._exec_cmd(init_cmd, cwd=working_dir)
+        if upgrade:
+            init_cmd.append('-upgrade')
+        plugin_cache_dir = self._get_plugin_cache_dir()
+        # NOTE: the plugin cache is not safe for concurrent terraform init.
+        with lockutils.lock('terraform-plugin-cache', external=True,
+                            lock_path=plugin_cache_dir):
+            self._exec_cmd(init_cmd, cwd=working_dir)
         LOG.info("Terraform init completed successfully.")
 
-        plan_cmd = self._gen_plan_cmd(access_info, tf_var_path)
-        self._exec_cmd(plan_cmd, cwd=working_dir)
-        LOG.info("Terraform plan completed successfully.")
+    def _plan_and_apply(self, access_info, working_dir, tf_var_path):
+        '''Executes terraform plan and terraform apply'''
+
+        if not CONF.v2_vnfm.tf_reuse_plan:
+            plan_cmd = self._gen_plan_cmd(access_info, tf_var_path)
+            self._exec_cmd(plan_cmd, cwd=working_dir)
+            LOG.info("Terraform plan completed successfully.")
 
-        apply_cmd = self._gen_apply_cmd(access_info, tf_var_path)
-        self._exec_cmd(apply_cmd, cwd=working_dir)
-        LOG.info("Terraform apply completed successfully.")
+            apply_cmd = self._gen_apply_cmd(access_info, tf_var_path)
+            self._exec_cmd(apply_cmd, cwd=working_dir)
+            LOG.info("Terraform apply completed successfully.")
+            return
+
+        plan_file = os.path.join(working_dir, TF_PLAN_FILE)
+        plan_cmd = self._gen_plan_cmd(access_info, tf_var_path,
+                                      extra_args=['-out', TF_PLAN_FILE])
+        try:
+            self._exec_cmd(plan_cmd, cwd=working_dir)
+            LOG.info("Terraform plan completed successfully.")
+
+            # NOTE: variables are included in the saved plan.
+            apply_cmd = ['terraform', 'apply', '-auto-approve', TF_PLAN_FILE]
+            self._exec_cmd(apply_cmd, cwd=working_dir)
+            LOG.info("Terraform apply completed successfully.")
+        finally:
+            # NOTE: the saved plan includes credentials of the VIM.
+            if os.path.exists(plan_file):
+                os.remove(plan_file)
 
     def terminate(self, req, inst, grant_req, grant, vnfd):
         '''Terminates the terraform resources managed by the current project'''
@@ -139,8 +185,7 @@ class Terraform():
                                       vnfd_id, tf_dir_path, tf_var_path):
         '''Calls Terraform Apply'''
 
-        excluded_files = ['.terraform', '.terraform.lock.hcl',
-                  'terraform.tfstate', 'provider.tf', 'provider.tf.json']
+        excluded_files = TF_LOCAL_FILES
 
         # Delete old files (e.g main.tf, variables.tf, modules)
         for root, dirs, files in os.walk(working_dir):
@@ -161,38 +206,24 @@ class Terraform():
                 context, vnfd_id)
         except exceptions.VnfPackageVnfdNotFound as exc:
             raise sol_ex.VnfdIdNotFound(vnfd_id=vnfd_id) from exc
-        csar_path = os.path.join(CONF.vnf_package.vnf_package_csar_path,
-                                pkg_vnfd.package_uuid)
-        if tf_dir_path is not None:
-            vnf_package_path = f"{csar_path}/{tf_dir_path}"
-        else:
-            vnf_package_path = csar_path
+        vnf_package_path = self._get_tf_template(pkg_vnfd.package_uuid,
+                                                 tf_dir_path)
 
-        # Copy files from new VNF Package
+        # Link files from new VNF Package
         for file_name in os.listdir(vnf_package_path):
             if file_name not in excluded_files:
                 source_path = os.path.join(vnf_package_path, file_name)
-                if os.path.exists(source_path):
-                    if os.path.isfile(source_path):
-                        shutil.copy2(source_path, working_dir)
-                    elif os.path.isdir(source_path):
-                        destination_dir = os.path.join(working_dir, file_name)
-                        shutil.copytree(source_path, destination_dir,
-                                        dirs_exist_ok=True)
+                if os.path.isfile(source_path):
+                    self._link_file(source_path,
+                                    os.path.join(working_dir, file_name))
+                elif os.path.isdir(source_path):
+                    destination_dir = os.path.join(working_dir, file_name)
+                    self._link_tree(source_path, destination_dir)
 
         access_info = vim_conn_info.get('accessInfo', {})
 
-        init_cmd = ['terraform', 'init', '-upgrade']
-        self._exec_cmd(init_cmd, cwd=working_dir)
-        LOG.info("Terraform init completed successfully.")
-
-        plan_cmd = self._gen_plan_cmd(access_info, tf_var_path)
-        self._exec_cmd(plan_cmd, cwd=working_dir)
-        LOG.info("Terraform plan completed successfully.")
-
-        apply_cmd = self._gen_apply_cmd(access_info, tf_var_path)
-        self._exec_cmd(apply_cmd, cwd=working_dir)
-        LOG.info("Terraform apply completed successfully.")
+        self._init(working_dir, upgrade=True)
+        self._plan_and_apply(access_info, working_dir, tf_var_path)
 
     def change_vnfpkg_rollback(self, req, inst, grant_req, grant, vnfd):
         '''Calls _change_vnfpkg_rolling_update function'''
@@ -299,19 +330,79 @@ class Terraform():
                 context, vnfd_id)
         except exceptions.VnfPackageVnfdNotFound as exc:
             raise sol_ex.VnfdIdNotFound(vnfd_id=vnfd_id) from exc
-        csar_path = os.path.join(CONF.vnf_package.vnf_package_csar_path,
-                                 pkg_vnfd.package_uuid)
+        vnf_package_path = self._get_tf_template(pkg_vnfd.package_uuid,
+                                                 tf_dir_path)
 
-        # Assemble paths and copy recursively
-        vnf_package_path = f"{csar_path}/{tf_dir_path}"
+        # Assemble paths and link recursively
         new_tf_dir_path = f"{CONF.v2_vnfm.tf_file_dir}/{vnf_instance_id}"
         os.makedirs(new_tf_dir_path, exist_ok=True)
         # NOTE: the creation of the directory /var/lib/tacker/terraform
         # should be completed during the installation of Tacker.
-        shutil.copytree(vnf_package_path, new_tf_dir_path, dirs_exist_ok=True)
+        self._link_tree(vnf_package_path, new_tf_dir_path)
 
         return new_tf_dir_path
 
+    def _get_tf_template(self, package_uuid, tf_dir_path):
+        """Return the template directory of the terraform files
+
+        The terraform files of a VNF package are copied into tf_file_dir
+        only at the first time so that working directories can be made of
+        hard links to them. The contents of a VNF package are never changed
+        once it is onboarded.
+
+        Each pair of a VNF package and tf_dir_path has its own template
+        directory so that a template is never nested in another one, i.e.
+        the existence of the directory means the template is complete.
+        The templates of a VNF package are removed with the package.
+        """
+        csar_path = os.path.join(CONF.vnf_package.vnf_package_csar_path,
+                                 package_uuid)
+        if tf_dir_path is not None:
+            csar_path = f"{csar_path}/{tf_dir_path}"
+        tf_dir_key = hashlib.sha256(
+            os.path.normpath(tf_dir_path or '.').encode()).hexdigest()
+        template_path = os.path.join(
+            csar_utils.get_tf_template_path(package_uuid), tf_dir_key)
+        if os.path.isdir(template_path):
+            return template_path
+
+        # NOTE: copy to a temporary directory and rename it so that a
+        # partially copied template is never used by other operations.
+        parent_dir = os.path.dirname(template_path)
+        os.makedirs(parent_dir, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=parent_dir)
+        shutil.copytree(csar_path, tmp_path, dirs_exist_ok=True)
+        try:
+            os.rename(tmp_path, template_path)
+        except OSError:
+            # made by another operation at the same time
+            shutil.rmtree(tmp_path)
+        return template_path
+
+    def _link_file(self, src, dst):
+        if os.path.basename(src) in TF_LOCAL_FILES:
+            # NOTE: they may be rewritten in place.
+            return shutil.copy2(src, dst)
+        if os.path.lexists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            # e.g. tf_file_dir spans file systems
+            return shutil.copy2(src, dst)
+        return dst
+
+    def _link_tree(self, src, dst):
+        shutil.copytree(src, dst, copy_function=self._link_file,
+                        dirs_exist_ok=True)
+
+    def _get_plugin_cache_dir(self):
+        plugin_cache_dir = (CONF.v2_vnfm.tf_plugin_cache_dir or
+                            os.path.join(CONF.v2_vnfm.tf_file_dir,
+                                         TF_PLUGIN_CACHE_DIR))
+        os.makedirs(plugin_cache_dir, exist_ok=True)
+        return plugin_cache_dir
+
     def _generate_provider_tf(self, vim_conn_info, main_tf_path):
         '''Creates provider.tf beside main.tf'''
 
@@ -391,8 +482,10 @@ class Terraform():
         commands used in this package. All the args other than self and cmd
         the same as for subprocess.run().
         """
+        env = dict(os.environ,
+                   TF_PLUGIN_CACHE_DIR=self._get_plugin_cache_dir())
         try:
             subprocess.run(cmd, cwd=cwd, stdout=stdout, stderr=stderr,
-                           check=check, text=text)
+                           check=check, text=text, env=env)
         except subprocess.CalledProcessError as error:
             raise sol_ex.TerraformOperationFailed(sol_detail=str(error))
@@ -170,6 +170,7 @@ class NfvoClient(object):
         csar_dir = os.path.join(self.csar_cache_dir, vnfd_id)
         if os.path.exists(csar_dir):
             self._delete_csar_dir(csar_dir)
+        vnfd_utils.VNFD_CACHE.invalidate(vnfd_id)
 
     def _delete_csar_dir(self, csar_dir):
         try:
@@ -215,13 +216,14 @@ class NfvoClient(object):
         if self.is_local:
             self.nfvo.recv_lcmocc_notification(context, lcmocc, inst)
 
-    def send_alarm_notification(self, context, alarm, inst, endpoint):
-        subscs = fm_utils.get_alarm_subscs(context, alarm, inst)
-        for subsc in subscs:
-            notif_data = alarm_utils.make_alarm_notif_data(
-                subsc, alarm, endpoint)
-            subsc_utils.send_notification(
-                subsc, notif_data, subsc_utils.NOTIFY_TYPE_FM)
+    def send_alarm_notifications(self, context, alarms, insts, endpoint):
+        for alarm, subscs in fm_utils.get_alarms_subscs(
+                context, alarms, insts):
+            for subsc in subscs:
+                notif_data = alarm_utils.make_alarm_notif_data(
+                    subsc, alarm, endpoint)
+                subsc_utils.send_notification(
+                    subsc, notif_data, subsc_utils.NOTIFY_TYPE_FM)
 
     def send_pm_job_notification(self, report, pm_job, timestamp, endpoint):
         report_object_instance_id = {entry.objectInstanceId
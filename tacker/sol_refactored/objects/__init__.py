@@ -68,6 +68,7 @@ def register_all():
     __import__(objects_root + '.v2.affected_virtual_link')
     __import__(objects_root + '.v2.affected_virtual_storage')
     __import__(objects_root + '.v2.affected_vnfc')
+    __import__(objects_root + '.v2.auto_heal_timer')
     __import__(objects_root + '.v2.cancel_mode')
     __import__(objects_root + '.v2.change_current_vnf_pkg_request')
     __import__(objects_root + '.v2.change_ext_vnf_connectivity_request')
@@ -103,6 +104,8 @@ def register_all():
     __import__(objects_root + '.v2.pm_job_criteria')
     __import__(objects_root + '.v2.pm_job_modification')
     __import__(objects_root + '.v2.pm_report')
+    __import__(objects_root + '.v2.pm_report_index')
+    __import__(objects_root + '.v2.prometheus_rule')
     __import__(objects_root + '.v2.revert_to_vnf_snapshot_request')
     __import__(objects_root + '.v2.scale_info')
     __import__(objects_root + '.v2.scale_vnf_request')
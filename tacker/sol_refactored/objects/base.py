@@ -14,17 +14,20 @@
 #    under the License.
 
 
+import base64
 import collections
 import contextlib
 import datetime
 
-from oslo_db.sqlalchemy import utils
 from oslo_log import log as logging
 import oslo_messaging as messaging
 from oslo_serialization import jsonutils
+from oslo_utils import timeutils
 from oslo_utils import versionutils
 from oslo_versionedobjects import base as ovoo_base
 from oslo_versionedobjects import exception as ovoo_exc
+from oslo_versionedobjects import fields as ovoo_fields
+import sqlalchemy as sa
 
 from tacker.db import api as db_api
 from tacker.sol_refactored.common import exceptions as sol_ex
@@ -77,6 +80,12 @@ def get_model_field(name):
     return name
 
 
+def _is_json_path_key(key):
+    # NOTE: Keys are quoted in a json path expression. Keys which can
+    # not be quoted simply are not supported.
+    return isinstance(key, str) and '"' not in key and '\\' not in key
+
+
 class TackerObjectRegistry(ovoo_base.VersionedObjectRegistry):
     notification_classes = []
     _registry = None
@@ -322,6 +331,11 @@ class TackerObjectSerializer(messaging.NoOpSerializer):
 class TackerPersistentObject(TackerObject):
     """Class for objects supposed to be to DB."""
 
+    # Sort keys of the list (i.e. get_all and get_dict_all). Pagination is
+    # done by keyset (i.e. values of the sort keys of the last object of the
+    # previous page). 'id' must be the last one to make the order stable.
+    _PAGING_KEYS = ('id',)
+
     def __init__(self, context=None, **kwargs):
         super(TackerPersistentObject, self).__init__(context, **kwargs)
         self._db_obj = None
@@ -377,17 +391,83 @@ class TackerPersistentObject(TackerObject):
             return None
         return cls.from_db_obj(result)
 
+    @classmethod
+    def get_paging_marker(cls, val):
+        """Return the opaque marker which points to the next of the val
+
+        val is an object or a dict returned by get_dict_all.
+        """
+        values = []
+        for key in cls._PAGING_KEYS:
+            v = val[key] if isinstance(val, dict) else getattr(val, key)
+            if isinstance(v, datetime.datetime):
+                v = timeutils.normalize_time(v).isoformat()
+            values.append(v)
+        marker = base64.urlsafe_b64encode(
+            jsonutils.dump_as_bytes(values)).decode()
+        # NOTE: padding is removed not to be escaped in the URL.
+        return marker.rstrip('=')
+
+    @classmethod
+    def _parse_paging_marker(cls, marker):
+        try:
+            padding = '=' * (-len(marker) % 4)
+            values = jsonutils.loads(
+                base64.urlsafe_b64decode(marker + padding))
+            if (not isinstance(values, list) or
+                    len(values) != len(cls._PAGING_KEYS)):
+                raise ValueError
+            for i, key in enumerate(cls._PAGING_KEYS):
+                if isinstance(cls.fields[key], obj_fields.DateTimeField):
+                    values[i] = timeutils.normalize_time(
+                        timeutils.parse_isotime(values[i]))
+                elif not isinstance(values[i], str):
+                    raise ValueError
+        except Exception:
+            raise sol_ex.InvalidPagingMarker(marker=marker)
+        return values
+
+    @classmethod
+    def _paginate(cls, query, model_cls, marker, limit):
+        columns = [getattr(model_cls, get_model_field(key))
+                   for key in cls._PAGING_KEYS]
+        if marker is not None:
+            values = cls._parse_paging_marker(marker)
+            # (k1, k2, ...) > (v1, v2, ...) i.e.
+            # k1 > v1 or (k1 = v1 and k2 > v2) or ...
+            conds = []
+            for i, column in enumerate(columns):
+                conds.append(sa.and_(
+                    *[columns[j] == values[j] for j in range(i)],
+                    column > values[i]))
+            query = query.filter(sa.or_(*conds))
+        query = query.order_by(*columns)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
     @classmethod
     @db_api.context_manager.reader
-    def get_all(cls, context, marker=None):
+    def get_all(cls, context, marker=None, limit=None):
         model_cls = getattr(models, cls.__name__)
         query = context.session.query(model_cls)
-        if marker is not None:
-            db_obj = query.filter(model_cls.id == marker).one_or_none()
-            if db_obj is None:
-                raise sol_ex.InvalidPagingMarker(marker=marker)
-            query = utils.paginate_query(query, model_cls, None, ['id'],
-                                         marker=db_obj)
+        query = cls._paginate(query, model_cls, marker, limit)
+        result = query.all()
+        return [cls.from_db_obj(item) for item in result]
+
+    @classmethod
+    @db_api.context_manager.reader
+    def get_all_ids(cls, context):
+        model_cls = getattr(models, cls.__name__)
+        result = context.session.query(model_cls.id).all()
+        return [item.id for item in result]
+
+    @classmethod
+    @db_api.context_manager.reader
+    def get_by_ids(cls, context, ids):
+        model_cls = getattr(models, cls.__name__)
+        query = context.session.query(model_cls).filter(
+            model_cls.id.in_(ids))
         result = query.all()
         return [cls.from_db_obj(item) for item in result]
 
@@ -399,18 +479,156 @@ class TackerPersistentObject(TackerObject):
         result = query.all()
         return [cls.from_db_obj(item) for item in result]
 
+    @classmethod
+    @db_api.context_manager.writer
+    def update_by_filter(cls, context, values, ids=None, **kwargs):
+        """Update attributes of the matched objects by one UPDATE statement
+
+        'values' is a dict of attribute names and values. The objects are
+        matched by the 'ids' (if specified) and the other keyword arguments
+        (same as get_by_filter). Returns the number of updated objects.
+        """
+        model_cls = getattr(models, cls.__name__)
+        query = context.session.query(model_cls).filter_by(**kwargs)
+        if ids is not None:
+            query = query.filter(model_cls.id.in_(ids))
+        return query.update(cls(**values).to_db_obj(),
+                            synchronize_session=False)
+
+    @classmethod
+    @db_api.context_manager.writer
+    def delete_by_filter(cls, context, ids=None, **kwargs):
+        """Delete the matched objects by one DELETE statement
+
+        The objects are matched in the same way as update_by_filter.
+        Returns the number of deleted objects.
+        """
+        model_cls = getattr(models, cls.__name__)
+        query = context.session.query(model_cls).filter_by(**kwargs)
+        if ids is not None:
+            query = query.filter(model_cls.id.in_(ids))
+        return query.delete(synchronize_session=False)
+
+    @classmethod
+    @db_api.context_manager.writer
+    def _save_all(cls, context, objs, merge=False):
+        model_cls = getattr(models, cls.__name__)
+        for obj in objs:
+            inst = model_cls()
+            inst.update(obj.to_db_obj())
+            if merge:
+                context.session.merge(inst, load=True)
+            else:
+                context.session.add(inst)
+            if obj._db_obj is None:
+                obj._db_obj = inst
+            obj.obj_reset_changes()
+
+    # NOTE: Unlike create() and update(), the following methods do not
+    # commit by themselves. The objects are flushed at once when the
+    # transaction ends, i.e. they are committed with the other changes if
+    # they are called within a transaction already begun.
+    @classmethod
+    def create_all(cls, context, objs):
+        cls._save_all(context, objs)
+
+    @classmethod
+    def update_all(cls, context, objs):
+        cls._save_all(context, objs, merge=True)
+
+    @classmethod
+    def is_json_path_filterable(cls, attr):
+        """Check if a filter on the attribute path can be done in DB.
+
+        The attribute path must go through ObjectField or
+        DictOfObjectsField (with an explicit key) and its leaf must be
+        a string field. ListOfObjectsField and KeyValuePairsField are
+        not supported since how to compare their values can not be
+        determined without looking at the data.
+        """
+        model_cls = getattr(models, cls.__name__)
+        if (len(attr) < 2 or not isinstance(attr[0], str) or
+                not hasattr(model_cls, get_model_field(attr[0]))):
+            return False
+
+        obj_cls = cls
+        path = list(attr)
+        while path:
+            name = path.pop(0)
+            field = obj_cls.fields.get(name)
+            if field is None:
+                return False
+            if isinstance(field, obj_fields.ObjectField):
+                obj_cls = cls.obj_class_from_name(field.objname, None)
+            elif isinstance(field, obj_fields.DictOfObjectsField):
+                if not path or not _is_json_path_key(path.pop(0)):
+                    return False
+                obj_cls = cls.obj_class_from_name(field.objname, None)
+            else:
+                # leaf. it must not be a top-level attribute.
+                return (not path and obj_cls is not cls and
+                        isinstance(field._type, ovoo_fields.String))
+        return False
+
+    @classmethod
+    def _get_filter_column(cls, context, model_cls, attr):
+        if isinstance(attr, str):
+            return getattr(model_cls, get_model_field(attr))
+
+        # json path. see is_json_path_filterable.
+        # NOTE: Values of ObjectField etc. are stored as a json string
+        # (i.e. double encoded). It is unquoted at first.
+        column = getattr(model_cls, get_model_field(attr[0]))
+        path = '$' + ''.join(['."%s"' % key for key in attr[1:]])
+        if context.session.bind.dialect.name == 'mysql':
+            return sa.func.json_unquote(
+                sa.func.json_extract(sa.func.json_unquote(column), path))
+        # sqlite
+        return sa.func.json_extract(
+            sa.func.json_extract(column, '$'), path)
+
+    @classmethod
+    def _get_dict_columns(cls):
+        """Return {attr: (column, is_json)} of the model
+
+        It is made once per class since it is referred for every query
+        and every row of get_dict_all.
+        """
+        # NOTE: cls.__dict__ is used not to refer the parent's one.
+        columns = cls.__dict__.get('_dict_columns')
+        if columns is None:
+            model_cls = getattr(models, cls.__name__)
+            columns = {}
+            for name in cls.fields:
+                column = getattr(model_cls, get_model_field(name), None)
+                if column is None:
+                    continue
+                columns[name] = (column, str(column.type) == 'JSON')
+            cls._dict_columns = columns
+        return columns
+
     @classmethod
     @db_api.context_manager.reader
-    def get_dict_all(cls, context, attrs, filters, limit):
+    def get_dict_all(cls, context, attrs, filters, limit, marker=None):
+        """Return dicts of the objects which include attrs only
+
+        Only the columns of attrs are got from DB and decoded. attrs
+        should be the ones which are returned to the client or used for
+        filtering after getting from DB.
+        """
         model_cls = getattr(models, cls.__name__)
-        args = []
-        for attr in attrs:
-            args.append(getattr(model_cls, get_model_field(attr)))
-        query = context.session.query(*args)
+        columns = cls._get_dict_columns()
+        # NOTE: the sort keys are necessary to make the marker of the
+        # next page.
+        attrs = list(set(attrs) | set(cls._PAGING_KEYS))
+        # NOTE: labeled by attr so that the row can be converted to the
+        # dict without renaming (ex. metadata__ -> metadata).
+        query = context.session.query(
+            *[columns[attr][0].label(attr) for attr in attrs])
         if filters:
             args = []
             for op, attr, val in filters:
-                column = getattr(model_cls, get_model_field(attr))
+                column = cls._get_filter_column(context, model_cls, attr)
                 if op == 'eq':
                     args.append(column.__eq__(val))
                 elif op == 'neq':
@@ -428,27 +646,22 @@ class TackerPersistentObject(TackerObject):
                 elif op == 'nin':
                     args.append(column.not_in(val))
             query = query.filter(*args)
-        if limit is not None:
-            query = query.limit(limit)
+        query = cls._paginate(query, model_cls, marker, limit)
         result = query.all()
-        ret = [item._asdict() for item in result]
-        json_attrs = [attr for attr in attrs
-            if str(getattr(model_cls, get_model_field(attr)).type) == 'JSON']
-        for item in ret:
-            for attr in attrs:
-                attr_ = get_model_field(attr)
-                val = item[attr_]
+        attr_types = [(attr, columns[attr][1]) for attr in attrs]
+        ret = []
+        for row in result:
+            item = {}
+            for (attr, is_json), val in zip(attr_types, row):
                 if val is None:
-                    del item[attr_]
                     continue
-                if attr != attr_:
-                    item[attr] = val
-                    del item[attr_]
                 # convert to dict if its type is JSON.
-                if attr in json_attrs and isinstance(val, str):
+                if is_json and isinstance(val, str):
                     # NOTE: It is str normally but there is a case it is
                     # already dict.
-                    item[attr] = jsonutils.loads(val)
+                    val = jsonutils.loads(val)
+                item[attr] = val
+            ret.append(item)
         return ret
 
     @classmethod
@@ -13,6 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_utils import timeutils
+
+from tacker.db import api as db_api
+from tacker.sol_refactored.db.sqlalchemy import models
 from tacker.sol_refactored.objects import base
 from tacker.sol_refactored.objects import fields
 
@@ -32,8 +36,37 @@ class PerformanceReportV2(base.TackerPersistentObject,
         'jobId': fields.StringField(nullable=False),
         'entries': fields.ListOfObjectsField(
             'VnfPmReportV2_Entries', nullable=False),
+        # NOTE: 'readyTime' attribute is not included in the original
+        #       'Report' data type definition.
+        'readyTime': fields.DateTimeField(nullable=False),
     }
 
+    _PAGING_KEYS = ('readyTime', 'id')
+
+    @classmethod
+    @db_api.context_manager.reader
+    def get_by_job(cls, context, job_id, marker=None, limit=None):
+        """Get the reports of the PM job in order of readyTime"""
+        model_cls = models.PerformanceReportV2
+        query = context.session.query(model_cls).filter_by(jobId=job_id)
+        query = cls._paginate(query, model_cls, marker, limit)
+        return [cls.from_db_obj(item) for item in query.all()]
+
+    @classmethod
+    @db_api.context_manager.reader
+    def get_ready_times(cls, context, job_id, before):
+        """Get (id, readyTime) of the reports ready before the time
+
+        The entries are not loaded. The result is in order of readyTime.
+        """
+        model_cls = models.PerformanceReportV2
+        query = context.session.query(
+            model_cls.id, model_cls.readyTime).filter(
+                model_cls.jobId == job_id,
+                model_cls.readyTime < timeutils.normalize_time(before))
+        query = query.order_by(model_cls.readyTime, model_cls.id)
+        return [(item.id, item.readyTime) for item in query.all()]
+
 
 @base.TackerObjectRegistry.register
 class VnfPmReportV2_Entries(base.TackerObject, base.TackerObjectDictCompat):
@@ -0,0 +1,37 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from tacker.sol_refactored.objects import base
+from tacker.sol_refactored.objects import fields
+
+
+# NOTE: This is a proprietary implementation of Tacker. It is the latest
+# report time per objectInstanceId, subObjectInstanceId and
+# performanceMetric of a PM job.
+@base.TackerObjectRegistry.register
+class PmReportIndexV2(base.TackerPersistentObject,
+                      base.TackerObjectDictCompat):
+
+    # Version 1.0: Initial version
+    VERSION = '1.0'
+
+    fields = {
+        'id': fields.StringField(nullable=False),
+        'jobId': fields.StringField(nullable=False),
+        'objectInstanceId': fields.StringField(nullable=False),
+        'subObjectInstanceId': fields.StringField(nullable=True),
+        'performanceMetric': fields.StringField(nullable=False),
+        'latestTimeStamp': fields.DateTimeField(nullable=False),
+    }
@@ -79,6 +79,10 @@ class VnfLcmOpOccV2(base.TackerPersistentObject,
     # Version 1.0: Initial version
     VERSION = '1.0'
 
+    # NOTE: listed in order of startTime. id is added to make the order
+    # stable since startTime is not unique.
+    _PAGING_KEYS = ('startTime', 'id')
+
     fields = {
         'id': fields.StringField(nullable=False),
         'operationState': v2fields.LcmOperationStateTypeField(nullable=False),
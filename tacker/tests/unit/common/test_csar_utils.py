@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import os
 import shutil
 import tempfile
@@ -389,6 +390,26 @@ class TestCSARUtils(testtools.TestCase):
         mock_rmtree.assert_called()
         mock_remove.assert_called()
 
+    def test_delete_csar_data_tf_template(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        for name, group, value in [
+                ('vnf_package_csar_path', 'vnf_package',
+                 os.path.join(temp_dir, 'csar')),
+                ('tf_file_dir', 'v2_vnfm', os.path.join(temp_dir, 'tf'))]:
+            csar_utils.CONF.set_override(name, value, group=group)
+            self.addCleanup(csar_utils.CONF.clear_override, name,
+                            group=group)
+        template_path = csar_utils.get_tf_template_path(constants.UUID)
+        os.makedirs(os.path.join(template_path, 'template'))
+        other_path = csar_utils.get_tf_template_path(uuid.uuid4().hex)
+        os.makedirs(other_path)
+
+        csar_utils.delete_csar_data(constants.UUID)
+        # the templates of the other packages are kept
+        self.assertFalse(os.path.exists(template_path))
+        self.assertTrue(os.path.isdir(other_path))
+
     @mock.patch('tacker.common.csar_utils.extract_csar_zip_file')
     def test_load_csar_data_without_policies(
             self, mock_extract_csar_zip_file):
@@ -483,3 +504,62 @@ class TestCSARUtils(testtools.TestCase):
         status = os.stat(extract_file_path)
         permission = oct(status.st_mode)[-3:]
         self.assertEqual('755', permission)
+
+    def _make_artifact_csar(self, artifacts):
+        dir_location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dir_location)
+        zip_file_path = os.path.join(dir_location, 'artifacts.zip')
+        with zipfile.ZipFile(zip_file_path, 'w') as zip:
+            for name, data in artifacts.items():
+                zip.writestr(name, data)
+        zfile = zipfile.ZipFile(zip_file_path)
+        self.addCleanup(zfile.close)
+        return mock.Mock(path=zip_file_path, zfile=zfile)
+
+    def _artifacts_data(self, artifacts):
+        return b'\n\n'.join(
+            (f'Source: {name}\nAlgorithm: SHA-256\nHash: {hash_code}'
+             ).encode() for name, hash_code in artifacts.items())
+
+    @mock.patch.object(csar_utils, 'HASH_CHUNK_SIZE', 4)
+    def test_convert_artifacts(self):
+        data = {'Scripts/a.sh': b'echo a' * 10, 'Scripts/b.sh': b'echo b'}
+        csar = self._make_artifact_csar(data)
+        hashes = {name: hashlib.sha256(value).hexdigest()
+                  for name, value in data.items()}
+
+        with mock.patch.object(csar.zfile, 'open',
+                               wraps=csar.zfile.open) as mock_open:
+            result = csar_utils._convert_artifacts(
+                [], self._artifacts_data(hashes), csar)
+
+        self.assertEqual(
+            [{'Source': name, 'Algorithm': 'SHA-256', 'Hash': hash_code}
+             for name, hash_code in hashes.items()], result)
+        # the opened archive is shared
+        self.assertEqual(2, mock_open.call_count)
+
+    def test_convert_artifacts_false_hash(self):
+        data = {'Scripts/a.sh': b'echo a', 'Scripts/b.sh': b'echo b'}
+        csar = self._make_artifact_csar(data)
+        hashes = {'Scripts/a.sh': hashlib.sha256(b'echo a').hexdigest(),
+                  'Scripts/b.sh': 'false-hash'}
+
+        exc = self.assertRaises(exceptions.InvalidCSAR,
+                                csar_utils._convert_artifacts,
+                                [], self._artifacts_data(hashes), csar)
+        self.assertEqual('The hash "false-hash" of artifact file '
+                         '"Scripts/b.sh" is an invalid value.',
+                         exc.format_message())
+
+    @mock.patch.object(csar_utils, '_validate_hashes')
+    def test_convert_artifacts_false_source(self, mock_validate_hashes):
+        csar = self._make_artifact_csar({'Scripts/a.sh': b'echo a'})
+
+        exc = self.assertRaises(
+            exceptions.InvalidCSAR, csar_utils._convert_artifacts,
+            [], self._artifacts_data({'Scripts/a.sh': 'x', 'none.sh': 'x'}),
+            csar)
+        self.assertIn('"none.sh"', exc.format_message())
+        # artifacts are not read if one of them is invalid
+        mock_validate_hashes.assert_not_called()
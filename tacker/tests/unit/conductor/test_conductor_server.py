@@ -40,6 +40,7 @@ from tacker.common import driver_manager
 from tacker.common import exceptions
 from tacker.common.rpc import BackingOffClient
 from tacker.conductor import conductor_server
+from tacker.conductor import notification_delivery
 import tacker.conf
 from tacker import context
 from tacker import context as t_context
@@ -3196,6 +3197,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'notificationType': 'VnfLcmOperationOccurrenceNotification'}
 
         result = self.conductor.send_notification(self.context, notification)
+        notification_delivery.NOTIFICATION_DELIVERY.wait()
 
         self.assertEqual(result, -1)
         mock_subscriptions_get.assert_called()
@@ -3246,6 +3248,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             '_links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        notification_delivery.NOTIFICATION_DELIVERY.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -3277,6 +3280,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        notification_delivery.NOTIFICATION_DELIVERY.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -3311,6 +3315,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        notification_delivery.NOTIFICATION_DELIVERY.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -3362,6 +3367,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        notification_delivery.NOTIFICATION_DELIVERY.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -3394,6 +3400,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
             'links': {}}
 
         result = self.conductor.send_notification(self.context, notification)
+        notification_delivery.NOTIFICATION_DELIVERY.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -3422,6 +3429,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
         mock_vnf_by_id.return_value = fakes.return_vnf_instance(
             fields.VnfInstanceState.INSTANTIATED)
         result = self.conductor.send_notification(self.context, notification)
+        notification_delivery.NOTIFICATION_DELIVERY.wait()
 
         self.assertEqual(result, 0)
         mock_subscriptions_get.assert_called()
@@ -3445,6 +3453,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
         mock_vnf_by_id.return_value = fakes.return_vnf_instance(
             fields.VnfInstanceState.INSTANTIATED)
         result = self.conductor.send_notification(self.context, notification)
+        notification_delivery.NOTIFICATION_DELIVERY.wait()
 
         self.assertEqual(result, -2)
         mock_subscriptions_get.assert_called()
@@ -3470,6 +3479,7 @@ class TestConductor(SqlTestCase, unit_base.FixturedTestCase):
 
         result = self.conductor.send_notification(self.context,
             notification)
+        notification_delivery.NOTIFICATION_DELIVERY.wait()
 
         # return value when timeout for POST method is 0
         self.assertEqual(result, 0)
@@ -0,0 +1,99 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+from unittest import mock
+
+from tacker import auth
+from tacker.conductor import notification_delivery
+from tacker.tests.unit import base
+
+
+SLOW_URI = 'https://slow/callback'
+FAST_URI = 'https://fast/callback'
+
+
+def _delivery(subscription_id, callback_uri, notification_id='notif'):
+    return notification_delivery.Delivery(
+        subscription_id, callback_uri, notification_id, '{}')
+
+
+class TestNotificationDeliveryEngine(base.TestCase):
+
+    def setUp(self):
+        super(TestNotificationDeliveryEngine, self).setUp()
+        # NOTE: requests_mock serializes requests, so the auth client is
+        # mocked to send requests concurrently.
+        self.responses = {}
+        self.requested = []
+        mock_client = mock.Mock()
+        mock_client.post.side_effect = self._post
+        patcher = mock.patch.object(auth.auth_manager, 'get_auth_client',
+                                    return_value=mock_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.config_fixture.config(group='vnf_lcm', retry_num=3,
+                                   retry_wait=0, notification_workers=2)
+        self.engine = notification_delivery.NotificationDeliveryEngine()
+        self.addCleanup(self.engine.wait, 10)
+
+    def _post(self, url, **kwargs):
+        self.requested.append(url)
+        status_code, event = self.responses[url]
+        if event is not None:
+            event.wait(10)
+        return mock.Mock(status_code=status_code)
+
+    def test_slow_subscriber(self):
+        release = threading.Event()
+        self.responses = {SLOW_URI: (204, release), FAST_URI: (204, None)}
+
+        self.engine.submit(_delivery('slow', SLOW_URI, 'notif1'))
+        self.engine.submit(_delivery('slow', SLOW_URI, 'notif2'))
+        self.engine.submit(_delivery('fast', FAST_URI))
+
+        # the fast subscriber is not delayed by the slow one
+        self.assertFalse(self.engine.wait(1))
+        stats = self.engine.get_stats()
+        self.assertEqual(1, stats['delivered'])
+        self.assertEqual(2, stats['pending'])
+
+        release.set()
+        self.assertTrue(self.engine.wait(10))
+        stats = self.engine.get_stats()
+        self.assertEqual(3, stats['delivered'])
+        self.assertEqual(0, stats['pending'])
+        self.assertEqual(3, stats['latency']['count'])
+
+    def test_retry(self):
+        self.config_fixture.config(group='vnf_lcm', retry_num=2,
+                                   retry_wait=1, notification_workers=1)
+        self.responses = {SLOW_URI: (400, None), FAST_URI: (204, None)}
+
+        self.engine.submit(_delivery('slow', SLOW_URI))
+        self.engine.submit(_delivery('fast', FAST_URI))
+
+        # the only worker is not blocked while waiting for the retry
+        self.assertFalse(self.engine.wait(0.5))
+        stats = self.engine.get_stats()
+        self.assertEqual(1, stats['delivered'])
+        self.assertEqual(1, stats['retries'])
+
+        self.assertTrue(self.engine.wait(10))
+        stats = self.engine.get_stats()
+        self.assertEqual(1, stats['delivered'])
+        self.assertEqual(1, stats['failed'])
+        self.assertEqual(1, stats['retries'])
+        self.assertEqual(2, self.requested.count(SLOW_URI))
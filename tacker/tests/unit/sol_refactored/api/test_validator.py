@@ -15,6 +15,7 @@
 
 from unittest import mock
 
+from tacker.api.validation import validators
 from tacker import context
 from tacker.sol_refactored.api import api_version
 from tacker.sol_refactored.api import validator
@@ -81,3 +82,33 @@ class TestValidator(base.BaseTestCase):
                 ng_ver, supported_versions)
             self.assertRaises(sol_ex.SolValidationError,
                 self._test_method, request=self.request, body=body)
+
+    @mock.patch.object(validators.jsonschema.validators, 'extend',
+                       wraps=validators.jsonschema.validators.extend)
+    def test_validator_compiled_once(self, mock_extend):
+        registry = validators._ValidatorRegistry()
+        self.patch(validators, 'VALIDATOR_REGISTRY', registry)
+
+        @validator.schema_nover(test_schema_v200)
+        def _test_method(request, body):
+            return True
+
+        body = {"vnfdId": "vnfd_id", "ProductId": "product_id"}
+        for _ in range(3):
+            self.assertTrue(_test_method(request=self.request, body=body))
+        self.assertRaises(sol_ex.SolValidationError,
+            _test_method, request=self.request, body={})
+
+        self.assertEqual(1, mock_extend.call_count)
+        self.assertEqual(1, len(registry.validators))
+        # the same schema shares the compiled validator
+        self.assertIs(
+            registry.validators[(validator.SolSchemaValidator.validator_org,
+                                 id(test_schema_v200))][1],
+            validator.SolSchemaValidator(test_schema_v200).validator)
+
+        stats = registry.get_stats()
+        name = ('TestValidator.test_validator_compiled_once.'
+                '<locals>._test_method')
+        self.assertEqual(4, stats[name]['count'])
+        self.assertGreaterEqual(stats[name]['total'], stats[name]['max'])
@@ -13,8 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
 import ddt
 from oslo_config import cfg
+from oslo_serialization import jsonutils
+import testtools
 from unittest import mock
 
 from tacker import context
@@ -34,6 +37,38 @@ class TestWsgi(base.TestCase):
         self.assertRaises(sol_ex.ResponseTooBig,
             response.serialize, 'application/json')
 
+    def test_response_list(self):
+        body = [{"id": str(i), "key": ["value", i]} for i in range(3)]
+        response = sol_wsgi.SolResponse(200, body).serialize(
+            'application/json')
+        self.assertEqual(jsonutils.dump_as_bytes(body), response.body)
+        self.assertEqual(len(response.body), response.content_length)
+        self.assertEqual('application/json', response.content_type)
+
+        response = sol_wsgi.SolResponse(200, []).serialize(
+            'application/json')
+        self.assertEqual(b'[]', response.body)
+
+    @mock.patch.object(sol_wsgi, '_dump_json', wraps=sol_wsgi._dump_json)
+    def test_response_list_too_big(self, mock_dump_json):
+        self.config_fixture.config(group='v2_vnfm', max_content_length=100)
+        body = [{"key": "value0123456789"}] * 100
+        response = sol_wsgi.SolResponse(200, body)
+        self.assertRaises(sol_ex.ResponseTooBig,
+            response.serialize, 'application/json')
+        # stopped as soon as the size exceeds the limit
+        self.assertEqual(4, mock_dump_json.call_count)
+
+    @testtools.skipIf(sol_wsgi.orjson is None, 'orjson is not installed')
+    def test_response_orjson(self):
+        self.config_fixture.config(group='v2_vnfm', json_encoder='orjson')
+        body = [{"id": "1", "time": datetime.datetime(2026, 1, 1)},
+                {"id": "2", "time": None}]
+        response = sol_wsgi.SolResponse(200, body).serialize(
+            'application/json')
+        self.assertEqual(jsonutils.loads(jsonutils.dump_as_bytes(body)),
+                         jsonutils.loads(response.body))
+
     def test_unknown_error_response(self):
         err_msg = "Test error"
         status = 500
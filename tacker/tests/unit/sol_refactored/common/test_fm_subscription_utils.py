@@ -35,6 +35,12 @@ class TestFmSubscriptionUtils(base.BaseTestCase):
         super(TestFmSubscriptionUtils, self).setUp()
         objects.register_all()
         self.context = context.get_admin_context()
+        subsc_utils.FM_SUBSC_INDEX.invalidate()
+
+    def _get_subsc_ids(self, mock_subscs):
+        def _get_ids(context):
+            return [subsc.id for subsc in mock_subscs.return_value]
+        return _get_ids
 
     @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_id')
     def test_get_subsc(self, mock_subsc):
@@ -58,8 +64,10 @@ class TestFmSubscriptionUtils(base.BaseTestCase):
         result = subsc_utils.get_subsc_all(context)
         self.assertEqual(fakes_for_fm.fm_subsc_example['id'], result[0].id)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
-    def test_get_matched_subscs(self, mock_subscs):
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
+    def test_get_matched_subscs(self, mock_subscs, mock_ids):
+        mock_ids.side_effect = self._get_subsc_ids(mock_subscs)
         inst = objects.VnfInstanceV2(id='test-instance', vnfProvider='company')
         notif_type = 'AlarmClearedNotification'
         new_alarm_example = copy.deepcopy(fakes_for_fm.alarm_example)
@@ -139,8 +147,10 @@ class TestFmSubscriptionUtils(base.BaseTestCase):
         result_ids = [sub.id for sub in result]
         self.assertEqual(expected_ids, result_ids)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
-    def test_get_alarm_subscs(self, mock_subscs):
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
+    def test_get_alarm_subscs(self, mock_subscs, mock_ids):
+        mock_ids.side_effect = self._get_subsc_ids(mock_subscs)
         inst = objects.VnfInstanceV2(
             id='dummy-vnfInstanceId-1', vnfdId='dummy-vnfdId-1',
             vnfProvider='dummy-vnfProvider-1',
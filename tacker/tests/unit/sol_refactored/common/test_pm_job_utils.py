@@ -13,6 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
+from oslo_db import exception as db_exc
 from oslo_utils import uuidutils
 from unittest import mock
 
@@ -32,8 +35,7 @@ class TestPmJobUtils(base.BaseTestCase):
         self.context = context.get_admin_context()
         self.context.api_version = api_version.APIVersion('2.1.0')
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_id')
-    def test_update_report(self, mock_pm):
+    def test_add_reports(self):
         _PmJobCriteriaV2 = objects.VnfPmJobCriteriaV2(
             performanceMetric=['VCpuUsageMeanVnf.VNF'],
             performanceMetricGroup=['VirtualisedComputeResource'],
@@ -48,7 +50,7 @@ class TestPmJobUtils(base.BaseTestCase):
                 password='test_pwd'
             )
         )
-        mock_pm.return_value = objects.PmJobV2(
+        pm_job = objects.PmJobV2(
             id='pm_job_1',
             objectType='VNF',
             objectInstanceIds=['id_1'],
@@ -60,16 +62,32 @@ class TestPmJobUtils(base.BaseTestCase):
         report = objects.PerformanceReportV2(
             id=uuidutils.generate_uuid(),
             jobId='pm_job_1',
+            readyTime='2008-01-03 08:04:34'
         )
 
-        result = pm_job_utils.update_report(self.context, 'pm_job_1',
-                                            report, '2008-01-03 08:04:34',
-                                            'endpoint')
+        result = pm_job_utils.add_reports(pm_job, [report], 'endpoint')
         href = result.reports[0].href
         self.assertEqual('pm_job_1', result.id)
         self.assertEqual(
             f'endpoint/vnfpm/v2/pm_jobs/pm_job_1/reports/{report.id}', href)
 
+        # the links of the deleted reports are removed and only the latest
+        # links are kept
+        pm_job_utils.CONF.set_override('vnfpm_pmjob_max_reports', 2,
+                                       group='v2_vnfm')
+        self.addCleanup(pm_job_utils.CONF.clear_override,
+                        'vnfpm_pmjob_max_reports', group='v2_vnfm')
+        reports = [objects.PerformanceReportV2(
+            id=f'report_{i}',
+            jobId='pm_job_1',
+            readyTime='2008-01-03 08:04:34') for i in range(3)]
+        result = pm_job_utils.add_reports(pm_job, reports, 'endpoint',
+                                          {report.id, 'report_2'})
+        self.assertEqual(
+            ['endpoint/vnfpm/v2/pm_jobs/pm_job_1/reports/report_0',
+             'endpoint/vnfpm/v2/pm_jobs/pm_job_1/reports/report_1'],
+            [job_report.href for job_report in result.reports])
+
     @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
     def test_get_pm_job_all(self, mock_pm):
         mock_pm.return_value = [objects.PmJobV2(id='pm_job_1')]
@@ -112,6 +130,120 @@ class TestPmJobUtils(base.BaseTestCase):
             pm_job_id='pm_job_1', report_id='report_1'
         )
 
+    @mock.patch.object(objects.base.TackerPersistentObject, 'update_all')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
+    def test_update_report_index(self, mock_get, mock_update):
+        index_id = pm_job_utils.report_index_id(
+            'pm_job_1', 'id_1', 'sub_id_1', 'VCpuUsageMeanVnf.VNF')
+        mock_get.return_value = [objects.PmReportIndexV2(
+            id=index_id,
+            jobId='pm_job_1',
+            objectInstanceId='id_1',
+            subObjectInstanceId='sub_id_1',
+            performanceMetric='VCpuUsageMeanVnf.VNF',
+            latestTimeStamp=datetime.datetime(2022, 6, 22, 1, 0, 0)
+        )]
+
+        def _entry(sub_object_instance_id, timestamp):
+            return objects.VnfPmReportV2_Entries(
+                objectType='Vnf',
+                objectInstanceId='id_1',
+                subObjectInstanceId=sub_object_instance_id,
+                performanceMetric='VCpuUsageMeanVnf.VNF',
+                performanceValues=[
+                    objects.VnfPmReportV2_Entries_PerformanceValues(
+                        timeStamp=timestamp, value=1)])
+
+        reports = [
+            objects.PerformanceReportV2(
+                id='report_1',
+                jobId='pm_job_1',
+                entries=[
+                    # older than the index
+                    _entry('sub_id_1',
+                           datetime.datetime(2022, 6, 22, 0, 0, 0)),
+                    _entry('sub_id_2',
+                           datetime.datetime(2022, 6, 22, 0, 0, 0))
+                ]
+            ),
+            objects.PerformanceReportV2(
+                id='report_2',
+                jobId='pm_job_1',
+                entries=[
+                    _entry('sub_id_2',
+                           datetime.datetime(2022, 6, 22, 2, 0, 0))
+                ]
+            )
+        ]
+        pm_job_utils.update_report_index(self.context, reports)
+
+        # the current indexes are got at once
+        mock_get.assert_called_once_with(self.context, [
+            index_id,
+            pm_job_utils.report_index_id(
+                'pm_job_1', 'id_1', 'sub_id_2', 'VCpuUsageMeanVnf.VNF')])
+        # only the index of sub_id_2 is updated with the latest time
+        indexes = mock_update.call_args[0][1]
+        self.assertEqual(1, len(indexes))
+        self.assertEqual('sub_id_2', indexes[0].subObjectInstanceId)
+        self.assertEqual(datetime.datetime(2022, 6, 22, 2, 0, 0,
+                                           tzinfo=datetime.timezone.utc),
+                         indexes[0].latestTimeStamp)
+
+    @mock.patch.object(objects.base.TackerPersistentObject, 'update_all')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
+    def test_update_report_index_duplicate(self, mock_get, mock_update):
+        index_id = pm_job_utils.report_index_id(
+            'pm_job_1', 'id_1', None, 'VCpuUsageMeanVnf.VNF')
+        timestamp = datetime.datetime(2022, 6, 22, 2, 0, 0)
+        # inserted by another conductor after the index is got
+        mock_get.side_effect = [[], [objects.PmReportIndexV2(
+            id=index_id,
+            jobId='pm_job_1',
+            objectInstanceId='id_1',
+            performanceMetric='VCpuUsageMeanVnf.VNF',
+            latestTimeStamp=datetime.datetime(2022, 6, 22, 1, 0, 0)
+        )]]
+        mock_update.side_effect = [db_exc.DBDuplicateEntry(), None]
+        reports = [objects.PerformanceReportV2(
+            id='report_1',
+            jobId='pm_job_1',
+            entries=[objects.VnfPmReportV2_Entries(
+                objectType='Vnf',
+                objectInstanceId='id_1',
+                performanceMetric='VCpuUsageMeanVnf.VNF',
+                performanceValues=[
+                    objects.VnfPmReportV2_Entries_PerformanceValues(
+                        timeStamp=timestamp, value=1)])]
+        )]
+        pm_job_utils.update_report_index(self.context, reports)
+
+        # the index is read again and updated
+        self.assertEqual(2, mock_get.call_count)
+        self.assertEqual(2, mock_update.call_count)
+        indexes = mock_update.call_args[0][1]
+        self.assertEqual([index_id], [index.id for index in indexes])
+        self.assertEqual(timestamp.replace(tzinfo=datetime.timezone.utc),
+                         indexes[0].latestTimeStamp)
+
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_filter')
+    def test_get_report_index(self, mock_get):
+        timestamp = datetime.datetime(2022, 6, 22, 1, 0, 0,
+                                      tzinfo=datetime.timezone.utc)
+        mock_get.return_value = [objects.PmReportIndexV2(
+            id='index_1',
+            jobId='pm_job_1',
+            objectInstanceId='id_1',
+            subObjectInstanceId=None,
+            performanceMetric='VCpuUsageMeanVnf.VNF',
+            latestTimeStamp=timestamp
+        )]
+
+        result = pm_job_utils.get_report_index(self.context, 'pm_job_1')
+        self.assertEqual(
+            {('id_1', None, 'VCpuUsageMeanVnf.VNF'): timestamp}, result)
+        mock_get.assert_called_once_with(self.context, jobId='pm_job_1')
+
     def test_pm_job_href(self):
         result = pm_job_utils.pm_job_href('pm_job_1', 'endpoint')
         self.assertEqual('endpoint/vnfpm/v2/pm_jobs/pm_job_1', result)
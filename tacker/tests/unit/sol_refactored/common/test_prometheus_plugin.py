@@ -28,9 +28,11 @@ from tacker.sol_refactored.common import monitoring_plugin_base as mon_base
 from tacker.sol_refactored.common import pm_job_utils
 from tacker.sol_refactored.common import pm_threshold_utils
 from tacker.sol_refactored.common import prometheus_plugin
+from tacker.sol_refactored.common import prometheus_rule_sync
 from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
 from tacker.sol_refactored import objects
 from tacker.tests.unit import base
+from tacker.tests.unit.db import base as db_base
 
 from unittest import mock
 
@@ -398,6 +400,14 @@ def unload_uuidsentinel():
         del sys.modules["tacker.tests.uuidsentinel"]
 
 
+def _report_index(report):
+    report = objects.PerformanceReportV2.from_dict(report)
+    return {(entry.objectInstanceId, entry.get('subObjectInstanceId'),
+             entry.performanceMetric):
+            max(value.timeStamp for value in entry.performanceValues)
+            for entry in report.entries}
+
+
 class _ParamikoTest():
     channel = None
     exp = None
@@ -431,6 +441,24 @@ class _ParamikoTest():
     def put(self, a1, a2):
         pass
 
+    def putfo(self, a1, a2):
+        pass
+
+    def posix_rename(self, a1, a2):
+        pass
+
+    def is_active(self):
+        return True
+
+    def open_session(self):
+        return self
+
+    def makefile_stderr(self, *args):
+        return self
+
+    def close(self):
+        pass
+
     def __enter__(self):
         return self
 
@@ -438,7 +466,7 @@ class _ParamikoTest():
         pass
 
 
-class TestPrometheusPluginPm(base.TestCase):
+class TestPrometheusPluginPm(db_base.SqlTestCase):
     def setUp(self):
         super(TestPrometheusPluginPm, self).setUp()
         objects.register_all()
@@ -446,6 +474,14 @@ class TestPrometheusPluginPm(base.TestCase):
         self.request = mock.Mock()
         self.request.context = self.context
         prometheus_plugin.PrometheusPluginPm._instance = None
+        # NOTE: the SSH connections are not kept over the tests.
+        patcher = mock.patch.object(
+            prometheus_rule_sync, 'RULE_SYNC',
+            prometheus_rule_sync.PrometheusRuleSync())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.config_fixture.config(
+            group='prometheus_plugin', rule_reload_window=0)
 
     def tearDown(self):
         super(TestPrometheusPluginPm, self).tearDown()
@@ -471,14 +507,13 @@ class TestPrometheusPluginPm(base.TestCase):
             prometheus_plugin.PrometheusPluginPm)
         self.assertIsInstance(pp._instance, mon_base.MonitoringPluginStub)
 
-    @mock.patch.object(pm_job_utils, 'get_pm_report')
+    @mock.patch.object(pm_job_utils, 'get_report_index')
     @mock.patch.object(pm_job_utils, 'get_pm_job')
-    def test_pm(self, mock_pm_job, mock_pm_report):
+    def test_pm(self, mock_pm_job, mock_report_index):
         self.config_fixture.config(
             group='prometheus_plugin', performance_management=True)
         mock_pm_job.return_value = objects.PmJobV2.from_dict(_pm_job)
-        mock_pm_report.return_value = [objects.PerformanceReportV2.from_dict(
-            _pm_report)]
+        mock_report_index.return_value = _report_index(_pm_report)
         pp = mon_base.MonitoringPlugin.get_instance(
             prometheus_plugin.PrometheusPluginPm)
 
@@ -490,14 +525,13 @@ class TestPrometheusPluginPm(base.TestCase):
                 result[_pm_job_id1][0]['objectInstanceId'],
                 '25b9b9d0-2461-4109-866e-a7767375415b')
 
-    @mock.patch.object(pm_job_utils, 'get_pm_report')
+    @mock.patch.object(pm_job_utils, 'get_report_index')
     @mock.patch.object(pm_job_utils, 'get_pm_job')
-    def test_pm_metrics(self, mock_pm_job, mock_pm_report):
+    def test_pm_metrics(self, mock_pm_job, mock_report_index):
         self.config_fixture.config(
             group='prometheus_plugin', performance_management=True)
         mock_pm_job.return_value = objects.PmJobV2.from_dict(_pm_job)
-        mock_pm_report.return_value = [objects.PerformanceReportV2.from_dict(
-            _pm_report)]
+        mock_report_index.return_value = _report_index(_pm_report)
         pp = mon_base.MonitoringPlugin.get_instance(
             prometheus_plugin.PrometheusPluginPm)
         unload_uuidsentinel()
@@ -507,14 +541,13 @@ class TestPrometheusPluginPm(base.TestCase):
             self.assertEqual(result[_pm_job_id1][0]["performanceMetric"],
                              'ByteIncomingVnfIntCp')
 
-    @mock.patch.object(pm_job_utils, 'get_pm_report')
+    @mock.patch.object(pm_job_utils, 'get_report_index')
     @mock.patch.object(pm_job_utils, 'get_pm_job')
-    def test_pm_report(self, mock_pm_job, mock_pm_report):
+    def test_pm_report(self, mock_pm_job, mock_report_index):
         self.config_fixture.config(
             group='prometheus_plugin', performance_management=True)
         mock_pm_job.return_value = objects.PmJobV2.from_dict(_pm_job)
-        mock_pm_report.return_value = [objects.PerformanceReportV2.from_dict(
-            _pm_report2)]
+        mock_report_index.return_value = _report_index(_pm_report2)
         pp = mon_base.MonitoringPlugin.get_instance(
             prometheus_plugin.PrometheusPluginPm)
         unload_uuidsentinel()
@@ -524,23 +557,28 @@ class TestPrometheusPluginPm(base.TestCase):
             self.assertEqual(
                 result[_pm_job_id1][0]['objectInstanceId'],
                 '25b9b9d0-2461-4109-866e-a7767375415b')
-        mock_pm_report.return_value = None
+        # the report just made is used though it is not stored yet.
+        mock_report_index.return_value = {}
         unload_uuidsentinel()
         with freezegun.freeze_time(datetime_test):
             result = pp._alert(self.request, body=_body_pm1)
+            self.assertEqual(0, len(result))
+        unload_uuidsentinel()
+        with freezegun.freeze_time(
+                datetime_test + datetime.timedelta(seconds=30)):
+            result = pp._alert(self.request, body=_body_pm1)
             self.assertTrue(len(result) > 0)
             self.assertEqual(
                 result[_pm_job_id1][0]['objectInstanceId'],
                 '25b9b9d0-2461-4109-866e-a7767375415b')
 
-    @mock.patch.object(pm_job_utils, 'get_pm_report')
+    @mock.patch.object(pm_job_utils, 'get_report_index')
     @mock.patch.object(pm_job_utils, 'get_pm_job')
-    def test_pm_datetime(self, mock_pm_job, mock_pm_report):
+    def test_pm_datetime(self, mock_pm_job, mock_report_index):
         self.config_fixture.config(
             group='prometheus_plugin', performance_management=True)
         mock_pm_job.return_value = objects.PmJobV2.from_dict(_pm_job)
-        mock_pm_report.return_value = [objects.PerformanceReportV2.from_dict(
-            _pm_report)]
+        mock_report_index.return_value = _report_index(_pm_report)
         pp = mon_base.MonitoringPlugin.get_instance(
             prometheus_plugin.PrometheusPluginPm)
         unload_uuidsentinel()
@@ -557,14 +595,13 @@ class TestPrometheusPluginPm(base.TestCase):
             result = pp._alert(self.request, body=_body_pm1)
             self.assertTrue(len(result) == 0)
 
-    @mock.patch.object(pm_job_utils, 'get_pm_report')
+    @mock.patch.object(pm_job_utils, 'get_report_index')
     @mock.patch.object(pm_job_utils, 'get_pm_job')
-    def test_pm_set_callback(self, mock_pm_job, mock_pm_report):
+    def test_pm_set_callback(self, mock_pm_job, mock_report_index):
         self.config_fixture.config(
             group='prometheus_plugin', performance_management=True)
         mock_pm_job.return_value = objects.PmJobV2.from_dict(_pm_job)
-        mock_pm_report.return_value = [objects.PerformanceReportV2.from_dict(
-            _pm_report)]
+        mock_report_index.return_value = _report_index(_pm_report)
         pp = mon_base.MonitoringPlugin.get_instance(
             prometheus_plugin.PrometheusPluginPm)
         pp.set_callback(None)
@@ -576,17 +613,15 @@ class TestPrometheusPluginPm(base.TestCase):
                 result[_pm_job_id1][0]['objectInstanceId'],
                 '25b9b9d0-2461-4109-866e-a7767375415b')
 
-    @mock.patch.object(pm_job_utils, 'get_pm_report')
+    @mock.patch.object(pm_job_utils, 'get_report_index')
     @mock.patch.object(pm_job_utils, 'get_pm_job')
-    def test_pm_multi_job_alerts(self, mock_pm_job, mock_pm_report):
+    def test_pm_multi_job_alerts(self, mock_pm_job, mock_report_index):
         self.config_fixture.config(
             group='prometheus_plugin', performance_management=True)
         return_pm_job1 = objects.PmJobV2.from_dict(_pm_job)
         return_pm_job2 = objects.PmJobV2.from_dict(_pm_job3)
-        mock_pm_job.side_effect = [return_pm_job1, return_pm_job1,
-            return_pm_job2]
-        mock_pm_report.return_value = [objects.PerformanceReportV2.from_dict(
-            _pm_report)]
+        mock_pm_job.side_effect = [return_pm_job1, return_pm_job2]
+        mock_report_index.return_value = _report_index(_pm_report)
         pp = mon_base.MonitoringPlugin.get_instance(
             prometheus_plugin.PrometheusPluginPm)
 
@@ -600,6 +635,9 @@ class TestPrometheusPluginPm(base.TestCase):
                 '25b9b9d0-2461-4109-866e-a7767375415b')
             self.assertEqual(result['pm_job_id2'][0]['objectInstanceId'],
                 'obj_instance_id2')
+        # a PM job is got once per request
+        self.assertEqual(2, mock_pm_job.call_count)
+        self.assertEqual(2, mock_report_index.call_count)
 
     def test_pm_error_access_info(self):
         self.config_fixture.config(
@@ -646,17 +684,14 @@ class TestPrometheusPluginPm(base.TestCase):
             exp=sol_ex.PrometheusPluginError())
         pp.delete_job(context=self.context, pm_job=job)
 
-    @mock.patch.object(paramiko, 'SSHClient')
     @mock.patch.object(http_client.HttpClient, 'do_request')
     @mock.patch.object(paramiko.SFTPClient, 'from_transport')
     @mock.patch.object(paramiko, 'Transport')
     @mock.patch.object(inst_utils, 'get_inst')
     def test_create_job(
-            self, mock_inst, mock_paramiko, mock_sftp, mock_do_request,
-            mock_sshclient):
+            self, mock_inst, mock_paramiko, mock_sftp, mock_do_request):
         mock_paramiko.return_value = _ParamikoTest()
         mock_sftp.return_value = _ParamikoTest()
-        mock_sshclient.return_value = _ParamikoTest()
         resp = webob.Response()
         resp.status_code = 202
         mock_do_request.return_value = resp, {}
@@ -853,19 +888,15 @@ class TestPrometheusPluginPm(base.TestCase):
             pp.create_job, context=self.context, pm_job=job
         )
 
-    @mock.patch.object(paramiko, 'SSHClient')
     @mock.patch.object(http_client.HttpClient, 'do_request')
     @mock.patch.object(paramiko.SFTPClient, 'from_transport')
     @mock.patch.object(paramiko, 'Transport')
     @mock.patch.object(inst_utils, 'get_inst')
     def test_create_job_uploading_error(
-            self, mock_inst, mock_paramiko, mock_sftp, mock_do_request,
-            mock_sshclient):
-        mock_paramiko.return_value = _ParamikoTest()
-        mock_sftp.return_value = _ParamikoTest()
+            self, mock_inst, mock_paramiko, mock_sftp, mock_do_request):
         exp = ValueError("test_create_job_error2")
-        mock_sshclient.return_value = _ParamikoTest(
-            exp=exp, recv_exit_status_value=1)
+        mock_paramiko.return_value = _ParamikoTest(exp=exp)
+        mock_sftp.return_value = _ParamikoTest()
         resp = webob.Response()
         resp.status_code = 202
         mock_do_request.return_value = resp, {}
@@ -882,26 +913,22 @@ class TestPrometheusPluginPm(base.TestCase):
         self.assertRaises(
             ValueError,
             pp.create_job, context=self.context, pm_job=job)
-        exp = sol_ex.PrometheusPluginError("test_create_job_error2")
-        mock_paramiko.return_value = _ParamikoTest(exp=exp)
-        mock_sshclient.return_value = _ParamikoTest(
-            exp=exp, recv_exit_status_value=1)
+        # validation error
+        mock_paramiko.return_value = _ParamikoTest(recv_exit_status_value=1)
         self.assertRaises(
             sol_ex.PrometheusPluginError,
             pp.create_job, context=self.context, pm_job=job)
 
     @mock.patch.object(utils, 'find_config_file')
-    @mock.patch.object(paramiko, 'SSHClient')
     @mock.patch.object(http_client.HttpClient, 'do_request')
     @mock.patch.object(paramiko.SFTPClient, 'from_transport')
     @mock.patch.object(paramiko, 'Transport')
     @mock.patch.object(inst_utils, 'get_inst')
     def test_promql_config_file_missing(
             self, mock_inst, mock_paramiko, mock_sftp, mock_do_request,
-            mock_sshclient, mock_utils):
+            mock_utils):
         mock_paramiko.return_value = _ParamikoTest()
         mock_sftp.return_value = _ParamikoTest()
-        mock_sshclient.return_value = _ParamikoTest(recv_exit_status_value=1)
         resp = webob.Response()
         resp.status_code = 202
         mock_do_request.return_value = resp, {}
@@ -929,17 +956,14 @@ class TestPrometheusPluginPm(base.TestCase):
             pp.make_rule, "TypeError", "id", "id", "id", "metric", "exp"
         )
 
-    @mock.patch.object(paramiko, 'SSHClient')
     @mock.patch.object(http_client.HttpClient, 'do_request')
     @mock.patch.object(paramiko.SFTPClient, 'from_transport')
     @mock.patch.object(paramiko, 'Transport')
     @mock.patch.object(inst_utils, 'get_inst')
     def test_promql(
-            self, mock_inst, mock_paramiko, mock_sftp, mock_do_request,
-            mock_sshclient):
-        mock_paramiko.return_value = _ParamikoTest()
+            self, mock_inst, mock_paramiko, mock_sftp, mock_do_request):
+        mock_paramiko.return_value = _ParamikoTest(recv_exit_status_value=1)
         mock_sftp.return_value = _ParamikoTest()
-        mock_sshclient.return_value = _ParamikoTest(recv_exit_status_value=1)
         resp = webob.Response()
         resp.status_code = 202
         mock_do_request.return_value = resp, {}
@@ -959,7 +983,7 @@ class TestPrometheusPluginPm(base.TestCase):
         )
 
 
-class TestPrometheusPluginThreshold(base.TestCase):
+class TestPrometheusPluginThreshold(db_base.SqlTestCase):
 
     def setUp(self):
         super(TestPrometheusPluginThreshold, self).setUp()
@@ -968,6 +992,14 @@ class TestPrometheusPluginThreshold(base.TestCase):
         self.request = mock.Mock()
         self.request.context = self.context
         prometheus_plugin.PrometheusPluginThreshold._instance = None
+        # NOTE: the SSH connections are not kept over the tests.
+        patcher = mock.patch.object(
+            prometheus_rule_sync, 'RULE_SYNC',
+            prometheus_rule_sync.PrometheusRuleSync())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.config_fixture.config(
+            group='prometheus_plugin', rule_reload_window=0)
 
     def tearDown(self):
         super(TestPrometheusPluginThreshold, self).tearDown()
@@ -1117,17 +1149,15 @@ class TestPrometheusPluginThreshold(base.TestCase):
             exp=sol_ex.PrometheusPluginError())
         pp.delete_threshold(context=self.context, pm_threshold=threshold)
 
-    @mock.patch.object(paramiko, 'SSHClient')
     @mock.patch.object(http_client.HttpClient, 'do_request')
     @mock.patch.object(paramiko.SFTPClient, 'from_transport')
     @mock.patch.object(paramiko, 'Transport')
     @mock.patch.object(inst_utils, 'get_inst')
     def test_create_pm_threshold(
             self, mock_inst, mock_paramiko, mock_sftp,
-            mock_do_request, mock_sshclient):
+            mock_do_request):
         mock_paramiko.return_value = _ParamikoTest()
         mock_sftp.return_value = _ParamikoTest()
-        mock_sshclient.return_value = _ParamikoTest()
         resp = webob.Response()
         resp.status_code = 202
         mock_do_request.return_value = resp, {}
@@ -1325,19 +1355,16 @@ class TestPrometheusPluginThreshold(base.TestCase):
             pp.create_threshold, context=self.context, pm_threshold=threshold
         )
 
-    @mock.patch.object(paramiko, 'SSHClient')
     @mock.patch.object(http_client.HttpClient, 'do_request')
     @mock.patch.object(paramiko.SFTPClient, 'from_transport')
     @mock.patch.object(paramiko, 'Transport')
     @mock.patch.object(inst_utils, 'get_inst')
     def test_create_pm_threshold_error2(
             self, mock_inst, mock_paramiko,
-            mock_sftp, mock_do_request, mock_sshclient):
-        mock_paramiko.return_value = _ParamikoTest()
-        mock_sftp.return_value = _ParamikoTest()
+            mock_sftp, mock_do_request):
         exp = ValueError("test_create_pm_threshold_error2")
-        mock_sshclient.return_value = _ParamikoTest(
-            exp=exp, recv_exit_status_value=1)
+        mock_paramiko.return_value = _ParamikoTest(exp=exp)
+        mock_sftp.return_value = _ParamikoTest()
         resp = webob.Response()
         resp.status_code = 202
         mock_do_request.return_value = resp, {}
@@ -1354,26 +1381,22 @@ class TestPrometheusPluginThreshold(base.TestCase):
         self.assertRaises(
             ValueError,
             pp.create_threshold, context=self.context, pm_threshold=threshold)
-        exp = sol_ex.PrometheusPluginError("test_create_pm_threshold_error2")
-        mock_paramiko.return_value = _ParamikoTest(exp=exp)
-        mock_sshclient.return_value = _ParamikoTest(
-            exp=exp, recv_exit_status_value=1)
+        # validation error
+        mock_paramiko.return_value = _ParamikoTest(recv_exit_status_value=1)
         self.assertRaises(
             sol_ex.PrometheusPluginError,
             pp.create_threshold, context=self.context, pm_threshold=threshold)
 
     @mock.patch.object(utils, 'find_config_file')
-    @mock.patch.object(paramiko, 'SSHClient')
     @mock.patch.object(http_client.HttpClient, 'do_request')
     @mock.patch.object(paramiko.SFTPClient, 'from_transport')
     @mock.patch.object(paramiko, 'Transport')
     @mock.patch.object(inst_utils, 'get_inst')
     def test_promql(
             self, mock_inst, mock_paramiko, mock_sftp, mock_do_request,
-            mock_sshclient, mock_utils):
-        mock_paramiko.return_value = _ParamikoTest()
+            mock_utils):
+        mock_paramiko.return_value = _ParamikoTest(recv_exit_status_value=1)
         mock_sftp.return_value = _ParamikoTest()
-        mock_sshclient.return_value = _ParamikoTest(recv_exit_status_value=1)
         resp = webob.Response()
         resp.status_code = 202
         mock_do_request.return_value = resp, {}
@@ -1401,17 +1424,14 @@ class TestPrometheusPluginThreshold(base.TestCase):
             pp.make_rule, "TypeError", "id", "id", "id", "metric", "exp"
         )
 
-    @mock.patch.object(paramiko, 'SSHClient')
     @mock.patch.object(http_client.HttpClient, 'do_request')
     @mock.patch.object(paramiko.SFTPClient, 'from_transport')
     @mock.patch.object(paramiko, 'Transport')
     @mock.patch.object(inst_utils, 'get_inst')
     def test_promql2(
-            self, mock_inst, mock_paramiko, mock_sftp, mock_do_request,
-            mock_sshclient):
-        mock_paramiko.return_value = _ParamikoTest()
+            self, mock_inst, mock_paramiko, mock_sftp, mock_do_request):
+        mock_paramiko.return_value = _ParamikoTest(recv_exit_status_value=1)
         mock_sftp.return_value = _ParamikoTest()
-        mock_sshclient.return_value = _ParamikoTest(recv_exit_status_value=1)
         resp = webob.Response()
         resp.status_code = 202
         mock_do_request.return_value = resp, {}
@@ -0,0 +1,184 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+from unittest import mock
+
+import paramiko
+import webob
+
+from tacker import context
+from tacker.sol_refactored.common import exceptions as sol_ex
+from tacker.sol_refactored.common import http_client
+from tacker.sol_refactored.common import prometheus_rule_sync
+from tacker.sol_refactored import objects
+from tacker.tests.unit.db import base as db_base
+
+
+_target = {
+    'host': 'prometheusHost',
+    'port': 22,
+    'user': 'user',
+    'password': 'password',
+    'path': '/etc/prometheus/rules'
+}
+_reload_uri = 'http://prometheusHost:9090/-/reload'
+_rule_file = '/etc/prometheus/rules/tacker-rules.json'
+_tmp_file = '/etc/prometheus/rules/.tacker-rules.json.tmp'
+
+
+def _rule_group(rule_id):
+    return {'groups': [{'name': f'tacker_{rule_id}', 'rules': []}]}
+
+
+class TestPrometheusRuleSync(db_base.SqlTestCase):
+
+    def setUp(self):
+        super(TestPrometheusRuleSync, self).setUp()
+        objects.register_all()
+        self.context = context.get_admin_context()
+        self.config_fixture.config(
+            group='prometheus_plugin', rule_reload_window=0)
+        self.rule_sync = prometheus_rule_sync.PrometheusRuleSync()
+
+        self.files = {}
+        self.sftp = mock.Mock()
+        self.sftp.putfo.side_effect = self._putfo
+        self.sftp.posix_rename.side_effect = self._rename
+        self.sftp.remove.side_effect = self._remove
+        self.transport = mock.Mock()
+        self.transport.is_active.return_value = True
+        self.channel = self.transport.open_session.return_value
+        self.channel.recv_exit_status.return_value = 0
+        self.channel.makefile_stderr.return_value.read.return_value = (
+            b'error')
+
+        for patcher in [
+                mock.patch.object(paramiko, 'Transport',
+                                  return_value=self.transport),
+                mock.patch.object(paramiko.SFTPClient, 'from_transport',
+                                  return_value=self.sftp)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.mock_transport = paramiko.Transport
+
+        resp = webob.Response()
+        resp.status_code = 202
+        patcher = mock.patch.object(http_client.HttpClient, 'do_request',
+                                    return_value=(resp, {}))
+        self.mock_do_request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _putfo(self, fp, filename):
+        self.files[filename] = json.loads(fp.read().decode('utf-8'))
+
+    def _rename(self, src, dst):
+        self.files[dst] = self.files.pop(src)
+
+    def _remove(self, filename):
+        if filename not in self.files:
+            raise FileNotFoundError(filename)
+        del self.files[filename]
+
+    def _register(self, rule_id):
+        self.rule_sync.register(self.context, rule_id, _rule_group(rule_id),
+                                [_target], [_reload_uri])
+
+    def _group_names(self):
+        return [group['name'] for group in self.files[_rule_file]['groups']]
+
+    def test_register_unregister(self):
+        self._register('job2')
+        self._register('job1')
+
+        # the rule groups are put together in one file
+        self.assertEqual(['tacker_job1', 'tacker_job2'], self._group_names())
+        self.assertEqual([_rule_file], list(self.files))
+        self.assertEqual(2, self.mock_do_request.call_count)
+        # the connection is reused
+        self.mock_transport.assert_called_once_with(
+            sock=('prometheusHost', 22))
+
+        self.rule_sync.unregister(self.context, 'job1', [_target],
+                                  [_reload_uri])
+        self.assertEqual(['tacker_job2'], self._group_names())
+        self.assertIsNone(
+            objects.PrometheusRuleV2.get_by_id(self.context, 'job1'))
+
+        # the file is removed when no rule is left
+        self.rule_sync.unregister(self.context, 'job2', [_target],
+                                  [_reload_uri])
+        self.assertEqual({}, self.files)
+        self.assertEqual(4, self.mock_do_request.call_count)
+
+    def test_unregister_legacy(self):
+        self.files['/etc/prometheus/rules/job1.json'] = {}
+        self.rule_sync.unregister(self.context, 'job1', [_target],
+                                  [_reload_uri])
+        self.assertEqual({}, self.files)
+
+    def test_register_validation_error(self):
+        self.config_fixture.config(
+            group='prometheus_plugin', test_rule_with_promtool=True)
+        self._register('job1')
+        self.channel.exec_command.assert_called_once_with(
+            f'promtool check rules {_tmp_file}')
+
+        self.channel.recv_exit_status.return_value = 1
+        self.assertRaises(sol_ex.PrometheusPluginError,
+                          self._register, 'job2')
+        # the rule file in place is not changed
+        self.assertEqual(['tacker_job1'], self._group_names())
+        self.assertEqual([_rule_file], list(self.files))
+        self.assertIsNone(
+            objects.PrometheusRuleV2.get_by_id(self.context, 'job2'))
+
+    def test_register_reconnect(self):
+        self._register('job1')
+        self.transport.is_active.return_value = False
+        self._register('job2')
+        self.assertEqual(2, self.mock_transport.call_count)
+
+        # a connection closed by the server is found on the use
+        self.transport.is_active.return_value = True
+        errors = [EOFError()]
+
+        def _putfo(fp, filename):
+            if errors:
+                raise errors.pop()
+            self._putfo(fp, filename)
+
+        self.sftp.putfo.side_effect = _putfo
+        self._register('job3')
+        self.assertEqual(3, self.mock_transport.call_count)
+        self.assertEqual(['tacker_job1', 'tacker_job2', 'tacker_job3'],
+                         self._group_names())
+
+    def test_reload_window(self):
+        self.config_fixture.config(
+            group='prometheus_plugin', rule_reload_window=60)
+        self._register('job1')
+        self._register('job2')
+        self.rule_sync.unregister(self.context, 'job1', [_target],
+                                  [_reload_uri])
+        self.mock_do_request.assert_not_called()
+        self.assertEqual({_reload_uri}, self.rule_sync.pending_reloads)
+
+        self.rule_sync.reload_timer.cancel()
+        self.rule_sync.flush_reloads()
+        # reloaded once for all the changes
+        self.mock_do_request.assert_called_once_with(
+            _reload_uri, 'PUT', context=mock.ANY)
+        self.assertIsNone(self.rule_sync.reload_timer)
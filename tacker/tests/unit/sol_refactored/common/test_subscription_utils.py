@@ -13,7 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import requests
+import threading
+import time
 from unittest import mock
 
 from oslo_utils import uuidutils
@@ -42,6 +45,12 @@ class TestSubscriptionUtils(base.BaseTestCase):
         objects.register_all()
         self.context = context.get_admin_context()
         self.context.api_version = api_version.APIVersion('2.0.0')
+        subsc_utils.LCM_SUBSC_INDEX.invalidate()
+
+    def _get_subsc_ids(self, mock_subscs):
+        def _get_ids(context):
+            return [subsc.id for subsc in mock_subscs.return_value]
+        return _get_ids
 
     @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_id')
     def test_get_subsc(self, mock_subsc):
@@ -179,24 +188,30 @@ class TestSubscriptionUtils(base.BaseTestCase):
             inst_filter_mismatch_inst_name, inst)
         self.assertEqual(False, result_5)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
-    def test_get_inst_create_subscs(self, mock_subscs):
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
+    def test_get_inst_create_subscs(self, mock_subscs, mock_ids):
+        mock_ids.side_effect = self._get_subsc_ids(mock_subscs)
         inst = objects.VnfInstanceV2(id='test-instance')
         mock_subscs.return_value = [objects.LccnSubscriptionV2(id='subsc-1')]
         result = subsc_utils.get_inst_create_subscs(context, inst)
 
         self.assertEqual('subsc-1', result[0].id)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
-    def test_get_inst_delete_subscs(self, mock_subscs):
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
+    def test_get_inst_delete_subscs(self, mock_subscs, mock_ids):
+        mock_ids.side_effect = self._get_subsc_ids(mock_subscs)
         inst = objects.VnfInstanceV2(id='test-instance')
         mock_subscs.return_value = [objects.LccnSubscriptionV2(id='subsc-1')]
         result = subsc_utils.get_inst_delete_subscs(context, inst)
 
         self.assertEqual('subsc-1', result[0].id)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
-    def test_get_lcmocc_subscs(self, mock_subscs):
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
+    def test_get_lcmocc_subscs(self, mock_subscs, mock_ids):
+        mock_ids.side_effect = self._get_subsc_ids(mock_subscs)
         inst = objects.VnfInstanceV2(id='test-instance')
         lcmocc = objects.VnfLcmOpOccV2(operationState='COMPLETED',
                                        operation='INSTANTIATE')
@@ -205,8 +220,10 @@ class TestSubscriptionUtils(base.BaseTestCase):
 
         self.assertEqual('subsc-1', result[0].id)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
-    def test_get_matched_subscs(self, mock_subscs):
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
+    def test_get_matched_subscs(self, mock_subscs, mock_ids):
+        mock_ids.side_effect = self._get_subsc_ids(mock_subscs)
         inst = objects.VnfInstanceV2(id='test-instance', vnfProvider='company')
         notif_type = 'VnfLcmOperationOccurrenceNotification'
         op_type = 'INSTANTIATE'
@@ -267,6 +284,59 @@ class TestSubscriptionUtils(base.BaseTestCase):
         result_ids = [sub.id for sub in result]
         self.assertEqual(expected_ids, result_ids)
 
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
+    def test_subsc_index(self, mock_subscs, mock_ids):
+        mock_ids.side_effect = self._get_subsc_ids(mock_subscs)
+        index = subsc_utils.LCM_SUBSC_INDEX
+        inst_filter = objects.VnfInstanceSubscriptionFilter(
+            vnfdIds=['vnfd-1'])
+        subsc_1 = objects.LccnSubscriptionV2(id='subsc-1')
+        subsc_2 = objects.LccnSubscriptionV2(
+            id='subsc-2', filter=objects.LifecycleChangeNotificationsFilterV2(
+                vnfInstanceSubscriptionFilter=inst_filter,
+                operationTypes=['INSTANTIATE', 'TERMINATE']))
+        subsc_3 = objects.LccnSubscriptionV2(
+            id='subsc-3', filter=objects.LifecycleChangeNotificationsFilterV2(
+                operationTypes=['HEAL']))
+        mock_subscs.return_value = [subsc_1, subsc_2, subsc_3]
+
+        def _get_ids(**values):
+            return [subsc.id for subsc in
+                    index.get_candidates(self.context, **values)]
+
+        self.assertEqual(['subsc-1', 'subsc-2'],
+                         _get_ids(operationType='INSTANTIATE',
+                                  vnfdId='vnfd-1'))
+        self.assertEqual(['subsc-1'],
+                         _get_ids(operationType='INSTANTIATE',
+                                  vnfdId='vnfd-2'))
+        self.assertEqual(['subsc-1', 'subsc-3'],
+                         _get_ids(operationType='HEAL', vnfdId='vnfd-1'))
+        # None means not checked
+        self.assertEqual(['subsc-1', 'subsc-2', 'subsc-3'],
+                         _get_ids(operationType=None, vnfdId=None))
+        # subscriptions are got from DB only once
+        self.assertEqual(1, mock_subscs.call_count)
+
+        # deleted and created by other process
+        subsc_4 = objects.LccnSubscriptionV2(
+            id='subsc-4', filter=objects.LifecycleChangeNotificationsFilterV2(
+                operationTypes=['INSTANTIATE']))
+        mock_subscs.return_value = [subsc_2, subsc_3, subsc_4]
+        self.assertEqual(['subsc-2', 'subsc-4'],
+                         _get_ids(operationType='INSTANTIATE',
+                                  vnfdId='vnfd-1'))
+        mock_subscs.assert_called_with(self.context, ['subsc-4'])
+
+        # deleted in this process
+        index.remove('subsc-2')
+        mock_subscs.return_value = [subsc_3, subsc_4]
+        self.assertEqual(['subsc-4'],
+                         _get_ids(operationType='INSTANTIATE',
+                                  vnfdId='vnfd-1'))
+        self.assertEqual(2, mock_subscs.call_count)
+
     def test_make_create_inst_notif_data(self):
         subsc = objects.LccnSubscriptionV2(id='subsc-1')
         inst = objects.VnfInstanceV2(id='test-instance')
@@ -361,6 +431,7 @@ class TestSubscriptionUtils(base.BaseTestCase):
 
         # execute oauth2 mtls
         subsc_utils.send_notification(subsc_oauth2_mtls, notif_data_no_auth)
+        subsc_utils.NOTIFICATION_DISPATCHER.wait_idle()
         mock_resp.assert_called_once()
 
     @mock.patch('tacker.sol_refactored.common.subscription_utils.LOG')
@@ -378,6 +449,7 @@ class TestSubscriptionUtils(base.BaseTestCase):
 
         # execute no_auth
         subsc_utils.send_notification(subsc_no_auth, notif_data_no_auth)
+        subsc_utils.NOTIFICATION_DISPATCHER.wait_idle()
         expected_message = "send_notification failed: unit test"
         mock_log.exception.assert_called_with(expected_message)
 
@@ -403,6 +475,7 @@ class TestSubscriptionUtils(base.BaseTestCase):
             subsc_basic_auth, alarm, 'http://127.0.0.1:9890')
 
         subsc_utils.send_notification(subsc_basic_auth, notif_data)
+        subsc_utils.NOTIFICATION_DISPATCHER.wait_idle()
         mock_resp.assert_called_once()
 
     @mock.patch.object(http_client.HttpClient, 'do_request')
@@ -431,8 +504,72 @@ class TestSubscriptionUtils(base.BaseTestCase):
         mock_resp.return_value = (resp_no_auth, None)
         subsc_utils.send_notification(
             pm_job, notif_data, subsc_utils.NOTIFY_TYPE_PM)
+        subsc_utils.NOTIFICATION_DISPATCHER.wait_idle()
         mock_resp.assert_called_once()
 
+    @mock.patch('random.uniform')
+    @mock.patch.object(http_client.HttpClient, 'do_request')
+    def test_send_notification_retry(self, mock_resp, mock_uniform):
+        CONF.set_override('notify_retries', 2, group='v2_vnfm')
+        # no wait for retry
+        mock_uniform.return_value = 0.0
+        subsc = objects.LccnSubscriptionV2(
+            id='sub-1', verbosity='SHORT',
+            callbackUri='http://127.0.0.1/callback')
+        notif_data = objects.VnfLcmOperationOccurrenceNotificationV2(
+            id=uuidutils.generate_uuid()
+        )
+        resp = requests.Response()
+        resp.status_code = 204
+        mock_resp.side_effect = [
+            sol_ex.SolException(sol_status=503, sol_detail="unit test"),
+            (resp, None)]
+        dispatcher = subsc_utils.NotificationDispatcher()
+
+        dispatcher.dispatch(subsc, notif_data, '2.0.0')
+        self.assertTrue(dispatcher.wait_idle(timeout=10))
+        self.assertEqual(2, mock_resp.call_count)
+        stats = dispatcher.get_stats()
+        self.assertEqual(1, stats['sent'])
+        self.assertEqual(0, stats['failed'])
+        self.assertEqual(1, stats['retried'])
+        self.assertEqual(0, stats['queued'])
+        # the http client (i.e. session) is reused
+        self.assertEqual(1, len(dispatcher.clients))
+
+    @mock.patch.object(http_client.HttpClient, 'do_request')
+    def test_send_notification_concurrency_per_endpoint(self, mock_resp):
+        CONF.set_override('notify_workers', 4, group='v2_vnfm')
+        CONF.set_override('notify_max_concurrency_per_endpoint', 1,
+                          group='v2_vnfm')
+        lock = threading.Lock()
+        running = collections.Counter()
+        max_running = collections.Counter()
+        resp = requests.Response()
+        resp.status_code = 204
+
+        def _do_request(url, *args, **kwargs):
+            with lock:
+                running[url] += 1
+                max_running[url] = max(max_running[url], running[url])
+            time.sleep(0.01)
+            with lock:
+                running[url] -= 1
+            return resp, None
+
+        mock_resp.side_effect = _do_request
+        dispatcher = subsc_utils.NotificationDispatcher()
+        for i in range(10):
+            subsc = objects.LccnSubscriptionV2(
+                id=f'sub-{i}', verbosity='SHORT',
+                callbackUri=f'http://127.0.0.{i % 2}/callback')
+            dispatcher.dispatch(subsc, {'id': i}, '2.0.0')
+        self.assertTrue(dispatcher.wait_idle(timeout=10))
+
+        self.assertEqual(10, dispatcher.get_stats()['sent'])
+        self.assertEqual(1, max_running['http://127.0.0.0/callback'])
+        self.assertEqual(1, max_running['http://127.0.0.1/callback'])
+
     @mock.patch.object(http_client.HttpClient, 'do_request')
     def test_test_notification(self, mock_resp):
         subsc_no_auth = objects.LccnSubscriptionV2(
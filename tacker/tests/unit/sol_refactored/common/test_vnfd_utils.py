@@ -297,3 +297,46 @@ class TestVnfd(base.BaseTestCase):
         expected_result = ['Scripts/install.sh',
                            'Files/kubernetes/deployment.yaml']
         self.assertEqual(expected_result, result)
+
+    def test_vnfd_cache(self):
+        vnfd_utils.VNFD_CACHE.invalidate()
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        csar_dir = os.path.join(tmp_dir, 'csar')
+        shutil.copytree(self._sample_dir("sample1"), csar_dir)
+
+        vnfd_1 = vnfd_utils.Vnfd(SAMPLE_VNFD_ID)
+        vnfd_1.init_from_csar_dir(csar_dir)
+        vnfd_2 = vnfd_utils.Vnfd(SAMPLE_VNFD_ID)
+        vnfd_2.init_from_csar_dir(csar_dir)
+        # parsed contents are shared
+        self.assertIs(vnfd_1.definitions, vnfd_2.definitions)
+        self.assertEqual(1, len(vnfd_utils.VNFD_CACHE.entries))
+
+        # derived lookups are memoized but a copy is returned
+        nodes = vnfd_1.get_vdu_nodes(SAMPLE_FLAVOUR_ID)
+        nodes.pop('VDU1')
+        self.assertIn('VDU1', vnfd_2.get_vdu_nodes(SAMPLE_FLAVOUR_ID))
+
+        # files are updated
+        path = os.path.join(csar_dir, 'Definitions',
+                            'ut_sample1_df_simple.yaml')
+        with open(path, 'a') as f:
+            f.write('\n# updated\n')
+        vnfd_3 = vnfd_utils.Vnfd(SAMPLE_VNFD_ID)
+        vnfd_3.init_from_csar_dir(csar_dir)
+        self.assertIsNot(vnfd_1.definitions, vnfd_3.definitions)
+        self.assertEqual(2, len(vnfd_utils.VNFD_CACHE.entries))
+
+        # invalidate
+        vnfd_utils.VNFD_CACHE.invalidate(SAMPLE_VNFD_ID)
+        self.assertEqual(0, len(vnfd_utils.VNFD_CACHE.entries))
+        self.assertEqual(0, vnfd_utils.VNFD_CACHE.size)
+
+        # no cache
+        vnfd_utils.CONF.set_override('vnfd_cache_size', 0, group='v2_vnfm')
+        self.addCleanup(vnfd_utils.CONF.clear_override, 'vnfd_cache_size',
+                        group='v2_vnfm')
+        vnfd_4 = vnfd_utils.Vnfd(SAMPLE_VNFD_ID)
+        vnfd_4.init_from_csar_dir(csar_dir)
+        self.assertEqual(0, len(vnfd_utils.VNFD_CACHE.entries))
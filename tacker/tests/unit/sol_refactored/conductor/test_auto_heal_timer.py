@@ -0,0 +1,97 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+import threading
+
+from oslo_utils import timeutils
+
+from tacker import context
+from tacker.sol_refactored.conductor import auto_heal_timer
+from tacker.sol_refactored import objects
+from tacker.tests.unit.db import base as db_base
+
+
+SOURCE = 'test'
+
+
+class TestAutoHealTimer(db_base.SqlTestCase):
+
+    def setUp(self):
+        super(TestAutoHealTimer, self).setUp()
+        objects.register_all()
+        self.context = context.get_admin_context()
+        # NOTE: the thread of the timer is left after the test. it is
+        # made not to access DB after the test.
+        self.config_fixture.config(group='v2_vnfm',
+                                   auto_heal_timer_poll_interval=3600)
+        self.timer = auto_heal_timer.AutoHealTimer()
+        self.healed = []
+        self.heal_event = threading.Event()
+        self.timer.register(SOURCE, self._heal)
+
+    def _heal(self, vnf_instance_id, vnfc_instance_ids):
+        self.healed.append((vnf_instance_id, vnfc_instance_ids))
+        self.heal_event.set()
+
+    def _get(self, vnf_instance_id):
+        return objects.AutoHealTimerV2.get_by_id(
+            self.context, auto_heal_timer.timer_id(SOURCE, vnf_instance_id))
+
+    def test_expire(self):
+        self.timer.add(SOURCE, 'inst1', ['c1', 'c2'], 1)
+        self.timer.add(SOURCE, 'inst1', ['c2', 'c3'], 1)
+        self.timer.add(SOURCE, 'inst2', ['c4'], 3600)
+        self.timer.add(SOURCE, 'inst3', ['c5'], 1)
+        self.timer.cancel(SOURCE, 'inst3')
+        self.assertEqual(2, len(self.timer.scheduled))
+
+        # one thread for all timers
+        self.timer.start()
+        self.assertTrue(self.heal_event.wait(10))
+        self.assertEqual([('inst1', ['c1', 'c2', 'c3'])], self.healed)
+        self.assertIsNone(self._get('inst1'))
+        self.assertEqual(['c4'], self._get('inst2').vnfcInstanceIds)
+        self.assertIsNone(self._get('inst3'))
+
+    def test_expire_taken_over(self):
+        # the timer stored by another conductor
+        due = timeutils.utcnow() - datetime.timedelta(seconds=1)
+        objects.AutoHealTimerV2(
+            id=auto_heal_timer.timer_id(SOURCE, 'inst1'),
+            source=SOURCE,
+            vnfInstanceId='inst1',
+            vnfcInstanceIds=['c1'],
+            dueTime=due).create(self.context)
+
+        self.timer.start()
+        self.assertTrue(self.heal_event.wait(10))
+        self.assertEqual([('inst1', ['c1'])], self.healed)
+        self.assertIsNone(self._get('inst1'))
+
+    def test_expire_already_done(self):
+        t_id = auto_heal_timer.timer_id(SOURCE, 'inst1')
+        # expired on another conductor
+        self.timer._expire(t_id)
+        self.assertEqual([], self.healed)
+
+        # canceled and added again
+        self.timer.add(SOURCE, 'inst1', ['c1'], 60)
+        with self.timer.cond:
+            self.timer.scheduled.clear()
+        self.timer._expire(t_id)
+        self.assertEqual([], self.healed)
+        self.assertIn(t_id, self.timer.scheduled)
+        self.assertEqual(['c1'], self._get('inst1').vnfcInstanceIds)
@@ -25,7 +25,9 @@ from tooz.drivers import file
 from tacker import context
 from tacker.sol_refactored.common import exceptions as sol_ex
 from tacker.sol_refactored.common import lcm_op_occ_utils as lcmocc_utils
+from tacker.sol_refactored.conductor import auto_heal_timer
 from tacker.sol_refactored.conductor import conductor_v2
+from tacker.sol_refactored.conductor import lcm_op_scheduler
 from tacker.sol_refactored.conductor import vnflcm_driver_v2
 from tacker.sol_refactored.nfvo import nfvo_client
 from tacker.sol_refactored import objects
@@ -44,8 +46,18 @@ class TestConductorV2(db_base.SqlTestCase):
     def setUp(self):
         super(TestConductorV2, self).setUp()
         objects.register_all()
-        self.conductor = conductor_v2.ConductorV2()
+        # NOTE: the timer thread is not started not to access DB in
+        # the background.
+        with mock.patch.object(auto_heal_timer.AUTO_HEAL_TIMER, 'start'):
+            self.conductor = conductor_v2.ConductorV2()
         self.context = context.get_admin_context()
+        # NOTE: LCM operations are executed in the calling thread not to
+        # access DB in the background.
+        patcher = mock.patch.object(
+            lcm_op_scheduler.LcmOpScheduler, '_dispatch',
+            lambda scheduler, entry: scheduler._run(entry))
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def _create_inst_and_lcmocc(
             self, op_state=fields.LcmOperationStateType.STARTING,
@@ -611,6 +623,42 @@ class TestConductorV2(db_base.SqlTestCase):
         expected = ex.make_problem_details()
         self.assertEqual(expected, lcmocc.error.to_dict())
 
+    @mock.patch.object(nfvo_client.NfvoClient, 'send_lcmocc_notification')
+    def test_change_lcm_op_state_bulk(self, mocked_send_lcmocc_notification):
+        # prepare
+        states = [fields.LcmOperationStateType.STARTING,
+                  fields.LcmOperationStateType.STARTING,
+                  fields.LcmOperationStateType.PROCESSING,
+                  fields.LcmOperationStateType.ROLLING_BACK,
+                  fields.LcmOperationStateType.COMPLETED]
+        lcmoccs = [self._prepare_change_lcm_op_state(state)
+                   for state in states]
+
+        # run _change_lcm_op_state
+        mocked_update_by_filter = mock.patch.object(
+            objects.VnfLcmOpOccV2, 'update_by_filter',
+            wraps=objects.VnfLcmOpOccV2.update_by_filter).start()
+        mocked_get_by_ids = mock.patch.object(
+            objects.VnfInstanceV2, 'get_by_ids',
+            wraps=objects.VnfInstanceV2.get_by_ids).start()
+        self.addCleanup(mock.patch.stopall)
+        self.conductor._change_lcm_op_state()
+
+        # one UPDATE per state and one query for vnf instances
+        self.assertEqual(3, mocked_update_by_filter.call_count)
+        self.assertEqual(1, mocked_get_by_ids.call_count)
+        self.assertEqual(4, mocked_send_lcmocc_notification.call_count)
+
+        expected = [fields.LcmOperationStateType.ROLLED_BACK,
+                    fields.LcmOperationStateType.ROLLED_BACK,
+                    fields.LcmOperationStateType.FAILED_TEMP,
+                    fields.LcmOperationStateType.FAILED_TEMP,
+                    fields.LcmOperationStateType.COMPLETED]
+        for lcmocc, state in zip(lcmoccs, expected):
+            lcmocc = lcmocc_utils.get_lcmocc(self.context, lcmocc.id)
+            self.assertEqual(state, lcmocc.operationState)
+        self.assertFalse(lcmocc.obj_attr_is_set('error'))
+
     def test_start_lcm_op_abnormal(self):
         # prepare
         lcmocc = self._create_inst_and_lcmocc(
@@ -774,6 +822,72 @@ class TestConductorV2(db_base.SqlTestCase):
                f'{vnf_instance_obj.id} Error: ')
         self.assertIn(f'{msg}', cm.output[1])
 
+    @mock.patch.object(vnflcm_driver_v2.VnfLcmDriverV2, 'diff_check_inst')
+    @mock.patch.object(client.CoreV1Api, 'list_namespaced_pod')
+    @mock.patch.object(objects.base.TackerPersistentObject, "get_by_filter")
+    def test_sync_db_group_and_skip_unchanged(
+            self, mock_get_by_filters, mock_list_namespaced_pod,
+            mock_diff_check_inst):
+        vim_connection_object = fakes.fake_vim_connection_info()
+        insts = []
+        for _ in range(2):
+            inst = fakes.fake_vnf_instance()
+            inst.id = uuidutils.generate_uuid()
+            inst.instantiatedVnfInfo.vnfcResourceInfo = []
+            inst.vimConnectionInfo['vim1'] = vim_connection_object
+            insts.append(inst)
+        mock_get_by_filters.return_value = insts
+        mock_list_namespaced_pod.return_value = client.V1PodList(
+            items=[fakes.get_fake_pod_info(kind='Pod')])
+        mock_diff_check_inst.side_effect = sol_ex.DbSyncNoDiff("no diff")
+
+        # 1st: pods are listed once for the VIM and namespace
+        self.conductor._sync_db()
+        self.assertEqual(1, mock_list_namespaced_pod.call_count)
+        self.assertEqual(2, mock_diff_check_inst.call_count)
+        self.assertEqual(2, self.conductor.sync_db_stats['no_diff'])
+        self.assertEqual(1, self.conductor.sync_db_stats['groups'])
+
+        # 2nd: nothing changed, so the difference check is skipped
+        self.conductor._sync_db()
+        self.assertEqual(2, mock_list_namespaced_pod.call_count)
+        self.assertEqual(2, mock_diff_check_inst.call_count)
+        self.assertEqual(2, self.conductor.sync_db_stats['skipped'])
+
+        # 3rd: pods changed, so the difference check is done again
+        pod = fakes.get_fake_pod_info(kind='Pod')
+        pod.metadata.name = 'fake_name2'
+        mock_list_namespaced_pod.return_value = client.V1PodList(
+            items=[fakes.get_fake_pod_info(kind='Pod'), pod])
+        self.conductor._sync_db()
+        self.assertEqual(4, mock_diff_check_inst.call_count)
+        self.assertEqual(0, self.conductor.sync_db_stats['skipped'])
+
+    @mock.patch.object(vnflcm_driver_v2.VnfLcmDriverV2, 'diff_check_inst')
+    @mock.patch.object(client.CoreV1Api, 'list_namespaced_pod')
+    @mock.patch.object(objects.base.TackerPersistentObject, "get_by_filter")
+    def test_sync_db_invalid_inst(
+            self, mock_get_by_filters, mock_list_namespaced_pod,
+            mock_diff_check_inst):
+        # no vimConnectionInfo
+        invalid_inst = fakes.fake_vnf_instance()
+        invalid_inst.id = uuidutils.generate_uuid()
+        invalid_inst.vimConnectionInfo = {}
+        inst = fakes.fake_vnf_instance()
+        inst.id = uuidutils.generate_uuid()
+        inst.instantiatedVnfInfo.vnfcResourceInfo = []
+        inst.vimConnectionInfo['vim1'] = fakes.fake_vim_connection_info()
+        mock_get_by_filters.return_value = [invalid_inst, inst]
+        mock_list_namespaced_pod.return_value = client.V1PodList(
+            items=[fakes.get_fake_pod_info(kind='Pod')])
+        mock_diff_check_inst.side_effect = sol_ex.DbSyncNoDiff("no diff")
+
+        # the other instances are synchronized
+        self.conductor._sync_db()
+        self.assertEqual(1, self.conductor.sync_db_stats['failed'])
+        self.assertEqual(1, self.conductor.sync_db_stats['no_diff'])
+        self.assertEqual(1, mock_diff_check_inst.call_count)
+
     @mock.patch.object(file.FileLock, 'acquire')
     @mock.patch.object(kubernetes_driver.Kubernetes,
                        '_check_pod_information')
@@ -0,0 +1,193 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+from unittest import mock
+
+from tacker import context
+from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
+from tacker.sol_refactored.conductor import lcm_op_scheduler
+from tacker.sol_refactored import objects
+from tacker.sol_refactored.objects.v2 import fields
+from tacker.tests import base
+
+
+CONF = lcm_op_scheduler.CONF
+
+
+class TestLcmOpScheduler(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestLcmOpScheduler, self).setUp()
+        objects.register_all()
+        self.scheduler = lcm_op_scheduler.LcmOpScheduler()
+        # {lcmocc_id: vim_key}
+        self.vims = {}
+        patcher = mock.patch.object(
+            lcm_op_scheduler.LcmOpScheduler, 'get_vim_key',
+            side_effect=lambda ctx, lcmocc: self.vims[lcmocc.id])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _set_limit(self, name, value):
+        CONF.set_override(name, value, group='v2_vnfm')
+        self.addCleanup(CONF.clear_override, name, group='v2_vnfm')
+
+    def _op(self, lcmocc_id, operation, tenant, vim='vim1'):
+        self.vims[lcmocc_id] = vim
+        ctx = context.Context('user', tenant)
+        lcmocc = objects.VnfLcmOpOccV2(id=lcmocc_id, operation=operation)
+        return ctx, lcmocc
+
+    def _submit(self, ctx, lcmocc, admitted, event=None):
+        def _run():
+            admitted.append(lcmocc.id)
+            if event is not None:
+                event.wait(10)
+
+        self.scheduler.submit(ctx, lcmocc, _run)
+
+    def _wait_running(self, num):
+        for _ in range(500):
+            if self.scheduler.get_state()['running'] == num:
+                return
+            time.sleep(0.01)
+        self.fail("operations are not admitted.")
+
+    def test_submit_priority_and_fairness(self):
+        self._set_limit('lcm_op_max_concurrency', 1)
+        admitted = []
+        release = threading.Event()
+
+        self._submit(*self._op('first', fields.LcmOperationType.SCALE, 'A'),
+                     admitted, release)
+        self._wait_running(1)
+        ops = [('inst', fields.LcmOperationType.INSTANTIATE, 'A'),
+               ('scale-a1', fields.LcmOperationType.SCALE, 'A'),
+               ('scale-a2', fields.LcmOperationType.SCALE, 'A'),
+               ('scale-b', fields.LcmOperationType.SCALE, 'B'),
+               ('heal', fields.LcmOperationType.HEAL, 'B')]
+        # the caller is not blocked by the queued operations.
+        for lcmocc_id, operation, tenant in ops:
+            self._submit(*self._op(lcmocc_id, operation, tenant), admitted)
+
+        state = self.scheduler.get_state()
+        self.assertEqual(1, state['running'])
+        self.assertEqual({'vim1': 1}, state['running_per_vim'])
+        self.assertEqual(5, state['waiting'])
+        self.assertEqual({'A': 3, 'B': 2}, state['waiting_per_tenant'])
+        self.assertEqual(3, state['waiting_per_operation']['SCALE'])
+
+        release.set()
+        self.assertTrue(self.scheduler.wait(10))
+
+        # heal first, round robin across tenants and instantiate last.
+        self.assertEqual(
+            ['first', 'heal', 'scale-a1', 'scale-b', 'scale-a2', 'inst'],
+            admitted)
+        state = self.scheduler.get_state()
+        self.assertEqual(0, state['running'])
+        self.assertEqual(0, state['waiting'])
+        self.assertEqual(6, state['admitted'])
+
+    def test_submit_per_vim(self):
+        self._set_limit('lcm_op_max_concurrency_per_vim', 1)
+        admitted = []
+        release = threading.Event()
+
+        self._submit(*self._op('first', fields.LcmOperationType.SCALE, 'A'),
+                     admitted, release)
+        self._wait_running(1)
+        self._submit(*self._op('vim1-op', fields.LcmOperationType.HEAL, 'A'),
+                     admitted)
+        # another VIM is not blocked.
+        self._submit(*self._op('vim2-op', fields.LcmOperationType.SCALE, 'A',
+                               vim='vim2'), admitted)
+        self._wait_running(1)
+        self.assertEqual(['first', 'vim2-op'], admitted)
+        self.assertEqual(1, self.scheduler.get_state()['waiting'])
+
+        release.set()
+        self.assertTrue(self.scheduler.wait(10))
+        self.assertEqual(['first', 'vim2-op', 'vim1-op'], admitted)
+
+    def test_submit_no_limit(self):
+        admitted = []
+        release = threading.Event()
+        self._submit(*self._op('first', fields.LcmOperationType.SCALE, 'A'),
+                     admitted, release)
+        self._submit(*self._op('second', fields.LcmOperationType.SCALE, 'A'),
+                     admitted, release)
+        self._wait_running(2)
+        release.set()
+        self.assertTrue(self.scheduler.wait(10))
+        self.assertEqual({'first', 'second'}, set(admitted))
+
+    def test_submit_error(self):
+        self._set_limit('lcm_op_max_concurrency', 1)
+        admitted = []
+
+        def _fail():
+            raise Exception('test')
+
+        self.scheduler.submit(
+            *self._op('first', fields.LcmOperationType.SCALE, 'A'), _fail)
+        self._submit(*self._op('second', fields.LcmOperationType.SCALE, 'A'),
+                     admitted)
+        # the slot is released even if the operation fails.
+        self.assertTrue(self.scheduler.wait(10))
+        self.assertEqual(['second'], admitted)
+
+
+class TestLcmOpSchedulerVimKey(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestLcmOpSchedulerVimKey, self).setUp()
+        objects.register_all()
+
+    @mock.patch.object(inst_utils, 'get_inst')
+    def test_get_vim_key(self, mock_inst):
+        scheduler = lcm_op_scheduler.LcmOpScheduler()
+        ctx = context.get_admin_context()
+        inst = objects.VnfInstanceV2(
+            id='inst', vimConnectionInfo={
+                'vim1': objects.VimConnectionInfo(
+                    vimId='vim-inst', vimType='ETSINFV.OPENSTACK_KEYSTONE.V_2')
+            })
+        mock_inst.return_value = inst
+        lcmocc = objects.VnfLcmOpOccV2(
+            id='op', vnfInstanceId='inst',
+            operation=fields.LcmOperationType.SCALE)
+        self.assertEqual('vim-inst', scheduler.get_vim_key(ctx, lcmocc))
+
+        # the VIM of the instantiate request is merged to the instance.
+        lcmocc = objects.VnfLcmOpOccV2(
+            id='op', vnfInstanceId='inst',
+            operation=fields.LcmOperationType.INSTANTIATE,
+            operationParams=objects.InstantiateVnfRequest(flavourId='small'))
+        self.assertEqual('vim-inst', scheduler.get_vim_key(ctx, lcmocc))
+        lcmocc.operationParams.vimConnectionInfo = {
+            'vim1': objects.VimConnectionInfo(
+                vimId='vim-req', vimType='ETSINFV.OPENSTACK_KEYSTONE.V_2')
+        }
+        self.assertEqual('vim-req', scheduler.get_vim_key(ctx, lcmocc))
+
+        # default VIM
+        inst.vimConnectionInfo = {}
+        lcmocc.operationParams = objects.InstantiateVnfRequest(
+            flavourId='small')
+        self.assertEqual(lcm_op_scheduler.DEFAULT_VIM,
+                         scheduler.get_vim_key(ctx, lcmocc))
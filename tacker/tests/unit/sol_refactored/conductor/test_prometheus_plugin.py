@@ -13,9 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
+from oslo_log import log as logging
 
 from tacker import context
+from tacker.sol_refactored.conductor import auto_heal_timer
 from tacker.sol_refactored.conductor import conductor_v2
 from tacker.sol_refactored.conductor import prometheus_plugin_driver as pp_drv
 from tacker.sol_refactored.conductor import vnflcm_auto
@@ -119,10 +120,12 @@ class TestPrometheusPlugin(db_base.SqlTestCase):
         self.context = context.get_admin_context()
         self.request = mock.Mock()
         self.request.context = self.context
-        self.timer_test = (None, None)
         self.config_fixture.config(
             group='prometheus_plugin', performance_management=True)
-        self.conductor = conductor_v2.ConductorV2()
+        # NOTE: the timer thread is not started not to access DB in
+        # the background.
+        with mock.patch.object(auto_heal_timer.AUTO_HEAL_TIMER, 'start'):
+            self.conductor = conductor_v2.ConductorV2()
 
     def tearDown(self):
         super(TestPrometheusPlugin, self).tearDown()
@@ -138,62 +141,38 @@ class TestPrometheusPlugin(db_base.SqlTestCase):
 
     def test_conductor_vnfm_auto_heal_queue(self):
         self.config_fixture.config(
-            group='prometheus_plugin', timer_interval=1)
+            group='prometheus_plugin', timer_interval=60)
         # queueing test
         id = 'test_id'
         self.conductor.enqueue_auto_heal_instance(
             self.context, id, 'id')
         self.conductor.enqueue_auto_heal_instance(
             self.context, id, 'id2')
-        self.assertEqual(
-            self.conductor.prom_driver.timer_map[id].queue,
-            {'id', 'id2'})
-        # Since the timeout period of `VnfmAutoHealTimer` is set to 1 second,
-        # it is also necessary to wait for 1 second before asserting.
-        time.sleep(1)
+        self.conductor.enqueue_auto_heal_instance(
+            self.context, id, 'id')
+        timer = objects.AutoHealTimerV2.get_by_id(
+            self.context,
+            auto_heal_timer.timer_id(pp_drv.TIMER_SOURCE, id))
+        self.assertEqual(['id', 'id2'], timer.vnfcInstanceIds)
         # remove_timer test
         self.conductor.dequeue_auto_heal_instance(self.context, id)
-        self.assertNotIn(id, self.conductor.prom_driver.timer_map)
+        self.assertIsNone(objects.AutoHealTimerV2.get_by_id(
+            self.context,
+            auto_heal_timer.timer_id(pp_drv.TIMER_SOURCE, id)))
         # remove_timer test: invalid_id
         self.conductor.dequeue_auto_heal_instance(
             self.context, 'invalid_id')
 
     @mock.patch.object(vnflcm_auto, 'auto_heal')
     def test_conductor_timer_expired(self, mock_do_heal):
-        self.conductor.prom_driver._timer_expired(
-            self.context, 'test_id', ['id'])
-
-    def expired(self, context, id, queue):
-        queue.sort()
-        self.timer_test = (id, queue)
-
-    def test_timer(self):
-        # queueing test
-        timer = pp_drv.VnfmAutoHealTimer(self.context, 'id', 1, self.expired)
-        timer.add_vnfc_info_id('1')
-        timer.add_vnfc_info_id('3')
-        # Since the timeout period of `VnfmAutoHealTimer` is set to 1 second,
-        # it is also necessary to wait for 2 second before asserting.
-        time.sleep(2)
-        self.assertEqual(self.timer_test[0], 'id')
-        self.assertEqual(self.timer_test[1], ['1', '3'])
-
-    def test_timer_cancel(self):
-        # cancel test
-        timer = pp_drv.VnfmAutoHealTimer(self.context, 'id2', 1, self.expired)
-        timer.add_vnfc_info_id('5')
-        timer.cancel()
-        # Since the timeout period of `VnfmAutoHealTimer` is set to 1 second,
-        # it is also necessary to wait for 2 second before asserting.
-        time.sleep(2)
-        self.assertIsNone(self.timer_test[0])
-        self.assertIsNone(self.timer_test[1])
-
-    def test_timer_destructor(self):
-        # method call after cancel()
-        timer = pp_drv.VnfmAutoHealTimer(self.context, 'id', 1, self.expired)
-        timer.cancel()
-        timer.expire()
-        timer.add_vnfc_info_id(['4'])
-        timer.cancel()
-        timer.__del__()
+        self.conductor.prom_driver._timer_expired('test_id', ['id'])
+        mock_do_heal.assert_called_once()
+        self.assertEqual({'vnfcInstanceId': ['id']},
+                         mock_do_heal.call_args[0][2])
+
+    def test_conductor_timer_expired_error(self):
+        log_name = "tacker.sol_refactored.conductor.prometheus_plugin_driver"
+        with self.assertLogs(logger=log_name, level=logging.ERROR) as cm:
+            self.conductor.prom_driver._timer_expired('test_id', ['id'])
+        msg = f'ERROR:{log_name}:VNFM AutoHealing is failed:'
+        self.assertIn(msg, cm.output[0])
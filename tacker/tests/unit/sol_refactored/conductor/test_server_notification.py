@@ -13,13 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import time
-import webob
-
 from oslo_log import log as logging
 
 from tacker import context
-from tacker.sol_refactored.common import http_client
+from tacker.sol_refactored.conductor import auto_heal_timer
 from tacker.sol_refactored.conductor import conductor_v2
 from tacker.sol_refactored.conductor import server_notification_driver as snd
 from tacker.sol_refactored.conductor import vnflcm_auto
@@ -35,33 +32,32 @@ class TestServerNotification(db_base.SqlTestCase):
         self.context = context.get_admin_context()
         self.request = mock.Mock()
         self.request.context = self.context
-        self.timer_test = (None, None)
         self.config_fixture.config(
             group='server_notification', server_notification=True)
-        self.conductor = conductor_v2.ConductorV2()
+        # NOTE: the timer thread is not started not to access DB in
+        # the background.
+        with mock.patch.object(auto_heal_timer.AUTO_HEAL_TIMER, 'start'):
+            self.conductor = conductor_v2.ConductorV2()
 
     def tearDown(self):
         super(TestServerNotification, self).tearDown()
 
-    @mock.patch.object(http_client.HttpClient, 'do_request')
-    def test_conductor_notify_server_notification(self, mock_do_request):
+    def test_conductor_notify_server_notification(self):
         self.config_fixture.config(
-            group='server_notification', timer_interval=1)
-        resp = webob.Response()
-        resp.status_code = 202
-        mock_do_request.return_value = resp, {}
+            group='server_notification', timer_interval=60)
         # queueing test
         id = 'test_id'
         self.conductor.server_notification_notify(
             self.context, id, ['id'])
         self.conductor.server_notification_notify(
-            self.context, id, ['id2', 'id3'])
-        self.assertEqual(
-            self.conductor.sn_driver.timer_map[id].queue, ['id', 'id2', 'id3'])
-        time.sleep(2)
+            self.context, id, ['id2', 'id3', 'id'])
+        timer = objects.AutoHealTimerV2.get_by_id(
+            self.context, auto_heal_timer.timer_id(snd.TIMER_SOURCE, id))
+        self.assertEqual(['id', 'id2', 'id3'], timer.vnfcInstanceIds)
         # remove_timer test
         self.conductor.server_notification_remove_timer(self.context, id)
-        self.assertNotIn(id, self.conductor.sn_driver.timer_map)
+        self.assertIsNone(objects.AutoHealTimerV2.get_by_id(
+            self.context, auto_heal_timer.timer_id(snd.TIMER_SOURCE, id)))
         # remove_timer test: invalid_id
         self.conductor.server_notification_remove_timer(
             self.context, 'invalid_id')
@@ -69,6 +65,7 @@ class TestServerNotification(db_base.SqlTestCase):
     @mock.patch.object(vnflcm_auto, 'auto_heal')
     def test_conductor_timer_expired(self, mock_heal):
         self.conductor.sn_driver.timer_expired('test_id', ['id'])
+        mock_heal.assert_called_once()
 
     def test_conductor_timer_expired_error(self):
         log_name = "tacker.sol_refactored.conductor.server_notification_driver"
@@ -76,37 +73,3 @@ class TestServerNotification(db_base.SqlTestCase):
             self.conductor.sn_driver.timer_expired('test_id', ['id'])
         msg = f'ERROR:{log_name}:server_notification auto healing is failed:'
         self.assertIn(msg, cm.output[1])
-
-    def expired(self, id, queue):
-        queue.sort()
-        self.timer_test = (id, queue)
-
-    def test_timer(self):
-        # queueing test
-        timer = snd.ServerNotificationTimer(
-            'id', 1, self.expired)
-        timer.append(['1', '2'])
-        timer.append(['3', '4'])
-        time.sleep(2)
-        self.assertEqual(self.timer_test[0], 'id')
-        self.assertEqual(self.timer_test[1], ['1', '2', '3', '4'])
-
-    def test_timer_cancel(self):
-        # cancel test
-        timer = snd.ServerNotificationTimer(
-            'id2', 1, self.expired)
-        timer.append(['5'])
-        timer.cancel()
-        time.sleep(2)
-        self.assertIsNone(self.timer_test[0])
-        self.assertIsNone(self.timer_test[1])
-
-    def test_timer_destructor(self):
-        # method call after cancel()
-        timer = snd.ServerNotificationTimer(
-            'id', 1, self.expired)
-        timer.cancel()
-        timer.expire()
-        timer.append(['4'])
-        timer.cancel()
-        timer.__del__()
@@ -13,40 +13,29 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 from unittest import mock
 
 from oslo_utils import uuidutils
 
 from tacker import context
+from tacker.sol_refactored.common import fm_alarm_utils as alarm_utils
 from tacker.sol_refactored.common import fm_subscription_utils
 from tacker.sol_refactored.common import subscription_utils as subsc_utils
-from tacker.sol_refactored.common import vnf_instance_utils as inst_utils
 from tacker.sol_refactored.conductor import vnffm_driver_v1
 from tacker.sol_refactored import objects
-from tacker.tests import base
+from tacker.tests.unit.db import base as db_base
 from tacker.tests.unit.sol_refactored.common import fakes_for_fm
 
 
-class TestVnffmDriverV1(base.BaseTestCase):
+class TestVnffmDriverV1(db_base.SqlTestCase):
 
     def setUp(self):
         super(TestVnffmDriverV1, self).setUp()
         objects.register_all()
         self.driver = vnffm_driver_v1.VnfFmDriverV1()
         self.context = context.get_admin_context()
-
-    @mock.patch.object(subsc_utils, 'send_notification')
-    @mock.patch.object(fm_subscription_utils, 'get_alarm_subscs')
-    @mock.patch.object(objects.base.TackerPersistentObject, 'create')
-    @mock.patch.object(objects.base.TackerPersistentObject, 'update')
-    @mock.patch.object(inst_utils, 'get_inst')
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_id')
-    def test_store_alarm_info(self, mock_alarm, mock_inst, mock_update,
-                              mock_create, mock_subscs, mock_send_notif):
-        alarm = objects.AlarmV1.from_dict(fakes_for_fm.alarm_example)
-        mock_alarm.return_value = objects.AlarmV1.from_dict(
-            fakes_for_fm.alarm_example)
-        mock_inst.return_value = objects.VnfInstanceV2(
+        objects.VnfInstanceV2(
             # required fields
             id=fakes_for_fm.alarm_example['managedObjectId'],
             vnfdId=uuidutils.generate_uuid(),
@@ -55,16 +44,42 @@ class TestVnffmDriverV1(base.BaseTestCase):
             vnfSoftwareVersion='software version',
             vnfdVersion='vnfd version',
             instantiationState='INSTANTIATED'
-        )
+        ).create(self.context)
+
+    def _alarm(self, alarm_id, cleared=False, inst_id=None):
+        alarm = copy.deepcopy(fakes_for_fm.alarm_example)
+        alarm['id'] = alarm_id
+        if inst_id is not None:
+            alarm['managedObjectId'] = inst_id
+        if not cleared:
+            del alarm['alarmClearedTime']
+        return objects.AlarmV1.from_dict(alarm)
+
+    @mock.patch.object(subsc_utils, 'send_notification')
+    @mock.patch.object(fm_subscription_utils, 'get_alarm_subscs')
+    def test_store_alarms_info(self, mock_subscs, mock_send_notif):
         mock_subscs.return_value = [objects.FmSubscriptionV1.from_dict(
             fakes_for_fm.fm_subsc_example)]
-        self.driver.store_alarm_info(self.context, alarm)
-        self.assertEqual(0, mock_create.call_count)
-        self.assertEqual(1, mock_update.call_count)
-        self.assertEqual(1, mock_send_notif.call_count)
-
-        mock_alarm.return_value = None
-        self.driver.store_alarm_info(self.context, alarm)
-        self.assertEqual(1, mock_create.call_count)
-        self.assertEqual(1, mock_update.call_count)
+        self.driver.store_alarms_info(
+            self.context, [self._alarm('alarm1'), self._alarm('alarm2')])
+        self.assertEqual(2, len(alarm_utils.get_not_cleared_alarms(
+            self.context, fakes_for_fm.alarm_example['managedObjectId'])))
+        # subscriptions are matched once for the alarms of the same
+        # attributes.
+        self.assertEqual(1, mock_subscs.call_count)
         self.assertEqual(2, mock_send_notif.call_count)
+
+        # alarm1 is cleared and alarm3 is raised.
+        # the alarm of the VNF instance not exist is stored but not
+        # notified.
+        self.driver.store_alarms_info(
+            self.context, [self._alarm('alarm1', cleared=True),
+                           self._alarm('alarm3'),
+                           self._alarm('alarm4', inst_id='not_exist')])
+        self.assertEqual(
+            ['alarm2', 'alarm3'],
+            sorted(alarm.id for alarm in alarm_utils.get_not_cleared_alarms(
+                self.context, fakes_for_fm.alarm_example['managedObjectId'])))
+        self.assertIsNotNone(alarm_utils.get_alarm(self.context, 'alarm4'))
+        self.assertEqual(3, mock_subscs.call_count)
+        self.assertEqual(4, mock_send_notif.call_count)
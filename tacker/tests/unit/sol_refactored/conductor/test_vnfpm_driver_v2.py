@@ -13,9 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
 from unittest import mock
 
+from oslo_db import exception as db_exc
+from oslo_utils import timeutils
+
 from tacker.tests import base
+from tacker.tests.unit.db import base as db_base
 
 from tacker import context
 from tacker.sol_refactored.common import pm_job_utils
@@ -34,13 +39,15 @@ class TestVnfPmDriverV2(base.BaseTestCase):
         self.context = context.get_admin_context()
 
     @mock.patch.object(NfvoClient, 'send_pm_job_notification')
-    @mock.patch.object(pm_job_utils, 'update_report')
-    @mock.patch.object(objects.base.TackerPersistentObject, 'update')
-    @mock.patch.object(objects.base.TackerPersistentObject, 'create')
-    def test_store_job_info(self, mock_create, mock_update, mock_update_report,
-                            mock_send):
-        mock_create.return_value = None
-        mock_update.return_value = None
+    @mock.patch.object(pm_job_utils, 'compact_reports')
+    @mock.patch.object(pm_job_utils, 'update_report_index')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_id')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'update_all')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'create_all')
+    def test_store_job_info(self, mock_create_all, mock_update_all,
+                            mock_get_by_id, mock_update_report_index,
+                            mock_compact_reports, mock_send):
+        mock_compact_reports.return_value = set()
         pm_job1 = objects.PmJobV2(
             id='pm_job_id1',
             objectTtype='VNF',
@@ -65,7 +72,7 @@ class TestVnfPmDriverV2(base.BaseTestCase):
             ),
             callbackUri='http://127.0.0.1/callback2'
         )
-        mock_update_report.side_effect = [pm_job1, pm_job2]
+        mock_get_by_id.side_effect = [pm_job1, pm_job2]
         mock_send.return_value = None
         report1 = {
             'id': 'fake_id1',
@@ -95,9 +102,14 @@ class TestVnfPmDriverV2(base.BaseTestCase):
         }
         reports = [report1, report2]
         VnfPmDriverV2().store_job_info(context=self.context, reports=reports)
-        call1 = mock.call(mock.ANY, 'pm_job_id1', mock.ANY, mock.ANY, mock.ANY)
-        call2 = mock.call(mock.ANY, 'pm_job_id2', mock.ANY, mock.ANY, mock.ANY)
-        mock_update_report.assert_has_calls([call1, call2])
+        self.assertEqual(2, mock_create_all.call_count)
+        self.assertEqual(2, mock_update_report_index.call_count)
+        # pm jobs are updated at once
+        mock_update_all.assert_called_once_with(mock.ANY, [pm_job1, pm_job2])
+        self.assertEqual(1, len(pm_job1.reports))
+        self.assertEqual(
+            'http://127.0.0.1:9890/vnfpm/v2/pm_jobs/pm_job_id1/'
+            'reports/fake_id1', pm_job1.reports[0].href)
         call1 = mock.call(mock.ANY, pm_job1, mock.ANY, mock.ANY)
         call2 = mock.call(mock.ANY, pm_job2, mock.ANY, mock.ANY)
         mock_send.assert_has_calls([call1, call2])
@@ -136,9 +148,7 @@ class TestVnfPmDriverV2(base.BaseTestCase):
         VnfPmDriverV2().store_threshold_info(context=self.context,
                                              threshold_states=threshold_states)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'create')
-    def test_store_report(self, mock_create):
-        mock_create.return_value = None
+    def test_make_report(self):
         report = {
             "id": "fake_id",
             "jobId": "fake_job_id",
@@ -152,28 +162,146 @@ class TestVnfPmDriverV2(base.BaseTestCase):
                 }]
             }]
         }
-        result = VnfPmDriverV2()._store_report(context=self.context,
-                                               report=report)
+        result = VnfPmDriverV2()._make_report(report=report)
         self.assertEqual('fake_job_id', result.jobId)
+        self.assertEqual(
+            result.entries[0].performanceValues[0].timeStamp,
+            result.readyTime)
+
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'update')
-    @mock.patch.object(pm_job_utils, 'update_report')
-    def test_update_job_reports(self, mock_update_report, mock_update):
+def _report(report_id, job_id, timestamp, value='1.0'):
+    return {
+        'id': report_id,
+        'jobId': job_id,
+        'entries': [{
+            'objectType': 'Vnf',
+            'objectInstanceId': 'instance_id1',
+            'performanceMetric': 'VCpuUsageMeanVnf.instance_id1',
+            'performanceValues': [{
+                'timeStamp': timestamp.isoformat() + 'Z',
+                'value': value
+            }]
+        }]
+    }
+
+
+class TestVnfPmDriverV2DB(db_base.SqlTestCase):
+
+    def setUp(self):
+        super(TestVnfPmDriverV2DB, self).setUp()
+        objects.register_all()
+        self.context = context.get_admin_context()
+        self.driver = VnfPmDriverV2()
+        self.now = timeutils.utcnow().replace(microsecond=0)
         pm_job = objects.PmJobV2(
             id='pm_job_1',
-            objectTtype='VNF',
-            authentication=objects.SubscriptionAuthentication(
-                authType=["BASIC"],
-                paramsBasic=objects.SubscriptionAuthentication_ParamsBasic(
-                    userName='test',
-                    password='test'
-                ),
-            ),
-            callbackUri='http://127.0.0.1/callback'
+            objectType='Vnf',
+            objectInstanceIds=['instance_id1'],
+            criteria=objects.VnfPmJobCriteriaV2(
+                performanceMetric=['VCpuUsageMeanVnf.instance_id1'],
+                collectionPeriod=60,
+                reportingPeriod=60),
+            callbackUri='http://127.0.0.1/callback',
+            reports=[]
         )
-        mock_update_report.return_value = pm_job
-        mock_update.return_value = None
-        result = VnfPmDriverV2()._update_job_reports(
-            context=self.context, job_id='pm_job_1', report='report',
-            timestamp='timestamp', endpoint='endpoint')
-        self.assertEqual('pm_job_1', result.id)
+        pm_job.create(self.context)
+
+    def _report_ids(self):
+        return [report.id for report in pm_job_utils.get_pm_reports(
+            self.context, 'pm_job_1')]
+
+    @mock.patch.object(NfvoClient, 'send_pm_job_notification')
+    def test_store_job_info(self, mock_send):
+        self.config_fixture.config(group='v2_vnfm',
+                                   vnfpm_pmjob_max_reports=2)
+        reports = [
+            _report(f'report_{i}', 'pm_job_1',
+                    self.now - datetime.timedelta(minutes=3 - i))
+            for i in range(3)
+        ]
+        # the report of the PM job not exist is dropped
+        reports.append(_report('report_x', 'pm_job_x', self.now))
+        self.driver.store_job_info(self.context, reports)
+
+        self.assertEqual(['report_0', 'report_1', 'report_2'],
+                         self._report_ids())
+        pm_job = pm_job_utils.get_pm_job(self.context, 'pm_job_1')
+        # only the latest reports are linked
+        self.assertEqual(
+            ['report_1', 'report_2'],
+            [report.href.rsplit('/', 1)[-1] for report in pm_job.reports])
+        self.assertEqual(3, mock_send.call_count)
+
+        # paging
+        page = pm_job_utils.get_pm_reports(self.context, 'pm_job_1',
+                                           limit=2)
+        self.assertEqual(['report_0', 'report_1'],
+                         [report.id for report in page])
+        marker = objects.PerformanceReportV2.get_paging_marker(page[-1])
+        page = pm_job_utils.get_pm_reports(self.context, 'pm_job_1',
+                                           marker=marker, limit=2)
+        self.assertEqual(['report_2'], [report.id for report in page])
+
+    @mock.patch.object(NfvoClient, 'send_pm_job_notification')
+    def test_store_job_info_compaction(self, mock_send):
+        self.config_fixture.config(group='v2_vnfm',
+                                   vnfpm_report_retention=86400,
+                                   vnfpm_report_rollup_age=3600,
+                                   vnfpm_report_rollup_interval=3600)
+        bucket = self.now.replace(minute=0, second=0) - datetime.timedelta(
+            hours=3)
+        reports = [
+            # expired
+            _report('report_0', 'pm_job_1',
+                    self.now - datetime.timedelta(days=2)),
+            # rolled up
+            _report('report_1', 'pm_job_1',
+                    bucket + datetime.timedelta(minutes=1), '1.0'),
+            _report('report_2', 'pm_job_1',
+                    bucket + datetime.timedelta(minutes=2), '3.0'),
+            # single report in the bucket
+            _report('report_3', 'pm_job_1',
+                    bucket + datetime.timedelta(hours=1)),
+            # not old enough
+            _report('report_4', 'pm_job_1', self.now),
+        ]
+        self.driver.store_job_info(self.context, reports)
+
+        self.assertEqual(['report_2', 'report_3', 'report_4'],
+                         self._report_ids())
+        report = pm_job_utils.get_pm_report(self.context, 'pm_job_1',
+                                            'report_2')
+        value = report.entries[0].performanceValues[0]
+        self.assertEqual(1, len(report.entries[0].performanceValues))
+        self.assertEqual('2.0', value.value)
+        self.assertEqual({'rollupCount': 2, 'min': 1.0, 'max': 3.0},
+                         value.context)
+
+        pm_job = pm_job_utils.get_pm_job(self.context, 'pm_job_1')
+        self.assertEqual(
+            ['report_2', 'report_3', 'report_4'],
+            [report.href.rsplit('/', 1)[-1] for report in pm_job.reports])
+        self.assertEqual(3, mock_send.call_count)
+
+        # the latest report time is indexed even if the report is deleted
+        index = pm_job_utils.get_report_index(self.context, 'pm_job_1')
+        self.assertEqual(1, len(index))
+
+    @mock.patch.object(NfvoClient, 'send_pm_job_notification')
+    @mock.patch.object(pm_job_utils, '_update_report_index')
+    def test_store_job_info_index_conflict(self, mock_update_index,
+                                           mock_send):
+        # the index is inserted by another conductor at the same time
+        # and the retry fails too.
+        mock_update_index.side_effect = db_exc.DBDuplicateEntry()
+        self.driver.store_job_info(
+            self.context, [_report('report_0', 'pm_job_1', self.now)])
+
+        # the reports are committed and notified anyway
+        self.assertEqual(2, mock_update_index.call_count)
+        self.assertEqual(['report_0'], self._report_ids())
+        pm_job = pm_job_utils.get_pm_job(self.context, 'pm_job_1')
+        self.assertEqual(['report_0'],
+                         [report.href.rsplit('/', 1)[-1]
+                          for report in pm_job.reports])
+        mock_send.assert_called_once()
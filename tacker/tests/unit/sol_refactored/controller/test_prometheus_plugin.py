@@ -419,6 +419,44 @@ class TestPrometheusPluginFm(base.TestCase):
         result = self.controller.alert(self.request, _body_fm2)
         self.assertEqual(204, result.status)
 
+    @mock.patch.object(fm_alarm_utils, 'get_not_cleared_alarms')
+    @mock.patch.object(inst_utils, 'get_inst')
+    def test_fm_batch(self, mock_inst, mock_alarms):
+        self.config_fixture.config(
+            group='prometheus_plugin', fault_management=True)
+        mock_alarms.side_effect = lambda context, inst_id: [
+            objects.AlarmV1.from_dict(
+                dict(_not_cleared_alarms, id=f'alarm_{inst_id}',
+                     managedObjectId=inst_id))]
+        mock_inst.return_value = objects.VnfInstanceV2.from_dict(_inst1)
+        mock_callback = mock.Mock()
+        _plugin = plugin.PrometheusPluginFm.instance()
+        _plugin.set_callback(mock_callback)
+
+        # new alarm
+        alert_new = copy.deepcopy(_body_fm_alert1)
+        alert_new['fingerprint'] = 'new_fingerprint'
+        # already firing
+        alert_firing = copy.deepcopy(_body_fm_alert1)
+        alert_firing['labels']['vnf_instance_id'] = 'vnf_instance_id2'
+        body = copy.copy(_body_base)
+        body['alerts'] = [alert_new, _body_fm_alert3, alert_firing]
+        result = self.controller.alert(self.request, body)
+        self.assertEqual(204, result.status)
+
+        # VNF instances and alarms are got once per VNF instance and
+        # the alarms are passed to the conductor at once.
+        self.assertEqual(2, mock_inst.call_count)
+        self.assertEqual(2, mock_alarms.call_count)
+        mock_callback.assert_called_once()
+        alarms = mock_callback.call_args[0][1]
+        self.assertEqual(2, len(alarms))
+        self.assertEqual(['fingerprint: new_fingerprint'],
+                         alarms[0].faultDetails[:1])
+        self.assertFalse(alarms[0].obj_attr_is_set('alarmClearedTime'))
+        self.assertEqual('alarm_vnf_instance_id', alarms[1].id)
+        self.assertTrue(alarms[1].obj_attr_is_set('alarmClearedTime'))
+
     @mock.patch.object(fm_alarm_utils, 'get_not_cleared_alarms')
     @mock.patch.object(inst_utils, 'get_inst')
     def test_fm_set_callback(self, mock_inst, mock_alarms):
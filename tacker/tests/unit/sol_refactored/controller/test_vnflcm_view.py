@@ -18,9 +18,13 @@ from unittest import mock
 from dateutil import parser
 import ddt
 
+from tacker import context
 from tacker.sol_refactored.common import exceptions as sol_ex
 from tacker.sol_refactored.controller import vnflcm_view
+from tacker.sol_refactored import objects
+from tacker.sol_refactored.objects import base as obj_base
 from tacker.tests import base
+from tacker.tests.unit.db import base as db_base
 
 
 class FakeField(object):
@@ -214,6 +218,179 @@ class TestBaseViewBuilder(base.BaseTestCase):
                           "(gt,foo,1,2)")
 
 
+class TestInstanceViewBuilderDB(db_base.SqlTestCase):
+
+    def setUp(self):
+        super(TestInstanceViewBuilderDB, self).setUp()
+        objects.register_all()
+        self.context = context.get_admin_context()
+        self.builder = vnflcm_view.InstanceViewBuilder('endpoint', 2)
+        for i, flavour in enumerate(['small', 'large', 'small', 'small']):
+            inst = objects.VnfInstanceV2(
+                id=f'inst-{i}',
+                vnfdId='vnfd-1',
+                vnfProvider='provider',
+                vnfProductName='product',
+                vnfSoftwareVersion='1.0',
+                vnfdVersion='1.0',
+                instantiationState='INSTANTIATED',
+                vimConnectionInfo={
+                    'vim1': objects.VimConnectionInfo(
+                        vimId=f'vim-{i % 2}',
+                        vimType='ETSINFV.OPENSTACK_KEYSTONE.V_3')
+                },
+                instantiatedVnfInfo=objects.VnfInstanceV2_InstantiatedVnfInfo(
+                    flavourId=flavour,
+                    vnfState='STARTED'),
+                metadata={'flavour': flavour}
+            )
+            inst.create(self.context)
+
+    def _get_dict_all(self, filter, marker=None):
+        filters = self.builder.parse_filter(filter)
+        selector = self.builder.parse_selector({})
+        pager = vnflcm_view.Pager(marker, 'url', self.builder.page_size)
+        result = self.builder.get_dict_all(self.context, filters, selector,
+                                           pager)
+        return filters, list(result)
+
+    def _get_pages(self, builder, filter=None):
+        pages = []
+        marker = None
+        while True:
+            filters = builder.parse_filter(filter)
+            selector = builder.parse_selector({})
+            pager = vnflcm_view.Pager(marker, 'url', builder.page_size)
+            values = builder.get_dict_all(self.context, filters, selector,
+                                          pager)
+            resp_body = builder.detail_dict_list(values, filters, selector,
+                                                 pager)
+            pages.append([item['id'] for item in resp_body])
+            if pager.next_marker is None:
+                return pages
+            marker = pager.next_marker
+
+    def test_is_json_path_filterable(self):
+        inst_cls = objects.VnfInstanceV2
+        self.assertTrue(inst_cls.is_json_path_filterable(
+            ['instantiatedVnfInfo', 'flavourId']))
+        self.assertTrue(inst_cls.is_json_path_filterable(
+            ['vimConnectionInfo', 'vim1', 'vimId']))
+        # top-level attribute
+        self.assertFalse(inst_cls.is_json_path_filterable(['vnfdId']))
+        # not string
+        self.assertFalse(inst_cls.is_json_path_filterable(
+            ['vimConnectionInfo', 'vim1', 'accessInfo']))
+        # key value pairs
+        self.assertFalse(inst_cls.is_json_path_filterable(
+            ['metadata', 'flavour']))
+        # list of objects
+        self.assertFalse(inst_cls.is_json_path_filterable(
+            ['instantiatedVnfInfo', 'vnfcResourceInfo', 'vduId']))
+        # @key
+        self.assertFalse(inst_cls.is_json_path_filterable(
+            ['vimConnectionInfo', vnflcm_view.KeyAttribute()]))
+        # not exist
+        self.assertFalse(inst_cls.is_json_path_filterable(
+            ['instantiatedVnfInfo', 'foo']))
+        self.assertFalse(inst_cls.is_json_path_filterable(
+            ['_links', 'self', 'href']))
+
+    def test_get_dict_all_json_path(self):
+        filters, result = self._get_dict_all(
+            '(eq,instantiatedVnfInfo/flavourId,small)')
+        # pushed down to DB and LIMIT is used
+        self.assertEqual([], filters)
+        self.assertEqual(['inst-0', 'inst-2', 'inst-3'],
+                         sorted(inst['id'] for inst in result))
+
+        filters, result = self._get_dict_all(
+            '(neq,instantiatedVnfInfo/flavourId,small);'
+            '(in,vimConnectionInfo/vim1/vimId,vim-1,vim-2)')
+        self.assertEqual([], filters)
+        self.assertEqual(['inst-1'], [inst['id'] for inst in result])
+
+        filters, result = self._get_dict_all(
+            '(eq,vimConnectionInfo/vim2/vimId,vim-1)')
+        self.assertEqual([], filters)
+        self.assertEqual([], result)
+
+    def test_get_dict_all_json_path_not_pushed_down(self):
+        filters, result = self._get_dict_all('(eq,metadata/flavour,small)')
+        # remains for matching in python
+        self.assertEqual(1, len(filters))
+        self.assertEqual(4, len(result))
+        self.assertEqual({'flavour': 'small'}, result[0]['metadata'])
+
+    def test_get_dict_all_projection(self):
+        inst_cls = objects.VnfInstanceV2
+        with mock.patch.object(obj_base.jsonutils, 'loads',
+                               wraps=obj_base.jsonutils.loads) as mock_loads:
+            result = inst_cls.get_dict_all(
+                self.context, {'vnfdId', 'instantiatedVnfInfo'}, [], None)
+
+        # only the specified columns (and id for paging) are got and
+        # decoded.
+        self.assertEqual(4, mock_loads.call_count)
+        self.assertEqual({'id', 'vnfdId', 'instantiatedVnfInfo'},
+                         set(result[0]))
+        self.assertEqual('small',
+                         result[0]['instantiatedVnfInfo']['flavourId'])
+
+        filters = self.builder.parse_filter(None)
+        selector = self.builder.parse_selector({'fields': 'metadata'})
+        pager = vnflcm_view.Pager(None, 'url', 0)
+        values = self.builder.get_dict_all(self.context, filters, selector,
+                                           pager)
+        resp_body = self.builder.detail_dict_list(values, filters, selector,
+                                                  pager)
+        self.assertEqual({'flavour': 'large'}, resp_body[1]['metadata'])
+        self.assertNotIn('instantiatedVnfInfo', resp_body[1])
+
+    def test_paging(self):
+        self.assertEqual([['inst-0', 'inst-1'], ['inst-2', 'inst-3']],
+                         self._get_pages(self.builder))
+
+        # filtered after getting from DB
+        self.assertEqual([['inst-0', 'inst-2'], ['inst-3']],
+                         self._get_pages(self.builder,
+                                         '(eq,metadata/flavour,small)'))
+
+    def test_paging_lcmocc_start_time(self):
+        start_times = ['2026-01-01T00:00:02+00:00',
+                       '2026-01-01T00:00:01+00:00',
+                       '2026-01-01T00:00:02+00:00',
+                       '2026-01-01T00:00:00+00:00']
+        for i, start_time in enumerate(start_times):
+            start_time = parser.isoparse(start_time)
+            lcmocc = objects.VnfLcmOpOccV2(
+                id=f'lcmocc-{i}',
+                operationState='COMPLETED',
+                stateEnteredTime=start_time,
+                startTime=start_time,
+                vnfInstanceId='inst-0',
+                operation='INSTANTIATE',
+                isAutomaticInvocation=False,
+                isCancelPending=False)
+            lcmocc.create(self.context)
+        builder = vnflcm_view.LcmOpOccViewBuilder('endpoint', 3)
+
+        # ordered by startTime and id
+        self.assertEqual([['lcmocc-3', 'lcmocc-1', 'lcmocc-0'],
+                          ['lcmocc-2']],
+                         self._get_pages(builder))
+
+    def test_paging_invalid_marker(self):
+        for marker in ['inst-0', objects.VnfLcmOpOccV2.get_paging_marker(
+                {'startTime': 'foo', 'id': 'lcmocc-0'})]:
+            pager = vnflcm_view.Pager(marker, 'url', self.builder.page_size)
+            self.assertRaises(sol_ex.InvalidPagingMarker,
+                              list,
+                              self.builder.get_dict_all(
+                                  self.context, [],
+                                  self.builder.parse_selector({}), pager))
+
+
 @ddt.ddt
 class TestPager(base.BaseTestCase):
 
@@ -367,15 +367,42 @@ class TestVnfpmV2(base.BaseTestCase):
                                         body=body)
         self.assertEqual({}, result.body)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_filter')
+    @mock.patch.object(objects.base.TackerPersistentObject,
+                       'delete_by_filter')
     @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_id')
-    def test_delete(self, mock_pm, mock_report):
+    def test_delete(self, mock_pm, mock_delete):
         mock_pm.return_value = objects.PmJobV2(id='pm_job_1')
-        mock_report.return_value = [objects.PerformanceReportV2(
-            id='report_id',
-            jobId='pm_job_1')]
         result = self.controller.delete(self.request, 'pm_job_1')
         self.assertEqual(204, result.status)
+        # reports and report indexes are deleted
+        self.assertEqual(2, mock_delete.call_count)
+        mock_delete.assert_called_with(mock.ANY, jobId='pm_job_1')
+
+    @mock.patch.object(pm_job_utils, 'get_pm_reports')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_id')
+    def test_report_index(self, mock_pm, mock_get):
+        mock_pm.return_value = objects.PmJobV2(id='pm_job_1')
+        mock_get.return_value = [
+            objects.PerformanceReportV2(
+                id=f'report_{i}',
+                jobId='pm_job_1',
+                readyTime=f'2022-06-21T23:4{i}:36Z')
+            for i in range(3)]
+        self.request.GET = {}
+        self.request.url = 'url'
+        self.controller._pm_report_view.page_size = 2
+
+        result = self.controller.report_index(self.request, 'pm_job_1')
+        self.assertEqual(200, result.status)
+        self.assertEqual(
+            [{'href': f'{self.controller.endpoint}/vnfpm/v2/pm_jobs/'
+                      f'pm_job_1/reports/report_{i}',
+              'readyTime': f'2022-06-21T23:4{i}:36Z'} for i in range(2)],
+            result.body)
+        # the next page
+        self.assertIn('nextpage_opaque_marker', result.headers['link'])
+        mock_get.assert_called_once_with(mock.ANY, marker=None, limit=3,
+                                         pm_job_id='pm_job_1')
 
     @mock.patch.object(PmJobViewBuilder, 'report_detail')
     @mock.patch.object(pm_job_utils, 'get_pm_report')
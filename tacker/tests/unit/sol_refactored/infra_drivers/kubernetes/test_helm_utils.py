@@ -13,8 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import base64
+import gzip
 from unittest import mock
 
+from kubernetes import client
+from oslo_serialization import jsonutils
+
 from tacker.sol_refactored.common import exceptions as sol_ex
 from tacker.sol_refactored.infra_drivers.kubernetes import helm_utils
 from tacker.tests.unit import base
@@ -32,6 +37,35 @@ class FakeCompletedProcess(object):
         self.stderr = stderr
 
 
+MANIFEST = """---
+# Source: test-chart/templates/service.yaml
+apiVersion: v1
+kind: Service
+metadata:
+  name: vdu1-svc
+---
+# Source: test-chart/templates/deployment.yaml
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: vdu1-deployment
+"""
+
+
+def _release_secret(version, status, manifest=MANIFEST):
+    release = {'name': RELEASE_NAME, 'version': version,
+               'info': {'status': status}, 'manifest': manifest}
+    data = base64.b64encode(gzip.compress(jsonutils.dump_as_bytes(release)))
+    return client.V1Secret(
+        metadata=client.V1ObjectMeta(
+            name=f'sh.helm.release.v1.{RELEASE_NAME}.v{version}',
+            uid=f'uid-{RELEASE_NAME}-{version}',
+            labels={'owner': 'helm', 'name': RELEASE_NAME,
+                    'status': status, 'version': str(version)}),
+        type=helm_utils.HELM_RELEASE_SECRET_TYPE,
+        data={'release': base64.b64encode(data).decode()})
+
+
 class TestHelmClient(base.TestCase):
 
     def setUp(self):
@@ -66,3 +100,85 @@ class TestHelmClient(base.TestCase):
         self.assertRaises(
             sol_ex.HelmOperationFailed,
             self.driver.is_release_exist, RELEASE_NAME, NAMESPACE)
+
+    @mock.patch.object(helm_utils.HelmClient, '_execute_command')
+    def test_install(self, mock_execute_command):
+        mock_execute_command.return_value = FakeCompletedProcess(
+            0, '{"name": "%s", "version": 1}' % RELEASE_NAME, '')
+
+        revision = self.driver.install(RELEASE_NAME, 'chart', NAMESPACE,
+                                       {'replica': 2})
+
+        self.assertEqual('1', revision)
+        helm_command = mock_execute_command.call_args[0][0]
+        self.assertEqual(['--output', 'json'], helm_command[-2:])
+
+
+class TestHelmClientRelease(base.TestCase):
+
+    def setUp(self):
+        super(TestHelmClientRelease, self).setUp()
+        self.driver = helm_utils.HelmClient(mock.Mock(), mock.Mock())
+        self.cache = helm_utils._ManifestCache()
+        patcher = mock.patch.object(helm_utils, '_MANIFEST_CACHE',
+                                    self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch.object(client.CoreV1Api, 'list_namespaced_secret')
+    @mock.patch.object(helm_utils.HelmClient, '_execute_command')
+    def test_get_release(self, mock_execute_command, mock_list_secret):
+        mock_list_secret.return_value = client.V1SecretList(items=[
+            _release_secret(1, 'superseded'),
+            _release_secret(10, 'deployed'),
+            _release_secret(2, 'superseded')])
+
+        release = self.driver.get_release(RELEASE_NAME, NAMESPACE)
+
+        self.assertEqual(10, release.revision)
+        self.assertEqual('deployed', release.status)
+        self.assertTrue(self.driver.is_release_exist(RELEASE_NAME,
+                                                     NAMESPACE))
+        mock_list_secret.assert_called_with(
+            namespace=NAMESPACE,
+            label_selector=f'owner=helm,name={RELEASE_NAME}')
+        # helm command is not used
+        mock_execute_command.assert_not_called()
+
+    @mock.patch.object(client.CoreV1Api, 'list_namespaced_secret')
+    def test_is_release_exist_not_found(self, mock_list_secret):
+        mock_list_secret.return_value = client.V1SecretList(items=[])
+
+        self.assertFalse(self.driver.is_release_exist(RELEASE_NAME,
+                                                      NAMESPACE))
+        self.assertRaises(sol_ex.HelmOperationFailed,
+            self.driver.get_manifest, RELEASE_NAME, NAMESPACE)
+
+    @mock.patch.object(client.CoreV1Api, 'list_namespaced_secret')
+    def test_is_release_exist_api_error(self, mock_list_secret):
+        mock_list_secret.side_effect = client.ApiException(status=403)
+
+        self.assertRaises(sol_ex.HelmOperationFailed,
+            self.driver.is_release_exist, RELEASE_NAME, NAMESPACE)
+
+    @mock.patch.object(helm_utils, 'decode_release',
+                       wraps=helm_utils.decode_release)
+    @mock.patch.object(client.CoreV1Api, 'list_namespaced_secret')
+    def test_get_manifest(self, mock_list_secret, mock_decode):
+        mock_list_secret.return_value = client.V1SecretList(items=[
+            _release_secret(1, 'deployed')])
+
+        result = self.driver.get_manifest(RELEASE_NAME, NAMESPACE)
+        self.assertEqual(['Service', 'Deployment'],
+                         [res['kind'] for res in result])
+
+        # modifying the result does not affect the cache
+        result[0]['metadata']['namespace'] = NAMESPACE
+        result = self.driver.get_manifest(RELEASE_NAME, NAMESPACE)
+        self.assertNotIn('namespace', result[0]['metadata'])
+        self.assertEqual(1, mock_decode.call_count)
+
+    def test_helm_driver_not_secret(self):
+        with mock.patch.dict('os.environ', {'HELM_DRIVER': 'configmap'}):
+            driver = helm_utils.HelmClient(mock.Mock(), mock.Mock())
+        self.assertIsNone(driver.k8s_api_client)
@@ -14,6 +14,7 @@
 #    under the License.
 
 import os
+import time
 
 from kubernetes import client
 from oslo_utils import uuidutils
@@ -23,6 +24,9 @@ from tacker import context
 from tacker.sol_refactored.common import exceptions as sol_ex
 from tacker.sol_refactored.common import vnfd_utils
 from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes
+from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_common
+from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_resource
+from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_watch
 from tacker.sol_refactored.nfvo import nfvo_client
 from tacker.sol_refactored import objects
 from tacker.tests.unit import base
@@ -33,6 +37,32 @@ from tacker.tests import utils
 CNF_SAMPLE_VNFD_ID = "b1bb0ce7-ebca-4fa7-95ed-4840d70a1177"
 
 
+def _deployment(name, replicas, ready_replicas):
+    return client.V1Deployment(
+        metadata=client.V1ObjectMeta(name=name),
+        spec=client.V1DeploymentSpec(
+            replicas=replicas, selector=client.V1LabelSelector(),
+            template=client.V1PodTemplateSpec()),
+        status=client.V1DeploymentStatus(
+            replicas=replicas, ready_replicas=ready_replicas))
+
+
+def _pod(name, phase):
+    return client.V1Pod(metadata=client.V1ObjectMeta(name=name),
+                        status=client.V1PodStatus(phase=phase))
+
+
+def _fake_stream(events):
+    # {list function: [event, ...]}
+    def _stream(func, **kwargs):
+        if func in events:
+            return iter(events.pop(func))
+        # no more event
+        time.sleep(0.1)
+        return iter([])
+    return _stream
+
+
 class TestKubernetes(base.TestCase):
 
     def setUp(self):
@@ -98,6 +128,73 @@ class TestKubernetes(base.TestCase):
         self.assertEqual(2, res1.is_update.call_count)
         self.assertEqual(1, res2.is_update.call_count)
 
+    @mock.patch.object(kubernetes_watch.watch.Watch, 'stream')
+    @mock.patch.object(client.AppsV1Api, 'list_namespaced_deployment')
+    @mock.patch.object(kubernetes_resource.Deployment, 'read')
+    def test_wait_k8s_reses_ready_watch(self, mock_read, mock_list,
+            mock_stream):
+        res = kubernetes_resource.Deployment(mock.Mock(), {
+            'kind': 'Deployment',
+            'metadata': {'name': 'vdu1', 'namespace': 'default'}})
+        mock_list.return_value = client.V1DeploymentList(
+            items=[_deployment('vdu1', 2, 0)],
+            metadata=client.V1ListMeta(resource_version='1'))
+        mock_stream.side_effect = _fake_stream({mock_list: [
+            {'type': 'MODIFIED', 'object': _deployment('vdu1', 2, 1)},
+            {'type': 'MODIFIED', 'object': _deployment('vdu1', 2, 2)}]})
+
+        self.driver._wait_k8s_reses_ready([res])
+
+        # resolved by the events without polling
+        mock_read.assert_not_called()
+        mock_list.assert_called_once_with(namespace='default')
+        self.assertEqual('1',
+                         mock_stream.call_args_list[0][1]['resource_version'])
+
+    @mock.patch.object(client.AppsV1Api, 'list_namespaced_deployment')
+    def test_wait_k8s_reses_deleted_watch_not_available(self, mock_list):
+        res = kubernetes_resource.Deployment(mock.Mock(), {
+            'kind': 'Deployment',
+            'metadata': {'name': 'vdu1', 'namespace': 'default'}})
+        res.is_exists = mock.MagicMock(side_effect=[True, False])
+        mock_list.side_effect = client.ApiException(status=403)
+
+        with mock.patch.object(kubernetes_common, 'CHECK_INTERVAL', 0):
+            self.driver._wait_k8s_reses_deleted([res])
+
+        # fall back to polling
+        self.assertEqual(2, res.is_exists.call_count)
+
+    @mock.patch.object(kubernetes_watch.watch.Watch, 'stream')
+    @mock.patch.object(client.CoreV1Api, 'list_namespaced_pod')
+    @mock.patch.object(client.AppsV1Api, 'list_namespaced_deployment')
+    @mock.patch('tacker.sol_refactored.infra_drivers.kubernetes.'
+                'kubernetes_utils.list_namespaced_pods')
+    def test_wait_k8s_reses_updated_watch(self, mock_list_namespaced_pods,
+            mock_list_deployment, mock_list_pod, mock_stream):
+        res = kubernetes_resource.Deployment(mock.Mock(), {
+            'kind': 'Deployment',
+            'metadata': {'name': 'vdu1', 'namespace': 'default'}})
+        old_pod = 'vdu1-5588797866-fs6vb'
+        new_pod = 'vdu1-6dfb4c8d57-x7kp2'
+        mock_list_deployment.return_value = client.V1DeploymentList(
+            items=[_deployment('vdu1', 1, 1)],
+            metadata=client.V1ListMeta(resource_version='1'))
+        mock_list_pod.return_value = client.V1PodList(
+            items=[_pod(old_pod, 'Running')],
+            metadata=client.V1ListMeta(resource_version='1'))
+        mock_stream.side_effect = _fake_stream({mock_list_pod: [
+            {'type': 'ADDED', 'object': _pod(new_pod, 'Pending')},
+            {'type': 'MODIFIED', 'object': _pod(new_pod, 'Running')},
+            {'type': 'DELETED', 'object': _pod(old_pod, 'Running')}]})
+
+        self.driver._wait_k8s_reses_updated([res], mock.Mock(), 'default',
+                                            [old_pod])
+
+        # pods are not listed every check
+        mock_list_namespaced_pods.assert_not_called()
+        mock_list_pod.assert_called_once_with(namespace='default')
+
     def test_check_status_timeout(self):
         res1 = mock.Mock()
         res1.is_ready = mock.MagicMock(return_value=False)
@@ -0,0 +1,124 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import base64
+import os
+import time
+from unittest import mock
+
+from oslo_serialization import jsonutils
+
+from tacker.sol_refactored.common import oidc_utils
+from tacker.sol_refactored.infra_drivers.kubernetes import kubernetes_utils
+from tacker.sol_refactored import objects
+from tacker.tests.unit import base
+
+
+CA_CERT = ("-----BEGIN CERTIFICATE----- MIIDBTCCAe2gAwIBAgIIa76wZDxLNAw"
+           "-----END CERTIFICATE-----")
+
+
+def _id_token(exp):
+    payload = base64.urlsafe_b64encode(
+        jsonutils.dump_as_bytes({'exp': exp})).decode().rstrip('=')
+    return f'header.{payload}.signature'
+
+
+def _vim_info(endpoint='https://127.0.0.1:6443', oidc=False):
+    access_info = {'bearer_token': 'secret_token'}
+    if oidc:
+        access_info = {
+            'oidc_token_url': 'https://127.0.0.1:8443/token',
+            'username': 'user',
+            'password': 'password',
+            'client_id': 'tacker'
+        }
+    return objects.VimConnectionInfo(
+        vimId='vim1',
+        vimType='ETSINFV.KUBERNETES.V_1',
+        interfaceInfo={'endpoint': endpoint, 'ssl_ca_cert': CA_CERT},
+        accessInfo=access_info)
+
+
+class TestK8sApiClientPool(base.TestCase):
+
+    def setUp(self):
+        super(TestK8sApiClientPool, self).setUp()
+        objects.register_all()
+        self.pool = kubernetes_utils.K8sApiClientPool()
+        kubernetes_utils.K8S_API_CLIENT_POOL.invalidate()
+        self.addCleanup(kubernetes_utils.K8S_API_CLIENT_POOL.invalidate)
+
+    def test_get(self):
+        client1 = self.pool.get(_vim_info())
+        # reused for the same VIM
+        self.assertIs(client1, self.pool.get(_vim_info()))
+
+        # another VIM (or the VIM is updated)
+        client2 = self.pool.get(_vim_info(endpoint='https://127.0.0.2:6443'))
+        self.assertIsNot(client1, client2)
+
+        # CA cert file is shared
+        ca_cert_file = client1.configuration.ssl_ca_cert
+        self.assertEqual(ca_cert_file, client2.configuration.ssl_ca_cert)
+        with open(ca_cert_file) as f:
+            self.assertIn('-----BEGIN CERTIFICATE-----\nMIID', f.read())
+
+        self.pool.invalidate(_vim_info())
+        self.assertIsNot(client1, self.pool.get(_vim_info()))
+
+    def test_get_pool_size(self):
+        self.config_fixture.config(group='v2_vnfm',
+                                   kubernetes_client_pool_size=1)
+        client1 = self.pool.get(_vim_info())
+        self.pool.get(_vim_info(endpoint='https://127.0.0.2:6443'))
+
+        # dropped from the pool
+        self.assertEqual(1, len(self.pool.clients))
+        self.assertIsNot(client1, self.pool.get(_vim_info()))
+
+    @mock.patch.object(oidc_utils, 'get_id_token_with_password_grant')
+    def test_get_oidc_token_refresh(self, mock_get_token):
+        now = time.time()
+        mock_get_token.side_effect = [_id_token(now + 30),
+                                      _id_token(now + 3600)]
+
+        # refreshed since the token expires within the margin
+        client1 = self.pool.get(_vim_info(oidc=True))
+        client2 = self.pool.get(_vim_info(oidc=True))
+        self.assertIsNot(client1, client2)
+        self.assertIs(client2, self.pool.get(_vim_info(oidc=True)))
+        self.assertEqual(2, mock_get_token.call_count)
+        self.assertEqual(_id_token(now + 3600),
+                         client2.configuration.api_key['authorization'])
+
+    def test_auth_context_manager(self):
+        with kubernetes_utils.AuthContextManager(_vim_info()) as acm:
+            acm.init_k8s_api_client()
+            acm.init_k8s_api_client()
+            acm._create_ca_cert_file(CA_CERT)
+            ca_cert_file = acm.ca_cert_file
+        self.assertEqual(1, len(kubernetes_utils.K8S_API_CLIENT_POOL.clients))
+        # shared file is not removed
+        self.assertTrue(os.path.exists(ca_cert_file))
+        kubernetes_utils.K8S_API_CLIENT_POOL.invalidate()
+
+        self.config_fixture.config(group='v2_vnfm',
+                                   kubernetes_client_pool_size=0)
+        with kubernetes_utils.AuthContextManager(_vim_info()) as acm:
+            acm.init_k8s_api_client()
+            ca_cert_file = acm.ca_cert_file
+        self.assertEqual(0, len(kubernetes_utils.K8S_API_CLIENT_POOL.clients))
+        self.assertFalse(os.path.exists(ca_cert_file))
@@ -0,0 +1,152 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from tacker.sol_refactored.common import exceptions as sol_ex
+from tacker.sol_refactored.infra_drivers.openstack import heat_utils
+from tacker.sol_refactored import objects
+from tacker.tests import base
+
+
+STACK_NAME = 'vnf-d8962b72-6dac-4eb5-a8c5-8c8b4ae7b0a6'
+STACK_ID = '2ed1e7bd-bd32-4fb6-9ebc-3dfc3e7f4c19'
+
+
+def _event(event_id, resource_name, resource_status):
+    return {
+        'id': event_id,
+        'resource_name': resource_name,
+        'resource_status': resource_status,
+        'resource_status_reason': 'state changed'
+    }
+
+
+class TestHeatClient(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestHeatClient, self).setUp()
+        objects.register_all()
+        vim_info = objects.VimConnectionInfo(
+            vimType='ETSINFV.OPENSTACK_KEYSTONE.V_3',
+            interfaceInfo={'endpoint': 'http://localhost/identity/v3'},
+            accessInfo={
+                'username': 'nfv_user',
+                'password': 'devstack',
+                'project': 'nfv',
+                'projectDomain': 'Default',
+                'userDomain': 'Default'
+            }
+        )
+        self.heat_client = heat_utils.HeatClient(vim_info)
+        self.stack_name = f'{STACK_NAME}/{STACK_ID}'
+
+        # NOTE: not to sleep in the tests. the interval of checking is
+        # multiplied by the value.
+        patcher = mock.patch.object(heat_utils.random, 'uniform',
+                                    return_value=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch.object(heat_utils.HeatClient, 'get_status')
+    @mock.patch.object(heat_utils.HeatClient, 'get_events')
+    @mock.patch.object(heat_utils.HeatClient, 'get_last_event_id')
+    def test_wait_stack_create_by_events(self, mock_last_event_id,
+            mock_events, mock_status):
+        mock_last_event_id.return_value = 'event-0'
+        mock_events.side_effect = [
+            [],
+            [_event('event-1', STACK_NAME, 'CREATE_IN_PROGRESS'),
+             _event('event-2', 'VDU1', 'CREATE_IN_PROGRESS')],
+            [],
+            [_event('event-3', 'VDU1', 'CREATE_COMPLETE')],
+            [_event('event-4', STACK_NAME, 'CREATE_COMPLETE')]
+        ]
+        mock_status.side_effect = [
+            ('CREATE_IN_PROGRESS', ''),
+            ('CREATE_IN_PROGRESS', ''),
+            ('CREATE_COMPLETE', '')
+        ]
+
+        self.heat_client.wait_stack_create(self.stack_name)
+
+        # the status is checked at first and when the events of the stack
+        # itself occur.
+        self.assertEqual(3, mock_status.call_count)
+        self.assertEqual(5, mock_events.call_count)
+        markers = [call.args[1] for call in mock_events.call_args_list]
+        self.assertEqual(
+            ['event-0', 'event-0', 'event-2', 'event-2', 'event-3'], markers)
+
+    @mock.patch.object(heat_utils.HeatClient, 'get_status')
+    @mock.patch.object(heat_utils.HeatClient, 'get_events')
+    @mock.patch.object(heat_utils.HeatClient, 'get_last_event_id')
+    def test_wait_stack_create_max_interval(self, mock_last_event_id,
+            mock_events, mock_status):
+        heat_utils.CONF.set_override('heat_check_interval_max', 2,
+                                     group='v2_vnfm')
+        self.addCleanup(heat_utils.CONF.clear_override,
+                        'heat_check_interval_max', group='v2_vnfm')
+        mock_last_event_id.return_value = None
+        # no event occurs
+        mock_events.return_value = []
+        mock_status.side_effect = [
+            ('CREATE_IN_PROGRESS', ''),
+            ('CREATE_IN_PROGRESS', ''),
+            ('CREATE_COMPLETE', '')
+        ]
+
+        self.heat_client.wait_stack_create(self.stack_name)
+
+        # interval: 1 -> 2 (max) -> check status -> check status
+        self.assertEqual(3, mock_status.call_count)
+        self.assertEqual(3, mock_events.call_count)
+
+    @mock.patch.object(heat_utils.HeatClient, 'get_status')
+    @mock.patch.object(heat_utils.HeatClient, 'get_events')
+    @mock.patch.object(heat_utils.HeatClient, 'get_last_event_id')
+    def test_wait_stack_create_events_not_available(self, mock_last_event_id,
+            mock_events, mock_status):
+        mock_last_event_id.side_effect = sol_ex.SolException(
+            sol_status=403, sol_detail='forbidden')
+        mock_status.side_effect = [
+            ('CREATE_IN_PROGRESS', ''),
+            ('CREATE_IN_PROGRESS', ''),
+            ('CREATE_FAILED', 'failed')
+        ]
+
+        self.assertRaises(sol_ex.StackOperationFailed,
+                          self.heat_client.wait_stack_create,
+                          self.stack_name)
+        self.assertEqual(3, mock_status.call_count)
+        mock_events.assert_not_called()
+
+    @mock.patch.object(heat_utils.HeatClient, 'get_status')
+    @mock.patch.object(heat_utils.HeatClient, 'get_events')
+    @mock.patch.object(heat_utils.HeatClient, 'get_last_event_id')
+    def test_wait_stack_delete(self, mock_last_event_id, mock_events,
+            mock_status):
+        mock_last_event_id.return_value = 'event-0'
+        # stack is deleted
+        mock_events.return_value = None
+        mock_status.side_effect = [
+            ('DELETE_IN_PROGRESS', ''),
+            (None, None)
+        ]
+
+        self.heat_client.wait_stack_delete(self.stack_name)
+
+        self.assertEqual(2, mock_status.call_count)
+        mock_events.assert_called_once_with(STACK_NAME, 'event-0')
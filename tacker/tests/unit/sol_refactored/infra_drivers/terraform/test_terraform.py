@@ -13,13 +13,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import json
 import os
+import shutil
 import tempfile
 
 from oslo_utils import uuidutils
 from unittest import mock
 
+from tacker.common import csar_utils
 from tacker import context
 from tacker.sol_refactored.common import vnfd_utils
 from tacker.sol_refactored.infra_drivers.terraform import terraform
@@ -476,3 +479,121 @@ class TestTerraform(base.BaseTestCase):
             # check instantiatedVnfInfo.metadata
             self.assertIn("metadata", result)
             self.assertEqual(expected["metadata"], result["metadata"])
+
+    def _set_override(self, name, value, group='v2_vnfm'):
+        terraform.CONF.set_override(name, value, group=group)
+        self.addCleanup(terraform.CONF.clear_override, name, group=group)
+
+    @mock.patch.object(terraform.vnf_package_vnfd.VnfPackageVnfd,
+                       'get_by_id')
+    def test_get_tf_vnfpkg(self, mock_get_by_id):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        csar_dir = os.path.join(temp_dir, 'csar')
+        tf_dir = os.path.join(temp_dir, 'terraform')
+        self._set_override('vnf_package_csar_path', csar_dir,
+                           group='vnf_package')
+        self._set_override('tf_file_dir', tf_dir)
+
+        pkg_tf_dir = os.path.join(csar_dir, 'pkg1', 'Files', 'terraform')
+        os.makedirs(os.path.join(pkg_tf_dir, 'modules'))
+        for file_name in ['main.tf', 'modules/vm.tf', '.terraform.lock.hcl']:
+            with open(os.path.join(pkg_tf_dir, file_name), 'w') as f:
+                f.write(file_name)
+        mock_get_by_id.return_value = mock.Mock(package_uuid='pkg1')
+
+        inst1_dir = self.driver._get_tf_vnfpkg(
+            'inst1', SAMPLE_VNFD_ID, 'Files/terraform')
+        inst2_dir = self.driver._get_tf_vnfpkg(
+            'inst2', SAMPLE_VNFD_ID, 'Files/terraform')
+
+        # copied once to the template and hard linked from instances
+        template_dir = os.path.join(
+            tf_dir, csar_utils.TF_TEMPLATE_DIR, 'pkg1',
+            hashlib.sha256(b'Files/terraform').hexdigest())
+        self.assertEqual(f'{tf_dir}/inst1', inst1_dir)
+        for file_name in ['main.tf', 'modules/vm.tf']:
+            template_file = os.path.join(template_dir, file_name)
+            self.assertEqual(3, os.stat(template_file).st_nlink)
+            self.assertTrue(os.path.samefile(
+                template_file, os.path.join(inst2_dir, file_name)))
+        # lock file may be rewritten by terraform init
+        self.assertFalse(os.path.samefile(
+            os.path.join(template_dir, '.terraform.lock.hcl'),
+            os.path.join(inst1_dir, '.terraform.lock.hcl')))
+
+        # retry (e.g. instantiate_rollback) works on the existing links
+        self.driver._get_tf_vnfpkg('inst1', SAMPLE_VNFD_ID, 'Files/terraform')
+        self.assertEqual(
+            3, os.stat(os.path.join(template_dir, 'main.tf')).st_nlink)
+
+    def test_get_tf_template_nested(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        csar_dir = os.path.join(temp_dir, 'csar')
+        self._set_override('vnf_package_csar_path', csar_dir,
+                           group='vnf_package')
+        self._set_override('tf_file_dir', os.path.join(temp_dir, 'tf'))
+        pkg_tf_dir = os.path.join(csar_dir, 'pkg1', 'Files', 'terraform')
+        os.makedirs(pkg_tf_dir)
+        with open(os.path.join(pkg_tf_dir, 'main.tf'), 'w') as f:
+            f.write('main.tf')
+        with open(os.path.join(csar_dir, 'pkg1', 'TOSCA.meta'), 'w') as f:
+            f.write('TOSCA.meta')
+
+        # the template of a subtree doesn't make the template of the
+        # whole package look complete and vice versa
+        sub_dir = self.driver._get_tf_template('pkg1', 'Files/terraform')
+        pkg_dir = self.driver._get_tf_template('pkg1', None)
+        self.assertNotEqual(sub_dir, pkg_dir)
+        self.assertFalse(os.path.commonpath([sub_dir, pkg_dir]) in
+                         (sub_dir, pkg_dir))
+        self.assertEqual(['main.tf'], os.listdir(sub_dir))
+        self.assertTrue(os.path.isfile(os.path.join(pkg_dir, 'TOSCA.meta')))
+        self.assertTrue(os.path.isfile(
+            os.path.join(pkg_dir, 'Files', 'terraform', 'main.tf')))
+        self.assertEqual(
+            sub_dir,
+            self.driver._get_tf_template('pkg1', 'Files/terraform/'))
+
+    @mock.patch.object(terraform.Terraform, '_exec_cmd')
+    def test_instantiate_reuse_plan(self, mock_exec_cmd):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        self._set_override('tf_file_dir', temp_dir)
+        self._set_override('tf_reuse_plan', True)
+        working_dir = os.path.join(temp_dir, 'inst1')
+        os.mkdir(working_dir)
+        plan_file = os.path.join(working_dir, terraform.TF_PLAN_FILE)
+
+        def _exec_cmd(cmd, cwd):
+            if cmd[1] == 'plan':
+                with open(plan_file, 'w') as f:
+                    f.write('plan')
+        mock_exec_cmd.side_effect = _exec_cmd
+
+        vim_conn_info = objects.VimConnectionInfo.from_dict(
+            _vim_connection_info_example)
+        self.driver._instantiate(vim_conn_info, working_dir, 'vars.tf')
+
+        cmds = [call[0][0] for call in mock_exec_cmd.call_args_list]
+        self.assertEqual(['terraform', 'init'], cmds[0])
+        self.assertEqual(['-out', terraform.TF_PLAN_FILE], cmds[1][-2:])
+        self.assertEqual(['terraform', 'apply', '-auto-approve',
+                          terraform.TF_PLAN_FILE], cmds[2])
+        # the saved plan is removed since it includes credentials
+        self.assertFalse(os.path.exists(plan_file))
+        self.assertTrue(os.path.isdir(
+            os.path.join(temp_dir, terraform.TF_PLUGIN_CACHE_DIR)))
+
+    @mock.patch.object(terraform.subprocess, 'run')
+    def test_exec_cmd_plugin_cache(self, mock_run):
+        self._set_override('tf_plugin_cache_dir', tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree,
+                        terraform.CONF.v2_vnfm.tf_plugin_cache_dir)
+
+        self.driver._exec_cmd(['terraform', 'init'], cwd='/tmp')
+
+        env = mock_run.call_args[1]['env']
+        self.assertEqual(terraform.CONF.v2_vnfm.tf_plugin_cache_dir,
+                         env['TF_PLUGIN_CACHE_DIR'])
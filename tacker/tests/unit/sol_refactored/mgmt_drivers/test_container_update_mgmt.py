@@ -643,6 +643,12 @@ class TestContainerUpdate(base.TestCase):
     def setUp(self):
         super(TestContainerUpdate, self).setUp()
         cfg.CONF.v2_vnfm.kubernetes_vim_rsc_wait_timeout = 0
+        # NOTE: list_namespaced_pod is mocked to return the pods of each
+        # check by polling.
+        cfg.CONF.set_override('kubernetes_vim_rsc_watch', False,
+                              group='v2_vnfm')
+        self.addCleanup(cfg.CONF.clear_override, 'kubernetes_vim_rsc_watch',
+                        group='v2_vnfm')
         sample_dir = utils.test_sample("functional/sol_kubernetes_v2")
         self.old_vnfd = vnfd_utils.Vnfd(SAMPLE_OLD_VNFD_ID)
         self.old_vnfd.init_from_csar_dir(os.path.join(
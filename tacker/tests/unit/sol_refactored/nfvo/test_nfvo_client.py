@@ -306,6 +306,7 @@ class TestNfvoClient(base.BaseTestCase):
         super(TestNfvoClient, self).setUp()
         objects.register_all()
         self.context = context.get_admin_context()
+        subsc_utils.LCM_SUBSC_INDEX.invalidate()
         CONF.vnf_package.vnf_package_csar_path = (
             '/opt/stack/data/tacker/vnfpackage/')
         self.context.api_version = api_version.APIVersion('2.0.0')
@@ -470,11 +471,13 @@ class TestNfvoClient(base.BaseTestCase):
         self.assertEqual('44fd5841-ce98-4d54-a828-6ef51f941c8a', result[
             'vimAssets']['softwareImages'][0]['vimSoftwareImageId'])
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
     @mock.patch.object(subsc_utils, 'send_notification')
     @mock.patch.object(local_nfvo.LocalNfvo, 'recv_inst_create_notification')
     def test_send_inst_create_notification(
-            self, mock_recv, mock_send, mock_subscs):
+            self, mock_recv, mock_send, mock_subscs, mock_ids):
+        mock_ids.return_value = ['subsc-1']
         cfg.CONF.clear_override("use_external_nfvo", group="v2_nfvo")
         self.nfvo_client.is_local = True
         inst = objects.VnfInstanceV2(id='test-instance')
@@ -484,11 +487,13 @@ class TestNfvoClient(base.BaseTestCase):
         self.assertEqual(1, mock_recv.call_count)
         self.assertEqual(1, mock_send.call_count)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
     @mock.patch.object(subsc_utils, 'send_notification')
     @mock.patch.object(local_nfvo.LocalNfvo, 'recv_inst_delete_notification')
     def test_send_inst_delete_notification(
-            self, mock_recv, mock_send, mock_subscs):
+            self, mock_recv, mock_send, mock_subscs, mock_ids):
+        mock_ids.return_value = ['subsc-1']
         cfg.CONF.clear_override("use_external_nfvo", group="v2_nfvo")
         self.nfvo_client.is_local = True
         inst = objects.VnfInstanceV2(id='test-instance')
@@ -498,10 +503,13 @@ class TestNfvoClient(base.BaseTestCase):
         self.assertEqual(1, mock_recv.call_count)
         self.assertEqual(1, mock_send.call_count)
 
-    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_all_ids')
+    @mock.patch.object(objects.base.TackerPersistentObject, 'get_by_ids')
     @mock.patch.object(subsc_utils, 'send_notification')
     @mock.patch.object(local_nfvo.LocalNfvo, 'recv_lcmocc_notification')
-    def test_send_lcmocc_notification(self, mock_recv, mock_send, mock_subscs):
+    def test_send_lcmocc_notification(self, mock_recv, mock_send, mock_subscs,
+                                      mock_ids):
+        mock_ids.return_value = ['subsc-1']
         inst = objects.VnfInstanceV2(id='test-instance')
         lcmocc = objects.VnfLcmOpOccV2.from_dict(_lcmocc_inst_value)
         mock_subscs.return_value = [objects.LccnSubscriptionV2(
@@ -10,6 +10,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 from sqlalchemy.orm import exc as orm_exc
 from unittest import mock
 
@@ -20,6 +21,7 @@ from tacker.extensions import nfvo
 from tacker.keymgr import API as KEYMGR_API
 from tacker import manager
 from tacker.tests.unit import base
+from tacker.vnfm import keystone
 from tacker.vnfm import vim_client
 
 
@@ -85,6 +87,8 @@ class TestVIMClient(base.TestCase):
         self.vimclient = vim_client.VimClient()
         self.service_plugins = mock.Mock()
         self.nfvo_plugin = mock.Mock()
+        vim_client.invalidate_vim_auth()
+        self.addCleanup(vim_client.invalidate_vim_auth)
 
     def _mock_external_token_api(self):
         def mock_token_resp(request, context):
@@ -193,6 +197,55 @@ class TestVIMClient(base.TestCase):
                           'tenant': 'test', 'extra': {}}
             self.assertEqual(vim_expect, vim_result)
 
+    def test_get_vim_cached_auth(self):
+        self.nfvo_plugin.get_vim.side_effect = (
+            lambda *args, **kwargs: copy.deepcopy(self.vim_info))
+        self.service_plugins.get.return_value = self.nfvo_plugin
+        self.vimclient._build_vim_auth = mock.Mock()
+        self.vimclient._build_vim_auth.return_value = {'password': 'test'}
+        with mock.patch.object(manager.TackerManager, 'get_service_plugins',
+                               return_value=self.service_plugins):
+            for _ in range(2):
+                vim_result = self.vimclient.get_vim(
+                    None, vim_id=self.vim_info['id'])
+                self.assertEqual({'password': 'test'},
+                                 vim_result['vim_auth'])
+                # callers can modify the result
+                vim_result['vim_auth'].pop('password')
+            self.assertEqual(1, self.vimclient._build_vim_auth.call_count)
+
+            # auth is updated by another process
+            self.vim_info['auth_cred'] = {'password': '*****'}
+            self.vimclient.get_vim(None, vim_id=self.vim_info['id'])
+            self.assertEqual(2, self.vimclient._build_vim_auth.call_count)
+
+            # updated or deleted by this process
+            vim_client.invalidate_vim_auth(self.vim_info['id'])
+            self.vimclient.get_vim(None, vim_id=self.vim_info['id'])
+            self.assertEqual(3, self.vimclient._build_vim_auth.call_count)
+
+            # cache is disabled
+            vim_client.invalidate_vim_auth()
+            self.config_fixture.config(group='nfvo_vim',
+                                       vim_auth_cache_ttl=0)
+            self.vimclient.get_vim(None, vim_id=self.vim_info['id'])
+            self.vimclient.get_vim(None, vim_id=self.vim_info['id'])
+            self.assertEqual(5, self.vimclient._build_vim_auth.call_count)
+
+    def test_keystone_session_cache(self):
+        auth = {'auth_url': self.vim_info['auth_url'], 'username': 'test',
+                'password': 'test', 'project_name': 'test',
+                'user_domain_name': 'Default',
+                'project_domain_name': 'Default'}
+        keystone_plugin = keystone.Keystone()
+        sess = keystone_plugin.get_cached_client(**auth)
+        self.assertIs(sess, keystone_plugin.get_cached_client(**auth))
+        self.assertIsNot(sess, keystone_plugin.get_cached_client(
+            **dict(auth, password='new')))
+
+        vim_client.invalidate_vim_auth(self.vim_info['id'])
+        self.assertIsNot(sess, keystone_plugin.get_cached_client(**auth))
+
     def test_find_vim_key_with_key_not_found_exception(self):
         vim_id = self.vim_info['id']
         self.assertRaises(nfvo.VimKeyNotFoundException,
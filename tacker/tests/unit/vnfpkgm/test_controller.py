@@ -20,6 +20,8 @@ from http import client as http_client
 import json
 import os
 import re
+import shutil
+import tempfile
 from unittest import mock
 import urllib
 from webob import exc
@@ -56,6 +58,10 @@ class TestController(base.TestCase):
     def setUp(self):
         super(TestController, self).setUp()
         self.controller = controller.VnfPkgmController()
+        vnfd_cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, vnfd_cache_path)
+        self.config_fixture.config(group='vnf_package',
+                                   vnfd_cache_path=vnfd_cache_path)
 
     @property
     def app(self):
@@ -1161,6 +1167,47 @@ class TestController(base.TestCase):
                           req, constants.UUID)
         self.assertEqual(http_client.INTERNAL_SERVER_ERROR, resp.status_code)
 
+    @mock.patch.object(VNFPackageRPCAPI, "get_vnf_package_vnfd")
+    @mock.patch.object(vnf_package.VnfPackage, "get_by_id")
+    def test_get_vnf_package_vnfd_cached(self, mock_vnf_by_id,
+                                         mock_get_vnf_package_vnfd):
+        mock_get_vnf_package_vnfd.return_value = fakes.return_vnfd_data()
+
+        def _get_vnfd(etag=None):
+            req = fake_request.HTTPRequest.blank(
+                '/vnf_packages/%s/vnfd' % constants.UUID)
+            mock_vnf_by_id.return_value = fakes.return_vnfpkg_obj(
+                vnf_package_updates={
+                    'tenant_id': req.environ['tacker.context'].project_id})
+            req.headers['Accept'] = 'application/zip'
+            if etag:
+                req.headers['If-None-Match'] = '"%s"' % etag
+            req.method = 'GET'
+            return req.get_response(self.app)
+
+        resp1 = _get_vnfd()
+        self.assertEqual(http_client.OK, resp1.status_code)
+        self.assertEqual('application/zip', resp1.content_type)
+        self.assertIsNotNone(resp1.etag)
+
+        # got from the cache
+        resp2 = _get_vnfd()
+        self.assertEqual(http_client.OK, resp2.status_code)
+        self.assertEqual(resp1.body, resp2.body)
+        self.assertEqual(resp1.etag, resp2.etag)
+        self.assertEqual(1, mock_get_vnf_package_vnfd.call_count)
+
+        resp3 = _get_vnfd(etag=resp1.etag)
+        self.assertEqual(http_client.NOT_MODIFIED, resp3.status_code)
+        self.assertEqual(b'', resp3.body)
+
+        # invalidated when the package is deleted
+        csar_utils.delete_vnfd_cache(constants.UUID)
+        resp4 = _get_vnfd(etag=resp1.etag)
+        # the same ETag since the archive is made in the same way
+        self.assertEqual(http_client.NOT_MODIFIED, resp4.status_code)
+        self.assertEqual(2, mock_get_vnf_package_vnfd.call_count)
+
     def test_fetch_vnf_package_content_valid_range(self):
         request = fake_request.HTTPRequest.blank(
             '/vnf_packages/%s/package_content/'
@@ -14,7 +14,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import os
+import threading
+import time
 
 from cryptography import fernet
 from keystoneauth1 import adapter
@@ -22,7 +25,9 @@ from keystoneauth1 import identity
 from keystoneauth1 import session
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 
+from tacker._i18n import _
 from tacker.common import utils
 
 
@@ -30,6 +35,67 @@ DEFAULT_IDENTITY_VERSION = "v3"
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
+OPTS = [
+    cfg.IntOpt('vim_auth_cache_ttl', default=300, min=0,
+               help=_('Time in seconds to keep the decrypted VIM auth and '
+                      'the keystone sessions made from it in memory. '
+                      'They are never persisted. 0 disables the cache.')),
+]
+cfg.CONF.register_opts(OPTS, 'nfvo_vim')
+
+
+def config_opts():
+    return [('nfvo_vim', OPTS)]
+
+
+class _SessionCache(object):
+    """Cache of keystone sessions per auth parameters
+
+    A session is shared by the clients with the same auth parameters
+    until CONF.nfvo_vim.vim_auth_cache_ttl seconds pass, so that a token is
+    not issued per client. The session itself re-authenticates when the
+    token expires. The key is a hash of the auth parameters so that the
+    secrets are not kept in the keys.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # {key: (expires, session)}
+        self.sessions = {}
+
+    @staticmethod
+    def _key(auth_params):
+        return hashlib.sha256(jsonutils.dump_as_bytes(
+            auth_params, sort_keys=True)).hexdigest()
+
+    def get(self, auth_params, create):
+        ttl = CONF.nfvo_vim.vim_auth_cache_ttl
+        if ttl <= 0:
+            return create()
+
+        key = self._key(auth_params)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.sessions.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            # NOTE: expired sessions are dropped here since the cache is
+            # small (i.e. the number of VIMs).
+            self.sessions = {k: v for k, v in self.sessions.items()
+                             if v[0] > now}
+
+        sess = create()
+        with self.lock:
+            self.sessions[key] = (now + ttl, sess)
+        return sess
+
+    def clear(self):
+        with self.lock:
+            self.sessions = {}
+
+
+SESSION_CACHE = _SessionCache()
+
 
 class Keystone(object):
     """Keystone module for OpenStack VIM
@@ -61,6 +127,11 @@ class Keystone(object):
             auth_plugin = identity.v3.Password(**kwargs)
         return self.get_session(auth_plugin=auth_plugin, verify=verify)
 
+    def get_cached_client(self, **kwargs):
+        """Get a session shared by the clients with the same kwargs"""
+        return SESSION_CACHE.get(
+            kwargs, lambda: self.initialize_client(**kwargs))
+
     @staticmethod
     def create_key_dir(path):
         if not os.access(path, os.F_OK):
@@ -13,11 +13,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+import hashlib
 import os
+import threading
+import time
 
 from cryptography import fernet
 from oslo_config import cfg
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 
 from tacker.common import utils
 from tacker import context as t_context
@@ -25,11 +30,73 @@ from tacker.extensions import nfvo
 from tacker.keymgr import API as KEYMGR_API
 from tacker import manager
 from tacker.plugins.common import constants
+from tacker.vnfm import keystone
 
 LOG = logging.getLogger(__name__)
 CONF = cfg.CONF
 
 
+class _VimAuthCache(object):
+    """Cache of decrypted VIM auth per VIM
+
+    Decrypting VIM auth needs the Fernet key from the local file system or
+    barbican. The decrypted auth is kept only in memory, for
+    CONF.nfvo_vim.vim_auth_cache_ttl seconds. An entry is valid only while
+    the encrypted auth of the VIM is not changed, so that an update of the
+    VIM by another process is not missed.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # {vim_id: (expires, fingerprint, vim_auth)}
+        self.entries = {}
+
+    @staticmethod
+    def fingerprint(vim_info):
+        return hashlib.sha256(jsonutils.dump_as_bytes(
+            [vim_info['auth_cred'], vim_info['auth_url']],
+            sort_keys=True)).hexdigest()
+
+    def get(self, vim_id, fingerprint):
+        with self.lock:
+            entry = self.entries.get(vim_id)
+            if entry is None:
+                return None
+            expires, cached_fingerprint, vim_auth = entry
+            if expires <= time.monotonic() or \
+                    cached_fingerprint != fingerprint:
+                del self.entries[vim_id]
+                return None
+        # NOTE: callers may modify vim_auth.
+        return copy.deepcopy(vim_auth)
+
+    def put(self, vim_id, fingerprint, vim_auth):
+        ttl = CONF.nfvo_vim.vim_auth_cache_ttl
+        if ttl <= 0:
+            return
+        with self.lock:
+            self.entries[vim_id] = (time.monotonic() + ttl, fingerprint,
+                                    copy.deepcopy(vim_auth))
+
+    def invalidate(self, vim_id=None):
+        with self.lock:
+            if vim_id is None:
+                self.entries = {}
+            else:
+                self.entries.pop(vim_id, None)
+
+
+VIM_AUTH_CACHE = _VimAuthCache()
+
+
+def invalidate_vim_auth(vim_id=None):
+    """Discard the cached auth of the VIM (all VIMs if vim_id is None)"""
+    VIM_AUTH_CACHE.invalidate(vim_id)
+    # NOTE: sessions are keyed by auth parameters, not by VIM. They are
+    # all discarded since updating or deleting a VIM is rare.
+    keystone.SESSION_CACHE.clear()
+
+
 class VimClient(object):
     def get_vim(self, context, vim_id=None, region_name=None):
         """Get Vim information for provided VIM id
@@ -59,7 +126,7 @@ class VimClient(object):
                                                  ['regions'], region_name):
             raise nfvo.VimRegionNotFoundException(region_name=region_name)
 
-        vim_auth = self._build_vim_auth(vim_info)
+        vim_auth = self._get_vim_auth(vim_info)
         vim_res = {'vim_auth': vim_auth, 'vim_id': vim_info['id'],
                    'vim_name': vim_info.get('name', vim_info['id']),
                    'vim_type': vim_info['type'],
@@ -72,6 +139,18 @@ class VimClient(object):
     def region_valid(vim_regions, region_name):
         return region_name in vim_regions
 
+    def _get_vim_auth(self, vim_info):
+        # NOTE: fingerprint is calculated before _build_vim_auth since it
+        # decrypts vim_info['auth_cred'] in place.
+        fingerprint = VIM_AUTH_CACHE.fingerprint(vim_info)
+        vim_auth = VIM_AUTH_CACHE.get(vim_info['id'], fingerprint)
+        if vim_auth is None:
+            vim_auth = self._build_vim_auth(vim_info)
+            VIM_AUTH_CACHE.put(vim_info['id'], fingerprint, vim_auth)
+        else:
+            LOG.debug('Use cached auth of VIM %s', vim_info['id'])
+        return vim_auth
+
     def _build_vim_auth(self, vim_info):
         LOG.debug('VIM id is %s', vim_info['id'])
         vim_auth = vim_info['auth_cred']
@@ -0,0 +1,102 @@
+# Copyright (C) 2026 Nippon Telegraph and Telephone Corporation
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Micro benchmark of the request schema validation
+
+For each object schema defined in tacker/api/schemas and
+tacker/sol_refactored/api/schemas, this compares the time of validating an
+empty body with a validator made per validation (the old behavior) and with
+the compiled validator got from the registry.
+
+Usage:
+    python3 tools/benchmark_schema_validation.py [-n NUMBER] [-f FILTER]
+"""
+
+import argparse
+import importlib
+import pkgutil
+import timeit
+
+import jsonschema
+
+from tacker.api.validation import validators
+from tacker.common import exceptions
+
+
+SCHEMA_PACKAGES = ['tacker.api.schemas', 'tacker.sol_refactored.api.schemas']
+
+
+def get_schemas(name_filter=None):
+    schemas = {}
+    for pkg_name in SCHEMA_PACKAGES:
+        pkg = importlib.import_module(pkg_name)
+        for mod_info in pkgutil.iter_modules(pkg.__path__):
+            mod = importlib.import_module(f'{pkg_name}.{mod_info.name}')
+            for attr, value in vars(mod).items():
+                name = f'{mod_info.name}.{attr}'
+                if (isinstance(value, dict) and
+                        value.get('type') == 'object' and
+                        (name_filter is None or name_filter in name)):
+                    schemas[name] = value
+    return schemas
+
+
+def _validate_uncompiled(schema, body):
+    validator_cls = jsonschema.validators.extend(
+        jsonschema.Draft7Validator, validators={})
+    validator = validator_cls(schema,
+                              format_checker=validators.FormatChecker())
+    try:
+        validator.validate(body)
+    except jsonschema.ValidationError:
+        pass
+
+
+def _validate_compiled(schema, body):
+    try:
+        validators._SchemaValidator(schema).validate(body)
+    except exceptions.ValidationError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-n', '--number', type=int, default=1000,
+                        help='number of validations per schema')
+    parser.add_argument('-f', '--filter',
+                        help='only schemas whose name contains it')
+    args = parser.parse_args()
+
+    body = {}
+    total_uncompiled = total_compiled = 0.0
+    print(f"{'schema':<60} {'uncompiled(us)':>15} {'compiled(us)':>13}")
+    for name, schema in sorted(get_schemas(args.filter).items()):
+        # warm up (i.e. compile) once
+        _validate_compiled(schema, body)
+        uncompiled = timeit.timeit(
+            lambda: _validate_uncompiled(schema, body), number=args.number)
+        compiled = timeit.timeit(
+            lambda: _validate_compiled(schema, body), number=args.number)
+        total_uncompiled += uncompiled
+        total_compiled += compiled
+        print(f"{name:<60} {uncompiled / args.number * 1e6:>15.1f} "
+              f"{compiled / args.number * 1e6:>13.1f}")
+
+    print(f"{'total(s)':<60} {total_uncompiled:>15.3f} "
+          f"{total_compiled:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()